@@ -0,0 +1,93 @@
+"""
+Benchmark the Hough Spiker engine against the original per-feature loop, on many features evaluated in lockstep and on
+a single feature walked from spike to spike.
+
+The original loop costs one Python iteration per timestep and per feature, so by default it is timed on the first
+``--reference-length`` samples and extrapolated linearly. Pass ``--full-reference`` to time it on the whole signal.
+Spikes are always checked to be identical on the timed range.
+
+Usage::
+
+    python benchmarks/bench_hough_spiker.py --length 100000 --features 128 --window-length 40
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from spikify.encoders.temporal.deconvolution import hough_spiker
+
+
+def reference_hough_spiker(signal: np.ndarray, fir_bank: np.ndarray) -> np.ndarray:
+    """Original nested-loop Hough Spiker implementation."""
+    T, F = signal.shape
+    window_length = fir_bank.shape[0]
+    spikes = np.zeros_like(signal, dtype=np.int8)
+    for f in range(F):
+        for t in range(0, T - window_length + 1):
+            match_count = np.sum(signal[t : t + window_length, f] >= fir_bank[:, f])
+            if match_count == window_length:
+                signal[t : t + window_length, f] -= fir_bank[:, f]
+                spikes[t, f] = 1
+    return spikes
+
+
+def run(name: str, signal: np.ndarray, window_length: int, cutoff: float, reference_length: int) -> None:
+    T, F = signal.shape
+
+    start = time.perf_counter()
+    spikes, fir_bank, shift, norm = hough_spiker(signal, window_length, cutoff)
+    vectorized = time.perf_counter() - start
+
+    # Same preprocessing as hough_spiker, restricted to the timed range
+    reference_signal = (signal[:reference_length] - shift) / norm
+    start = time.perf_counter()
+    expected = reference_hough_spiker(reference_signal, fir_bank)
+    reference = (time.perf_counter() - start) * T / reference_length
+
+    # The last window_length - 1 positions of the range are cut short by the end of the reference signal
+    compared = reference_length - window_length + 1
+    identical = np.array_equal(spikes[:compared], expected[:compared])
+    estimate = "" if reference_length == T else " (extrapolated)"
+    print(f"{name:>7}: loop {reference:8.2f} s{estimate}, engine {vectorized:6.2f} s, ", end="")
+    print(f"speedup {reference / vectorized:5.1f}x, spike rate {spikes.mean():.3f}, identical: {identical}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--length", type=int, default=100_000, help="number of timesteps (T)")
+    parser.add_argument("--features", type=int, default=128, help="number of features (F)")
+    parser.add_argument("--window-length", type=int, default=40, help="filter length")
+    parser.add_argument("--cutoff", type=float, default=0.05, help="filter cutoff frequency")
+    parser.add_argument("--reference-length", type=int, default=5_000, help="timesteps timed with the loop")
+    parser.add_argument("--full-reference", action="store_true", help="time the loop on the whole signal")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    reference_length = args.length if args.full_reference else min(args.reference_length, args.length)
+
+    for features in (args.features, 1):
+        shape = (args.length, features)
+        print(f"Hough Spiker, T={args.length}, F={features}, window_length={args.window_length}")
+        # Slow oscillations, matching the filter for long stretches: frequent spikes
+        time_steps = np.arange(args.length)[:, None]
+        periods = rng.uniform(200, 2000, features)
+        run(
+            "smooth",
+            np.sin(2 * np.pi * time_steps / periods) + 0.05 * rng.normal(size=shape),
+            args.window_length,
+            args.cutoff,
+            reference_length,
+        )
+        # Mostly silent signal with isolated bursts: rare spikes
+        bursts = np.zeros(shape)
+        bursts[rng.integers(0, args.length, (args.length // 500, features)), np.arange(features)] = 1.0
+        bursts = np.apply_along_axis(np.convolve, 0, bursts, np.hanning(4 * args.window_length), mode="same")
+        run("sparse", bursts, args.window_length, args.cutoff, reference_length)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark encode_many against a sequential loop over the recordings.
+
+Every recording is encoded with the Hough Spiker by default, and the results of every run are checked to be identical
+to the sequential ones. The speedup is bounded by the number of physical cores of the machine.
+
+Usage::
+
+    python benchmarks/bench_parallel.py --recordings 102 --length 20000 --features 6 --workers 1 2 4 8 16 32
+
+"""
+
+import argparse
+import time
+from functools import partial
+
+import numpy as np
+
+from spikify.encoders.temporal.contrast import step_forward
+from spikify.encoders.temporal.deconvolution import hough_spiker
+from spikify.parallel import encode_many
+
+ENCODERS = {
+    "hough_spiker": partial(hough_spiker, window_length=20, cutoff=0.05),
+    "step_forward": partial(step_forward, threshold=0.2),
+}
+
+
+def identical(results: list, expected: list) -> bool:
+    return all(
+        all(np.array_equal(array, expected_array) for array, expected_array in zip(result, value))
+        for result, value in zip(results, expected)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recordings", type=int, default=102, help="number of recordings")
+    parser.add_argument("--length", type=int, default=20_000, help="number of timesteps of every recording (T)")
+    parser.add_argument("--features", type=int, default=6, help="number of features of every recording (F)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="numbers of workers to time")
+    parser.add_argument("--encoder", choices=sorted(ENCODERS), default="hough_spiker")
+    parser.add_argument("--strategy", choices=["process", "thread"], default="process")
+    parser.add_argument("--chunking", choices=["recording", "feature"], default="recording")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    shape = (args.recordings, args.length, args.features)
+    signals = np.cumsum(rng.normal(scale=0.1, size=shape), axis=1)
+    encoder = ENCODERS[args.encoder]
+
+    print(f"{args.encoder}, {args.recordings} recordings, T={args.length}, F={args.features}, {args.strategy} pool")
+    start = time.perf_counter()
+    expected = [encoder(signal) for signal in signals]
+    sequential = time.perf_counter() - start
+    print(f"   loop: {sequential:7.2f} s")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = encode_many(encoder, signals, workers=workers, strategy=args.strategy, chunking=args.chunking)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers: {elapsed:7.2f} s, speedup {sequential / elapsed:5.1f}x, ", end="")
+        print(f"identical: {identical(results, expected)}")
+
+
+if __name__ == "__main__":
+    main()
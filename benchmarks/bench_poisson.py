@@ -0,0 +1,79 @@
+"""
+Benchmark the vectorized Poisson encoder against the original per-interval loop.
+
+The two draw their random numbers from different generators, so their spikes are not compared one by one. Their spike
+rates are checked to agree instead, on the benchmark signal and on constant signals of known rate. The Bernoulli and
+binomial methods, which spike at every timestep with the interval rate, are timed as well.
+
+Usage::
+
+    python benchmarks/bench_poisson.py --length 100000 --features 128 --interval-length 10
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from spikify.encoders.rate import poisson
+
+
+def reference_poisson(signal: np.ndarray, interval_length: int, seed: int = 0) -> np.ndarray:
+    """Original per-feature, per-interval Poisson implementation, on a signal already scaled to [0, 1]."""
+    T, F = signal.shape
+    np.random.seed(seed)
+    interval_rate_mean = np.mean(signal.reshape(T // interval_length, interval_length, F), axis=1)
+    spikes = np.zeros((T // interval_length, interval_length, F), dtype=np.int8)
+    bins = np.linspace(0, 1, interval_length + 1)
+    for feat in range(F):
+        for idx, rate in enumerate(interval_rate_mean[:, feat]):
+            if rate > 0:
+                ISI = -np.log(1 - np.random.random(interval_length)) / (rate * interval_length)
+                spike_times = np.searchsorted(bins, np.cumsum(ISI)) - 1
+                spikes[idx, spike_times[spike_times < interval_length], feat] = 1
+    return spikes.reshape(T, F)
+
+
+def run(signal: np.ndarray, interval_length: int) -> None:
+    start = time.perf_counter()
+    spikes = poisson(signal, interval_length)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = reference_poisson(signal, interval_length)
+    reference = time.perf_counter() - start
+
+    print(f"loop {reference:8.2f} s, vectorized {vectorized:6.2f} s, speedup {reference / vectorized:5.1f}x")
+    print(f"spike rate: loop {expected.mean():.4f}, vectorized {spikes.mean():.4f}")
+
+    for method in ("bernoulli", "binomial"):
+        start = time.perf_counter()
+        spikes = poisson(signal, interval_length, method=method)
+        elapsed = time.perf_counter() - start
+        print(f"{method:>9}: {elapsed:6.2f} s, {vectorized / elapsed:5.1f}x the ISI method, ", end="")
+        print(f"spike rate {spikes.mean():.4f} (signal mean {signal.mean():.4f})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--length", type=int, default=100_000, help="number of timesteps (T)")
+    parser.add_argument("--features", type=int, default=128, help="number of features (F)")
+    parser.add_argument("--interval-length", type=int, default=10, help="interval length")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    length = args.length - args.length % args.interval_length
+    rng = np.random.default_rng(args.seed)
+
+    print(f"Poisson, T={length}, F={args.features}, interval_length={args.interval_length}")
+    run(rng.uniform(size=(length, args.features)), args.interval_length)
+
+    for rate in (0.1, 0.5, 0.9):
+        signal = np.full((length, 1), rate)
+        expected = reference_poisson(signal, args.interval_length).mean()
+        print(f"rate {rate}: loop {expected:.4f}, vectorized {poisson(signal, args.interval_length).mean():.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Backends package."""
+
+from .precision import get_dtype, resolve_dtype, set_dtype, use_dtype
+from .registry import available_backends, get_backend, get_kernel, register_kernel, set_backend, use_backend
+
+__all__ = [
+    "available_backends",
+    "get_backend",
+    "get_dtype",
+    "get_kernel",
+    "register_kernel",
+    "resolve_dtype",
+    "set_backend",
+    "set_dtype",
+    "use_backend",
+    "use_dtype",
+]
@@ -0,0 +1,214 @@
+"""
+.. raw:: html
+
+    <h2>Numba Backend</h2>
+
+Compiled kernels for the encoders whose inner loop is sequential because of state feedback. This module is imported
+by :mod:`spikify.backends.registry` the first time the ``"numba"`` backend is requested, never on ``import spikify``.
+
+Each kernel runs the original per-feature, per-timestep algorithm natively, except the Moving Window kernel, which
+slides a running sum over the signal instead of averaging every window again, restarted at the blocks of the NumPy
+backend. The error sums of the deconvolution kernels are accumulated sequentially, while NumPy uses pairwise summation
+for windows longer than 8 samples, so spikes may differ from the NumPy backend when a window lands exactly on the
+detection threshold, as may Moving Window spikes when a sample lands exactly on its base plus or minus the threshold.
+"""
+
+import numba
+import numpy as np
+from spikify.encoders.temporal.contrast.moving_window_algorithm import _default_block
+from spikify.encoders.utils import spike_buffer
+from .registry import register_kernel
+
+
+@numba.njit(cache=True)
+def _step_forward_loop(signal, thresholds, base, spikes):
+    T, F = signal.shape
+    for f in range(F):
+        b = base[f]
+        for t in range(T):
+            value = signal[t, f]
+            if value > b + thresholds[f]:
+                spikes[t, f] = 1
+                b += thresholds[f]
+            elif value < b - thresholds[f]:
+                spikes[t, f] = -1
+                b -= thresholds[f]
+        base[f] = b
+    return spikes
+
+
+@numba.njit(cache=True)
+def _window_increment(value, reference, sign, counts):
+    # Count a non-finite sample entering (sign 1) or leaving (sign -1) the window, or return its finite contribution
+    if np.isnan(value):
+        counts[0] += sign
+    elif value == np.inf:
+        counts[1] += sign
+    elif value == -np.inf:
+        counts[2] += sign
+    else:
+        return sign * (value - reference)
+    return 0.0
+
+
+@numba.njit(cache=True)
+def _moving_window_loop(signal, window_length, thresholds, block, spikes):
+    T, F = signal.shape
+    counts = np.zeros(3, dtype=np.int64)
+    for f in range(F):
+        # The first window_length samples share the mean of the first window as base
+        first = signal[: min(window_length, T), f].mean()
+        reference = 0.0
+        total = 0.0
+        for t in range(T):
+            if t < window_length:
+                base = first
+            else:
+                if (t - window_length) % block == 0:
+                    # Restart the running sum of the window every block, relative to its first finite sample
+                    reference = signal[t - window_length, f]
+                    if not np.isfinite(reference):
+                        reference = 0.0
+                    total = 0.0
+                    counts[:] = 0
+                    for k in range(t - window_length, t):
+                        total += _window_increment(signal[k, f], reference, 1, counts)
+                else:
+                    total += _window_increment(signal[t - 1, f], reference, 1, counts)
+                    total += _window_increment(signal[t - 1 - window_length, f], reference, -1, counts)
+
+                # Windows holding NaN or infinities of both signs have a NaN mean, otherwise the infinity they hold
+                if counts[0] > 0 or (counts[1] > 0 and counts[2] > 0):
+                    base = np.nan
+                elif counts[1] > 0:
+                    base = np.inf
+                elif counts[2] > 0:
+                    base = -np.inf
+                else:
+                    base = total / window_length + reference
+            if signal[t, f] > base + thresholds[f]:
+                spikes[t, f] = 1
+            elif signal[t, f] < base - thresholds[f]:
+                spikes[t, f] = -1
+    return spikes
+
+
+@numba.njit(cache=True)
+def _bens_spiker_loop(signal, fir_bank, thresholds, spikes):
+    T, F = signal.shape
+    window_length = fir_bank.shape[0]
+    for f in range(F):
+        for t in range(T - window_length + 1):
+            error1 = 0.0
+            error2 = 0.0
+            for k in range(window_length):
+                error1 += abs(signal[t + k, f] - fir_bank[k, f])
+                error2 += abs(signal[t + k, f])
+            if error1 <= error2 - thresholds[f]:
+                spikes[t, f] = 1
+                for k in range(window_length):
+                    signal[t + k, f] -= fir_bank[k, f]
+    return spikes
+
+
+@numba.njit(cache=True)
+def _hough_spiker_loop(signal, fir_bank, spikes):
+    T, F = signal.shape
+    window_length = fir_bank.shape[0]
+    for f in range(F):
+        for t in range(T - window_length + 1):
+            match = True
+            for k in range(window_length):
+                if not signal[t + k, f] >= fir_bank[k, f]:
+                    match = False
+                    break
+            if match:
+                spikes[t, f] = 1
+                for k in range(window_length):
+                    signal[t + k, f] -= fir_bank[k, f]
+    return spikes
+
+
+@numba.njit(cache=True)
+def _modified_hough_spiker_loop(signal, fir_bank, thresholds, spikes):
+    T, F = signal.shape
+    window_length = fir_bank.shape[0]
+    for f in range(F):
+        for t in range(T):
+            # The window is truncated at the end of the signal
+            length = min(window_length, T - t)
+            error = 0.0
+            for k in range(length):
+                error += max(fir_bank[k, f] - signal[t + k, f], 0.0)
+            if error <= thresholds[f]:
+                spikes[t, f] = 1
+                for k in range(length):
+                    signal[t + k, f] -= fir_bank[k, f]
+    return spikes
+
+
+def _float_array(array: np.ndarray) -> np.ndarray:
+    """
+    Return a C-contiguous float version of an array, as expected by the compiled loops. ``float32`` arrays are kept in
+    single precision, for which the loops are compiled separately; any other type is converted to ``float64``.
+
+    :param array: Input array.
+    :type array: numpy.ndarray
+    :return: The array itself if it already complies, otherwise a converted copy.
+    :rtype: numpy.ndarray
+
+    """
+    array = np.asarray(array)
+    return np.ascontiguousarray(array, dtype=np.float32 if array.dtype == np.float32 else np.float64)
+
+
+@register_kernel("numba", "step_forward")
+def _step_forward_kernel(
+    signal: np.ndarray, thresholds: np.ndarray, base: np.ndarray, out: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    signal = _float_array(signal)
+    base = np.array(base, dtype=signal.dtype)
+    spikes = _step_forward_loop(signal, _float_array(thresholds), base, spike_buffer(out, signal.shape))
+    return spikes, base
+
+
+@register_kernel("numba", "moving_window")
+def _moving_window_kernel(
+    signal: np.ndarray, window_length: int, thresholds: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    signal = _float_array(signal)
+    block = _default_block(window_length, signal.shape[1], signal.dtype)
+    return _moving_window_loop(signal, window_length, _float_array(thresholds), block, spike_buffer(out, signal.shape))
+
+
+@register_kernel("numba", "bens_spiker")
+def _bens_spiker_kernel(
+    signal: np.ndarray, fir_bank: np.ndarray, thresholds: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    work = _float_array(signal)
+    spikes = _bens_spiker_loop(work, _float_array(fir_bank), _float_array(thresholds), spike_buffer(out, signal.shape))
+    if work is not signal:
+        signal[...] = work
+    return spikes
+
+
+@register_kernel("numba", "hough_spiker")
+def _hough_spiker_kernel(signal: np.ndarray, fir_bank: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    work = _float_array(signal)
+    spikes = _hough_spiker_loop(work, _float_array(fir_bank), spike_buffer(out, signal.shape))
+    if work is not signal:
+        signal[...] = work
+    return spikes
+
+
+@register_kernel("numba", "modified_hough_spiker")
+def _modified_hough_spiker_kernel(
+    signal: np.ndarray, fir_bank: np.ndarray, thresholds: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    work = _float_array(signal)
+    spikes = _modified_hough_spiker_loop(
+        work, _float_array(fir_bank), _float_array(thresholds), spike_buffer(out, signal.shape)
+    )
+    if work is not signal:
+        signal[...] = work
+    return spikes
@@ -0,0 +1,210 @@
+"""
+.. raw:: html
+
+    <h2>Backend Registry</h2>
+"""
+
+import importlib
+import importlib.util
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+# Kernels registered so far, per backend. The NumPy kernels register themselves when their encoder module is imported
+_KERNELS: dict[str, dict[str, Callable]] = {"numpy": {}}
+
+# Modules to import the first time a backend is used, so that optional dependencies are never imported eagerly
+_MODULES = {"numba": "spikify.backends.numba_backend"}
+
+# Name of the package each optional backend depends on
+_REQUIREMENTS = {"numba": "numba"}
+
+_default_backend = "numpy"
+
+
+def register_kernel(backend: str, name: str) -> Callable[[Callable], Callable]:
+    """
+    Register a function as the ``name`` kernel of ``backend``.
+
+    Kernels implement the inner loop of an encoder on a 2D (time × features) float signal. Every kernel registered
+    under the same name must take the same arguments and return the same values as the NumPy one. Kernels returning
+    a spike train also take an ``out`` keyword argument, a preallocated ``int8`` array of shape (time, features) that
+    they fill and return instead of allocating one.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        from spikify.backends import register_kernel
+
+        @register_kernel("numpy", "my_encoder")
+        def _my_encoder_kernel(signal, thresholds):
+            ...
+
+    :param backend: Name of the backend providing the kernel.
+    :type backend: str
+    :param name: Name of the kernel, usually the name of the encoder using it.
+    :type name: str
+    :return: A decorator registering the function and returning it unchanged.
+    :rtype: Callable
+
+    """
+
+    def decorator(function: Callable) -> Callable:
+        _KERNELS.setdefault(backend, {})[name] = function
+        return function
+
+    return decorator
+
+
+def available_backends() -> list[str]:
+    """
+    List the backends that can be used in the current environment.
+
+    Optional backends are listed only if the package they depend on is installed; the package itself is not
+    imported.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        from spikify.backends import available_backends
+        backends = available_backends()
+
+    .. doctest::
+        :hide:
+
+        >>> from spikify.backends import available_backends
+        >>> "numpy" in available_backends()
+        True
+
+    :return: Names of the usable backends.
+    :rtype: list[str]
+
+    """
+    backends = []
+    for backend in sorted(set(_KERNELS) | set(_MODULES)):
+        requirement = _REQUIREMENTS.get(backend)
+        if requirement is None or importlib.util.find_spec(requirement) is not None:
+            backends.append(backend)
+    return backends
+
+
+def get_backend() -> str:
+    """
+    Return the name of the backend used when an encoder is called without ``backend``.
+
+    :return: Name of the default backend.
+    :rtype: str
+
+    """
+    return _default_backend
+
+
+def set_backend(backend: str) -> None:
+    """
+    Set the backend used when an encoder is called without ``backend``.
+
+    Besides the name of an available backend, ``"auto"`` selects ``"numba"`` when it is installed and ``"numpy"``
+    otherwise.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        from spikify.backends import set_backend
+        set_backend("numba")
+
+    :param backend: Name of the backend, or ``"auto"``.
+    :type backend: str
+    :raises ValueError: If the backend is unknown.
+    :raises ImportError: If the backend depends on a package which is not installed.
+
+    """
+    global _default_backend
+    _default_backend = _resolve(backend)
+
+
+@contextmanager
+def use_backend(backend: str) -> Iterator[str]:
+    """
+    Temporarily change the default backend inside a ``with`` block.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.backends import use_backend
+        from spikify.encoders.temporal.contrast import step_forward
+
+        with use_backend("numba"):
+            spikes, thresholds = step_forward(np.random.rand(1000, 4), 0.1)
+
+    :param backend: Name of the backend, or ``"auto"``.
+    :type backend: str
+    :return: A context manager yielding the name of the selected backend.
+    :rtype: Iterator[str]
+    :raises ValueError: If the backend is unknown.
+    :raises ImportError: If the backend depends on a package which is not installed.
+
+    """
+    global _default_backend
+    previous = _default_backend
+    _default_backend = _resolve(backend)
+    try:
+        yield _default_backend
+    finally:
+        _default_backend = previous
+
+
+def get_kernel(name: str, backend: str | None = None) -> Callable:
+    """
+    Return the ``name`` kernel of a backend.
+
+    The backend module is imported the first time one of its kernels is requested. If the backend does not provide
+    the kernel, the NumPy one is returned.
+
+    :param name: Name of the kernel.
+    :type name: str
+    :param backend: Name of the backend, or ``"auto"``. If ``None``, the default backend is used.
+    :type backend: str | None
+    :return: The kernel function.
+    :rtype: Callable
+    :raises ValueError: If the backend is unknown.
+    :raises ImportError: If the backend depends on a package which is not installed.
+    :raises KeyError: If no backend provides the kernel.
+
+    """
+    backend = _default_backend if backend is None else _resolve(backend)
+    kernels = _KERNELS.get(backend, {})
+    return kernels[name] if name in kernels else _KERNELS["numpy"][name]
+
+
+def _resolve(backend: str) -> str:
+    """
+    Validate a backend name, importing its module if it was not imported yet.
+
+    :param backend: Name of the backend, or ``"auto"``.
+    :type backend: str
+    :return: Name of the backend.
+    :rtype: str
+    :raises ValueError: If the backend is unknown.
+    :raises ImportError: If the backend depends on a package which is not installed.
+
+    """
+    if backend == "auto":
+        backend = "numba" if "numba" in available_backends() else "numpy"
+
+    if backend not in _KERNELS and backend not in _MODULES:
+        raise ValueError(f"Unknown backend '{backend}'. Available backends: {', '.join(available_backends())}.")
+
+    if backend in _MODULES and backend not in _KERNELS:
+        try:
+            importlib.import_module(_MODULES[backend])
+        except ImportError as error:
+            raise ImportError(
+                f"The '{backend}' backend requires the '{_REQUIREMENTS[backend]}' package. "
+                f"Install it with 'pip install {_REQUIREMENTS[backend]}'."
+            ) from error
+
+    return backend
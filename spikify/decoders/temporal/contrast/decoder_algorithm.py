@@ -5,12 +5,17 @@
 """
 
 import numpy as np
+from spikify.backends import resolve_dtype
+from spikify.encoders.utils import fold_batch, fold_parameter, unfold_batch
+from spikify.spikes import SpikeEvents, SpikeTrain
 
 
 def contrast_decoder(
-    spikes: np.ndarray,
+    spikes: np.ndarray | SpikeEvents | SpikeTrain,
     thresholds: np.ndarray,
     start_point: float | int | list[float | int] | np.ndarray,
+    dtype: type | np.dtype | str | None = None,
+    out: np.ndarray | None = None,
 ) -> np.ndarray:
     """
     Perform Contrast family decoding on the input spike train.
@@ -28,7 +33,13 @@ def contrast_decoder(
           encoding (e.g. ``signal[0]`` for a 1D signal, or ``signal[0, :]`` for a multi-feature/channel signal).
           Since the Contrast family encodes only differences between consecutive samples, the absolute signal
           level is lost during encoding and must be restored by anchoring reconstruction to this initial value.
-
+        - The reconstruction is computed as ``start_point`` plus the cumulative sum of the signed threshold steps,
+          accumulated in the output dtype in the same order as a sample-by-sample loop. The spikes of the first
+          timestep are ignored, since the first sample is the start point itself.
+        - The spike train can also be given as :class:`~spikify.spikes.SpikeEvents`. Only the events are then
+          accumulated, and each feature is filled with constant runs between its events, which gives the same result
+          as the dense spike train at a cost proportional to the number of spikes (plus writing the output).
+          A packed :class:`~spikify.spikes.SpikeTrain` is decoded the same way from its events.
 
     **Code Example:**
 
@@ -56,28 +67,64 @@ def contrast_decoder(
         array([0.1, 0.1, 0.1, 0.3, 0.5, 0.7])
 
     :param spikes: The input spike train to be decoded. This should be a numpy ndarray with values in {-1, 0, +1},
-        as produced by any of the Contrast family encoders (TBR, SF, MW, ZCSF).
-    :type spikes: numpy.ndarray
+        as produced by any of the Contrast family encoders (TBR, SF, MW, ZCSF), its events or its packed form. A batch
+        of spike trains (3D array: samples × time × features, or list of events or packed trains of the same shape)
+        is decoded in a single pass into an array of shape (samples, time, features).
+    :type spikes: numpy.ndarray | SpikeEvents | SpikeTrain | list[SpikeEvents | SpikeTrain]
     :param threshold: Per-feature or channels threshold values used during encoding, as returned directly by the TBR,
         SF, MW or ZCSF encoder. Passing the encoder's returned ``thresholds`` array
-        ensures the reconstruction step size exactly matches the one used during encoding.
+        ensures the reconstruction step size exactly matches the one used during encoding. For a batch, they can
+        also be given per sample, shape (samples, features).
     :type threshold: numpy.ndarray
-    :param start_point: Initial signal value(s) for reconstruction (scalar or 1D sequence matching features).
+    :param start_point: Initial signal value(s) for reconstruction (scalar or 1D sequence matching features, or
+        per-sample array (samples, features) for a batch).
         Should be set to the first sample of the original signal before encoding (e.g. ``signal[0]``), as the
         Contrast family encodes only signal differences and the absolute offset must be restored manually.
     :type start_point: float | int | list[float | int] | numpy.ndarray
-    :return: A numpy array representing the reconstructed continuous signal approximation.
+    :param dtype: Floating point type of the reconstructed signal, e.g. ``numpy.float32`` to halve its memory, or
+        ``"auto"`` to follow ``thresholds`` (see :mod:`spikify.backends.precision`). If ``None``, the dtype of ``out``
+        is used, or the default type if ``out`` is not given.
+    :type dtype: type | numpy.dtype | str | None
+    :param out: Preallocated array of shape (time, features or channels), or (samples, time, features) for a batch,
+        receiving the reconstructed signal.
+    :type out: numpy.ndarray | None
+    :return: A numpy array representing the reconstructed continuous signal approximation (``out`` if given).
     :rtype: numpy.ndarray
-    :raises ValueError: If the input spike train is empty or if the start_point dimensions do not match
-        the spike train feature dimensions.
+    :raises ValueError: If the input spike train is empty, if the start_point dimensions do not match
+        the spike train feature dimensions, if ``out`` does not match the spike train shape or ``dtype``, or if
+        ``dtype`` is not supported.
 
     """
+    # Decode a batch (N, T, F) as a single spike train (T, N × F)
+    spikes, batch = fold_batch(spikes)
+    if batch is not None:
+        N, F = batch
+        T = spikes.shape[0]
+        if out is not None:
+            if out.shape != (N, T, F):
+                raise ValueError(f"Output array must have shape {(N, T, F)}, got {out.shape}.")
+            if dtype is not None and out.dtype != resolve_dtype(dtype, thresholds):
+                raise ValueError(f"Output array must have dtype {resolve_dtype(dtype, thresholds)}, got {out.dtype}.")
+            dtype = out.dtype
+
+        thresholds = fold_parameter(thresholds, batch, name="Thresholds")
+        start_point = fold_parameter(start_point, batch, name="Startpoint")
+        signal = unfold_batch(contrast_decoder(spikes, thresholds, start_point, dtype), batch)
+        if out is None:
+            return signal
+        out[...] = signal
+        return out
+
+    # Packed spike trains are decoded from their events, unpacked block by block
+    if isinstance(spikes, SpikeTrain):
+        spikes = spikes.to_events()
+
     # Check for empty spike train
-    if len(spikes) == 0:
+    if (spikes.shape[0] if isinstance(spikes, SpikeEvents) else len(spikes)) == 0:
         raise ValueError("Spike train cannot be empty.")
 
     # Ensure 2D processing (T, F)
-    if spikes.ndim == 1:
+    if not isinstance(spikes, SpikeEvents) and spikes.ndim == 1:
         spikes = spikes.reshape(-1, 1)
 
     T, F = spikes.shape
@@ -92,16 +139,62 @@ def contrast_decoder(
         if start_points.size != F:
             raise ValueError("Startpoint must match the number of features in the spike train.")
 
-    signal = np.zeros((T, F), dtype=float)
+    if out is None:
+        signal = np.empty((T, F), dtype=resolve_dtype(dtype, thresholds))
+    else:
+        if out.shape != (T, F):
+            raise ValueError(f"Output array must have shape {(T, F)}, got {out.shape}.")
+        if dtype is not None and out.dtype != resolve_dtype(dtype, thresholds):
+            raise ValueError(f"Output array must have dtype {resolve_dtype(dtype, thresholds)}, got {out.dtype}.")
+        signal = out
+
+    if isinstance(spikes, SpikeEvents):
+        _accumulate_events(spikes, np.asarray(thresholds, dtype=signal.dtype), start_points, signal)
+        return signal
+
+    # Signed threshold step of every timestep, then a sequential running sum from the start point
+    steps = signal[1:]
+    steps[...] = 0
+    np.copyto(steps, np.asarray(thresholds, dtype=signal.dtype), where=spikes[1:] == 1)
+    np.copyto(steps, -np.asarray(thresholds, dtype=signal.dtype), where=spikes[1:] == -1)
     signal[0] = start_points
-
-    for t in range(1, T):
-        for f in range(F):
-            if spikes[t, f] == 1:
-                signal[t, f] = signal[t - 1, f] + thresholds[f]
-            elif spikes[t, f] == -1:
-                signal[t, f] = signal[t - 1, f] - thresholds[f]
-            else:
-                signal[t, f] = signal[t - 1, f]
+    np.cumsum(signal, axis=0, out=signal)
 
     return signal
+
+
+def _accumulate_events(events: SpikeEvents, thresholds: np.ndarray, start_points: np.ndarray, signal: np.ndarray):
+    """
+    Reconstruct the signal from spike events, writing it into ``signal``.
+
+    The threshold steps of each feature are accumulated in time order from the start point, exactly as in the dense
+    decoder, and every level is repeated until the next event of the feature.
+
+    :param events: Events of the spike train.
+    :type events: SpikeEvents
+    :param thresholds: Per-feature thresholds, in the dtype of ``signal``.
+    :type thresholds: numpy.ndarray
+    :param start_points: Per-feature start points.
+    :type start_points: numpy.ndarray
+    :param signal: Output array, shape (time, features).
+    :type signal: numpy.ndarray
+
+    """
+    T, F = events.shape
+
+    # As in the dense decoder, only +1 and -1 spikes after the first timestep move the signal
+    keep = (events.times > 0) & ((events.polarities == 1) | (events.polarities == -1))
+    # Group the events by feature, keeping them in time order inside each feature
+    order = np.argsort(events.channels[keep], kind="stable")
+    times = events.times[keep][order]
+    channels = events.channels[keep][order]
+    steps = np.where(events.polarities[keep][order] == 1, thresholds[channels], -thresholds[channels])
+    bounds = np.searchsorted(channels, np.arange(F + 1))
+
+    for f in range(F):
+        start, stop = bounds[f], bounds[f + 1]
+        levels = np.empty(stop - start + 1, dtype=signal.dtype)
+        levels[0] = start_points[f]
+        levels[1:] = steps[start:stop]
+        np.cumsum(levels, out=levels)
+        signal[:, f] = np.repeat(levels, np.diff(times[start:stop], prepend=0, append=T))
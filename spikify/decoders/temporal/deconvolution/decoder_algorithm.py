@@ -5,14 +5,22 @@
 """
 
 import numpy as np
-from scipy.signal import lfilter
+from scipy.signal import lfilter, oaconvolve
+from spikify.backends import resolve_dtype
+from spikify.encoders.utils import fold_batch, fold_parameter, unfold_batch
+from spikify.spikes import SpikeEvents, SpikeTrain
+
+# Per-feature filters up to this length are applied tap by tap, longer ones with an overlap-add FFT convolution
+_DIRECT_LENGTH = 32
 
 
 def deconvolution_decoder(
-    spikes: np.ndarray,
+    spikes: np.ndarray | SpikeEvents | SpikeTrain,
     fir_bank: np.ndarray,
     shift: np.ndarray,
     norm: np.ndarray | None = None,
+    dtype: type | np.dtype | str | None = None,
+    out: np.ndarray | None = None,
 ) -> np.ndarray:
     """
     Perform signal reconstruction via deconvolution decoding of a spike train.
@@ -28,6 +36,14 @@ def deconvolution_decoder(
         - If ``norm`` is ``None``, no amplitude rescaling is applied; only the per-feature shift is restored.
           Pass ``norm`` explicitly whenever the encoder performed normalization. Only MHSA and HSA have normalization
           steps, while BSA does not.
+        - All features are filtered at once. When every column of ``fir_bank`` holds the same filter, as returned by
+          HSA and MHSA, a single causal filtering call runs along the time axis. Otherwise each column is convolved
+          with its own filter, tap by tap for short filters and with an overlap-add FFT convolution for long ones;
+          the result then matches per-feature filtering up to floating point rounding.
+        - The spike train can also be given as :class:`~spikify.spikes.SpikeEvents`. The filter of each event's
+          feature, scaled by its polarity, is then added at the event location, at a cost proportional to the number
+          of spikes times the filter length (plus writing the output). A packed :class:`~spikify.spikes.SpikeTrain`
+          is decoded the same way from its events.
 
     **Code Example:**
 
@@ -62,41 +78,150 @@ def deconvolution_decoder(
                0.        , 0.        , 0.        , 0.        , 0.24793707])
 
     :param spikes: Binary spike train to decode (values in {0, 1}), as produced by
-        any of the deconvolution family encoders (HSA, MHSA, BSA).
-    :type spikes: numpy.ndarray
+        any of the deconvolution family encoders (HSA, MHSA, BSA), its events or its packed form. A batch of spike
+        trains (3D array: samples × time × features, or list of events or packed trains of the same shape) is
+        decoded in a single pass into an array of shape (samples, time, features).
+    :type spikes: numpy.ndarray | SpikeEvents | SpikeTrain | list[SpikeEvents | SpikeTrain]
     :param fir_bank: FIR filter coefficients used during encoding.
         Each column corresponds to the filter applied to one feature or channel. This is the ``fir_bank`` value
-        returned directly by the encoder.
+        returned directly by the encoder. A 1D array is used as the filter of every feature. For a batch, it can
+        also be given per sample, shape (samples, window_length, features).
     :type fir_bank: numpy.ndarray
     :param shift: Per-feature shift values subtracted during encoding to ensure signal non-negativity.
-                  This is the ``shift`` value returned directly by the encoder.
+                  This is the ``shift`` value returned directly by the encoder, per sample (samples, features) for a
+                  batch.
     :type shift: numpy.ndarray
     :param norm: Per-feature normalization values used during encoding to scale the signal to [0, 1].
                  If ``None``, no amplitude rescaling is applied and only the shift is restored.
-                 This is the ``norm`` value returned directly by the encoder.
+                 This is the ``norm`` value returned directly by the encoder, per sample (samples, features) for a
+                 batch.
     :type norm: numpy.ndarray | None
-    :return: A numpy array representing the reconstructed continuous signal approximation.
+    :param dtype: Floating point type of the reconstructed signal, e.g. ``numpy.float32`` to filter in single
+        precision, or ``"auto"`` to follow ``fir_bank`` (see :mod:`spikify.backends.precision`). If ``None``, the
+        dtype of ``out`` is used, or the default type if ``out`` is not given.
+    :type dtype: type | numpy.dtype | str | None
+    :param out: Preallocated array of shape (time, features or channels), or (samples, time, features) for a batch,
+        receiving the reconstructed signal.
+    :type out: numpy.ndarray | None
+    :return: A numpy array representing the reconstructed continuous signal approximation (``out`` if given).
     :rtype: numpy.ndarray
-    :raises ValueError: If the input spike train is empty.
+    :raises ValueError: If the input spike train is empty, if the parameters of a batch do not match its samples
+        and features, if ``out`` does not match the spike train shape or ``dtype``, or if ``dtype`` is not
+        supported.
 
     """
 
+    # Decode a batch (N, T, F) as a single spike train (T, N × F)
+    spikes, batch = fold_batch(spikes)
+    if batch is not None:
+        N, F = batch
+        T = spikes.shape[0]
+        if out is not None:
+            if out.shape != (N, T, F):
+                raise ValueError(f"Output array must have shape {(N, T, F)}, got {out.shape}.")
+            if dtype is not None and out.dtype != resolve_dtype(dtype, fir_bank):
+                raise ValueError(f"Output array must have dtype {resolve_dtype(dtype, fir_bank)}, got {out.dtype}.")
+            dtype = out.dtype
+
+        if np.ndim(fir_bank) == 1:
+            fir_bank = np.broadcast_to(np.asarray(fir_bank)[:, None], (len(fir_bank), batch[1]))
+        fir_bank = fold_parameter(fir_bank, batch, ndim=2, name="Filter bank")
+        shift = fold_parameter(shift, batch, name="Shift")
+        if norm is not None:
+            norm = fold_parameter(norm, batch, name="Norm")
+        signal = unfold_batch(deconvolution_decoder(spikes, fir_bank, shift, norm, dtype), batch)
+        if out is None:
+            return signal
+        out[...] = signal
+        return out
+
+    # Packed spike trains are decoded from their events, unpacked block by block
+    if isinstance(spikes, SpikeTrain):
+        spikes = spikes.to_events()
+
     # Check for empty spike train
-    if len(spikes) == 0:
+    if (spikes.shape[0] if isinstance(spikes, SpikeEvents) else len(spikes)) == 0:
         raise ValueError("Spike train cannot be empty.")
 
     # Ensure 2D processing (T, F)
-    if spikes.ndim == 1:
+    if not isinstance(spikes, SpikeEvents) and spikes.ndim == 1:
         spikes = spikes.reshape(-1, 1)
 
     T, F = spikes.shape
-    signal = np.zeros((T, F))
+    if out is not None:
+        if out.shape != (T, F):
+            raise ValueError(f"Output array must have shape {(T, F)}, got {out.shape}.")
+        if dtype is not None and out.dtype != resolve_dtype(dtype, fir_bank):
+            raise ValueError(f"Output array must have dtype {resolve_dtype(dtype, fir_bank)}, got {out.dtype}.")
+        dtype = out.dtype
+    else:
+        dtype = resolve_dtype(dtype, fir_bank)
+    fir_bank = np.asarray(fir_bank, dtype=dtype)
+    if fir_bank.ndim == 1:
+        fir_bank = fir_bank.reshape(-1, 1)
+
+    if isinstance(spikes, SpikeEvents):
+        signal = _scatter_events(spikes, fir_bank)
+    elif fir_bank.strides[1] == 0 or (fir_bank == fir_bank[:, :1]).all():
+        # Shared filter: one filtering call for all features, run along contiguous rows of the transposed train
+        signal = lfilter(fir_bank[:, 0], np.ones(1, dtype=dtype), np.ascontiguousarray(spikes.T), axis=1).T
+    elif fir_bank.shape[0] <= _DIRECT_LENGTH:
+        signal = _direct_convolution(spikes, fir_bank)
+    else:
+        signal = oaconvolve(spikes.astype(dtype), fir_bank, axes=0)[:T]
+
+    if out is None:
+        signal = np.ascontiguousarray(signal)
+    else:
+        out[...] = signal
+        signal = out
+
+    if norm is not None:
+        signal *= np.asarray(norm, dtype=dtype)
+    signal += np.asarray(shift, dtype=dtype)
 
-    for f in range(F):
-        x = lfilter(fir_bank[:, f], 1, spikes[:, f], axis=0)
-        if norm is not None:
-            signal[:, f] = x * norm[f] + shift[f]
-        else:
-            signal[:, f] = x + shift[f]
+    return signal
+
+
+def _direct_convolution(spikes: np.ndarray, fir_bank: np.ndarray) -> np.ndarray:
+    """
+    Filter every feature with its own short FIR filter, accumulating one tap at a time for all features.
+
+    :param spikes: Spike train, shape (time, features).
+    :type spikes: numpy.ndarray
+    :param fir_bank: FIR filter of every feature, shape (taps, features).
+    :type fir_bank: numpy.ndarray
+    :return: Causally filtered spike train, shape (time, features), in the dtype of ``fir_bank``.
+    :rtype: numpy.ndarray
+
+    """
+    T = spikes.shape[0]
+    signal = np.multiply(spikes, fir_bank[0], dtype=fir_bank.dtype)
+    for k in range(1, min(fir_bank.shape[0], T)):
+        signal[k:] += spikes[: T - k] * fir_bank[k]
 
     return signal
+
+
+def _scatter_events(events: SpikeEvents, fir_bank: np.ndarray) -> np.ndarray:
+    """
+    Add the filter of every event's feature, scaled by its polarity, at the event location.
+
+    :param events: Events of the spike train.
+    :type events: SpikeEvents
+    :param fir_bank: FIR filter of every feature, shape (taps, features).
+    :type fir_bank: numpy.ndarray
+    :return: Causally filtered spike train, shape (time, features), in the dtype of ``fir_bank``.
+    :rtype: numpy.ndarray
+
+    """
+    T, F = events.shape
+    rows = events.times[:, None] + np.arange(fir_bank.shape[0])
+    weights = events.polarities[:, None] * fir_bank.T[events.channels]
+
+    # Filter taps running past the end of the signal are dropped, as in causal filtering
+    inside = rows < T
+    index = rows[inside] * F + np.broadcast_to(events.channels[:, None], rows.shape)[inside]
+    signal = np.bincount(index, weights=weights[inside], minlength=T * F)
+
+    return signal.reshape(T, F).astype(fir_bank.dtype, copy=False)
@@ -0,0 +1,349 @@
+"""
+.. raw:: html
+
+    <h2>Encoder Base Classes</h2>
+"""
+
+import copy
+from abc import ABC, abstractmethod
+
+import numpy as np
+from spikify.backends import resolve_dtype
+from .utils import check_output, fold_batch, fold_parameter, unfold_batch, write_output
+
+
+class Encoder(ABC):
+    """
+    Base class of the encoders prepared once and reused across many signals.
+
+    :meth:`fit` computes everything an encoder derives from the data (normalization statistics, per-feature thresholds,
+    filter bank) from a calibration signal, and :meth:`transform` encodes any number of signals with these parameters,
+    so that, for example, training and inference data are normalized the same way. Calling :meth:`fit_transform` on a
+    signal gives the output of the corresponding encoding function on that signal.
+
+    Both methods also accept a batch of signals of shape (samples, time, features). :meth:`fit` computes the
+    parameters over all the samples together, and :meth:`transform` encodes every sample with them in a single pass.
+    The encoding functions instead compute the parameters of every sample of a batch separately.
+
+    The fitted parameters are computed in the floating point type selected by the ``dtype`` argument of the encoder
+    (see :mod:`spikify.backends.precision`), and :meth:`transform` encodes every signal in that same type.
+
+    """
+
+    #: Names of the fitted attributes holding one value per feature along their last axis
+    _feature_parameters: tuple[str, ...] = ()
+
+    def __init__(self):
+        """Constructor method."""
+        self.num_features = None
+        self.output = "dense"
+        self.dtype = None
+
+    @abstractmethod
+    def fit(self, signal: np.ndarray) -> "Encoder":
+        """
+        Compute the parameters of the encoder from a calibration signal.
+
+        :param signal: Calibration signal (1D or 2D: time × features or channels).
+        :type signal: numpy.ndarray
+        :return: The encoder itself.
+        :rtype: Encoder
+        :raises ValueError: If the signal is empty or if the parameters of the encoder do not match its features.
+
+        """
+
+    def transform(self, signal: np.ndarray, out: np.ndarray | None = None, copy: bool = True):
+        """
+        Encode a signal, or a batch of signals, with the parameters computed by :meth:`fit`.
+
+        A batch is encoded in a single pass, every sample with the same parameters (see
+        :func:`~spikify.encoders.utils.fold_batch`).
+
+        :param signal: Input signal to encode (1D or 2D: time × features or channels, or 3D: samples × time ×
+                       features), with the features of the calibration signal.
+        :type signal: numpy.ndarray
+        :param out: Preallocated ``int8`` array of the shape of the dense spike train, receiving it. The spikes of a
+                    single signal are written into it directly, those of a batch are copied into it.
+        :type out: numpy.ndarray | None
+        :param copy: If ``False``, encoders that normalize the signal do it in place when it is a writable array of
+                     the type they compute in, overwriting it instead of copying it. Other encoders never modify the
+                     signal.
+        :type copy: bool
+        :return: The encoded spike train, as returned by the encoding function (``out`` if given), with a leading
+                 samples axis for a batch (a list of events per sample with ``output="events"``).
+        :raises ValueError: If the encoder is not fitted, if the signal is empty or its features do not match the
+                            calibration signal, or if ``out`` is given for events or does not match the spike train
+                            shape or ``dtype``.
+
+        """
+        check_output(self.output, out)
+
+        signal, batch = fold_batch(signal)
+        if batch is None:
+            return self._transform(self._check_signal(signal), out, copy)
+
+        self._check_features(batch[1])
+        return write_output(unfold_batch(self._folded(batch[0])._transform(signal, None, copy), batch), out)
+
+    def fit_transform(self, signal: np.ndarray, out: np.ndarray | None = None, copy: bool = True):
+        """
+        Compute the parameters of the encoder from a signal, then encode it.
+
+        :param signal: Input signal to encode (1D or 2D: time × features or channels, or 3D: samples × time ×
+                       features).
+        :type signal: numpy.ndarray
+        :param out: Preallocated ``int8`` array of the shape of the dense spike train, receiving it.
+        :type out: numpy.ndarray | None
+        :param copy: If ``False``, the signal may be overwritten by the encoding instead of copied (see
+                     :meth:`transform`).
+        :type copy: bool
+        :return: The encoded spike train, as returned by the encoding function.
+
+        """
+        return self.fit(signal).transform(signal, out, copy)
+
+    @abstractmethod
+    def _transform(self, signal: np.ndarray, out: np.ndarray | None = None, copy: bool = True):
+        """
+        Encode a signal checked against the calibration signal.
+
+        :param signal: Input signal to encode, shape (time, features).
+        :type signal: numpy.ndarray
+        :param out: Preallocated ``int8`` array receiving the dense spike train.
+        :type out: numpy.ndarray | None
+        :param copy: If ``False``, the signal may be normalized in place.
+        :type copy: bool
+        :return: The encoded spike train, as returned by the encoding function (``out`` if given).
+
+        """
+
+    @staticmethod
+    def _as_2d(signal: np.ndarray) -> np.ndarray:
+        """
+        Check that a signal is not empty and view it as a 2D array. The samples of a batch are concatenated along
+        time, so that :meth:`fit` computes the parameters over all of them.
+
+        :param signal: Signal (1D, 2D or 3D).
+        :type signal: numpy.ndarray
+        :return: The signal, shape (time, features).
+        :rtype: numpy.ndarray
+        :raises ValueError: If the signal is empty.
+
+        """
+        signal = np.asarray(signal)
+        if signal.ndim == 3:
+            signal = signal.reshape(-1, signal.shape[2])
+        if len(signal) == 0:
+            raise ValueError("Signal cannot be empty.")
+
+        # Ensure 2D processing (T, F)
+        if signal.ndim == 1:
+            signal = signal.reshape(-1, 1)
+
+        return signal
+
+    def _as_float_2d(self, signal: np.ndarray) -> np.ndarray:
+        """
+        View a calibration signal as a 2D array of the floating point type the encoder computes in.
+
+        :param signal: Signal (1D, 2D or 3D).
+        :type signal: numpy.ndarray
+        :return: The signal, shape (time, features), of the type selected by ``dtype``.
+        :rtype: numpy.ndarray
+        :raises ValueError: If the signal is empty or if ``dtype`` is not supported.
+
+        """
+        signal = self._as_2d(signal)
+        return np.asarray(signal, dtype=resolve_dtype(self.dtype, signal))
+
+    def _check_signal(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Check a signal to transform against the calibration signal and view it as a 2D array.
+
+        :param signal: Signal (1D or 2D).
+        :type signal: numpy.ndarray
+        :return: The signal, shape (time, features).
+        :rtype: numpy.ndarray
+        :raises ValueError: If the encoder is not fitted, or if the signal is empty or its features do not match the
+                            calibration signal.
+
+        """
+        signal = self._as_2d(signal)
+        self._check_features(signal.shape[1])
+        return signal
+
+    def _check_features(self, num_features: int) -> None:
+        """
+        Check the number of features of a signal to transform against the calibration signal.
+
+        :param num_features: Number of features of the signal.
+        :type num_features: int
+        :raises ValueError: If the encoder is not fitted or if the number of features does not match the calibration
+                            signal.
+
+        """
+        if self.num_features is None:
+            raise ValueError(f"{type(self).__name__} must be fitted before transforming a signal.")
+
+        if num_features != self.num_features:
+            raise ValueError(f"Signal has {num_features} features, but the encoder was fitted on {self.num_features}.")
+
+    def _folded(self, num_samples: int) -> "Encoder":
+        """
+        Copy the encoder with every per-feature parameter repeated for each sample of a folded batch.
+
+        :param num_samples: Number of samples of the batch.
+        :type num_samples: int
+        :return: An encoder fitted on ``num_samples`` × ``num_features`` features.
+        :rtype: Encoder
+
+        """
+        encoder = copy.copy(self)
+        encoder.num_features = num_samples * self.num_features
+        for name in self._feature_parameters:
+            value = getattr(self, name)
+            setattr(encoder, name, fold_parameter(value, (num_samples, self.num_features), value.ndim, name))
+        return encoder
+
+    def _select_features(self, features: slice) -> "Encoder":
+        """
+        Copy the encoder keeping only a range of the fitted features.
+
+        :param features: Range of features to keep.
+        :type features: slice
+        :return: An encoder fitted on the selected features.
+        :rtype: Encoder
+
+        """
+        encoder = copy.copy(self)
+        encoder.num_features = len(range(*features.indices(self.num_features)))
+        for name in self._feature_parameters:
+            setattr(encoder, name, getattr(self, name)[..., features])
+        return encoder
+
+
+class StreamingEncoder(ABC):
+    """
+    Base class of the encoders that process a signal received in chunks.
+
+    A streaming encoder keeps everything it needs from the past samples in a *state* dictionary, so that unbounded
+    signals are encoded with constant memory. The state can be handled explicitly with :meth:`init_state`,
+    :meth:`process` and :meth:`finalize`, or implicitly with :meth:`push` and :meth:`flush`, which keep it in the
+    :attr:`state` attribute of the encoder.
+
+    :meth:`process` returns the spikes of every sample it can already encode. Encoders that need future samples (for
+    example a lookahead or a warm-up window) hold the remaining ones in the state, and :meth:`finalize` returns their
+    spikes once the signal is over. Concatenating all the outputs gives one row per input sample.
+
+    """
+
+    def __init__(self):
+        """Constructor method."""
+        self.state = None
+
+    @abstractmethod
+    def init_state(self, num_features: int) -> dict:
+        """
+        Create the state of a new signal.
+
+        :param num_features: Number of features or channels of the signal.
+        :type num_features: int
+        :return: The initial state.
+        :rtype: dict
+        :raises ValueError: If the parameters of the encoder do not match the number of features.
+
+        """
+
+    @abstractmethod
+    def process(self, chunk: np.ndarray, state: dict) -> tuple[np.ndarray, dict]:
+        """
+        Encode the next chunk of the signal.
+
+        :param chunk: Next samples of the signal (1D or 2D: time × features or channels).
+        :type chunk: numpy.ndarray
+        :param state: State returned by :meth:`init_state` or by the previous call to :meth:`process`. It is not
+                      modified.
+        :type state: dict
+        :return:
+            - spikes: Spikes of the samples that can be encoded so far, shape (time, features or channels).
+            - state: The updated state.
+        :rtype: tuple[numpy.ndarray, dict]
+        :raises ValueError: If the chunk features do not match the state.
+
+        """
+
+    def finalize(self, state: dict) -> np.ndarray:
+        """
+        Encode the samples still held in the state once the signal is over.
+
+        :param state: State returned by the last call to :meth:`process`.
+        :type state: dict
+        :return: Spikes of the held samples, shape (time, features or channels). Empty for encoders that hold no
+                 samples.
+        :rtype: numpy.ndarray
+
+        """
+        return np.zeros((0, state["num_features"]), dtype=np.int8)
+
+    def reset(self) -> None:
+        """
+        Forget the state kept by :meth:`push`, so that the next chunk starts a new signal.
+
+        """
+        self.state = None
+
+    def push(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Encode the next chunk of the signal, keeping the state in the encoder.
+
+        :param chunk: Next samples of the signal (1D or 2D: time × features or channels). Every chunk must have the
+                      same number of features.
+        :type chunk: numpy.ndarray
+        :return: Spikes of the samples that can be encoded so far, shape (time, features or channels).
+        :rtype: numpy.ndarray
+        :raises ValueError: If the parameters of the encoder or the chunk features do not match the features of the
+                            previous chunks.
+
+        """
+        if self.state is None:
+            self.state = self.init_state(1 if np.ndim(chunk) == 1 else np.shape(chunk)[1])
+        spikes, self.state = self.process(chunk, self.state)
+        return spikes
+
+    def flush(self) -> np.ndarray:
+        """
+        Encode the samples still held by the encoder and reset it.
+
+        :return: Spikes of the held samples, shape (time, features or channels).
+        :rtype: numpy.ndarray
+
+        """
+        if self.state is None:
+            return np.zeros((0, 0), dtype=np.int8)
+        spikes = self.finalize(self.state)
+        self.reset()
+        return spikes
+
+    @staticmethod
+    def _check_chunk(chunk: np.ndarray, state: dict) -> np.ndarray:
+        """
+        Convert a chunk to a 2D float array and check it against the state.
+
+        :param chunk: Next samples of the signal (1D or 2D).
+        :type chunk: numpy.ndarray
+        :param state: Current state.
+        :type state: dict
+        :return: The chunk, shape (time, features).
+        :rtype: numpy.ndarray
+        :raises ValueError: If the chunk features do not match the state.
+
+        """
+        chunk = np.asarray(chunk, dtype=np.float64)
+        # Ensure 2D processing (T, F)
+        if chunk.ndim == 1:
+            chunk = chunk.reshape(-1, 1)
+
+        if chunk.shape[1] != state["num_features"]:
+            raise ValueError(f"Chunk has {chunk.shape[1]} features, but the state has {state['num_features']}.")
+
+        return chunk
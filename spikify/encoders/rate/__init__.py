@@ -1,5 +1,5 @@
 """Rate package."""
 
-from .poisson_algorithm import poisson
+from .poisson_algorithm import PoissonEncoder, poisson
 
-__all__ = ["poisson"]
+__all__ = ["poisson", "PoissonEncoder"]
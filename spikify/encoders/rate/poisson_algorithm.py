@@ -4,10 +4,33 @@
     <h2>Poisson Algorithm</h2>
 """
 
+from typing import Literal
+
 import numpy as np
+from spikify.encoders.base import Encoder
+from spikify.encoders.utils import (
+    check_output,
+    event_block_length,
+    fold_batch,
+    spike_buffer,
+    unfold_batch,
+    working_signal,
+    write_output,
+)
+from spikify.rng import CounterRNG
+from spikify.spikes import SpikeEvents
 
 
-def poisson(signal: np.ndarray, interval_length: int, seed: int = 0) -> np.ndarray:
+def poisson(
+    signal: np.ndarray,
+    interval_length: int,
+    seed: int | np.random.SeedSequence | np.random.Generator | CounterRNG | None = 0,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    copy: bool = True,
+    dtype: type | np.dtype | str | None = None,
+    method: Literal["isi", "bernoulli", "binomial"] = "isi",
+) -> np.ndarray | SpikeEvents:
     """
     Perform Poisson encoding on the input signal.
 
@@ -25,6 +48,20 @@ def poisson(signal: np.ndarray, interval_length: int, seed: int = 0) -> np.ndarr
           the constant firing rate for that block. Spikes are placed within the block using
           exponentially distributed inter-spike intervals, allowing multiple spikes per block
           (exact Poisson generation for the block's constant rate).
+        - ``method`` selects how the spikes of a block are drawn. ``"isi"`` places the arrivals of exponential
+          inter-spike intervals as described above. ``"bernoulli"`` emits a spike at every timestep with a
+          probability equal to the block rate, with one uniform draw per sample: it is the fastest and needs the
+          least memory. ``"binomial"`` draws the number of spikes of every block from a binomial law, then places
+          them on distinct random timesteps of the block; its spike trains follow the same law as the Bernoulli ones.
+          With ``"isi"``, several arrivals can fall in the same timestep, so a timestep spikes with probability
+          ``1 - exp(-rate)`` instead of ``rate``.
+        - The random draws of every block and feature are made at once by a :class:`numpy.random.Generator`, which
+          never touches the global NumPy random state. To encode signals in parallel with independent reproducible
+          streams, give every worker its own child of a :class:`numpy.random.SeedSequence` (see
+          :meth:`numpy.random.SeedSequence.spawn`).
+        - With a :class:`~spikify.rng.CounterRNG` seed, the random numbers of every recording, feature and interval
+          are computed from their position instead, so the spikes do not depend on how a recording is split into
+          calls: by chunks of time, by groups of features or across a process pool.
 
     **Code Example:**
 
@@ -33,9 +70,8 @@ def poisson(signal: np.ndarray, interval_length: int, seed: int = 0) -> np.ndarr
             import numpy as np
             from spikify.encoders.rate import poisson
             signal = np.array([0.2, 0.5, 0.8, 1.0])
-            np.random.seed(0)
             interval_length = 2
-            encoded_signal = poisson(signal, interval_length)
+            encoded_signal = poisson(signal, interval_length, seed=0)
 
     .. doctest::
         :hide:
@@ -47,78 +83,382 @@ def poisson(signal: np.ndarray, interval_length: int, seed: int = 0) -> np.ndarr
         >>> interval_length = 2
         >>> encoded_signal = poisson(signal, interval_length)
         >>> encoded_signal
-        array([0, 0, 0, 1], dtype=int8)
+        array([0, 1, 1, 0], dtype=int8)
 
-    :param signal: Input signal to encode (1D or 2D: timestamps × features).
+    :param signal: Input signal to encode (1D or 2D: timestamps × features), or a batch of signals (3D: samples ×
+                   timestamps × features) encoded in a single pass, every sample with its own scaling. The spike
+                   train of a batch gets a leading samples axis (a list of events per sample with
+                   ``output="events"``), and its random draws differ from encoding the samples one by one.
     :type signal: numpy.ndarray
     :param interval_length: Length of each time block for rate computation and spike placement.
                             Must evenly divide the signal length. ``interval_length=1`` uses the
                             instantaneous value as rate (bin-by-bin); larger values use the block
                             mean as constant rate (allows multiple spikes per block).
     :type interval_length: int
-    :param seed: Random seed for reproducibility. Default is 0.
-    :type seed: int
-    :return: A numpy array representing the encoded spike train.
-    :rtype: numpy.ndarray
-    :raises ValueError: If the input signal is empty or if signal length is not divisible for the interval length
+    :param seed: Seed of the random generator, for reproducibility (an integer or a
+                 :class:`numpy.random.SeedSequence`), the :class:`numpy.random.Generator` to draw from, or a
+                 :class:`~spikify.rng.CounterRNG` for counter-based random numbers. If ``None``, fresh entropy is
+                 drawn from the operating system. Default is 0.
+    :type seed: int | numpy.random.SeedSequence | numpy.random.Generator | CounterRNG | None
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``int8`` array of the shape of the dense spike train, receiving it, e.g. the array of a
+                :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param copy: If ``False`` and the signal is a writable array of type ``dtype``, it is scaled in place instead of
+                 copied, and holds the scaled signal afterwards.
+    :type copy: bool
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :param method: Spike generation method, ``"isi"`` (inter-spike intervals), ``"bernoulli"`` (one draw per
+                   timestep) or ``"binomial"`` (spike count per interval, then random placement).
+    :type method: str
+    :return: A numpy array representing the encoded spike train (``out`` if given), or its events (shape (time,
+             features) even for a 1D signal).
+    :rtype: numpy.ndarray | SpikeEvents
+    :raises ValueError: If the input signal is empty, if signal length is not divisible for the interval length, if
+                        the output format or the method is not supported or if ``out`` is given for events or does not
+                        match the spike train shape or ``dtype``
     :raises TypeError: If the signal is not a numpy.ndarray
 
     """
+    signal, batch = fold_batch(signal)
+    encoder = PoissonEncoder(interval_length, seed=seed, output=output, dtype=dtype, method=method)
+    _check_interval(len(encoder._as_2d(signal)), interval_length)
+    encoder.fit(signal)
+    if batch is not None:
+        # Every sample of the batch draws the counter-based random numbers of a recording of its own
+        encoder.streams = _streams(*batch)
+    spikes = encoder.transform(signal, out if batch is None else None, copy)
+    return write_output(unfold_batch(spikes, batch), out)
 
-    # Check for empty signal
-    if len(signal) == 0:
-        raise ValueError("Signal cannot be empty.")
 
-    # Ensure 2D processing (T, F)
-    if signal.ndim == 1:
-        signal = signal.reshape(-1, 1)
+class PoissonEncoder(Encoder):
+    """
+    Poisson encoder prepared once and reused across signals.
 
-    T, F = signal.shape
+    :meth:`fit` computes the per-feature amplitude used to scale the clipped signal to [0, 1], as :func:`poisson`
+    does. :meth:`transform` then encodes any signal with it, so that every signal is scaled the same way.
 
-    if T % interval_length != 0:
-        raise ValueError(
-            f"The interval ({interval_length}) must evenly divide the signal length ({T}). "
-            "Consider trimming or padding the signal to make its length a multiple of the interval."
-        )
+    **Code Example:**
+
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.encoders.rate import PoissonEncoder
+        encoder = PoissonEncoder(interval_length=4).fit(np.array([0.2, 0.4, 1.6, 0.8]))
+        encoded_signal = encoder.transform(np.array([0.8, 1.2, 1.6, 0.4, 0.0, 0.2, 0.1, 0.3]))
+
+    .. doctest::
+        :hide:
+
+        >>> import numpy as np
+        >>> from spikify.encoders.rate import PoissonEncoder
+        >>> encoder = PoissonEncoder(interval_length=4).fit(np.array([0.2, 0.4, 1.6, 0.8]))
+        >>> encoder.norm
+        array([1.6])
+        >>> encoder.transform(np.array([0.8, 1.2, 1.6, 0.4, 0.0, 0.2, 0.1, 0.3])).shape
+        (8,)
+
+    :param interval_length: Size of the interval. Must evenly divide the length of the signals.
+    :type interval_length: int
+    :param seed: Seed from which a new random generator is created for every encoded signal (an integer or a
+                 :class:`numpy.random.SeedSequence`), so that encoding a signal twice gives the same spikes, or a
+                 :class:`numpy.random.Generator` whose stream continues from one signal to the next, or a
+                 :class:`~spikify.rng.CounterRNG`, with which every signal is encoded as the same recording. The
+                 samples of a batch are encoded as consecutive recordings.
+    :type seed: int | numpy.random.SeedSequence | numpy.random.Generator | CounterRNG | None
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param dtype: Floating point type of the fitted parameters and of the computation (see
+                  :mod:`spikify.backends.precision`), ``"auto"`` to follow the calibration signal. If ``None``, the
+                  default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :param method: Spike generation method, ``"isi"``, ``"bernoulli"`` or ``"binomial"`` (see :func:`poisson`).
+    :type method: str
+    :raises ValueError: If the output format or the method is not supported.
+
+    """
+
+    _feature_parameters = ("norm", "streams")
+
+    def __init__(
+        self,
+        interval_length: int,
+        seed: int | np.random.SeedSequence | np.random.Generator | CounterRNG | None = 0,
+        output: Literal["dense", "events"] = "dense",
+        dtype: type | np.dtype | str | None = None,
+        method: Literal["isi", "bernoulli", "binomial"] = "isi",
+    ):
+        """Constructor method."""
+        check_output(output)
+        if method not in _METHODS:
+            raise ValueError(f"Method {method} is not supported")
+        super().__init__()
+        self.interval_length = interval_length
+        self.seed = seed
+        self.output = output
+        self.dtype = dtype
+        self.method = method
+        self.norm = None
+        self.streams = None
 
-    # Set seed
-    np.random.seed(seed)
+    def fit(self, signal: np.ndarray) -> "PoissonEncoder":
+        """
+        Compute the per-feature scaling from a calibration signal.
 
-    signal_copy = np.copy(signal)
+        :param signal: Calibration signal (1D or 2D: time × features or channels).
+        :type signal: numpy.ndarray
+        :return: The encoder itself.
+        :rtype: PoissonEncoder
+        :raises ValueError: If the signal is empty.
 
-    # Ensure non-negative signal values
-    signal_copy = np.clip(signal_copy, 0, None)
+        """
+        signal = self._as_float_2d(signal)
 
-    max_amp = signal_copy.max(axis=0)
+        # Ensure non-negative signal values
+        norm = np.clip(signal, 0, None).max(axis=0)
+        norm[norm <= 1] = 1  # only scale features whose amplitude is greater than 1
 
-    # Find features that require scaling
-    features_to_scale = np.where(max_amp > 1)[0]
+        self.num_features = signal.shape[1]
+        self.norm = norm
+        self.streams = _streams(1, signal.shape[1])
+        return self
 
-    for f in features_to_scale:
-        signal_copy[:, f] /= max_amp[f]
+    def _transform(
+        self, signal: np.ndarray, out: np.ndarray | None = None, copy: bool = True
+    ) -> np.ndarray | SpikeEvents:
+        """
+        Encode a signal with the fitted scaling. Samples above the range seen by :meth:`fit` are clipped to it.
 
-    # Compute mean over the signal reshaped to interval-sized chunks
-    interval_rate_mean = np.mean(signal_copy.reshape(T // interval_length, interval_length, F), axis=1)
+        :param signal: Input signal to encode, shape (time, features).
+        :type signal: numpy.ndarray
+        :param out: Preallocated ``int8`` array receiving the dense spike train.
+        :type out: numpy.ndarray | None
+        :param copy: If ``False``, the signal may be scaled in place.
+        :type copy: bool
+        :return: A numpy array representing the encoded spike train (``out`` if given), or its events (shape (time,
+                 features) even for a 1D signal).
+        :rtype: numpy.ndarray | SpikeEvents
+        :raises ValueError: If the signal length is not divisible by the interval length.
 
-    spikes = np.zeros((T // interval_length, interval_length, F), dtype=np.int8)
+        """
+        interval_length = self.interval_length
+        T, F = signal.shape
 
-    # Create bins for Poisson encoding
-    bins = np.linspace(0, 1, interval_length + 1)
+        _check_interval(T, interval_length)
+        rng = None if isinstance(self.seed, CounterRNG) else np.random.default_rng(self.seed)
 
-    for feat in range(F):
-        for idx, rate in enumerate(interval_rate_mean[:, feat]):
-            if rate > 0:
-                ISI = -np.log(1 - np.random.random(interval_length)) / (  # inter-spike intervals where probability of
-                    rate * interval_length  # having k=0 spikes is equal to rate (time
-                )  # amount to wait to see the next spike)
-                spike_times = np.searchsorted(bins, np.cumsum(ISI)) - 1  # find spike times
-                spike_times = spike_times[spike_times < interval_length]  # clip times within interval
-                spikes[idx, spike_times, feat] = 1
+        # Ensure non-negative signal values, scaled to [0, 1]
+        signal_copy = working_signal(signal, copy, self.norm.dtype)
+        np.clip(signal_copy, 0, None, out=signal_copy)
+        signal_copy /= self.norm
+        np.minimum(signal_copy, 1, out=signal_copy)
 
-    spikes = spikes.reshape(T, F)
+        # Compute mean over the signal reshaped to interval-sized chunks
+        num_intervals = T // interval_length
+        interval_rate_mean = np.mean(signal_copy.reshape(num_intervals, interval_length, F), axis=1)
 
-    # Flatten if input was 1D
-    if F == 1:
-        spikes = spikes.flatten()
+        draw = _METHODS[self.method]
+        # Intervals drawn at once, to bound the memory of the random draws
+        step = max(1, event_block_length(F) // interval_length)
+        blocks = [(start, min(start + step, num_intervals)) for start in range(0, num_intervals, step)]
 
-    return spikes
+        if self.output == "events":
+
+            def event_blocks():
+                for start, stop in blocks:
+                    spikes = np.zeros((stop - start, interval_length, F), dtype=np.int8)
+                    draw(self._random_source(rng, start, stop), interval_rate_mean[start:stop], spikes)
+                    yield start * interval_length, spikes.reshape(-1, F)
+
+            return SpikeEvents.from_dense_blocks(event_blocks(), (T, F))
+
+        # A single feature is returned as a 1D spike train
+        spike_train = spike_buffer(out, (T, F) if F > 1 else (T,), clear=self.method != "bernoulli")
+        spikes = spike_train.reshape(num_intervals, interval_length, F)
+        for start, stop in blocks:
+            draw(self._random_source(rng, start, stop), interval_rate_mean[start:stop], spikes[start:stop])
+        return spike_train
+
+    def _random_source(self, rng: np.random.Generator | None, start: int, stop: int):
+        """
+        Random source of a block of intervals.
+
+        :param rng: Generator of the encoded signal, ``None`` with a :class:`~spikify.rng.CounterRNG` seed.
+        :type rng: numpy.random.Generator | None
+        :param start: Index of the first interval of the block.
+        :type start: int
+        :param stop: Index of the interval following the block.
+        :type stop: int
+        :return: ``rng``, or the counter-based random numbers of the block.
+        :rtype: numpy.random.Generator | _CounterDraws
+
+        """
+        if rng is None:
+            return _CounterDraws(self.seed, np.arange(start, stop), self.streams)
+        return rng
+
+    def _folded(self, num_samples: int) -> "PoissonEncoder":
+        """
+        Copy the encoder for a folded batch, every sample drawing the counter-based random numbers of a recording of
+        its own.
+
+        :param num_samples: Number of samples of the batch.
+        :type num_samples: int
+        :return: An encoder fitted on ``num_samples`` × ``num_features`` features.
+        :rtype: PoissonEncoder
+
+        """
+        encoder = super()._folded(num_samples)
+        encoder.streams = encoder.streams.copy()
+        encoder.streams[0] += np.repeat(np.arange(num_samples), self.num_features)
+        return encoder
+
+
+def _isi(rng: np.random.Generator, rate: np.ndarray, spikes: np.ndarray) -> None:
+    """
+    Place the arrivals of exponential inter-spike intervals, ``interval_length`` of them per interval and feature.
+
+    :param rng: Random generator.
+    :type rng: numpy.random.Generator
+    :param rate: Mean rate of every interval, in [0, 1], shape (intervals, features).
+    :type rate: numpy.ndarray
+    :param spikes: Zeroed spike train of the intervals, written in place, shape (intervals, interval_length,
+                   features).
+    :type spikes: numpy.ndarray
+
+    """
+    interval_length = spikes.shape[1]
+
+    # Arrival times of the first interval_length spikes of every interval and feature, as cumulated exponential
+    # inter-spike intervals of mean 1 / rate (time amount to wait to see the next spike), in timesteps. They are
+    # drawn in float64 whatever the dtype, so that a seed gives the same spikes in every precision
+    arrivals = rng.standard_exponential(spikes.shape)
+    np.cumsum(arrivals, axis=1, out=arrivals)
+    with np.errstate(divide="ignore"):
+        arrivals /= rate[:, None, :]  # infinite, hence never within the interval, for a zero rate
+
+    # Keep the arrivals within their interval, each in the timestep it falls in
+    intervals, draws, channels = np.nonzero(arrivals <= interval_length)
+    steps = np.ceil(arrivals[intervals, draws, channels]).astype(np.intp) - 1
+    np.maximum(steps, 0, out=steps)
+    spikes[intervals, steps, channels] = 1
+
+
+def _bernoulli(rng: np.random.Generator, rate: np.ndarray, spikes: np.ndarray) -> None:
+    """
+    Emit a spike at every timestep with the probability of its interval rate.
+
+    :param rng: Random generator.
+    :type rng: numpy.random.Generator
+    :param rate: Mean rate of every interval, in [0, 1], shape (intervals, features).
+    :type rate: numpy.ndarray
+    :param spikes: Spike train of the intervals, entirely overwritten, shape (intervals, interval_length, features).
+    :type spikes: numpy.ndarray
+
+    """
+    np.less(rng.random(spikes.shape), rate[:, None, :], out=spikes.view(np.bool_))
+
+
+def _binomial(rng: np.random.Generator, rate: np.ndarray, spikes: np.ndarray) -> None:
+    """
+    Draw the number of spikes of every interval from a binomial law, then place them on distinct timesteps.
+
+    :param rng: Random generator.
+    :type rng: numpy.random.Generator
+    :param rate: Mean rate of every interval, in [0, 1], shape (intervals, features).
+    :type rate: numpy.ndarray
+    :param spikes: Zeroed spike train of the intervals, written in place, shape (intervals, interval_length,
+                   features).
+    :type spikes: numpy.ndarray
+
+    """
+    interval_length = spikes.shape[1]
+    counts = rng.binomial(interval_length, np.minimum(rate, 1))
+
+    # The spikes go to the first timesteps of a random permutation of every interval
+    order = np.argsort(rng.random(spikes.shape), axis=1)
+    selected = np.arange(interval_length)[:, None] < counts[:, None, :]
+    np.put_along_axis(spikes, order, selected, axis=1)
+
+
+# Spike generation of every method
+_METHODS = {"isi": _isi, "bernoulli": _bernoulli, "binomial": _binomial}
+
+
+def _streams(num_samples: int, num_features: int) -> np.ndarray:
+    """
+    Counter-based random streams of the features of a batch folded by :func:`~spikify.encoders.utils.fold_batch`.
+
+    :param num_samples: Number of samples of the batch.
+    :type num_samples: int
+    :param num_features: Number of features of every sample.
+    :type num_features: int
+    :return: Recording (the sample) and feature within the recording of every folded feature, shape
+             (2, samples × features).
+    :rtype: numpy.ndarray
+
+    """
+    return np.stack([np.repeat(np.arange(num_samples), num_features), np.tile(np.arange(num_features), num_samples)])
+
+
+class _CounterDraws:
+    """
+    Counter-based random numbers of a block of intervals, drawn with the methods of :class:`numpy.random.Generator`
+    used by the spike generation methods. Every call takes the next draws of every interval.
+
+    :param rng: Counter-based random source.
+    :type rng: CounterRNG
+    :param intervals: Indices of the intervals of the block.
+    :type intervals: numpy.ndarray
+    :param streams: Recording and feature of every feature, shape (2, features).
+    :type streams: numpy.ndarray
+
+    """
+
+    def __init__(self, rng: CounterRNG, intervals: np.ndarray, streams: np.ndarray):
+        """Constructor method."""
+        self.rng = rng
+        self.intervals = intervals
+        self.streams = streams
+        self.drawn = 0
+
+    def _uniform(self, num_draws: int) -> np.ndarray:
+        draws = range(self.drawn, self.drawn + num_draws)
+        self.drawn += num_draws
+        return self.rng.uniform(self.intervals, self.streams[0], self.streams[1], draws)
+
+    def random(self, shape: tuple[int, int, int]) -> np.ndarray:
+        return self._uniform(shape[1])
+
+    def standard_exponential(self, shape: tuple[int, int, int]) -> np.ndarray:
+        # Inverse transform sampling, with one draw per number
+        samples = self._uniform(shape[1])
+        np.log(samples, out=samples)
+        return np.negative(samples, out=samples)
+
+    def binomial(self, n: int, p: np.ndarray) -> np.ndarray:
+        # Number of successes of n Bernoulli trials, with a fixed number of draws
+        return np.count_nonzero(self._uniform(n) < p[:, None, :], axis=1)
+
+
+def _check_interval(length: int, interval_length: int) -> None:
+    """
+    Check that the interval length divides the signal length.
+
+    :param length: Number of timesteps of the signal.
+    :type length: int
+    :param interval_length: Size of the interval.
+    :type interval_length: int
+    :raises ValueError: If the signal length is not divisible by the interval length.
+
+    """
+    if length % interval_length != 0:
+        raise ValueError(
+            f"The interval ({interval_length}) must evenly divide the signal length ({length}). "
+            "Consider trimming or padding the signal to make its length a multiple of the interval."
+        )
@@ -1,8 +1,17 @@
 """Temporal Contrast package."""
 
-from .moving_window_algorithm import moving_window
-from .step_forward_algorithm import step_forward
-from .threshold_based_algorithm import threshold_based_representation
-from .zero_cross_step_forward_algorithm import zero_cross_step_forward
+from .moving_window_algorithm import MovingWindowEncoder, moving_window
+from .step_forward_algorithm import StepForwardEncoder, step_forward
+from .threshold_based_algorithm import ThresholdBasedEncoder, threshold_based_representation
+from .zero_cross_step_forward_algorithm import ZeroCrossStepForwardEncoder, zero_cross_step_forward
 
-__all__ = ["moving_window", "step_forward", "threshold_based_representation", "zero_cross_step_forward"]
+__all__ = [
+    "moving_window",
+    "MovingWindowEncoder",
+    "step_forward",
+    "StepForwardEncoder",
+    "threshold_based_representation",
+    "ThresholdBasedEncoder",
+    "zero_cross_step_forward",
+    "ZeroCrossStepForwardEncoder",
+]
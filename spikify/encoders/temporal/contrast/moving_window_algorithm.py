@@ -4,12 +4,32 @@
     <h2>Moving Window Algorithm</h2>
 """
 
+from typing import Literal
+
 import numpy as np
+from spikify.backends import get_kernel, register_kernel, resolve_dtype
+from spikify.encoders.base import StreamingEncoder
+from spikify.encoders.utils import (
+    broadcast_threshold,
+    check_output,
+    fold_batch,
+    fold_parameter,
+    spike_buffer,
+    unfold_batch,
+    write_output,
+)
+from spikify.spikes import SpikeEvents
 
 
 def moving_window(
-    signal: np.ndarray, window_length: int, threshold: float | int | list[float | int] | np.ndarray
-) -> tuple[np.ndarray, np.ndarray]:
+    signal: np.ndarray,
+    window_length: int,
+    threshold: float | int | list[float | int] | np.ndarray,
+    backend: str | None = None,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    dtype: type | np.dtype | str | None = None,
+) -> tuple[np.ndarray | SpikeEvents, np.ndarray]:
     """
     Perform Moving Window (MW) encoding on the input signal.
 
@@ -43,63 +63,393 @@ def moving_window(
         >>> encoded_signal.flatten()
         array([0, 0, 0, 1, 1, 1], dtype=int8)
 
-    :param signal: Input signal to encode (1D or 2D: time × features or channels).
+    :param signal: Input signal to encode (1D or 2D: time × features or channels), or a batch of signals (3D:
+                   samples × time × features) encoded in a single pass. Every output of a batch gets a leading samples
+                   axis (a list of events per sample with ``output="events"``).
     :type signal: numpy.ndarray
     :param window_length: The size of the sliding window for calculating the signal base mean.
     :type window_length: int
-    :param threshold: Threshold(s) for spike generation; scalar or 1D sequence matching features.
+    :param threshold: Threshold(s) for spike generation; scalar or 1D sequence matching features, or per-sample
+                      array (samples, features) for a batch.
     :type threshold: float | int | list[float | int] | numpy.ndarray
+    :param backend: Backend running the encoding loop (see :mod:`spikify.backends`). If ``None``, the default
+                    backend is used.
+    :type backend: str | None
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``int8`` array of shape (time, features or channels), or (samples, time, features) for a
+                batch, receiving the dense spike train, e.g. the array of a :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
     :return:
-        - spikes: A numpy array representing the encoded spike train. (values in {-1, 0, +1})
+        - spikes: A numpy array representing the encoded spike train (values in {-1, 0, +1}, ``out`` if given), or
+          its events.
         - thresholds: Per-feature or channel thresholds used for encoding, returned for use in decoding,
-          shape (features or channels,).
+          shape (features or channels,), of type ``dtype``.
     :rtype: tuple[numpy.ndarray, numpy.ndarray]
-    :raises ValueError: If the input signal is empty or if the threshold dimensions do not match the signal f
-                        eature dimensions.
+    :raises ValueError: If the input signal is empty, if the threshold dimensions do not match the signal
+                        feature dimensions or if the output format is not supported, if ``out`` is given for events or
+                        does not match the spike train shape or ``dtype``, or if ``dtype`` is not supported.
+    :raises IndexError: If the window_length is greater than the signal length.
 
     """
 
     # Check for empty signal
     if len(signal) == 0:
         raise ValueError("Signal cannot be empty.")
+    check_output(output, out)
+
+    # Fold a batch (N, T, F) into a single signal (T, N × F)
+    signal, batch = fold_batch(signal)
+    if batch is not None:
+        threshold = fold_parameter(threshold, batch)
 
     # Ensure 2D processing (T, F)
     if signal.ndim == 1:
         signal = signal.reshape(-1, 1)
 
     T, F = signal.shape
+    dtype = resolve_dtype(dtype, signal)
 
     # Handle threshold
     if np.isscalar(threshold):
-        thresholds = np.full(F, float(threshold))
+        thresholds = np.full(F, float(threshold), dtype=dtype)
     else:
-        thresholds = np.asarray(threshold, dtype=float)
+        thresholds = np.asarray(threshold, dtype=dtype)
         if thresholds.ndim != 1:
             raise ValueError("Threshold must be a scalar or a 1D sequence of numbers.")
         if thresholds.size != F:
             raise ValueError("Threshold must match the number of features in the signal.")
 
-    spikes = np.zeros_like(signal, dtype=np.int8)
+    if window_length > T:
+        raise IndexError("window_length must not be greater than the number of time steps in the signal.")
+
+    kernel = get_kernel("moving_window", backend)
+    spikes = kernel(
+        np.asarray(signal, dtype=dtype),
+        window_length,
+        thresholds,
+        out=spike_buffer(out if batch is None else None, (T, F), clear=False),
+    )
+
+    if output == "events":
+        spikes = SpikeEvents.from_dense(spikes)
+
+    return write_output(unfold_batch(spikes, batch), out), unfold_batch(thresholds, batch)
+
 
-    # First loop: t = 0 : window_length
-    # For the first window_length samples, use the mean of available samples as base signal otherwise
+@register_kernel("numpy", "moving_window")
+def _moving_window_kernel(
+    signal: np.ndarray,
+    window_length: int,
+    thresholds: np.ndarray,
+    block: int | None = None,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Run the Moving Window encoding on every feature of the signal.
+
+    The base of every timestep is computed at once from running sums, so the cost does not depend on the window
+    length. Running sums are restarted every ``block`` timesteps and taken relative to the first sample of each block,
+    which keeps the rounding error at the level of a direct mean even on long, drifting signals. In blocks holding
+    non-finite samples, the running sums skip them, and only the windows holding them get a non-finite base.
+
+    :param signal: Float signal to encode, shape (time, features). The base is computed in its floating point type.
+    :type signal: numpy.ndarray
+    :param window_length: The size of the sliding window for calculating the signal base mean.
+    :type window_length: int
+    :param thresholds: Per-feature thresholds, shape (features,).
+    :type thresholds: numpy.ndarray
+    :param block: Number of timesteps sharing the same running sum. By default it is chosen from the number of
+                  features and the window length.
+    :type block: int | None
+    :param out: Preallocated ``int8`` array of shape (time, features) receiving the spike train.
+    :type out: numpy.ndarray | None
+    :return: Encoded spike train, shape (time, features) (``out`` if given).
+    :rtype: numpy.ndarray
+
+    """
+    T, F = signal.shape
+    signal = np.asarray(signal)
+    base = np.empty((T, F), dtype=signal.dtype)
+
+    if block is None:
+        block = _default_block(window_length, F, signal.dtype)
+
+    # For the first window_length samples, use the mean of the first window as base signal otherwise
     # the first window_length samples will not be encoded since there are not enough samples to fill the window
-    for f in range(F):
-        base = np.mean(signal[:window_length, f])
-        for t in range(window_length):
-            if signal[t, f] > base + thresholds[f]:
-                spikes[t, f] = 1
-            elif signal[t, f] < base - thresholds[f]:
-                spikes[t, f] = -1
-
-    # Second loop: t = window_length : T
-    # For the rest of the signal, use the moving window to calculate the base signal
-    for f in range(F):
-        for t in range(window_length, T):
-            base = np.mean(signal[t - window_length : t, f])
-            if signal[t, f] > base + thresholds[f]:
-                spikes[t, f] = 1
-            elif signal[t, f] < base - thresholds[f]:
-                spikes[t, f] = -1
-
-    return spikes, thresholds
+    base[:window_length] = np.mean(signal[:window_length], axis=0)
+
+    # For the rest of the signal, the base is the mean of the previous window_length samples:
+    # base[t] = (sums[t - start + window_length] - sums[t - start]) / window_length, with sums the running sum of
+    # signal[start - window_length : stop]
+    for start in range(window_length, T, block):
+        stop = min(start + block, T)
+        segment = signal[start - window_length : stop - 1]
+        reference = segment[0]
+        sums = np.zeros((segment.shape[0] + 1, F), dtype=signal.dtype)
+        with np.errstate(invalid="ignore"):
+            np.cumsum(segment - reference, axis=0, out=sums[1:])
+
+        # A non-finite sample would spread to every later sum of the block: sum the finite samples only instead
+        finite = np.isfinite(sums[-1]).all()
+        if not finite:
+            reference = _finite_reference(reference)
+            np.cumsum(_finite_values(segment, reference), axis=0, out=sums[1:])
+
+        window_sums = sums[window_length:] - sums[: stop - start]
+        np.add(window_sums / window_length, reference, out=base[start:stop])
+        if not finite:
+            _nonfinite_windows(segment, window_length, base[start:stop])
+
+    return _compare(signal, base, thresholds, out)
+
+
+def _finite_reference(reference: np.ndarray) -> np.ndarray:
+    """
+    Reference of the running sums of a block, replaced by zero for the features where it is not finite.
+
+    :param reference: First sample of the block, shape (features,).
+    :type reference: numpy.ndarray
+    :return: The reference.
+    :rtype: numpy.ndarray
+
+    """
+    return np.where(np.isfinite(reference), reference, 0)
+
+
+def _finite_values(values: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """
+    Samples relative to the reference of the running sums, with zero in place of the non-finite samples.
+
+    :param values: Samples, shape (time, features).
+    :type values: numpy.ndarray
+    :param reference: Finite reference, shape (features,).
+    :type reference: numpy.ndarray
+    :return: The relative samples, shape (time, features).
+    :rtype: numpy.ndarray
+
+    """
+    return np.where(np.isfinite(values), values - reference, 0)
+
+
+def _nonfinite_windows(values: np.ndarray, window_length: int, base: np.ndarray) -> None:
+    """
+    Set the base of the windows holding non-finite samples to their mean: NaN if a window holds a NaN or infinities
+    of both signs, otherwise the infinity it holds. The non-finite samples of each window are counted with exact
+    integer running sums.
+
+    :param values: Samples of the windows, shape (time + window_length - 1, features).
+    :type values: numpy.ndarray
+    :param window_length: The size of the sliding window.
+    :type window_length: int
+    :param base: Base of the windows, computed from the finite samples only, shape (time, features). It is updated in
+                 place.
+    :type base: numpy.ndarray
+
+    """
+    counts = np.zeros((3, values.shape[0] + 1, values.shape[1]), dtype=np.int64)
+    np.cumsum(np.isnan(values), axis=0, out=counts[0, 1:])
+    np.cumsum(values == np.inf, axis=0, out=counts[1, 1:])
+    np.cumsum(values == -np.inf, axis=0, out=counts[2, 1:])
+    nan, positive, negative = (counts[:, window_length:] - counts[:, : base.shape[0]]) > 0
+
+    base[positive] = np.inf
+    base[negative] = -np.inf
+    base[nan | (positive & negative)] = np.nan
+
+
+def _default_block(window_length: int, num_features: int, dtype: type | np.dtype = np.float64) -> int:
+    """
+    Number of timesteps sharing the same running sum in :func:`_moving_window_kernel` by default.
+
+    :param window_length: The size of the sliding window.
+    :type window_length: int
+    :param num_features: Number of features of the signal.
+    :type num_features: int
+    :param dtype: Floating point type of the running sums. In ``float32``, the sums are restarted more often, since
+                  their rounding error grows with their magnitude.
+    :type dtype: type | numpy.dtype
+    :return: The block length.
+    :rtype: int
+
+    """
+    block = (1 << 18) // max(num_features, 1)
+    if np.dtype(dtype) == np.float32:
+        block = min(block, 1024)
+    return max(window_length, block)
+
+
+class MovingWindowEncoder(StreamingEncoder):
+    """
+    Streaming Moving Window (MW) encoder for signals received in chunks.
+
+    The state keeps the last ``window_length`` samples and the running sum of the current block, and reproduces the
+    running sums of the NumPy backend of :func:`moving_window` block by block, so concatenating the spikes returned
+    for consecutive chunks and by :meth:`finalize` gives exactly its output on the whole signal. Since the first
+    ``window_length`` samples share the mean of the first window as base, they are held in the state until the window
+    is full. If the signal ends before, :meth:`finalize` encodes them against the mean of the samples received.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.encoders.temporal.contrast import MovingWindowEncoder
+        encoder = MovingWindowEncoder(window_length=3, threshold=0.2)
+        first = encoder.push(np.array([0.1, 0.3]))
+        second = encoder.push(np.array([0.2, 0.5, 0.8, 1.0]))
+
+    .. doctest::
+        :hide:
+
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.contrast import MovingWindowEncoder
+        >>> encoder = MovingWindowEncoder(window_length=3, threshold=0.2)
+        >>> first = encoder.push(np.array([0.1, 0.3]))
+        >>> first.shape
+        (0, 1)
+        >>> second = encoder.push(np.array([0.2, 0.5, 0.8, 1.0]))
+        >>> second.flatten()
+        array([0, 0, 0, 1, 1, 1], dtype=int8)
+
+    :param window_length: The size of the sliding window for calculating the signal base mean.
+    :type window_length: int
+    :param threshold: Threshold(s) for spike generation; scalar or 1D sequence matching features.
+    :type threshold: float | int | list[float | int] | numpy.ndarray
+
+    """
+
+    def __init__(self, window_length: int, threshold: float | int | list[float | int] | np.ndarray):
+        """Constructor method."""
+        super().__init__()
+        self.window_length = window_length
+        self.threshold = threshold
+
+    def init_state(self, num_features: int) -> dict:
+        """
+        Create the state of a new signal, waiting for the first window.
+
+        :param num_features: Number of features or channels of the signal.
+        :type num_features: int
+        :return: The initial state.
+        :rtype: dict
+        :raises ValueError: If the threshold dimensions do not match the number of features.
+
+        """
+        return {
+            "num_features": num_features,
+            "thresholds": broadcast_threshold(self.threshold, num_features),
+            "block": _default_block(self.window_length, num_features),
+            "warmup": np.empty((0, num_features)),
+            "position": 0,
+            "history": None,
+            "reference": None,
+            "sums": None,
+        }
+
+    def process(self, chunk: np.ndarray, state: dict) -> tuple[np.ndarray, dict]:
+        """
+        Encode the next chunk of the signal.
+
+        :param chunk: Next samples of the signal (1D or 2D: time × features or channels).
+        :type chunk: numpy.ndarray
+        :param state: State returned by :meth:`init_state` or by the previous call to :meth:`process`.
+        :type state: dict
+        :return:
+            - spikes: Spikes of the chunk, shape (time, features or channels). (values in {-1, 0, +1}) During the
+              first window it is empty, then it also includes the spikes of the held samples.
+            - state: The updated state.
+        :rtype: tuple[numpy.ndarray, dict]
+        :raises ValueError: If the chunk features do not match the state.
+
+        """
+        chunk = self._check_chunk(chunk, state)
+        window_length, block, thresholds = self.window_length, state["block"], state["thresholds"]
+        outputs = []
+
+        if state["warmup"] is not None:
+            samples = np.concatenate([state["warmup"], chunk])
+            if samples.shape[0] < window_length:
+                return np.zeros((0, state["num_features"]), dtype=np.int8), dict(state, warmup=samples)
+
+            # The first window_length samples use the mean of the first window as base
+            first = samples[:window_length]
+            outputs.append(_compare(first, np.mean(first, axis=0), thresholds))
+            state = dict(state, warmup=None, position=window_length, history=first)
+            chunk = samples[window_length:]
+
+        # values[i] is the sample window_length steps before the i-th sample of the chunk
+        values = np.concatenate([state["history"], chunk])
+        position, reference, sums = state["position"], state["reference"], state["sums"]
+        T = chunk.shape[0]
+        base = np.empty_like(chunk)
+
+        i = 0
+        while i < T:
+            # Restart the running sum where the offline kernel starts a block, from the previous window_length samples
+            offset = (position - window_length) % block
+            if offset == 0:
+                reference = _finite_reference(values[i])
+                sums = np.zeros((window_length + 1, chunk.shape[1]))
+                np.cumsum(_finite_values(values[i : i + window_length], reference), axis=0, out=sums[1:])
+
+            # Extend the running sum up to the last sample of the block available in the chunk
+            length = min(T - i, block - offset)
+            extended = np.empty((window_length + 1 + length, chunk.shape[1]))
+            extended[: window_length + 1] = sums
+            extended[-length:] = _finite_values(values[i + window_length : i + window_length + length], reference)
+            np.cumsum(extended[window_length:], axis=0, out=extended[window_length:])
+
+            window_sums = extended[window_length : window_length + length] - extended[:length]
+            np.add(window_sums / window_length, reference, out=base[i : i + length])
+            windows = values[i : i + window_length + length - 1]
+            if not np.isfinite(windows).all():
+                _nonfinite_windows(windows, window_length, base[i : i + length])
+            sums = extended[length:]
+            position += length
+            i += length
+
+        outputs.append(_compare(chunk, base, thresholds))
+        state = dict(state, position=position, history=values[-window_length:], reference=reference, sums=sums)
+
+        return np.concatenate(outputs), state
+
+    def finalize(self, state: dict) -> np.ndarray:
+        """
+        Encode the samples held when the signal is shorter than the window, against their mean.
+
+        :param state: State returned by the last call to :meth:`process`.
+        :type state: dict
+        :return: Spikes of the held samples, shape (time, features or channels).
+        :rtype: numpy.ndarray
+
+        """
+        samples = state["warmup"]
+        if samples is None or samples.shape[0] == 0:
+            return np.zeros((0, state["num_features"]), dtype=np.int8)
+        return _compare(samples, np.mean(samples, axis=0), state["thresholds"])
+
+
+def _compare(signal: np.ndarray, base: np.ndarray, thresholds: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Compare the signal with its base plus or minus the thresholds, a positive spike taking precedence.
+
+    :param signal: Signal, shape (time, features).
+    :type signal: numpy.ndarray
+    :param base: Base, broadcastable to the signal.
+    :type base: numpy.ndarray
+    :param thresholds: Per-feature thresholds, shape (features,).
+    :type thresholds: numpy.ndarray
+    :param out: Preallocated ``int8`` array receiving the spikes.
+    :type out: numpy.ndarray | None
+    :return: Spikes, shape (time, features) (``out`` if given).
+    :rtype: numpy.ndarray
+
+    """
+    up = signal > base + thresholds
+    down = (signal < base - thresholds) & ~up
+    return np.subtract(up.view(np.int8), down.view(np.int8), out=out)
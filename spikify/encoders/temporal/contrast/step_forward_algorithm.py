@@ -4,12 +4,32 @@
     <h2>Step Forward Algorithm</h2>
 """
 
+from typing import Literal
+
 import numpy as np
+from spikify.backends import get_kernel, register_kernel, resolve_dtype
+from spikify.encoders.base import StreamingEncoder
+from spikify.encoders.utils import (
+    broadcast_threshold,
+    check_output,
+    event_block_length,
+    fold_batch,
+    fold_parameter,
+    spike_buffer,
+    unfold_batch,
+    write_output,
+)
+from spikify.spikes import SpikeEvents
 
 
 def step_forward(
-    signal: np.ndarray, threshold: float | int | list[float | int] | np.ndarray
-) -> tuple[np.ndarray, np.ndarray]:
+    signal: np.ndarray,
+    threshold: float | int | list[float | int] | np.ndarray,
+    backend: str | None = None,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    dtype: type | np.dtype | str | None = None,
+) -> tuple[np.ndarray | SpikeEvents, np.ndarray]:
     """
     Perform Step-Forward (SF) encoding on the input signal.
 
@@ -17,6 +37,13 @@ def step_forward(
     signal and threshold-based approach. A spike is generated when the signal exceeds or drops below the dynamically
     adjusted baseline (`base`) by the specified `threshold`.
 
+    .. note::
+        - All features are encoded together with NumPy array operations. Stretches where the signal moves less than
+          one threshold per sample are resolved in closed form, and the result is bit-identical to the sequential
+          algorithm.
+        - With ``output="events"``, the signal is encoded one block of timesteps at a time and only the events of
+          each block are kept, so the dense spike train is never held in memory.
+
     Refer to the :ref:`step_forward_algorithm_desc` for a detailed explanation of the SF encoding algorithm.
 
     **Code Example:**
@@ -40,55 +67,521 @@ def step_forward(
         >>> encoded_signal.flatten()
         array([0, 0, 1, 0, 0, 1], dtype=int8)
 
-    :param signal: Input signal to encode (1D or 2D: time × features or channels).
+    :param signal: Input signal to encode (1D or 2D: time × features or channels), or a batch of signals (3D:
+                   samples × time × features) encoded in a single pass. Every output of a batch gets a leading samples
+                   axis (a list of events per sample with ``output="events"``).
     :type signal: numpy.ndarray
-    :param threshold: Threshold(s) for spike generation; scalar or 1D sequence matching features.
+    :param threshold: Threshold(s) for spike generation; scalar or 1D sequence matching features, or per-sample
+                      array (samples, features) for a batch.
     :type threshold: float | int | list[float | int] | numpy.ndarray
+    :param backend: Backend running the encoding loop (see :mod:`spikify.backends`). If ``None``, the default
+                    backend is used.
+    :type backend: str | None
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``int8`` array of shape (time, features or channels), or (samples, time, features) for a
+                batch, receiving the dense spike train, e.g. the array of a :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
     :return:
-        - spikes: A numpy array representing the encoded spike train. (values in {-1, 0, +1})
+        - spikes: A numpy array representing the encoded spike train (values in {-1, 0, +1}, ``out`` if given), or
+          its events.
         - thresholds: Per-feature or channel thresholds used for encoding, returned for use in decoding,
-          shape (features or channels,).
+          shape (features or channels,), of type ``dtype``.
     :rtype: tuple[numpy.ndarray, numpy.ndarray]
-    :raises ValueError: If the input signal is empty or if the threshold dimensions do not match the signal
-            features dimensions.
+    :raises ValueError: If the input signal is empty, if the threshold dimensions do not match the signal
+            features dimensions or if the output format is not supported, if ``out`` is given for events or does
+            not match the spike train shape or ``dtype``, or if ``dtype`` is not supported.
 
     """
 
     # Input validation
     if len(signal) == 0:
         raise ValueError("Signal cannot be empty.")
+    check_output(output, out)
+
+    # Fold a batch (N, T, F) into a single signal (T, N × F)
+    signal, batch = fold_batch(signal)
+    if batch is not None:
+        threshold = fold_parameter(threshold, batch)
 
     # Ensure 2D processing (T, F)
     if signal.ndim == 1:
         signal = signal.reshape(-1, 1)
 
     T, F = signal.shape
+    dtype = resolve_dtype(dtype, signal)
 
     # Handle threshold
     if np.isscalar(threshold):
-        thresholds = np.full(F, float(threshold))
+        thresholds = np.full(F, float(threshold), dtype=dtype)
     else:
-        thresholds = np.asarray(threshold, dtype=float)
+        thresholds = np.asarray(threshold, dtype=dtype)
         if thresholds.ndim != 1:
             raise ValueError("Threshold must be a scalar or a 1D sequence of numbers.")
         if thresholds.size != F:
             raise ValueError("Threshold must match the number of features in the signal.")
 
-    spike = np.zeros_like(signal, dtype=np.int8)
+    # base signal initialized at the start of the signal, the first timestep is never encoded
+    base = np.asarray(signal[0, :], dtype=dtype)
+    kernel = get_kernel("step_forward", backend)
+
+    if output == "events":
+
+        def blocks(base):
+            length = event_block_length(F)
+            for start in range(1, T, length):
+                spikes, base = kernel(np.asarray(signal[start : start + length], dtype=dtype), thresholds, base)
+                yield start, spikes
+
+        return unfold_batch(SpikeEvents.from_dense_blocks(blocks(base), (T, F)), batch), unfold_batch(thresholds, batch)
+
+    spike = spike_buffer(out if batch is None else None, (T, F), clear=False)
+    spike[0] = 0
+    kernel(np.asarray(signal[1:], dtype=dtype), thresholds, base, out=spike[1:])
+
+    return write_output(unfold_batch(spike, batch), out), unfold_batch(thresholds, batch)
+
+
+class StepForwardEncoder(StreamingEncoder):
+    """
+    Streaming Step-Forward (SF) encoder for signals received in chunks.
+
+    The state carries the Step-Forward base between chunks, so that concatenating the spikes returned for consecutive
+    chunks gives exactly the output of :func:`step_forward` on the whole signal. The base is initialized from the
+    first sample of the first chunk, which is never encoded. No sample is held back, so :meth:`finalize` returns no
+    spikes.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.encoders.temporal.contrast import StepForwardEncoder
+        encoder = StepForwardEncoder(threshold=0.2)
+        first = encoder.push(np.array([0.1, 0.3, 0.4]))
+        second = encoder.push(np.array([0.2, 0.5, 0.6]))
+
+    .. doctest::
+        :hide:
+
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.contrast import StepForwardEncoder
+        >>> encoder = StepForwardEncoder(threshold=0.2)
+        >>> first = encoder.push(np.array([0.1, 0.3, 0.4]))
+        >>> second = encoder.push(np.array([0.2, 0.5, 0.6]))
+        >>> np.concatenate([first, second]).flatten()
+        array([0, 0, 1, 0, 0, 1], dtype=int8)
+
+    :param threshold: Threshold(s) for spike generation; scalar or 1D sequence matching features.
+    :type threshold: float | int | list[float | int] | numpy.ndarray
+    :param backend: Backend running the encoding loop (see :mod:`spikify.backends`). If ``None``, the default
+                    backend is used.
+    :type backend: str | None
+
+    """
+
+    def __init__(self, threshold: float | int | list[float | int] | np.ndarray, backend: str | None = None):
+        """Constructor method."""
+        super().__init__()
+        self.threshold = threshold
+        self.backend = backend
+
+    def init_state(self, num_features: int) -> dict:
+        """
+        Create the state of a new signal: per-feature thresholds and a base still to be initialized.
+
+        :param num_features: Number of features or channels of the signal.
+        :type num_features: int
+        :return: The initial state.
+        :rtype: dict
+        :raises ValueError: If the threshold dimensions do not match the number of features.
+
+        """
+        return {
+            "num_features": num_features,
+            "thresholds": broadcast_threshold(self.threshold, num_features),
+            "base": None,
+        }
+
+    def process(self, chunk: np.ndarray, state: dict) -> tuple[np.ndarray, dict]:
+        """
+        Encode the next chunk of the signal.
+
+        :param chunk: Next samples of the signal (1D or 2D: time × features or channels).
+        :type chunk: numpy.ndarray
+        :param state: State returned by :meth:`init_state` or by the previous call to :meth:`process`.
+        :type state: dict
+        :return:
+            - spikes: Spikes of the chunk, shape (time, features or channels). (values in {-1, 0, +1})
+            - state: The updated state.
+        :rtype: tuple[numpy.ndarray, dict]
+        :raises ValueError: If the chunk features do not match the state.
+
+        """
+        chunk = self._check_chunk(chunk, state)
+        T, F = chunk.shape
+
+        spikes = np.zeros((T, F), dtype=np.int8)
+        if T == 0:
+            return spikes, state
+
+        # The first sample of the signal initializes the base and is not encoded
+        base = state["base"]
+        if base is None:
+            base = chunk[0].copy()
+            chunk = chunk[1:]
+
+        kernel = get_kernel("step_forward", self.backend)
+        spikes[T - chunk.shape[0] :], base = kernel(chunk, state["thresholds"], base)
+
+        return spikes, dict(state, base=base)
+
+
+# Fewest features advanced together one timestep at a time, fewer ones are advanced one at a time in Python
+_LOCKSTEP_FEATURES = 24
+
+# Shortest run of steps smaller than the threshold encoded in closed form when a feature is advanced on its own
+_MIN_RUN = 1 << 14
+
+
+@register_kernel("numpy", "step_forward")
+def _step_forward_kernel(
+    signal: np.ndarray,
+    thresholds: np.ndarray,
+    base: np.ndarray,
+    block: int | None = None,
+    out: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run the Step-Forward recurrence on every feature at once.
+
+    The signal is processed in blocks of timesteps. Inside a block, features whose signal moves less than one
+    threshold per sample take the closed-form path (see :func:`_closed_form_levels`), whose result is checked against
+    the exact floating point recurrence. When many features remain, they are advanced together one timestep at a
+    time. Otherwise every remaining feature is advanced on its own, and its block is split at the steps larger than
+    the threshold: long runs of smaller steps are still encoded in closed form, and the steps in between by the
+    sequential loop. The spikes are bit-identical to the sequential per-feature loop.
+
+    :param signal: Float signal to encode, shape (time, features). Every row is compared against the current base,
+                   in the floating point type of the signal.
+    :type signal: numpy.ndarray
+    :param thresholds: Per-feature thresholds, shape (features,).
+    :type thresholds: numpy.ndarray
+    :param base: Per-feature base before the first row of ``signal``, shape (features,).
+    :type base: numpy.ndarray
+    :param block: Number of timesteps processed per block. By default it is chosen from the number of features.
+    :type block: int | None
+    :param out: Preallocated ``int8`` array of shape (time, features) receiving the spike train.
+    :type out: numpy.ndarray | None
+    :return:
+        - spikes: Encoded spike train, shape (time, features) (``out`` if given).
+        - base: Per-feature base after the last row of ``signal``, shape (features,).
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+
+    """
+    T, F = signal.shape
+    thresholds = np.asarray(thresholds, dtype=signal.dtype)
+    base = np.array(base, dtype=signal.dtype)
+    spikes = spike_buffer(out, (T, F), clear=False)
+
+    if block is None:
+        block = max(256, (1 << 16) // max(F, 1))
+
+    # The closed form works in units of threshold, so it needs a positive finite threshold
+    scalable = np.isfinite(thresholds) & (thresholds > 0)
+    scale = np.where(scalable, thresholds, 1.0)
+
+    previous = base
+    for start in range(0, T, block):
+        chunk = signal[start : start + block]
+        B = chunk.shape[0]
+
+        # Feature-major copy of the block, prefixed with the previous sample to measure every step
+        values = np.empty((F, B + 1), dtype=signal.dtype)
+        values[:, 0] = previous
+        values[:, 1:] = chunk.T
+        small_steps = np.abs(np.diff(values, axis=1)) < thresholds[:, None]
+        smooth = scalable & small_steps.all(axis=1)
+
+        next_base = base.copy()
+        spikes_block = spikes[start : start + B]
+        remaining = ~smooth
+
+        features = np.flatnonzero(smooth)
+        if features.size:
+            exact, bases, mismatch = _closed_form_step_forward(
+                values[features, 1:], thresholds[features], base[features], scale[features]
+            )
+            accepted = mismatch == B
+            spikes_block[:, features] = exact.T
+            next_base[features[accepted]] = bases[accepted, -1]
+            remaining[features[~accepted]] = True
+
+        features = np.flatnonzero(remaining)
+        if features.size >= _LOCKSTEP_FEATURES:
+            spikes_block[:, features], next_base[features] = _lockstep_step_forward(
+                chunk[:, features], thresholds[features], base[features]
+            )
+        else:
+            for f in features:
+                # Runs of small steps are only worth the closed form for thresholds it can scale by
+                runs = small_steps[f] if scalable[f] else np.zeros(B, dtype=bool)
+                next_base[f] = _split_step_forward(values[f], runs, thresholds[f], base[f], spikes_block[:, f])
+
+        previous = chunk[-1]
+        base = next_base
+
+    return spikes, base
+
+
+def _closed_form_step_forward(
+    values: np.ndarray, thresholds: np.ndarray, base: np.ndarray, scale: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Guess the Step-Forward spikes of a block in closed form, and check them against the exact recurrence.
+
+    The base is rebuilt from the guess exactly as the sequential loop does (one rounding per step), and the spike
+    conditions are evaluated again on it. Both agree up to the first mismatch of every feature, so that the spikes
+    and bases before it are exact.
+
+    :param values: Signal of the block, shape (features, time).
+    :type values: numpy.ndarray
+    :param thresholds: Per-feature thresholds, shape (features,).
+    :type thresholds: numpy.ndarray
+    :param base: Per-feature base before the block, shape (features,).
+    :type base: numpy.ndarray
+    :param scale: Per-feature positive finite thresholds, measuring the signal in threshold units, shape (features,).
+    :type scale: numpy.ndarray
+    :return:
+        - spikes: Spikes of the exact recurrence on the guessed bases, shape (features, time).
+        - bases: Guessed base before every timestep and after the last one, shape (features, time + 1).
+        - mismatch: Index of the first timestep where the guess is wrong, or time if it is right, shape (features,).
+    :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+
+    """
+    F, B = values.shape
+    thresholds_col = thresholds[:, None]
+    levels = _closed_form_levels((values - base[:, None]) / scale[:, None])
+    guess = np.diff(levels, axis=1, prepend=0.0)
+
+    bases = np.empty((F, B + 1), dtype=values.dtype)
+    bases[:, 0] = base
+    np.multiply(guess, thresholds_col, out=bases[:, 1:])
+    np.cumsum(bases, axis=1, out=bases)
+    previous_base = bases[:, :-1]
+    exact = (values > previous_base + thresholds_col).view(np.int8) - (values < previous_base - thresholds_col).view(
+        np.int8
+    )
+
+    wrong = exact != guess
+    mismatch = np.where(wrong.any(axis=1), wrong.argmax(axis=1), B)
+    return exact, bases, mismatch
+
+
+def _split_step_forward(
+    values: np.ndarray, small_steps: np.ndarray, threshold: float, base: float, spikes: np.ndarray
+) -> float:
+    """
+    Run the Step-Forward recurrence on a block of a single feature, split at its steps larger than the threshold.
+
+    Runs of at least ``_MIN_RUN`` small steps are encoded in closed form, once the sequential loop has brought the
+    base within one threshold of the signal: from there on the base never lags behind the signal by more than one
+    threshold, which is what the closed form assumes. Every other step is encoded by the sequential loop.
+
+    :param values: Signal of the block, prefixed with the sample before the block, shape (time + 1,).
+    :type values: numpy.ndarray
+    :param small_steps: Whether every step of the block may be encoded in closed form, shape (time,).
+    :type small_steps: numpy.ndarray
+    :param threshold: Threshold of the feature.
+    :type threshold: float
+    :param base: Base before the block.
+    :type base: float
+    :param spikes: Array receiving the spikes of the block, shape (time,).
+    :type spikes: numpy.ndarray
+    :return: Base after the block.
+    :rtype: float
+
+    """
+    B = spikes.shape[0]
+    dtype = values.dtype
+    samples = values.tolist()
+    thresholds = np.array([threshold], dtype=dtype)
+    threshold = float(threshold)
+    base = float(base)
+
+    # Bounds of the runs of small steps
+    edges = np.flatnonzero(np.diff(small_steps.view(np.int8), prepend=0, append=0)).tolist()
+    runs = [
+        (run_start, run_stop)
+        for run_start, run_stop in zip(edges[::2], edges[1::2])
+        if run_stop - run_start >= _MIN_RUN
+    ]
+
+    t = 0
+    for run_start, run_stop in runs + [(B, B)]:
+        stepped, base, stop = _sequential_step_forward(samples, threshold, base, t, run_stop, run_start, dtype)
+        spikes[t:stop] = stepped
+        t = stop
+        if run_stop - t >= _MIN_RUN:
+            exact, bases, mismatch = _closed_form_step_forward(
+                values[None, t + 1 : run_stop + 1], thresholds, np.array([base], dtype=dtype), thresholds
+            )
+            accepted = int(mismatch[0])
+            spikes[t : t + accepted] = exact[0, :accepted]
+            base = float(bases[0, accepted])
+            t += accepted
+
+    return base
+
+
+def _sequential_step_forward(
+    samples: list[float],
+    threshold: float,
+    base: float,
+    start: int,
+    stop: int,
+    settle: int,
+    dtype: np.dtype,
+) -> tuple[list[int], float, int]:
+    """
+    Run the Step-Forward recurrence one step at a time on Python floats, for a single feature.
+
+    The base is rounded to ``dtype`` after every update, which gives the results of the arithmetic in ``dtype``.
+
+    :param samples: Signal of the block, prefixed with the sample before the block.
+    :type samples: list[float]
+    :param threshold: Threshold of the feature.
+    :type threshold: float
+    :param base: Base before step ``start``.
+    :type base: float
+    :param start: First step to encode.
+    :type start: int
+    :param stop: Step after the last one to encode.
+    :type stop: int
+    :param settle: First step from which the loop stops as soon as the sample before the step lies within one threshold
+                   of the base.
+    :type settle: int
+    :param dtype: Floating point type of the arithmetic.
+    :type dtype: numpy.dtype
+    :return:
+        - spikes: Spikes of the encoded steps.
+        - base: Base after the last encoded step.
+        - stop: Step after the last encoded one.
+    :rtype: tuple[list[int], float, int]
+
+    """
+    rounding = float if dtype == np.float64 else lambda value: float(dtype.type(value))
+    spikes = []
+    upper = rounding(base + threshold)
+    lower = rounding(base - threshold)
+    for t in range(start, stop):
+        if t >= settle and lower <= samples[t] <= upper:
+            return spikes, base, t
+        value = samples[t + 1]
+        if value > upper:
+            spikes.append(1)
+            base = upper
+        elif value < lower:
+            spikes.append(-1)
+            base = lower
+        else:
+            spikes.append(0)
+            continue
+        upper = rounding(base + threshold)
+        lower = rounding(base - threshold)
+
+    return spikes, base, stop
+
+
+def _closed_form_levels(position: np.ndarray) -> np.ndarray:
+    """
+    Compute the Step-Forward base level of every timestep with a parallel scan.
+
+    With the signal expressed in threshold units relative to the initial base (``position``), the base sits on an
+    integer level ``k``. When the signal moves less than one threshold per sample, a timestep maps ``k`` to
+    ``clip(k, ceil(position - 1), floor(position + 1))``. Clips compose into clips, so the level at every timestep
+    is obtained by composing clips inside fixed-size chunks (all chunks at once), chaining the chunk totals and
+    applying the chained level back to each chunk.
+
+    :param position: Signal in threshold units relative to the initial base, shape (features, time).
+    :type position: numpy.ndarray
+    :return: Base level after every timestep, shape (features, time).
+    :rtype: numpy.ndarray
+
+    """
+    F, T = position.shape
+    size = max(1, int(np.sqrt(T)))
+    count = -(-T // size)
+
+    # Lay the clips out as (position inside chunk, feature, chunk); padding timesteps are identity clips
+    lower = np.full((size, F, count), -np.inf)
+    upper = np.full((size, F, count), np.inf)
+    padded = np.full((F, count * size), np.nan)
+    padded[:, :T] = position
+    padded = padded.reshape(F, count, size).transpose(2, 0, 1)
+    np.ceil(padded - 1, out=lower, where=~np.isnan(padded))
+    np.floor(padded + 1, out=upper, where=~np.isnan(padded))
+
+    # Compose the clips of each chunk cumulatively: clip(clip(k, a, b), c, d) == clip(k, clip(a, c, d), clip(b, c, d))
+    scratch = np.empty((F, count))
+    for i in range(1, size):
+        np.maximum(upper[i - 1], lower[i], out=scratch)
+        np.minimum(scratch, upper[i], out=upper[i])
+        np.maximum(lower[i - 1], lower[i], out=lower[i])
+        np.minimum(lower[i], upper[i], out=lower[i])
+
+    # Chain the chunks starting from level 0, then apply each chunk starting level to its cumulative clips
+    start = np.empty((F, count))
+    level = np.zeros(F)
+    for j in range(count):
+        start[:, j] = level
+        level = np.minimum(np.maximum(level, lower[-1, :, j]), upper[-1, :, j])
+
+    np.maximum(lower, start, out=lower)
+    np.minimum(lower, upper, out=lower)
+
+    return lower.transpose(1, 2, 0).reshape(F, count * size)[:, :T]
+
+
+def _lockstep_step_forward(
+    signal: np.ndarray, thresholds: np.ndarray, base: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run the Step-Forward recurrence one timestep at a time, advancing all features together.
+
+    :param signal: Float signal to encode, shape (time, features).
+    :type signal: numpy.ndarray
+    :param thresholds: Per-feature thresholds, shape (features,).
+    :type thresholds: numpy.ndarray
+    :param base: Per-feature base before the first row of ``signal``, shape (features,).
+    :type base: numpy.ndarray
+    :return:
+        - spikes: Encoded spike train, shape (time, features).
+        - base: Per-feature base after the last row of ``signal``, shape (features,).
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+
+    """
+    T, F = signal.shape
+    signal = np.ascontiguousarray(signal)
+    base = base.copy()
+    upper = np.empty(F, dtype=base.dtype)
+    lower = np.empty(F, dtype=base.dtype)
+    up = np.empty((T, F), dtype=bool)
+    down = np.empty((T, F), dtype=bool)
 
-    # base signal initialized at the start of the signal
-    base = signal[0, :]
+    for t in range(T):
+        np.add(base, thresholds, out=upper)
+        np.subtract(base, thresholds, out=lower)
+        np.greater(signal[t], upper, out=up[t])
+        np.less(signal[t], lower, out=down[t])
+        # A positive spike takes precedence, so it is applied last
+        np.copyto(base, lower, where=down[t])
+        np.copyto(base, upper, where=up[t])
 
-    # Iterate over signal values skipping the first timestep since it's used for initialization of the base signal
-    for feat in range(F):
-        base = signal[0, feat]
-        for t in range(1, T):
-            value = signal[t, feat]
-            if value > base + thresholds[feat]:
-                spike[t, feat] = 1
-                base += thresholds[feat]
-            elif value < base - thresholds[feat]:
-                spike[t, feat] = -1
-                base -= thresholds[feat]
+    down &= ~up
 
-    return spike, thresholds
+    return up.view(np.int8) - down.view(np.int8), base
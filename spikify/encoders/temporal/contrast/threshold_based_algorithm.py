@@ -4,12 +4,31 @@
     <h2>Threshold Based Representation Algorithm</h2>
 """
 
+from typing import Literal
+
 import numpy as np
+from spikify.backends import resolve_dtype
+from spikify.encoders.base import StreamingEncoder
+from spikify.encoders.utils import (
+    broadcast_threshold,
+    check_output,
+    event_block_length,
+    fold_batch,
+    fold_parameter,
+    spike_buffer,
+    unfold_batch,
+    write_output,
+)
+from spikify.spikes import SpikeEvents
 
 
 def threshold_based_representation(
-    signal: np.ndarray, factor: float | int | list[float | int] | np.ndarray
-) -> tuple[np.ndarray, np.ndarray]:
+    signal: np.ndarray,
+    factor: float | int | list[float | int] | np.ndarray,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    dtype: type | np.dtype | str | None = None,
+) -> tuple[np.ndarray | SpikeEvents, np.ndarray]:
     """
     Perform Threshold-Based Representation (TBR) encoding on the input signal.
 
@@ -40,56 +59,313 @@ def threshold_based_representation(
         >>> encoded_signal.flatten()
         array([ 1,  0, -1,  1,  0,  0], dtype=int8)
 
-    :param signal: Input signal to encode (1D or 2D: time × features or channels).
+    :param signal: Input signal to encode (1D or 2D: time × features or channels), or a batch of signals (3D:
+                   samples × time × features) encoded in a single pass. Every output of a batch gets a leading samples
+                   axis (a list of events per sample with ``output="events"``).
     :type signal: numpy.ndarray
     :param factor: The factor value (`factor`) that controls the noise-reduction threshold.
-                   Can be a float, an integer, or a list of floats or integers.
+                   Can be a float, an integer, or a list of floats or integers, or a per-sample array
+                   (samples, features) for a batch.
     :type factor: float | int | list[float | int] | numpy.ndarray
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``int8`` array of shape (time, features or channels), or (samples, time, features) for a
+                batch, receiving the dense spike train, e.g. the array of a :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
     :return:
-        - spikes: A numpy array representing the encoded spike train. (values in {-1, 0, +1})
+        - spikes: A numpy array representing the encoded spike train (values in {-1, 0, +1}, ``out`` if given), or
+          its events.
         - thresholds: Per-feature or channel thresholds used for encoding, returned for use in decoding,
-          shape (features or channels,).
+          shape (features or channels,), of type ``dtype``.
     :rtype: tuple[numpy.ndarray, numpy.ndarray]
-    :raises ValueError: If the input signal is empty or if the factor length does not match the number of features.
+    :raises ValueError: If the input signal is empty, if the factor length does not match the number of features or if
+                        the output format is not supported, if ``out`` is given for events or does not match the spike
+                        train shape or ``dtype``, or if ``dtype`` is not supported.
 
     """
 
     # Input validation
     if len(signal) == 0:
         raise ValueError("Signal cannot be empty.")
+    check_output(output, out)
+
+    # Fold a batch (N, T, F) into a single signal (T, N × F)
+    signal, batch = fold_batch(signal)
+    if batch is not None:
+        factor = fold_parameter(factor, batch, name="Factor")
 
     # Ensure 2D processing (T, F)
     if signal.ndim == 1:
         signal = signal.reshape(-1, 1)
 
     T, F = signal.shape
+    dtype = resolve_dtype(dtype, signal)
 
     # Handle factor
     if np.isscalar(factor):
-        factors = np.full(F, float(factor))
+        factors = np.full(F, float(factor), dtype=dtype)
     else:
-        factors = np.asarray(factor, dtype=float)
+        factors = np.asarray(factor, dtype=dtype)
         if factors.ndim != 1:
             raise ValueError("Factor must be a scalar or a 1D sequence of numbers.")
         if factors.size != F:
             raise ValueError("Factor must match the number of features in the signal.")
-    spike = np.zeros_like(signal, dtype=np.int8)
 
+    diff = _variation(np.asarray(signal, dtype=dtype))
+
+    # Compute threshold per feature (over all T variations, including the duplicated last)
+    threshold = np.mean(diff, axis=0) + factors * np.std(diff, axis=0)
+
+    if output == "events":
+        length = event_block_length(F)
+        blocks = ((start, _compare(diff[start : start + length], threshold)) for start in range(0, T, length))
+        return unfold_batch(SpikeEvents.from_dense_blocks(blocks, (T, F)), batch), unfold_batch(threshold, batch)
+
+    # Generate spikes: compare on the full diff array (length S)
+    spike = _compare(diff, threshold, spike_buffer(out if batch is None else None, (T, F)))
+
+    return write_output(unfold_batch(spike, batch), out), unfold_batch(threshold, batch)
+
+
+def _variation(signal: np.ndarray) -> np.ndarray:
+    """
+    Compute the variation of the signal used by TBR.
+
+    :param signal: Signal, shape (time, features).
+    :type signal: numpy.ndarray
+    :return: ``diff[t] = signal[t + 1] - signal[t]``, with the last variation repeated, shape (time, features).
+    :rtype: numpy.ndarray
+
+    """
     # Compute variation exactly as in the original code
     # diff[t] = s[t+1] - s[t] for t = 0 to T-2
     # diff[T-1] = diff[T-2] (last value set to second-last)
     diff = np.diff(signal, axis=0, append=signal[[0], :])  # append first value of signal to maintain shape
     diff[-1, :] = diff[-2, :]  # force last to equal second-last
+    return diff
 
-    # Compute threshold per feature (over all T variations, including the duplicated last)
-    threshold = np.mean(diff, axis=0) + factors * np.std(diff, axis=0)
 
-    # Generate spikes: compare on the full diff array (length S)
-    threshold = threshold.reshape(1, threshold.shape[0])
+def _compare(diff: np.ndarray, threshold: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Compare the variations with plus or minus the threshold, a negative spike taking precedence.
+
+    :param diff: Variations, shape (time, features).
+    :type diff: numpy.ndarray
+    :param threshold: Thresholds, broadcastable to the variations.
+    :type threshold: numpy.ndarray
+    :param out: Array of zeros receiving the spikes.
+    :type out: numpy.ndarray | None
+    :return: Spikes, shape (time, features) (``out`` if given).
+    :rtype: numpy.ndarray
+
+    """
+    spike = np.zeros(diff.shape, dtype=np.int8) if out is None else out
     spike[diff > threshold] = 1
     spike[diff < -threshold] = -1
+    return spike
+
+
+class ThresholdBasedEncoder(StreamingEncoder):
+    """
+    Streaming Threshold-Based Representation (TBR) encoder for signals received in chunks.
+
+    The spike of a sample depends on the variation towards the next sample, so the last sample of every chunk is held
+    in the state until the next chunk (or :meth:`finalize`) arrives. The threshold comes from the statistics of the
+    variation, which are obtained in one of two modes:
+
+    - ``"calibrated"``: the mean and standard deviation are fixed, either given to the constructor or computed by
+      :meth:`calibrate` on a calibration signal. Calibrating on the whole signal reproduces
+      :func:`threshold_based_representation` exactly, for any chunking.
+    - ``"running"``: the mean and standard deviation are updated sample by sample with Welford's algorithm, and every
+      variation is compared with the threshold computed from the variations seen so far, itself included. The result
+      does not depend on the chunking, but it differs from the global statistics of the offline encoder, especially
+      at the beginning of the signal.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.encoders.temporal.contrast import ThresholdBasedEncoder
+        signal = np.array([0.1, 0.3, 0.4, 0.2, 0.5, 0.6])
+        encoder = ThresholdBasedEncoder(factor=0.5)
+        encoder.calibrate(signal)
+        spikes = np.concatenate([encoder.push(signal[:4]), encoder.push(signal[4:]), encoder.flush()])
+
+    .. doctest::
+        :hide:
+
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.contrast import ThresholdBasedEncoder
+        >>> signal = np.array([0.1, 0.3, 0.4, 0.2, 0.5, 0.6])
+        >>> encoder = ThresholdBasedEncoder(factor=0.5)
+        >>> _ = encoder.calibrate(signal)
+        >>> spikes = np.concatenate([encoder.push(signal[:4]), encoder.push(signal[4:]), encoder.flush()])
+        >>> spikes.flatten()
+        array([ 1,  0, -1,  1,  0,  0], dtype=int8)
+
+    :param factor: The factor value (`factor`) that controls the noise-reduction threshold.
+                   Can be a float, an integer, or a list of floats or integers.
+    :type factor: float | int | list[float | int] | numpy.ndarray
+    :param mode: How the statistics of the variation are obtained, ``"calibrated"`` or ``"running"``.
+    :type mode: str
+    :param mean: Mean of the variation used in ``"calibrated"`` mode; scalar or 1D sequence matching features.
+    :type mean: float | int | list[float | int] | numpy.ndarray | None
+    :param std: Standard deviation of the variation used in ``"calibrated"`` mode; scalar or 1D sequence matching
+                features.
+    :type std: float | int | list[float | int] | numpy.ndarray | None
+    :raises ValueError: If the mode is not supported.
+
+    """
+
+    def __init__(
+        self,
+        factor: float | int | list[float | int] | np.ndarray,
+        mode: Literal["calibrated", "running"] = "calibrated",
+        mean: float | int | list[float | int] | np.ndarray | None = None,
+        std: float | int | list[float | int] | np.ndarray | None = None,
+    ):
+        """Constructor method."""
+        if mode not in ("calibrated", "running"):
+            raise ValueError(f"Mode {mode} is not supported")
+        super().__init__()
+        self.factor = factor
+        self.mode = mode
+        self.mean = mean
+        self.std = std
+
+    def calibrate(self, signal: np.ndarray) -> "ThresholdBasedEncoder":
+        """
+        Compute the statistics of the variation of a calibration signal, as :func:`threshold_based_representation`
+        does on the signal it encodes.
+
+        :param signal: Calibration signal (1D or 2D: time × features or channels), with at least two samples.
+        :type signal: numpy.ndarray
+        :return: The encoder itself.
+        :rtype: ThresholdBasedEncoder
+        :raises ValueError: If the calibration signal has less than two samples.
+
+        """
+        signal = np.asarray(signal, dtype=np.float64)
+        if len(signal) < 2:
+            raise ValueError("Calibration signal must have at least two samples.")
+
+        # Ensure 2D processing (T, F)
+        if signal.ndim == 1:
+            signal = signal.reshape(-1, 1)
+
+        diff = _variation(signal)
+        self.mean = np.mean(diff, axis=0)
+        self.std = np.std(diff, axis=0)
+        return self
+
+    def init_state(self, num_features: int) -> dict:
+        """
+        Create the state of a new signal.
+
+        :param num_features: Number of features or channels of the signal.
+        :type num_features: int
+        :return: The initial state.
+        :rtype: dict
+        :raises ValueError: If the factor or the statistics do not match the number of features, or if the encoder
+                            is in ``"calibrated"`` mode without statistics.
+
+        """
+        factors = broadcast_threshold(self.factor, num_features, name="Factor")
+        state = {"num_features": num_features, "factors": factors, "last": None, "variation": None}
+
+        if self.mode == "calibrated":
+            if self.mean is None or self.std is None:
+                raise ValueError("Calibrated mode needs the mean and std of the variation, see calibrate.")
+            mean = broadcast_threshold(self.mean, num_features, name="Mean")
+            std = broadcast_threshold(self.std, num_features, name="Std")
+            state["thresholds"] = mean + factors * std
+        else:
+            state["count"] = 0
+            state["mean"] = np.zeros(num_features)
+            state["m2"] = np.zeros(num_features)
+
+        return state
+
+    def process(self, chunk: np.ndarray, state: dict) -> tuple[np.ndarray, dict]:
+        """
+        Encode the next chunk of the signal.
+
+        :param chunk: Next samples of the signal (1D or 2D: time × features or channels).
+        :type chunk: numpy.ndarray
+        :param state: State returned by :meth:`init_state` or by the previous call to :meth:`process`.
+        :type state: dict
+        :return:
+            - spikes: Spikes of the samples followed by a known sample, that is the last held sample and all the
+              samples of the chunk except the last one, shape (time, features or channels). (values in {-1, 0, +1})
+            - state: The updated state.
+        :rtype: tuple[numpy.ndarray, dict]
+        :raises ValueError: If the chunk features do not match the state.
+
+        """
+        chunk = self._check_chunk(chunk, state)
+        if state["last"] is not None:
+            chunk = np.concatenate([state["last"][None], chunk])
+
+        if chunk.shape[0] < 2:
+            return np.zeros((0, state["num_features"]), dtype=np.int8), dict(
+                state, last=chunk[0] if len(chunk) else None
+            )
+
+        diff = np.diff(chunk, axis=0)
+        spikes, state = self._encode(diff, state)
+
+        return spikes, dict(state, last=chunk[-1], variation=diff[-1])
+
+    def finalize(self, state: dict) -> np.ndarray:
+        """
+        Encode the last sample of the signal, whose variation is taken equal to the previous one.
+
+        :param state: State returned by the last call to :meth:`process`.
+        :type state: dict
+        :return: Spike of the last sample, shape (1, features or channels), or an empty array if no sample was
+                 received. A signal made of a single sample gives no spike.
+        :rtype: numpy.ndarray
+
+        """
+        if state["last"] is None:
+            return np.zeros((0, state["num_features"]), dtype=np.int8)
+        if state["variation"] is None:
+            return np.zeros((1, state["num_features"]), dtype=np.int8)
+
+        spikes, _ = self._encode(state["variation"][None], state)
+        return spikes
+
+    def _encode(self, diff: np.ndarray, state: dict) -> tuple[np.ndarray, dict]:
+        """
+        Compare the variations with the threshold, updating the running statistics in ``"running"`` mode.
+
+        :param diff: Variations, shape (time, features).
+        :type diff: numpy.ndarray
+        :param state: Current state.
+        :type state: dict
+        :return:
+            - spikes: Spikes of the variations, shape (time, features).
+            - state: The updated state.
+        :rtype: tuple[numpy.ndarray, dict]
 
-    # Reshape threshold to 1D for return
-    threshold = threshold.flatten()
+        """
+        if self.mode == "calibrated":
+            thresholds = state["thresholds"]
+        else:
+            # Welford's online update, one variation at a time for all features
+            count, mean, m2 = state["count"], state["mean"].copy(), state["m2"].copy()
+            thresholds = np.empty_like(diff)
+            for t in range(diff.shape[0]):
+                count += 1
+                delta = diff[t] - mean
+                mean += delta / count
+                m2 += delta * (diff[t] - mean)
+                thresholds[t] = mean + state["factors"] * np.sqrt(m2 / count)
+            state = dict(state, count=count, mean=mean, m2=m2)
 
-    return spike, threshold
+        return _compare(diff, thresholds), state
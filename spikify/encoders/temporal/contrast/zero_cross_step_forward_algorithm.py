@@ -4,12 +4,31 @@
     <h2>Zero Crossing Step Forward Algorithm</h2>
 """
 
+from typing import Literal
+
 import numpy as np
+from spikify.backends import resolve_dtype
+from spikify.encoders.base import StreamingEncoder
+from spikify.encoders.utils import (
+    broadcast_threshold,
+    check_output,
+    event_block_length,
+    fold_batch,
+    fold_parameter,
+    spike_buffer,
+    unfold_batch,
+    write_output,
+)
+from spikify.spikes import SpikeEvents
 
 
 def zero_cross_step_forward(
-    signal: np.ndarray, threshold: float | int | list[float | int] | np.ndarray
-) -> tuple[np.ndarray, np.ndarray]:
+    signal: np.ndarray,
+    threshold: float | int | list[float | int] | np.ndarray,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    dtype: type | np.dtype | str | None = None,
+) -> tuple[np.ndarray | SpikeEvents, np.ndarray]:
     """
     Perform Zero-Crossing Step-Forward (ZCSF) encoding on the input signal.
 
@@ -41,45 +60,145 @@ def zero_cross_step_forward(
         >>> encoded_signal.flatten()
         array([0, 0, 1, 0, 1, 0], dtype=int8)
 
-    :param signal: Input signal to encode (1D or 2D: time × features or channels).
+    :param signal: Input signal to encode (1D or 2D: time × features or channels), or a batch of signals (3D:
+                   samples × time × features) encoded in a single pass. Every output of a batch gets a leading samples
+                   axis (a list of events per sample with ``output="events"``).
     :type signal: numpy.ndarray
-    :param threshold: Threshold(s) for spike generation; scalar or 1D sequence matching features.
+    :param threshold: Threshold(s) for spike generation; scalar or 1D sequence matching features, or per-sample
+                      array (samples, features) for a batch.
     :type threshold: float | int | list[float | int] | numpy.ndarray
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``int8`` array of shape (time, features or channels), or (samples, time, features) for a
+                batch, receiving the dense spike train, e.g. the array of a :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
     :return:
-        - spikes: A numpy array representing the encoded spike train. (values in {0, +1})
+        - spikes: A numpy array representing the encoded spike train (values in {0, +1}, ``out`` if given), or its
+          events.
         - thresholds: Per-feature or channel thresholds used for encoding, returned for use in decoding,
-          shape (features or channels,).
+          shape (features or channels,), of type ``dtype``.
     :rtype: tuple[numpy.ndarray, numpy.ndarray]
-    :raises ValueError: If the input signal is empty or if the threshold dimensions do not match the signal features.
+    :raises ValueError: If the input signal is empty, if the threshold dimensions do not match the signal features,
+                        if the output format is not supported, if ``out`` is given for events or does not match the
+                        spike train shape or ``dtype``, or if ``dtype`` is not supported.
 
     """
 
     # Check for empty signal
     if len(signal) == 0:
         raise ValueError("Signal cannot be empty.")
+    check_output(output, out)
+
+    # Fold a batch (N, T, F) into a single signal (T, N × F)
+    signal, batch = fold_batch(signal)
+    if batch is not None:
+        threshold = fold_parameter(threshold, batch)
 
     # Ensure 2D processing (T, F)
     if signal.ndim == 1:
         signal = signal.reshape(-1, 1)
 
     S, F = signal.shape
+    dtype = resolve_dtype(dtype, signal)
+    signal = np.asarray(signal, dtype=dtype)
 
     # Handle threshold
     if np.isscalar(threshold):
-        thresholds = np.full(F, float(threshold))
+        thresholds = np.full(F, float(threshold), dtype=dtype)
     else:
-        thresholds = np.asarray(threshold, dtype=float)
+        thresholds = np.asarray(threshold, dtype=dtype)
         if thresholds.ndim != 1:
             raise ValueError("Threshold must be a scalar or a 1D sequence of numbers.")
         if thresholds.size != F:
             raise ValueError("Threshold must match the number of features in the signal.")
 
-    spike = np.zeros_like(signal, dtype=np.int8)
+    if output == "events":
+        length = event_block_length(F)
+        blocks = (
+            (start, (np.maximum(signal[start : start + length], 0) > thresholds).view(np.int8))
+            for start in range(0, S, length)
+        )
+        return unfold_batch(SpikeEvents.from_dense_blocks(blocks, (S, F)), batch), unfold_batch(thresholds, batch)
+
+    spike = spike_buffer(out if batch is None else None, (S, F), clear=False)
+
+    # Zero out negative values, then apply the threshold condition straight into the spike train
+    np.greater(np.maximum(signal, 0), thresholds, out=spike.view(np.bool_))
+
+    return write_output(unfold_batch(spike, batch), out), unfold_batch(thresholds, batch)
+
 
-    # Zero out negative values
-    signal = np.maximum(signal, 0)
+class ZeroCrossStepForwardEncoder(StreamingEncoder):
+    """
+    Streaming Zero-Crossing Step-Forward (ZCSF) encoder for signals received in chunks.
+
+    ZCSF encodes every sample on its own, so the state only holds the per-feature thresholds and concatenating the
+    spikes returned for consecutive chunks gives exactly the output of :func:`zero_cross_step_forward` on the whole
+    signal.
+
+    **Code Example:**
+
+    .. code-block:: python
 
-    # Apply threshold condition
-    spike[signal > thresholds] = 1
+        import numpy as np
+        from spikify.encoders.temporal.contrast import ZeroCrossStepForwardEncoder
+        encoder = ZeroCrossStepForwardEncoder(threshold=0.4)
+        first = encoder.push(np.array([-0.2, 0.1, 0.5]))
+        second = encoder.push(np.array([0.0, 1.2, 0.3]))
+
+    .. doctest::
+        :hide:
+
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.contrast import ZeroCrossStepForwardEncoder
+        >>> encoder = ZeroCrossStepForwardEncoder(threshold=0.4)
+        >>> first = encoder.push(np.array([-0.2, 0.1, 0.5]))
+        >>> second = encoder.push(np.array([0.0, 1.2, 0.3]))
+        >>> np.concatenate([first, second]).flatten()
+        array([0, 0, 1, 0, 1, 0], dtype=int8)
+
+    :param threshold: Threshold(s) for spike generation; scalar or 1D sequence matching features.
+    :type threshold: float | int | list[float | int] | numpy.ndarray
+
+    """
 
-    return spike, thresholds
+    def __init__(self, threshold: float | int | list[float | int] | np.ndarray):
+        """Constructor method."""
+        super().__init__()
+        self.threshold = threshold
+
+    def init_state(self, num_features: int) -> dict:
+        """
+        Create the state of a new signal, holding the per-feature thresholds.
+
+        :param num_features: Number of features or channels of the signal.
+        :type num_features: int
+        :return: The initial state.
+        :rtype: dict
+        :raises ValueError: If the threshold dimensions do not match the number of features.
+
+        """
+        return {"num_features": num_features, "thresholds": broadcast_threshold(self.threshold, num_features)}
+
+    def process(self, chunk: np.ndarray, state: dict) -> tuple[np.ndarray, dict]:
+        """
+        Encode the next chunk of the signal.
+
+        :param chunk: Next samples of the signal (1D or 2D: time × features or channels).
+        :type chunk: numpy.ndarray
+        :param state: State returned by :meth:`init_state`.
+        :type state: dict
+        :return:
+            - spikes: Spikes of the chunk, shape (time, features or channels). (values in {0, +1})
+            - state: The state, unchanged.
+        :rtype: tuple[numpy.ndarray, dict]
+        :raises ValueError: If the chunk features do not match the state.
+
+        """
+        chunk = self._check_chunk(chunk, state)
+        spikes = (np.maximum(chunk, 0) > state["thresholds"]).view(np.int8)
+        return spikes, state
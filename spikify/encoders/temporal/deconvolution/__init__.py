@@ -1,7 +1,14 @@
 """Deconvolution package."""
 
-from .bens_spiker_algorithm import bens_spiker
-from .modified_hough_spiker_algorithm import modified_hough_spiker
-from .hough_spiker_algorithm import hough_spiker
+from .bens_spiker_algorithm import BensSpikerEncoder, bens_spiker
+from .modified_hough_spiker_algorithm import ModifiedHoughSpikerEncoder, modified_hough_spiker
+from .hough_spiker_algorithm import HoughSpikerEncoder, hough_spiker
 
-__all__ = ["bens_spiker", "modified_hough_spiker", "hough_spiker"]
+__all__ = [
+    "bens_spiker",
+    "BensSpikerEncoder",
+    "modified_hough_spiker",
+    "ModifiedHoughSpikerEncoder",
+    "hough_spiker",
+    "HoughSpikerEncoder",
+]
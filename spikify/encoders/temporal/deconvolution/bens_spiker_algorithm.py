@@ -4,9 +4,24 @@
     <h2>Bens Spiker Algorithm</h2>
 """
 
+from typing import Literal
+
 import numpy as np
-from scipy.signal import firwin
-from .utils import WindowType
+from spikify.backends import get_kernel, register_kernel
+from spikify.encoders.base import Encoder
+from spikify.encoders.utils import (
+    broadcast_threshold,
+    check_output,
+    fold_batch,
+    fold_parameter,
+    normalization_range,
+    spike_buffer,
+    unfold_batch,
+    working_signal,
+    write_output,
+)
+from spikify.spikes import SpikeEvents
+from .utils import WindowType, design_filter, lockstep_deconvolution
 
 
 def bens_spiker(
@@ -19,7 +34,12 @@ def bens_spiker(
     pass_zero: bool | str = True,
     scale: bool = True,
     fs: float | None = None,
-) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    backend: str | None = None,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    copy: bool = True,
+    dtype: type | np.dtype | str | None = None,
+) -> tuple[np.ndarray | SpikeEvents, np.ndarray, np.ndarray]:
     """
     Perform Ben's Spiker (BSA) encoding on the input signal.
 
@@ -70,7 +90,10 @@ def bens_spiker(
         >>> encoded_signal.flatten()
         array([0, 1, 1, 0, 0, 0, 0], dtype=int8)
 
-    :param signal: Input signal to encode (1D or 2D: time × features or channels).
+    :param signal: Input signal to encode (1D or 2D: time × features or channels), or a batch of signals (3D:
+                   samples × time × features) encoded in a single pass, every sample with its own shift and
+                   filter scaling. Every output of a batch gets a leading samples axis (a list of events per
+                   sample with ``output="events"``).
     :type signal: numpy.ndarray
     :param window_length: Length of the FIR filter (number of coefficients).
     :type window_length: int
@@ -78,7 +101,7 @@ def bens_spiker(
                    Scalar or an array of cutoff frequencies (that is, band edges).
     :type cutoff: float | numpy.ndarray
     :param threshold: Threshold factor for spike detection.
-                      Scalar or per-feature sequence.
+                      Scalar or per-feature sequence, or per-sample array (samples, features) for a batch.
     :type threshold: float | int | list[float | int] | numpy.ndarray
     :param width: Transition width for FIR filter design (optional, used with certain window types).
     :type width: int | None
@@ -91,73 +114,321 @@ def bens_spiker(
     :type scale: bool
     :param fs: Sampling frequency (used for physical frequency units in cutoff; optional).
     :type fs: float | None
+    :param backend: Backend running the encoding loop (see :mod:`spikify.backends`). If ``None``, the default
+                    backend is used.
+    :type backend: str | None
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``int8`` array of shape (time, features or channels), or (samples, time, features) for a
+                batch, receiving the dense spike train, e.g. the array of a :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param copy: If ``False`` and the signal is a writable array of type ``dtype``, it is normalized in place instead of
+                 copied, and is overwritten by the encoding.
+    :type copy: bool
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
     :return:
-        - spikes:  A numpy array representing the encoded spike train. (values in {0, +1})
-        - fir_bank: Final filter coefficients used, shape (window_length, features or channels).
+        - spikes: A numpy array representing the encoded spike train (values in {0, +1}, ``out`` if given), or its
+          events.
+        - fir_bank: Final filter coefficients used, shape (window_length, features or channels). Unless some features
+          needed their own scaling, it is a read-only view of a single filter shared by all features.
         - shift: Per-feature shift values subtracted to make signal non-negative, shape (features or channels,).
     :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
     :raises ValueError: If the input signal is empty or if the threshold dimensions do not match the signal
-                        feature dimensions or if the window_length is greater than the signal lenght.
+                        feature dimensions or if the window_length is greater than the signal lenght,
+                        or if the output format is not supported, or if ``out`` is given for events or does not match
+                        the spike train shape or ``dtype``.
+
+    """
+    signal, batch = fold_batch(signal)
+    if batch is not None:
+        threshold = fold_parameter(threshold, batch)
+    encoder = BensSpikerEncoder(
+        window_length,
+        cutoff,
+        threshold,
+        width,
+        window_type,
+        pass_zero,
+        scale,
+        fs,
+        backend=backend,
+        output=output,
+        dtype=dtype,
+    )
+    spikes = encoder.fit_transform(signal, out if batch is None else None, copy)
+    spikes = write_output(unfold_batch(spikes, batch), out)
+
+    return spikes, unfold_batch(encoder.fir_bank, batch), unfold_batch(encoder.shift, batch)
 
+
+class BensSpikerEncoder(Encoder):
     """
+    Ben's Spiker (BSA) encoder prepared once and reused across signals.
+
+    :meth:`fit` computes the per-feature thresholds, the shift making the signal non-negative and the filter bank,
+    scaled for every feature whose amplitude is greater than 1, as :func:`bens_spiker` does. :meth:`transform` then
+    encodes any signal with them, without designing the filter again.
+
+    **Code Example:**
 
-    # Check for empty signal
-    if len(signal) == 0:
-        raise ValueError("Signal cannot be empty.")
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.encoders.temporal.deconvolution import BensSpikerEncoder
+        encoder = BensSpikerEncoder(window_length=3, cutoff=0.1, threshold=0.1)
+        encoder.fit(np.array([0.1, 0.2, 0.8, 0.95, 0.5, 0.3, 0.1]))
+        encoded_signal = encoder.transform(np.array([0.2, 0.3, 0.9, 0.9, 0.4, 0.2, 0.1]))
 
-    # Ensure 2D processing (T, F)
-    if signal.ndim == 1:
-        signal = signal.reshape(-1, 1)
+    .. doctest::
+        :hide:
 
-    T, F = signal.shape
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.deconvolution import BensSpikerEncoder
+        >>> encoder = BensSpikerEncoder(window_length=3, cutoff=0.1, threshold=0.1)
+        >>> encoder = encoder.fit(np.array([0.1, 0.2, 0.8, 0.95, 0.5, 0.3, 0.1]))
+        >>> encoder.transform(np.array([0.2, 0.3, 0.9, 0.9, 0.4, 0.2, 0.1])).flatten()
+        array([0, 1, 1, 0, 0, 0, 0], dtype=int8)
 
-    # Handle window_length
-    if window_length > T:
-        raise ValueError("window_length must be less than the number of time steps in the signal.")
+    :param window_length: Length of the FIR filter (number of coefficients).
+    :type window_length: int
+    :param cutoff: Cutoff frequency(ies) for the FIR filter design (normalized 0 to 1, where 1 = Nyquist).
+    :type cutoff: float | numpy.ndarray
+    :param threshold: Threshold factor for spike detection; scalar or per-feature sequence.
+    :type threshold: float | int | list[float | int] | numpy.ndarray
+    :param width: Transition width for FIR filter design (optional, used with certain window types).
+    :type width: int | None
+    :param window_type: Window function for FIR filter design (e.g., 'hann', 'hamming', 'blackman', 'boxcar').
+    :type window_type: str
+    :param pass_zero: Whether the filter should be low-pass (True) or high-pass (False/'highpass').
+    :type pass_zero: bool | str
+    :param scale: Set to True to scale the coefficients so that the frequency response is exactly unity at a
+                  certain frequency.
+    :type scale: bool
+    :param fs: Sampling frequency (used for physical frequency units in cutoff; optional).
+    :type fs: float | None
+    :param backend: Backend running the encoding loop (see :mod:`spikify.backends`). If ``None``, the default
+                    backend is used.
+    :type backend: str | None
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param dtype: Floating point type of the fitted parameters and of the computation (see
+                  :mod:`spikify.backends.precision`), ``"auto"`` to follow the calibration signal. If ``None``, the
+                  default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :raises ValueError: If the output format is not supported.
 
-    # Handle threshold
-    if np.isscalar(threshold):
-        thresholds = np.full(F, float(threshold))
-    else:
-        thresholds = np.asarray(threshold, dtype=float)
-        if thresholds.ndim != 1:
-            raise ValueError("Threshold must be a scalar or a 1D sequence of numbers.")
-        if thresholds.size != F:
-            raise ValueError("Threshold must match the number of features in the signal.")
+    """
 
-    spikes = np.zeros_like(signal, dtype=np.int8)
+    _feature_parameters = ("thresholds", "fir_bank", "shift")
 
-    # Generate filter coefficient values according to their window length for each feature
-    fir = firwin(window_length, cutoff, width=width, window=window_type, pass_zero=pass_zero, scale=scale, fs=fs)
+    def __init__(
+        self,
+        window_length: int,
+        cutoff: float | np.ndarray,
+        threshold: float | int | list[float, int] | np.ndarray,
+        width: int | None = None,
+        window_type: WindowType = "hann",
+        pass_zero: bool | str = True,
+        scale: bool = True,
+        fs: float | None = None,
+        backend: str | None = None,
+        output: Literal["dense", "events"] = "dense",
+        dtype: type | np.dtype | str | None = None,
+    ):
+        """Constructor method."""
+        check_output(output)
+        super().__init__()
+        self.window_length = window_length
+        self.cutoff = cutoff
+        self.threshold = threshold
+        self.width = width
+        self.window_type = window_type
+        self.pass_zero = pass_zero
+        self.scale = scale
+        self.fs = fs
+        self.backend = backend
+        self.output = output
+        self.dtype = dtype
+        self.thresholds = None
+        self.fir_bank = None
+        self.shift = None
 
-    # Stack the same filter for all features in case we need to modify coeffiecient due to signal
-    # amplitude for certain features
-    fir_bank = np.stack([fir] * F, axis=0).T
+    def fit(self, signal: np.ndarray) -> "BensSpikerEncoder":
+        """
+        Compute the thresholds, the shift and the filter bank from a calibration signal.
 
-    signal_copy = np.copy(signal)
+        :param signal: Calibration signal (1D or 2D: time × features or channels).
+        :type signal: numpy.ndarray
+        :return: The encoder itself.
+        :rtype: BensSpikerEncoder
+        :raises ValueError: If the signal is empty or if the threshold dimensions do not match the signal features.
 
-    # Normalize signal if signal has negative values
-    shift = signal_copy.min(axis=0)
-    shift[shift > 0] = 0  # only shift if negative values are present
-    signal_copy -= shift
+        """
+        signal = self._as_float_2d(signal)
+        F = signal.shape[1]
 
-    # Compute max amplitude per feature to be used for scaling if max amplitude is grater than 1
-    max_amp = signal_copy.max(axis=0)
+        thresholds = broadcast_threshold(self.threshold, F, dtype=signal.dtype)
 
-    # Find features that require scaling
-    features_to_scale = np.where(max_amp > 1)[0]
+        # Generate filter coefficient values according to their window length, shared by all features
+        fir = design_filter(
+            self.window_length, self.cutoff, self.width, self.window_type, self.pass_zero, self.scale, self.fs
+        )
+        fir_bank = np.broadcast_to(fir.astype(signal.dtype, copy=False)[:, None], (self.window_length, F))
+
+        # Normalize signal if signal has negative values, and compute max amplitude per feature to be used for
+        # scaling if max amplitude is grater than 1
+        shift, max_amp = normalization_range(signal)
+
+        # Find features that require scaling
+        features_to_scale = np.where(max_amp > 1)[0]
+
+        # Only copy the filter for every feature if some of them need their own coefficients
+        if features_to_scale.size:
+            fir_bank = fir_bank.copy()
+        for f in features_to_scale:
+            s = fir_bank[:, f].sum()
+            fir_bank[:, f] *= 2 * max_amp[f] / s
+
+        self.num_features = F
+        self.thresholds = thresholds
+        self.fir_bank = fir_bank
+        self.shift = shift
+        return self
+
+    def _transform(
+        self, signal: np.ndarray, out: np.ndarray | None = None, copy: bool = True
+    ) -> np.ndarray | SpikeEvents:
+        """
+        Encode a signal with the fitted thresholds, shift and filter bank. Samples below the shift seen by
+        :meth:`fit` are clipped to it.
+
+        :param signal: Input signal to encode, shape (time, features).
+        :type signal: numpy.ndarray
+        :param out: Preallocated ``int8`` array receiving the dense spike train.
+        :type out: numpy.ndarray | None
+        :param copy: If ``False``, the signal may be normalized in place.
+        :type copy: bool
+        :return: The encoded spike train (values in {0, +1}), shape (time, features or channels) (``out`` if given),
+                 or its events.
+        :rtype: numpy.ndarray | SpikeEvents
+        :raises ValueError: If the window_length is greater than the signal length.
+
+        """
+
+        # Handle window_length
+        if self.window_length > signal.shape[0]:
+            raise ValueError("window_length must be less than the number of time steps in the signal.")
+
+        signal_copy = working_signal(signal, copy, self.shift.dtype)
+        signal_copy -= self.shift
+        np.maximum(signal_copy, 0, out=signal_copy)
+
+        kernel = get_kernel("bens_spiker", self.backend)
+        spikes = kernel(signal_copy, self.fir_bank, self.thresholds, out=spike_buffer(out, signal.shape, clear=False))
+
+        if self.output == "events":
+            spikes = SpikeEvents.from_dense(spikes)
+
+        return spikes if out is None else out
+
+
+@register_kernel("numpy", "bens_spiker")
+def _bens_spiker_kernel(
+    signal: np.ndarray,
+    fir_bank: np.ndarray,
+    thresholds: np.ndarray,
+    block: int | None = None,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Run the Ben's Spiker detection on every feature of the signal at once (see :func:`.lockstep_deconvolution`).
+
+    Batches of a few positions sum every window exactly as in the per-feature loop. Longer batches slide the error
+    between every segment and the zero signal along the windows (see :func:`_sliding_condition`). Either way, the
+    spikes are bit-identical to the per-feature loop.
+
+    :param signal: Non-negative signal to encode, shape (time, features). It is modified in place, as the filter is
+                   subtracted at every detected spike.
+    :type signal: numpy.ndarray
+    :param fir_bank: Per-feature filter coefficients, shape (window_length, features).
+    :type fir_bank: numpy.ndarray
+    :param thresholds: Per-feature thresholds, shape (features,).
+    :type thresholds: numpy.ndarray
+    :param block: Number of window positions evaluated at once. By default it is chosen from the number of features
+                  and the window length.
+    :type block: int | None
+    :param out: Preallocated ``int8`` array of shape (time, features) receiving the spike train.
+    :type out: numpy.ndarray | None
+    :return: Encoded spike train, shape (time, features) (``out`` if given).
+    :rtype: numpy.ndarray
+
+    """
+    thresholds = np.asarray(thresholds)[:, None]
+    window_length, F = fir_bank.shape
+
+    # Filters and zero signal of every feature, to compute both errors of a window with the same operations
+    references = np.zeros((2, F, 1, window_length), dtype=fir_bank.dtype)
+    references[0, :, 0] = fir_bank.T
+
+    def condition(windows: np.ndarray, filters: np.ndarray, features: np.ndarray | slice) -> np.ndarray:
+        if windows.shape[1] < window_length:
+            # C order keeps every window contiguous, so that it is summed exactly as a single window
+            errors = np.subtract(windows, references[:, features], order="C")
+            errors = np.add.reduce(np.abs(errors, out=errors), axis=-1)
+            # Error between segment and filter against error between segment and zero signal
+            return errors[0] <= errors[1] - thresholds[features]
+        error1 = np.add.reduce(np.abs(np.subtract(windows, filters, order="C")), axis=-1)
+        return _sliding_condition(windows, error1, thresholds[features])
+
+    return lockstep_deconvolution(signal, fir_bank, condition, block, out)
+
+
+def _sliding_condition(windows: np.ndarray, error1: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the Ben's Spiker condition on windows of consecutive positions, with the error between every segment and
+    the zero signal maintained incrementally as the window slides.
+
+    The error to the zero signal of every window is the difference of two running sums of the absolute samples,
+    accumulated in ``float64``. Away from the threshold, the rounding error of the running sums cannot change the
+    outcome. The few windows close enough to the threshold for it to matter are summed exactly as in the per-feature
+    loop, so the spikes are bit-identical to it. The error to the filter depends on the alignment of the filter with
+    every window, so it can not slide and is computed for every window.
+
+    :param windows: Windows of consecutive positions, shape (features, positions, window_length).
+    :type windows: numpy.ndarray
+    :param error1: Error between every segment and the filter, summed as in the per-feature loop, shape (features,
+                   positions).
+    :type error1: numpy.ndarray
+    :param thresholds: Per-feature thresholds, shape (features, 1).
+    :type thresholds: numpy.ndarray
+    :return: Whether every window spikes, shape (features, positions).
+    :rtype: numpy.ndarray
+
+    """
+    F, P, W = windows.shape
 
-    for f in features_to_scale:
-        s = fir_bank[:, f].sum()
-        fir_bank[:, f] *= 2 * max_amp[f] / s
+    # Running sums of the samples covered by the windows: the first sample of every window, then the rest of the last
+    samples = np.concatenate([windows[:, :, 0], windows[:, -1, 1:]], axis=1)
+    sums = np.zeros((F, P + W), dtype=np.float64)
+    np.cumsum(np.abs(samples), axis=1, dtype=np.float64, out=sums[:, 1:])
+    # Non-finite samples make the running sums non-finite from there on, the margins are then NaN or infinite
+    with np.errstate(invalid="ignore"):
+        error2 = sums[:, W:] - sums[:, :P]
+        margin = error2 - thresholds - error1
 
-    for f in range(F):
-        for t in range(0, T - window_length + 1):
-            seg = signal_copy[t : t + window_length, f]  # segment of the signal
-            error1 = np.abs(seg - fir_bank[:, f]).sum()  # error between segment and filter
-            error2 = np.abs(seg).sum()  # error between segment and zero signal
-            if error1 <= (error2 - thresholds[f]):  # spike condition
-                spikes[t, f] = 1
-                signal_copy[t : t + window_length, f] -= fir_bank[:, f]  # update signal by removing filter effect
+        # Rounding error of the running sums, plus that of the per-feature loop summing and comparing in its own type
+        bound = 3 * (P + W) * np.finfo(np.float64).eps * sums[:, -1:]
+        bound = bound + (W + 2) * np.finfo(error1.dtype).eps * (error2 + np.abs(thresholds))
+    fires = margin >= 0
 
-    return spikes, fir_bank, shift
+    # NaN margins, and infinite ones with an infinite bound, are always summed again
+    close = ~(np.abs(margin) > bound)
+    if close.any():
+        rows, positions = np.nonzero(close)
+        error2 = np.add.reduce(np.abs(windows[rows, positions]), axis=-1)
+        fires[rows, positions] = error1[rows, positions] <= error2 - thresholds[rows, 0]
+    return fires
@@ -4,9 +4,22 @@
     <h2>Hough Spiker Algorithm</h2>
 """
 
+from typing import Literal
+
 import numpy as np
-from scipy.signal import firwin
-from .utils import WindowType
+from spikify.backends import get_kernel, register_kernel
+from spikify.encoders.base import Encoder
+from spikify.encoders.utils import (
+    check_output,
+    fold_batch,
+    normalization_range,
+    spike_buffer,
+    unfold_batch,
+    working_signal,
+    write_output,
+)
+from spikify.spikes import SpikeEvents
+from .utils import WindowType, design_filter, lockstep_deconvolution
 
 
 def hough_spiker(
@@ -18,7 +31,12 @@ def hough_spiker(
     pass_zero: bool | str = True,
     scale: bool = True,
     fs: float | None = None,
-) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    backend: str | None = None,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    copy: bool = True,
+    dtype: type | np.dtype | str | None = None,
+) -> tuple[np.ndarray | SpikeEvents, np.ndarray, np.ndarray, np.ndarray]:
     """
     Perform Hough Spiker Algorithm (HSA) encoding on the input signal.
 
@@ -60,7 +78,10 @@ def hough_spiker(
         >>> encoded_signal.flatten()
         array([0, 1, 0, 0, 0, 0, 0], dtype=int8)
 
-    :param signal: Input signal to encode (1D or 2D: time × features or channels).
+    :param signal: Input signal to encode (1D or 2D: time × features or channels), or a batch of signals (3D:
+                   samples × time × features) encoded in a single pass, every sample with its own shift and
+                   normalization. Every output of a batch gets a leading samples axis (a list of events per
+                   sample with ``output="events"``).
     :type signal: numpy.ndarray
     :param window_length: Length of the FIR filter (number of coefficients).
     :type window_length: int
@@ -78,55 +99,222 @@ def hough_spiker(
     :type scale: bool
     :param fs: Sampling frequency (used for physical frequency units in cutoff; optional).
     :type fs: float | None
+    :param backend: Backend running the encoding loop (see :mod:`spikify.backends`). If ``None``, the default
+                    backend is used.
+    :type backend: str | None
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``int8`` array of shape (time, features or channels), or (samples, time, features) for a
+                batch, receiving the dense spike train, e.g. the array of a :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param copy: If ``False`` and the signal is a writable array of type ``dtype``, it is normalized in place instead of
+                 copied, and is overwritten by the encoding.
+    :type copy: bool
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
     :return:
-        - spikes: A numpy array representing the encoded spike train. (values in {0, +1})
-        - fir_bank: Final filter coefficients used (window_length, features or channels).
+        - spikes: A numpy array representing the encoded spike train (values in {0, +1}, ``out`` if given), or its
+          events.
+        - fir_bank: Final filter coefficients used (window_length, features or channels), a read-only view of a
+          single filter shared by all features.
         - shift: Per-feature shift values subtracted to make signal non-negative, shape (features or channels,).
         - norm: Per-feature normalization values used to scale signal to [0, 1], shape (features or channels,).
     :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]
-    :raises ValueError: If the input signal is empty or if the window_length is greater than the signal lenght.
+    :raises ValueError: If the input signal is empty or if the window_length is greater than the signal lenght,
+                        or if the output format is not supported, or if ``out`` is given for events or does not match
+                        the spike train shape or ``dtype``.
 
     """
-    # Check for empty signal
-    if len(signal) == 0:
-        raise ValueError("Signal cannot be empty.")
+    signal, batch = fold_batch(signal)
+    encoder = HoughSpikerEncoder(
+        window_length, cutoff, width, window_type, pass_zero, scale, fs, backend=backend, output=output, dtype=dtype
+    )
+    spikes = encoder.fit_transform(signal, out if batch is None else None, copy)
+    spikes = write_output(unfold_batch(spikes, batch), out)
 
-    # Ensure 2D processing (T, F)
-    if signal.ndim == 1:
-        signal = signal.reshape(-1, 1)
+    return (spikes,) + tuple(unfold_batch(value, batch) for value in (encoder.fir_bank, encoder.shift, encoder.norm))
 
-    T, F = signal.shape
 
-    # Handle window_length
-    if window_length > T:
-        raise ValueError("window_length must be less than the number of time steps in the signal.")
+class HoughSpikerEncoder(Encoder):
+    """
+    Hough Spiker Algorithm (HSA) encoder prepared once and reused across signals.
 
-    spikes = np.zeros_like(signal, dtype=np.int8)
+    :meth:`fit` computes the shift and the normalization bringing the signal to [0, 1], and designs the filter bank,
+    as :func:`hough_spiker` does. :meth:`transform` then encodes any signal with them, without designing the filter
+    again.
 
-    # Generate filter coefficient values according to their window length for each feature
-    fir = firwin(window_length, cutoff, width=width, window=window_type, pass_zero=pass_zero, scale=scale, fs=fs)
+    **Code Example:**
 
-    fir_bank = np.stack([fir] * F, axis=0).T
+    .. code-block:: python
 
-    signal_copy = np.copy(np.array(signal, dtype=np.float64))
+        import numpy as np
+        from spikify.encoders.temporal.deconvolution import HoughSpikerEncoder
+        encoder = HoughSpikerEncoder(window_length=3, cutoff=0.1).fit(np.array([0.1, 0.2, 4.1, 1.0, 3.0, 0.3, 0.1]))
+        encoded_signal = encoder.transform(np.array([0.1, 0.2, 4.1, 1.0, 3.0, 3.0, 1.0]))
 
-    # Normalize signal if signal has negative values
-    shift = signal_copy.min(axis=0)
-    shift[shift > 0] = 0  # only shift if negative values are present
-    signal_copy -= shift
+    .. doctest::
+        :hide:
 
-    norm = signal_copy.max(axis=0)
-    norm[norm <= 1] = 1  # only normalize if max is greater than 1
-    signal_copy /= norm
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.deconvolution import HoughSpikerEncoder
+        >>> encoder = HoughSpikerEncoder(window_length=3, cutoff=0.1).fit(np.array([0.1, 0.2, 4.1, 1.0, 3.0, 0.3, 0.1]))
+        >>> encoder.transform(np.array([0.1, 0.2, 4.1, 1.0, 3.0, 3.0, 1.0])).flatten()
+        array([0, 1, 0, 0, 0, 0, 0], dtype=int8)
 
-    for f in range(F):
-        for t in range(0, T - window_length + 1):
-            # Count how many values match or exceed the filter window values
-            match_count = np.sum(signal_copy[t : t + window_length, f] >= fir)
+    :param window_length: Length of the FIR filter (number of coefficients).
+    :type window_length: int
+    :param cutoff: Cutoff frequency(ies) for the FIR filter design (normalized 0 to 1, where 1 = Nyquist).
+    :type cutoff: float | numpy.ndarray
+    :param width: Transition width for FIR filter design (optional, used with certain window types).
+    :type width: int | None
+    :param window_type: Window function for FIR filter design (e.g., 'hann', 'hamming', 'blackman', 'boxcar').
+    :type window_type: str
+    :param pass_zero: Whether the filter should be low-pass (True) or high-pass (False/'highpass').
+    :type pass_zero: bool | str
+    :param scale: Set to True to scale the coefficients so that the frequency response is exactly unity at a
+                  certain frequency.
+    :type scale: bool
+    :param fs: Sampling frequency (used for physical frequency units in cutoff; optional).
+    :type fs: float | None
+    :param backend: Backend running the encoding loop (see :mod:`spikify.backends`). If ``None``, the default
+                    backend is used.
+    :type backend: str | None
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param dtype: Floating point type of the fitted parameters and of the computation (see
+                  :mod:`spikify.backends.precision`), ``"auto"`` to follow the calibration signal. If ``None``, the
+                  default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :raises ValueError: If the output format is not supported.
+
+    """
+
+    _feature_parameters = ("fir_bank", "shift", "norm")
+
+    def __init__(
+        self,
+        window_length: int,
+        cutoff: float | np.ndarray,
+        width: int | None = None,
+        window_type: WindowType = "hann",
+        pass_zero: bool | str = True,
+        scale: bool = True,
+        fs: float | None = None,
+        backend: str | None = None,
+        output: Literal["dense", "events"] = "dense",
+        dtype: type | np.dtype | str | None = None,
+    ):
+        """Constructor method."""
+        check_output(output)
+        super().__init__()
+        self.window_length = window_length
+        self.cutoff = cutoff
+        self.width = width
+        self.window_type = window_type
+        self.pass_zero = pass_zero
+        self.scale = scale
+        self.fs = fs
+        self.backend = backend
+        self.output = output
+        self.dtype = dtype
+        self.fir_bank = None
+        self.shift = None
+        self.norm = None
+
+    def fit(self, signal: np.ndarray) -> "HoughSpikerEncoder":
+        """
+        Compute the shift, the normalization and the filter bank from a calibration signal.
+
+        :param signal: Calibration signal (1D or 2D: time × features or channels).
+        :type signal: numpy.ndarray
+        :return: The encoder itself.
+        :rtype: HoughSpikerEncoder
+        :raises ValueError: If the signal is empty.
+
+        """
+        signal = self._as_float_2d(signal)
+        F = signal.shape[1]
+
+        # Generate filter coefficient values according to their window length, shared by all features
+        fir = design_filter(
+            self.window_length, self.cutoff, self.width, self.window_type, self.pass_zero, self.scale, self.fs
+        )
+        self.fir_bank = np.broadcast_to(fir.astype(signal.dtype, copy=False)[:, None], (self.window_length, F))
+
+        # Normalize signal if signal has negative values, then scale it to [0, 1]
+        self.shift, norm = normalization_range(signal)
+        norm[norm <= 1] = 1  # only normalize if max is greater than 1
+        self.norm = norm
+
+        self.num_features = F
+        return self
+
+    def _transform(
+        self, signal: np.ndarray, out: np.ndarray | None = None, copy: bool = True
+    ) -> np.ndarray | SpikeEvents:
+        """
+        Encode a signal with the fitted shift, normalization and filter bank. Samples outside of the range
+        seen by :meth:`fit` are clipped to [0, 1] after normalization.
+
+        :param signal: Input signal to encode, shape (time, features).
+        :type signal: numpy.ndarray
+        :param out: Preallocated ``int8`` array receiving the dense spike train.
+        :type out: numpy.ndarray | None
+        :param copy: If ``False``, the signal may be normalized in place.
+        :type copy: bool
+        :return: The encoded spike train (values in {0, +1}), shape (time, features or channels) (``out`` if given),
+                 or its events.
+        :rtype: numpy.ndarray | SpikeEvents
+        :raises ValueError: If the window_length is greater than the signal length.
+
+        """
+
+        # Handle window_length
+        if self.window_length > signal.shape[0]:
+            raise ValueError("window_length must be less than the number of time steps in the signal.")
+
+        signal_copy = working_signal(signal, copy, self.shift.dtype)
+        signal_copy -= self.shift
+        signal_copy /= self.norm
+        np.clip(signal_copy, 0, 1, out=signal_copy)
+
+        kernel = get_kernel("hough_spiker", self.backend)
+        spikes = kernel(signal_copy, self.fir_bank, out=spike_buffer(out, signal.shape, clear=False))
+
+        if self.output == "events":
+            spikes = SpikeEvents.from_dense(spikes)
+
+        return spikes if out is None else out
+
+
+@register_kernel("numpy", "hough_spiker")
+def _hough_spiker_kernel(
+    signal: np.ndarray, fir_bank: np.ndarray, block: int | None = None, out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Run the Hough Spiker detection on every feature of the signal at once (see :func:`.lockstep_deconvolution`).
+
+    A window matches when all its values match or exceed the filter, which is tested for every feature at once.
+
+    :param signal: Signal to encode scaled to [0, 1], shape (time, features). It is modified in place, as the filter
+                   is subtracted at every detected spike.
+    :type signal: numpy.ndarray
+    :param fir_bank: Per-feature filter coefficients, shape (window_length, features).
+    :type fir_bank: numpy.ndarray
+    :param block: Number of window positions evaluated at once. By default it is chosen from the number of features
+                  and the window length.
+    :type block: int | None
+    :param out: Preallocated ``int8`` array of shape (time, features) receiving the spike train.
+    :type out: numpy.ndarray | None
+    :return: Encoded spike train, shape (time, features) (``out`` if given).
+    :rtype: numpy.ndarray
+
+    """
 
-            # If all values match or exceed, a spike is detected
-            if match_count == window_length:
-                signal_copy[t : t + window_length, f] -= fir_bank[:, f]
-                spikes[t, f] = 1
+    def condition(windows: np.ndarray, filters: np.ndarray, features: np.ndarray | slice) -> np.ndarray:
+        return np.logical_and.reduce(windows >= filters, axis=-1)
 
-    return spikes, fir_bank, shift, norm
+    return lockstep_deconvolution(signal, fir_bank, condition, block, out)
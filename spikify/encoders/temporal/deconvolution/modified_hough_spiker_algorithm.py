@@ -4,9 +4,24 @@
     <h2>Modified Hough Spiker Algorithm</h2>
 """
 
+from typing import Literal
+
 import numpy as np
-from scipy.signal import firwin
-from .utils import WindowType
+from spikify.backends import get_kernel, register_kernel
+from spikify.encoders.base import Encoder
+from spikify.encoders.utils import (
+    broadcast_threshold,
+    check_output,
+    fold_batch,
+    fold_parameter,
+    normalization_range,
+    spike_buffer,
+    unfold_batch,
+    working_signal,
+    write_output,
+)
+from spikify.spikes import SpikeEvents
+from .utils import WindowType, design_filter, lockstep_deconvolution
 
 
 def modified_hough_spiker(
@@ -19,7 +34,12 @@ def modified_hough_spiker(
     pass_zero: bool | str = True,
     scale: bool = True,
     fs: float | None = None,
-) -> np.ndarray:
+    backend: str | None = None,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    copy: bool = True,
+    dtype: type | np.dtype | str | None = None,
+) -> tuple[np.ndarray | SpikeEvents, np.ndarray, np.ndarray, np.ndarray]:
     """
     Perform Modified Hough Spiker Algorithm (MHSA) encoding on the input signal.
 
@@ -69,7 +89,10 @@ def modified_hough_spiker(
         >>> encoded_signal.flatten()
         array([0, 0, 1, 1, 0, 0, 1], dtype=int8)
 
-    :param signal: Input signal to encode (1D or 2D: time × features or channels).
+    :param signal: Input signal to encode (1D or 2D: time × features or channels), or a batch of signals (3D:
+                   samples × time × features) encoded in a single pass, every sample with its own shift and
+                   normalization. Every output of a batch gets a leading samples axis (a list of events per
+                   sample with ``output="events"``).
     :type signal: numpy.ndarray
     :param window_length: Length of the FIR filter (number of coefficients).
     :type window_length: int
@@ -77,7 +100,7 @@ def modified_hough_spiker(
                    Scalar or an array of cutoff frequencies (that is, band edges).
     :type cutoff: float | numpy.ndarray
     :param threshold: Threshold factor for spike detection.
-                      Scalar or per-feature sequence.
+                      Scalar or per-feature sequence, or per-sample array (samples, features) for a batch.
     :type threshold: float | int | list[float | int] | numpy.ndarray
     :param width: Transition width for FIR filter design (optional, used with certain window types).
     :type width: int | None
@@ -90,76 +113,281 @@ def modified_hough_spiker(
     :type scale: bool
     :param fs: Sampling frequency (used for physical frequency units in cutoff; optional).
     :type fs: float | None
+    :param backend: Backend running the encoding loop (see :mod:`spikify.backends`). If ``None``, the default
+                    backend is used.
+    :type backend: str | None
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``int8`` array of shape (time, features or channels), or (samples, time, features) for a
+                batch, receiving the dense spike train, e.g. the array of a :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param copy: If ``False`` and the signal is a writable array of type ``dtype``, it is normalized in place instead of
+                 copied, and is overwritten by the encoding.
+    :type copy: bool
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
     :return:
-        - spikes: A numpy array representing the encoded spike train. (values in {0, +1})
-        - fir_bank: Final filter coefficients used, shape (window_length, features or channels).
+        - spikes: A numpy array representing the encoded spike train (values in {0, +1}, ``out`` if given), or its
+          events.
+        - fir_bank: Final filter coefficients used, shape (window_length, features or channels), a read-only view
+          of a single filter shared by all features.
         - shift: Per-feature shift values subtracted to make signal non-negative, shape (features or channels,).
         - norm: Per-feature normalization values used to scale signal to [0, 1], shape (features or channels,).
     :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]
     :raises ValueError: If the input signal is empty or if the threshold dimensions do not match the signal
-                        features or if the window_length is greater than the signal lenght.
+                        features or if the window_length is greater than the signal lenght,
+                        or if the output format is not supported, or if ``out`` is given for events or does not match
+                        the spike train shape or ``dtype``.
 
     """
-    # Check for empty signal
-    if len(signal) == 0:
-        raise ValueError("Signal cannot be empty.")
+    signal, batch = fold_batch(signal)
+    if batch is not None:
+        threshold = fold_parameter(threshold, batch)
+    encoder = ModifiedHoughSpikerEncoder(
+        window_length,
+        cutoff,
+        threshold,
+        width,
+        window_type,
+        pass_zero,
+        scale,
+        fs,
+        backend=backend,
+        output=output,
+        dtype=dtype,
+    )
+    spikes = encoder.fit_transform(signal, out if batch is None else None, copy)
+    spikes = write_output(unfold_batch(spikes, batch), out)
 
-    # Ensure 2D processing (T, F)
-    if signal.ndim == 1:
-        signal = signal.reshape(-1, 1)
+    return (spikes,) + tuple(unfold_batch(value, batch) for value in (encoder.fir_bank, encoder.shift, encoder.norm))
 
-    T, F = signal.shape
 
-    # Handle window_length
-    if window_length > T:
-        raise ValueError("window_length must be less than the number of time steps in the signal.")
+class ModifiedHoughSpikerEncoder(Encoder):
+    """
+    Modified Hough Spiker Algorithm (MHSA) encoder prepared once and reused across signals.
+
+    :meth:`fit` computes the per-feature thresholds, the shift and the normalization bringing the signal to [0, 1],
+    and designs the filter bank, as :func:`modified_hough_spiker` does. :meth:`transform` then encodes any signal
+    with them, without designing the filter again.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.encoders.temporal.deconvolution import ModifiedHoughSpikerEncoder
+        encoder = ModifiedHoughSpikerEncoder(window_length=3, cutoff=0.1, threshold=0.3)
+        encoder = encoder.fit(np.array([0, 1.5, 2, 3, 4, 5, 6, 3, 2, 1, 0]))
+        encoded_signal = encoder.transform(np.array([0, 1.2, 2, 3.5, 4, 5, 6.5, 3, 2, 1, 0]))
+
+    .. doctest::
+        :hide:
+
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.deconvolution import ModifiedHoughSpikerEncoder
+        >>> encoder = ModifiedHoughSpikerEncoder(window_length=3, cutoff=0.1, threshold=0.3)
+        >>> encoder = encoder.fit(np.array([0, 1.5, 2, 3, 4, 5, 6, 3, 2, 1, 0]))
+        >>> encoder.transform(np.array([0, 1.2, 2, 3.5, 4, 5, 6.5, 3, 2, 1, 0])).flatten()
+        array([0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1], dtype=int8)
+
+    :param window_length: Length of the FIR filter (number of coefficients).
+    :type window_length: int
+    :param cutoff: Cutoff frequency(ies) for the FIR filter design (normalized 0 to 1, where 1 = Nyquist).
+    :type cutoff: float | numpy.ndarray
+    :param threshold: Threshold for spike detection; scalar or per-feature sequence.
+    :type threshold: float | int | list[float | int] | numpy.ndarray
+    :param width: Transition width for FIR filter design (optional, used with certain window types).
+    :type width: int | None
+    :param window_type: Window function for FIR filter design (e.g., 'hann', 'hamming', 'blackman', 'boxcar').
+    :type window_type: str
+    :param pass_zero: Whether the filter should be low-pass (True) or high-pass (False/'highpass').
+    :type pass_zero: bool | str
+    :param scale: Set to True to scale the coefficients so that the frequency response is exactly unity at a
+                  certain frequency.
+    :type scale: bool
+    :param fs: Sampling frequency (used for physical frequency units in cutoff; optional).
+    :type fs: float | None
+    :param backend: Backend running the encoding loop (see :mod:`spikify.backends`). If ``None``, the default
+                    backend is used.
+    :type backend: str | None
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param dtype: Floating point type of the fitted parameters and of the computation (see
+                  :mod:`spikify.backends.precision`), ``"auto"`` to follow the calibration signal. If ``None``, the
+                  default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :raises ValueError: If the output format is not supported.
+
+    """
+
+    _feature_parameters = ("thresholds", "fir_bank", "shift", "norm")
+
+    def __init__(
+        self,
+        window_length: int,
+        cutoff: float | np.ndarray,
+        threshold: float | int | list[float, int] | np.ndarray,
+        width: int | None = None,
+        window_type: WindowType = "hann",
+        pass_zero: bool | str = True,
+        scale: bool = True,
+        fs: float | None = None,
+        backend: str | None = None,
+        output: Literal["dense", "events"] = "dense",
+        dtype: type | np.dtype | str | None = None,
+    ):
+        """Constructor method."""
+        check_output(output)
+        super().__init__()
+        self.window_length = window_length
+        self.cutoff = cutoff
+        self.threshold = threshold
+        self.width = width
+        self.window_type = window_type
+        self.pass_zero = pass_zero
+        self.scale = scale
+        self.fs = fs
+        self.backend = backend
+        self.output = output
+        self.dtype = dtype
+        self.thresholds = None
+        self.fir_bank = None
+        self.shift = None
+        self.norm = None
+
+    def fit(self, signal: np.ndarray) -> "ModifiedHoughSpikerEncoder":
+        """
+        Compute the thresholds, the shift, the normalization and the filter bank from a calibration signal.
+
+        :param signal: Calibration signal (1D or 2D: time × features or channels).
+        :type signal: numpy.ndarray
+        :return: The encoder itself.
+        :rtype: ModifiedHoughSpikerEncoder
+        :raises ValueError: If the signal is empty or if the threshold dimensions do not match the signal features.
+
+        """
+        signal = self._as_float_2d(signal)
+        F = signal.shape[1]
+
+        self.thresholds = broadcast_threshold(self.threshold, F, dtype=signal.dtype)
+        # Generate filter coefficient values according to their window length, shared by all features
+        fir = design_filter(
+            self.window_length, self.cutoff, self.width, self.window_type, self.pass_zero, self.scale, self.fs
+        )
+        self.fir_bank = np.broadcast_to(fir.astype(signal.dtype, copy=False)[:, None], (self.window_length, F))
 
-    # Handle threshold
-    if np.isscalar(threshold):
-        thresholds = np.full(F, float(threshold))
-    else:
-        thresholds = np.asarray(threshold, dtype=float)
-        if thresholds.ndim != 1:
-            raise ValueError("Threshold must be a scalar or a 1D sequence of numbers.")
-        if thresholds.size != F:
-            raise ValueError("Threshold must match the number of features in the signal.")
+        # Normalize signal if signal has negative values, then scale it to [0, 1]
+        self.shift, norm = normalization_range(signal)
+        norm[norm <= 1] = 1  # only normalize if max is greater than 1
+        self.norm = norm
 
-    spikes = np.zeros_like(signal, dtype=np.int8)
+        self.num_features = F
+        return self
 
-    # Generate filter coefficient values according to their window length for each feature
-    fir = firwin(window_length, cutoff, width=width, window=window_type, pass_zero=pass_zero, scale=scale, fs=fs)
+    def _transform(
+        self, signal: np.ndarray, out: np.ndarray | None = None, copy: bool = True
+    ) -> np.ndarray | SpikeEvents:
+        """
+        Encode a signal with the fitted thresholds, shift, normalization and filter bank. Samples outside of the
+        range seen by :meth:`fit` are clipped to [0, 1] after normalization.
 
-    # Stack the same filter for all features in case we need to modify coeffiecient due to signal
-    # amplitude for certain features
-    fir_bank = np.stack([fir] * F, axis=0).T
+        :param signal: Input signal to encode, shape (time, features).
+        :type signal: numpy.ndarray
+        :param out: Preallocated ``int8`` array receiving the dense spike train.
+        :type out: numpy.ndarray | None
+        :param copy: If ``False``, the signal may be normalized in place.
+        :type copy: bool
+        :return: The encoded spike train (values in {0, +1}), shape (time, features or channels) (``out`` if given),
+                 or its events.
+        :rtype: numpy.ndarray | SpikeEvents
+        :raises ValueError: If the window_length is greater than the signal length.
 
-    signal_copy = np.copy(np.array(signal, dtype=np.float64))
+        """
 
-    # Normalize signal if signal has negative values
-    shift = signal_copy.min(axis=0)
-    shift[shift > 0] = 0  # only shift if negative values are present
-    signal_copy -= shift
+        # Handle window_length
+        if self.window_length > signal.shape[0]:
+            raise ValueError("window_length must be less than the number of time steps in the signal.")
 
-    norm = signal_copy.max(axis=0)
-    norm[norm <= 1] = 1  # only normalize if max is greater than 1
-    signal_copy /= norm
+        signal_copy = working_signal(signal, copy, self.shift.dtype)
+        signal_copy -= self.shift
+        signal_copy /= self.norm
+        np.clip(signal_copy, 0, 1, out=signal_copy)
 
-    for f in range(F):
-        for t in range(0, T):
+        kernel = get_kernel("modified_hough_spiker", self.backend)
+        spikes = kernel(signal_copy, self.fir_bank, self.thresholds, out=spike_buffer(out, signal.shape, clear=False))
+
+        if self.output == "events":
+            spikes = SpikeEvents.from_dense(spikes)
+
+        return spikes if out is None else out
+
+
+@register_kernel("numpy", "modified_hough_spiker")
+def _modified_hough_spiker_kernel(
+    signal: np.ndarray,
+    fir_bank: np.ndarray,
+    thresholds: np.ndarray,
+    block: int | None = None,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Run the Modified Hough Spiker detection on every feature of the signal at once.
+
+    The positions whose window fits in the signal are processed by :func:`.lockstep_deconvolution`. The last
+    ``window_length - 1`` positions, whose window is truncated by the end of the signal, are then processed one at a
+    time for all features together. The errors are computed in a scratch buffer reused across evaluations and summed
+    exactly as in the per-feature loop, so the spikes are bit-identical to it.
+
+    :param signal: Signal to encode scaled to [0, 1], shape (time, features). It is modified in place, as the filter
+                   is subtracted at every detected spike.
+    :type signal: numpy.ndarray
+    :param fir_bank: Per-feature filter coefficients, shape (window_length, features).
+    :type fir_bank: numpy.ndarray
+    :param thresholds: Per-feature thresholds, shape (features,).
+    :type thresholds: numpy.ndarray
+    :param block: Number of window positions evaluated at once. By default it is chosen from the number of features
+                  and the window length.
+    :type block: int | None
+    :param out: Preallocated ``int8`` array of shape (time, features) receiving the spike train.
+    :type out: numpy.ndarray | None
+    :return: Encoded spike train, shape (time, features) (``out`` if given).
+    :rtype: numpy.ndarray
+
+    """
+    T, F = signal.shape
+    window_length = fir_bank.shape[0]
+    thresholds = np.asarray(thresholds)
+    column = thresholds[:, None]
+    scratch = np.empty(0, dtype=np.result_type(signal, fir_bank))
 
-            # Determine the end index for the current window
-            end_index = min(t + window_length, T)
+    def errors(filters: np.ndarray, windows: np.ndarray) -> np.ndarray:
+        nonlocal scratch
+        if scratch.size < windows.size:
+            scratch = np.empty(windows.size, dtype=scratch.dtype)
+        # Contiguous windows are summed exactly as a single window
+        difference = scratch[: windows.size].reshape(windows.shape)
+        np.subtract(filters, windows, out=difference)
+        return np.add.reduce(np.maximum(difference, 0, out=difference), axis=-1)
 
-            # Extract the relevant segment of the signal and the corresponding filter window
-            signal_segment = signal_copy[t:end_index, f]
-            filter_segment = fir_bank[: end_index - t, f]
+    def condition(windows: np.ndarray, filters: np.ndarray, features: np.ndarray | slice) -> np.ndarray:
+        return errors(filters, windows) <= column[features]
 
-            # Calculate the error for this segment
-            error = np.sum(np.maximum(filter_segment - signal_segment, 0))
+    # Full windows
+    spikes = lockstep_deconvolution(signal, fir_bank, condition, block, out)
 
-            # If the cumulative error is within the threshold, a spike is detected
-            if error <= thresholds[f]:
-                signal_copy[t:end_index, f] -= filter_segment
-                spikes[t, f] = 1
+    # Windows truncated at the end of the signal
+    start = max(T - window_length + 1, 0)
+    tail = np.ascontiguousarray(signal[start:].T)
+    filters = np.ascontiguousarray(fir_bank.T)
+    for t in range(start, T):
+        length = T - t
+        features = np.flatnonzero(errors(filters[:, :length], tail[:, t - start :]) <= thresholds)
+        if features.size:
+            spikes[t, features] = 1
+            tail[features, t - start :] -= filters[features, :length]
+    signal[start:] = tail.T
 
-    return spikes, fir_bank, shift, norm
+    return spikes
@@ -1,4 +1,9 @@
-from typing import Literal
+from functools import lru_cache
+from typing import Callable, Literal
+
+import numpy as np
+from scipy.signal import firwin
+from spikify.encoders.utils import spike_buffer
 
 WindowType = Literal[
     "barthann",
@@ -49,3 +54,219 @@ WindowType = Literal[
     "tukey",
     "tuk",
 ]
+
+
+def design_filter(
+    window_length: int,
+    cutoff: float | np.ndarray,
+    width: int | None = None,
+    window_type: WindowType = "hann",
+    pass_zero: bool | str = True,
+    scale: bool = True,
+    fs: float | None = None,
+) -> np.ndarray:
+    """
+    Design the FIR filter of the deconvolution encoders with :func:`scipy.signal.firwin`, memoizing the result.
+
+    Encoding many short windows with the same parameters designs the same filter over and over, so the last designed
+    filters are kept in a bounded LRU cache. The returned array is shared between calls, hence read-only.
+
+    :param window_length: Length of the filter (number of coefficients).
+    :type window_length: int
+    :param cutoff: Cutoff frequency or frequencies of the filter.
+    :type cutoff: float | numpy.ndarray
+    :param width: Approximate width of the transition region, if not ``None``.
+    :type width: int | None
+    :param window_type: Window used to design the filter.
+    :type window_type: WindowType
+    :param pass_zero: Whether the gain at frequency 0 is 1, or the type of filter.
+    :type pass_zero: bool | str
+    :param scale: Whether to scale the coefficients so that the frequency response is exactly unity at a certain
+                  frequency.
+    :type scale: bool
+    :param fs: The sampling frequency of the signal.
+    :type fs: float | None
+    :return: Read-only filter coefficients, shape (window_length,).
+    :rtype: numpy.ndarray
+
+    """
+    if not np.isscalar(cutoff):
+        # Arrays are not hashable: key the cache on their values
+        cutoff = tuple(np.asarray(cutoff, dtype=float).ravel().tolist())
+    return _design_filter(window_length, cutoff, width, window_type, pass_zero, scale, fs)
+
+
+@lru_cache(maxsize=64)
+def _design_filter(
+    window_length: int,
+    cutoff: float | tuple[float, ...],
+    width: int | None,
+    window_type: WindowType,
+    pass_zero: bool | str,
+    scale: bool,
+    fs: float | None,
+) -> np.ndarray:
+    if isinstance(cutoff, tuple):
+        cutoff = np.array(cutoff)
+    fir = firwin(window_length, cutoff, width=width, window=window_type, pass_zero=pass_zero, scale=scale, fs=fs)
+    fir.flags.writeable = False
+    return fir
+
+
+# Fewest features evaluated together at every window position, fewer ones are walked one at a time
+_LOCKSTEP_FEATURES = 8
+
+# Number of window positions evaluated after a spike, doubled while none of them spikes
+_FIRST_EVALUATION = 8
+
+
+def lockstep_deconvolution(
+    signal: np.ndarray,
+    fir_bank: np.ndarray,
+    condition: Callable[[np.ndarray, np.ndarray, np.ndarray | slice], np.ndarray],
+    block: int | None = None,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Run a deconvolution encoding loop on every feature of the signal at once.
+
+    At every window position, a feature spikes if ``condition`` holds for its window, and the filter is then
+    subtracted from the window. The signal is processed in blocks of window positions. The condition of every position
+    of the block is first evaluated for all features at once, then the block is walked in time. A spike only changes
+    the ``window_length`` samples the filter is subtracted from, so only the features that fired during the last
+    ``window_length - 1`` positions are evaluated again, one position at a time, while the walk jumps directly to the
+    next spiking position when no feature is affected. With fewer than ``_LOCKSTEP_FEATURES`` features, every feature
+    is walked on its own instead (see :func:`_walk_deconvolution`), which costs NumPy calls per spike rather than per
+    position. The spikes are identical to the per-feature loop as long as ``condition`` evaluates every window
+    independently.
+
+    :param signal: Signal to encode, shape (time, features). It is modified in place, as the filter is subtracted at
+                   every detected spike.
+    :type signal: numpy.ndarray
+    :param fir_bank: Per-feature filter coefficients, shape (window_length, features).
+    :type fir_bank: numpy.ndarray
+    :param condition: Spike condition, called as ``condition(windows, filters, features)`` with ``windows`` of shape
+                      (selected features, positions, window_length), the windows of consecutive positions of every
+                      feature, each window being contiguous, ``filters`` of shape (selected features, 1,
+                      window_length) and ``features`` the index of the selected features (to select per-feature
+                      parameters). It returns a boolean array of shape (selected features, positions).
+    :type condition: Callable[[numpy.ndarray, numpy.ndarray, numpy.ndarray | slice], numpy.ndarray]
+    :param block: Number of window positions evaluated at once. By default it is chosen from the number of features
+                  and the window length.
+    :type block: int | None
+    :param out: Preallocated ``int8`` array of shape (time, features) receiving the spike train.
+    :type out: numpy.ndarray | None
+    :return: Encoded spike train, shape (time, features) (``out`` if given).
+    :rtype: numpy.ndarray
+
+    """
+    T, F = signal.shape
+    window_length = fir_bank.shape[0]
+    spikes = spike_buffer(out, (T, F))
+
+    if block is None:
+        block = max(window_length, (1 << 20) // max(F * window_length, 1))
+
+    # Feature-major copies, so that every window is contiguous
+    filters = np.ascontiguousarray(fir_bank.T)[:, None]
+
+    if F < _LOCKSTEP_FEATURES:
+        for f in range(F):
+            work = np.ascontiguousarray(signal[:, f])
+            _walk_deconvolution(work, filters[f : f + 1], condition, slice(f, f + 1), block, spikes[:, f])
+            signal[:, f] = work
+        return spikes
+
+    for start in range(0, T - window_length + 1, block):
+        stop = min(start + block, T - window_length + 1)
+        work = np.ascontiguousarray(signal[start : stop + window_length - 1].T)
+        windows = np.lib.stride_tricks.sliding_window_view(work, window_length, axis=1)
+        fires = condition(windows, filters, slice(None))
+        pending = fires.any(axis=0)
+
+        # A feature that fired at t has to be evaluated again at every position before affected[f]
+        affected = np.zeros(F, dtype=np.int64)
+        last_affected = start
+
+        t = start
+        while t < stop:
+            i = t - start
+            if last_affected > t:
+                stale = np.flatnonzero(affected > t)
+                if stale.size == F:
+                    stale = slice(None)
+                fires[stale, i] = condition(windows[stale, i : i + 1], filters[stale], stale)[:, 0]
+            elif not pending[i]:
+                # No feature is affected by a previous spike: jump to the next spiking position
+                offset = int(np.argmax(pending[i:]))
+                if not pending[i + offset]:
+                    break
+                t += offset
+                i += offset
+
+            features = np.flatnonzero(fires[:, i])
+            if features.size:
+                if features.size == F:
+                    features = slice(None)
+                spikes[t, features] = 1
+                work[features, i : i + window_length] -= filters[features, 0]  # remove the filter from the signal
+                affected[features] = t + window_length
+                last_affected = t + window_length
+            t += 1
+
+        signal[start : stop + window_length - 1] = work.T
+
+    return spikes
+
+
+def _walk_deconvolution(
+    signal: np.ndarray,
+    filters: np.ndarray,
+    condition: Callable[[np.ndarray, np.ndarray, np.ndarray | slice], np.ndarray],
+    features: slice,
+    block: int,
+    spikes: np.ndarray,
+) -> None:
+    """
+    Run a deconvolution encoding loop on a single feature, jumping from spike to spike.
+
+    The windows following the last spike are evaluated a batch at a time, starting with ``_FIRST_EVALUATION``
+    positions and doubling the batch while none of them spikes, up to ``block`` positions. The walk then jumps to the
+    first spiking position, where the filter is subtracted, and the positions after it are evaluated again. Every
+    evaluation sees all the previous spikes, so the spikes are identical to the per-feature loop.
+
+    :param signal: Contiguous signal of the feature, shape (time,). It is modified in place, as the filter is
+                   subtracted at every detected spike.
+    :type signal: numpy.ndarray
+    :param filters: Filter coefficients of the feature, shape (1, 1, window_length).
+    :type filters: numpy.ndarray
+    :param condition: Spike condition (see :func:`lockstep_deconvolution`).
+    :type condition: Callable[[numpy.ndarray, numpy.ndarray, numpy.ndarray | slice], numpy.ndarray]
+    :param features: Index of the feature, to select its parameters in ``condition``.
+    :type features: slice
+    :param block: Largest number of window positions evaluated at once.
+    :type block: int
+    :param spikes: Array receiving the spikes of the feature, shape (time,).
+    :type spikes: numpy.ndarray
+
+    """
+    window_length = filters.shape[-1]
+    positions = signal.shape[0] - window_length + 1
+    windows = np.lib.stride_tricks.sliding_window_view(signal, window_length)[None]
+    kernel = filters[0, 0]
+
+    t = 0
+    size = _FIRST_EVALUATION
+    while t < positions:
+        fires = condition(windows[:, t : t + size], filters, features)
+        offset = int(fires.argmax())
+        if not fires.item(offset):
+            t += size
+            size = min(2 * size, block)
+            continue
+
+        t += offset
+        spikes[t] = 1
+        signal[t : t + window_length] -= kernel  # remove the filter from the signal
+        t += 1
+        size = _FIRST_EVALUATION
@@ -1,6 +1,6 @@
 """GlobalReferenced package."""
 
-from .phase_encoding_algorithm import phase
-from .time_to_first_spike_algorithm import time_to_first_spike
+from .phase_encoding_algorithm import PhaseEncoder, phase
+from .time_to_first_spike_algorithm import TimeToFirstSpikeEncoder, time_to_first_spike
 
-__all__ = ["phase", "time_to_first_spike"]
+__all__ = ["phase", "PhaseEncoder", "time_to_first_spike", "TimeToFirstSpikeEncoder"]
@@ -4,10 +4,29 @@
     <h2>Phase Encoding Algorithm</h2>
 """
 
-import numpy as np
-
+from functools import lru_cache
+from typing import Literal
 
-def phase(signal: np.ndarray, num_bits: int) -> np.ndarray:
+import numpy as np
+from spikify.encoders.base import Encoder
+from spikify.encoders.utils import (
+    check_output,
+    fold_batch,
+    normalization_range,
+    spike_buffer,
+    unfold_batch,
+    write_output,
+)
+from spikify.spikes import SpikeEvents
+
+
+def phase(
+    signal: np.ndarray,
+    num_bits: int,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    dtype: type | np.dtype | str | None = None,
+) -> np.ndarray | SpikeEvents:
     """
     Perform Phase Encoding (PE) on the input signal.
 
@@ -44,75 +63,213 @@ def phase(signal: np.ndarray, num_bits: int) -> np.ndarray:
         >>> encoded_signal
         array([1, 1, 1, 1, 1, 0, 0, 0], dtype=uint8)
 
-    :param signal: The input signal to be encoded. This should be a numpy ndarray.
+    :param signal: The input signal to be encoded. This should be a numpy ndarray (1D or 2D: time × features, or 3D:
+                   samples × time × features for a batch encoded in a single pass, every sample with its own
+                   scaling). The spike train of a batch gets a leading samples axis (a list of events per sample
+                   with ``output="events"``).
     :type signal: numpy.ndarray
     :param num_bits: The number of bits to use for encoding.
     :type num_bits: int
-    :return: A 1D numpy array representing the phase-encoded spike train.
-    :rtype: numpy.ndarray
-    :raises ValueError: If the input signal is empty or if the number of bits is not appropriate for the signal length.
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``uint8`` array of the shape of the dense spike train, receiving it, e.g. the array of a
+                :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :return: A 1D numpy array representing the phase-encoded spike train (``out`` if given), or its events (shape
+             (time, features) even for a 1D signal).
+    :rtype: numpy.ndarray | SpikeEvents
+    :raises ValueError: If the input signal is empty, if the number of bits is not appropriate for the signal length or
+                        if the output format is not supported, or if ``out`` is given for events or does not match the
+                        spike train shape or ``dtype``.
 
     """
+    signal, batch = fold_batch(signal)
+    spikes = PhaseEncoder(num_bits, output=output, dtype=dtype).fit_transform(signal, out if batch is None else None)
+    return write_output(unfold_batch(spikes, batch), out)
 
-    # Check for invalid inputs
-    if len(signal) == 0:
-        raise ValueError("Signal cannot be empty.")
-
-    # Ensure 2D processing (T, F)
-    if signal.ndim == 1:
-        signal = signal.reshape(-1, 1)
-
-    T, F = signal.shape
 
-    if T % num_bits != 0:
-        raise ValueError(f"The phase_encoding num_bits ({num_bits}) is not a factor of the signal length ({T}).")
-
-    signal_copy = signal.copy()
-
-    # Normalize signal if signal has negative values
-    shift = signal_copy.min(axis=0)
-    shift[shift > 0] = 0  # only shift if negative values are present
-    signal_copy -= shift
-
-    # Compute max amplitude per feature to be used for scaling if max amplitude is grater than 1
-    max_amp = signal_copy.max(axis=0)
-
-    # Find features that require scaling
-    features_to_scale = np.where(max_amp > 1)[0]
+class PhaseEncoder(Encoder):
+    """
+    Phase encoder prepared once and reused across signals.
 
-    for f in features_to_scale:
-        signal_copy[:, f] /= max_amp[f]
+    :meth:`fit` computes the shift and the per-feature scaling bringing the signal to [0, 1], and the per-feature
+    maximum of the bit-interval means used to scale them before the phase mapping, as :func:`phase` does.
+    :meth:`transform` then encodes any signal with them, so that the same intensity always gives the same bits.
 
-    # Compute mean over the signal reshaped to bit-sized chunks
-    interval_bit_mean = np.mean(signal_copy.reshape(T // num_bits, num_bits, F), axis=1)
+    **Code Example:**
 
-    max_amp = interval_bit_mean.max(axis=0)
+    .. code-block:: python
 
-    # Find features that require scaling
-    features_to_scale = np.where(max_amp > 0)[0]
+        import numpy as np
+        from spikify.encoders.temporal.global_referenced import PhaseEncoder
+        encoder = PhaseEncoder(num_bits=2).fit(np.array([0.0, 0.0, 1.0, 1.0]))
+        encoded_signal = encoder.transform(np.array([0.5, 0.5, 1.0, 1.0]))
 
-    for f in features_to_scale:
-        interval_bit_mean[:, f] /= max_amp[f]
+    .. doctest::
+        :hide:
 
-    phase = np.arcsin(interval_bit_mean)
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.global_referenced import PhaseEncoder
+        >>> encoder = PhaseEncoder(num_bits=2).fit(np.array([0.0, 0.0, 1.0, 1.0]))
+        >>> encoder.transform(np.array([0.5, 0.5, 1.0, 1.0]))
+        array([1, 0, 1, 1], dtype=uint8)
 
-    bins = np.linspace(0, np.pi / 2, 2**num_bits + 1)
-    levels = np.searchsorted(bins, phase)
+    :param num_bits: Number of bits used to encode each interval. Must evenly divide the length of the signals.
+    :type num_bits: int
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param dtype: Floating point type of the fitted parameters and of the computation (see
+                  :mod:`spikify.backends.precision`), ``"auto"`` to follow the calibration signal. If ``None``, the
+                  default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :raises ValueError: If the output format is not supported.
 
-    # Adjust levels to avoid out-of-range values
-    levels = np.clip(levels, 0, 2**num_bits - 1)
+    """
 
-    spikes = np.zeros((T, F), dtype=np.uint8)
+    _feature_parameters = ("shift", "norm", "level_norm")
+
+    def __init__(
+        self,
+        num_bits: int,
+        output: Literal["dense", "events"] = "dense",
+        dtype: type | np.dtype | str | None = None,
+    ):
+        """Constructor method."""
+        check_output(output)
+        super().__init__()
+        self.num_bits = num_bits
+        self.output = output
+        self.dtype = dtype
+        self.shift = None
+        self.norm = None
+        self.level_norm = None
+
+    def fit(self, signal: np.ndarray) -> "PhaseEncoder":
+        """
+        Compute the shift, the per-feature scaling and the scaling of the bit-interval means from a calibration
+        signal.
+
+        :param signal: Calibration signal (1D or 2D: time × features or channels).
+        :type signal: numpy.ndarray
+        :return: The encoder itself.
+        :rtype: PhaseEncoder
+        :raises ValueError: If the signal is empty, or if the number of bits does not divide its length.
+
+        """
+        signal = self._as_float_2d(signal)
+
+        # Shift the signal if it has negative values, then scale the features whose amplitude is greater than 1
+        self.shift, norm = normalization_range(signal)
+        norm[norm <= 1] = 1
+        self.norm = norm
+
+        # Scale the bit-interval means of every feature that is not silent to a maximum of 1. The normalization is
+        # linear, so it is applied to the interval means rather than to every sample
+        level_norm = (self._interval_means(signal).max(axis=0) - self.shift) / self.norm
+        level_norm[level_norm <= 0] = 1
+        self.level_norm = level_norm
+
+        self.num_features = signal.shape[1]
+        return self
+
+    def _transform(
+        self, signal: np.ndarray, out: np.ndarray | None = None, copy: bool = True
+    ) -> np.ndarray | SpikeEvents:
+        """
+        Encode a signal with the fitted scalings. Interval means outside of the range seen by :meth:`fit` are clipped
+        to [0, 1] after normalization.
+
+        :param signal: Input signal to encode, shape (time, features).
+        :type signal: numpy.ndarray
+        :param out: Preallocated array receiving the dense spike train.
+        :type out: numpy.ndarray | None
+        :param copy: Unused, the signal is never modified.
+        :type copy: bool
+        :return: A numpy array representing the phase-encoded spike train (``out`` if given), or its events (shape
+                 (time, features) even for a 1D signal).
+        :rtype: numpy.ndarray | SpikeEvents
+        :raises ValueError: If the number of bits does not divide the signal length.
+
+        """
+        num_bits = self.num_bits
+        T, F = signal.shape
+
+        # The normalization is linear, so it is applied to the interval means rather than to every sample
+        interval_bit_mean = self._interval_means(np.asarray(signal, dtype=self.shift.dtype))
+        interval_bit_mean -= self.shift
+        interval_bit_mean /= self.norm * self.level_norm
+        np.clip(interval_bit_mean, 0, 1, out=interval_bit_mean)
+
+        # Quantize the phase arcsin(mean) of every interval, comparing the means with the sines of the phase levels
+        levels = np.searchsorted(_phase_thresholds(num_bits), interval_bit_mean)
+
+        # Adjust levels to avoid out-of-range values
+        np.minimum(levels, 2**num_bits - 1, out=levels)
+
+        if self.output == "events":
+            # Collect the set bits one bit position at a time, from the most significant one
+            times, channels = [], []
+            for bit in range(num_bits):
+                interval, feature = np.nonzero((levels >> (num_bits - 1 - bit)) & 1)
+                times.append(interval * num_bits + bit)
+                channels.append(feature)
+            times, channels = np.concatenate(times), np.concatenate(channels)
+            return SpikeEvents(times, channels, np.ones(times.size, dtype=np.uint8), (T, F))
+
+        # A single feature is returned as a 1D spike train
+        spikes = spike_buffer(out, (T, F) if F > 1 else (T,), clear=False, dtype=np.uint8)
+
+        # Shift and extract bits
+        # Each integer is represented in binary using `num_bits` bits.
+        # The signal (levels) is right-shifted bit-by-bit to bring each bit position to the least significant bit,
+        # then masked with &1 to extract it (1 if set, 0 otherwise).
+        bits = spikes.reshape(T // num_bits, num_bits, F)
+        for bit in range(num_bits):
+            bits[:, bit] = (levels >> (num_bits - 1 - bit)) & 1
+
+        return spikes
+
+    def _interval_means(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Compute the mean of every bit interval of a normalized signal.
+
+        :param signal: Normalized signal, shape (time, features).
+        :type signal: numpy.ndarray
+        :return: Mean of every interval of ``num_bits`` samples, shape (time // num_bits, features).
+        :rtype: numpy.ndarray
+        :raises ValueError: If the number of bits does not divide the signal length.
+
+        """
+        T, F = signal.shape
+        if T % self.num_bits != 0:
+            raise ValueError(
+                f"The phase_encoding num_bits ({self.num_bits}) is not a factor of the signal length ({T})."
+            )
+
+        # Compute mean over the signal reshaped to bit-sized chunks
+        return np.mean(signal.reshape(T // self.num_bits, self.num_bits, F), axis=1)
+
+
+@lru_cache(maxsize=64)
+def _phase_thresholds(num_bits: int) -> np.ndarray:
+    """
+    Thresholds of the phase levels, on the interval means.
 
-    # Shift and extract bits
-    # Each integer is represented in binary using `num_bits` bits.
-    # The signal (levels) is right-shifted bit-by-bit to bring each bit position to the least significant bit,
-    # then masked with &1 to extract it (1 if set, 0 otherwise).
-    bits_arr = ((levels[..., None] >> np.arange(num_bits - 1, -1, -1)) & 1).astype(np.uint8)
-    spikes = bits_arr.transpose(0, 2, 1).reshape(T, F)
+    The level of an interval of mean ``x`` is the number of bins of ``linspace(0, pi / 2, 2**num_bits + 1)`` below its
+    phase ``arcsin(x)``, that is the number of thresholds ``sin(bin)`` below ``x``. Comparing the means with the
+    thresholds avoids evaluating the arcsine of every mean.
 
-    # Flatten if input was 1D
-    if F == 1:
-        spikes = spikes.flatten()
+    :param num_bits: Number of bits of the phase levels.
+    :type num_bits: int
+    :return: The thresholds, in increasing order, shape (2**num_bits + 1,).
+    :rtype: numpy.ndarray
 
-    return spikes
+    """
+    thresholds = np.sin(np.linspace(0, np.pi / 2, 2**num_bits + 1))
+    thresholds.flags.writeable = False
+    return thresholds
@@ -4,10 +4,31 @@
     <h2>Time To First Spike Algorithm</h2>
 """
 
-import numpy as np
-
+from functools import lru_cache
+from typing import Literal
 
-def time_to_first_spike(signal: np.ndarray, interval_length: int) -> np.ndarray:
+import numpy as np
+from spikify.encoders.base import Encoder
+from spikify.encoders.utils import (
+    check_output,
+    fold_batch,
+    normalization_range,
+    spike_buffer,
+    unfold_batch,
+    working_signal,
+    write_output,
+)
+from spikify.spikes import SpikeEvents
+
+
+def time_to_first_spike(
+    signal: np.ndarray,
+    interval_length: int,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    copy: bool = True,
+    dtype: type | np.dtype | str | None = None,
+) -> np.ndarray | SpikeEvents:
     """
     Perform Time To First Spike (TTFS) encoding on the input signal.
 
@@ -48,65 +69,187 @@ def time_to_first_spike(signal: np.ndarray, interval_length: int) -> np.ndarray:
         >>> encoded_signal
         array([0, 1, 0, 0, 0, 1, 0, 0], dtype=int8)
 
-    :param signal: Input signal to encode (1D or 2D: timestamps × features).
+    :param signal: Input signal to encode (1D or 2D: timestamps × features), or a batch of signals (3D: samples ×
+                   timestamps × features) encoded in a single pass, every sample with its own normalization. The
+                   spike train of a batch gets a leading samples axis (a list of events per sample with
+                   ``output="events"``).
     :type signal: numpy.ndarray
     :param interval_length: Length of each time window (block) for latency mapping.
                             Must evenly divide the signal length. Larger values give
                             coarser temporal resolution but allow longer latency range.
     :type interval_length: int
-    :return: A numpy array representing the encoded spike train.
-    :rtype: numpy.ndarray
-    :raises ValueError: If signal is empty or interval_length does not divide signal length.
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``int8`` array of the shape of the dense spike train, receiving it, e.g. the array of a
+                :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param copy: If ``False`` and the signal is a writable array of type ``dtype``, it is normalized in place instead of
+                 copied, and holds the normalized signal afterwards.
+    :type copy: bool
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :return: A numpy array representing the encoded spike train (``out`` if given), or its events (shape (time,
+             features) even for a 1D signal).
+    :rtype: numpy.ndarray | SpikeEvents
+    :raises ValueError: If signal is empty, interval_length does not divide signal length or the output format is not
+                        supported, or if ``out`` is given for events or does not match the spike train shape or
+                        ``dtype``.
 
     """
+    signal, batch = fold_batch(signal)
+    encoder = TimeToFirstSpikeEncoder(interval_length, output=output, dtype=dtype)
+    spikes = encoder.fit_transform(signal, out if batch is None else None, copy)
+    return write_output(unfold_batch(spikes, batch), out)
 
-    # Check for empty signal
-    if signal.shape[0] == 0:
-        raise ValueError("Signal cannot be empty.")
-
-    # Ensure 2D processing (T, F)
-    if signal.ndim == 1:
-        signal = signal.reshape(-1, 1)
 
-    T, F = signal.shape
-
-    if T % interval_length != 0:
-        raise ValueError(f"The interval_length ({interval_length}) is not a factor of the signal length ({T}).")
+class TimeToFirstSpikeEncoder(Encoder):
+    """
+    Time To First Spike (TTFS) encoder prepared once and reused across signals.
 
-    signal_copy = signal.copy()
+    :meth:`fit` computes the shift and the per-feature scaling bringing the signal to [0, 1], as
+    :func:`time_to_first_spike` does. :meth:`transform` then encodes any signal with them, so that the same intensity
+    always gives the same latency.
 
-    # Normalize signal if signal has negative values
-    shift = signal_copy.min(axis=0)
-    shift[shift > 0] = 0  # only shift if negative values are present
-    signal_copy -= shift
+    **Code Example:**
 
-    # Compute max amplitude per feature to be used for scaling if max amplitude is grater than 1
-    max_amp = signal_copy.max(axis=0)
+    .. code-block:: python
 
-    # Find features that require scaling
-    features_to_scale = np.where(max_amp > 1)[0]
+        import numpy as np
+        from spikify.encoders.temporal.global_referenced import TimeToFirstSpikeEncoder
+        encoder = TimeToFirstSpikeEncoder(interval_length=4).fit(np.array([0.0, 4.0]))
+        encoded_signal = encoder.transform(np.array([4.0, 4.0, 4.0, 4.0, 1.0, 1.0, 1.0, 1.0]))
 
-    for f in features_to_scale:
-        signal_copy[:, f] /= max_amp[f]
+    .. doctest::
+        :hide:
 
-    # Compute mean over the signal reshaped to interval-sized chunks
-    signal_copy = np.mean(signal_copy.reshape(T // interval_length, interval_length, F), axis=1)
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.global_referenced import TimeToFirstSpikeEncoder
+        >>> encoder = TimeToFirstSpikeEncoder(interval_length=4).fit(np.array([0.0, 4.0]))
+        >>> encoder.transform(np.array([4.0, 4.0, 4.0, 4.0, 1.0, 1.0, 1.0, 1.0]))
+        array([1, 0, 0, 0, 0, 1, 0, 0], dtype=int8)
 
-    intensity = np.full_like(signal_copy, 2.0)
-    mask = signal_copy > 0.0
-    intensity[mask] = 0.1 * np.log(1 / signal_copy[mask])
+    :param interval_length: Size of the interval. Must evenly divide the length of the signals.
+    :type interval_length: int
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param dtype: Floating point type of the fitted parameters and of the computation (see
+                  :mod:`spikify.backends.precision`), ``"auto"`` to follow the calibration signal. If ``None``, the
+                  default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :raises ValueError: If the output format is not supported.
 
-    bins = np.linspace(0, 1, interval_length)
-    levels = np.searchsorted(bins, intensity)
+    """
 
-    spikes = np.zeros((T // interval_length, interval_length, F), dtype=np.int8)
-    for f in range(F):
-        spikes[np.arange(T // interval_length), np.clip(levels[:, f], 0, interval_length - 1), f] = 1
+    _feature_parameters = ("shift", "norm")
+
+    def __init__(
+        self,
+        interval_length: int,
+        output: Literal["dense", "events"] = "dense",
+        dtype: type | np.dtype | str | None = None,
+    ):
+        """Constructor method."""
+        check_output(output)
+        super().__init__()
+        self.interval_length = interval_length
+        self.output = output
+        self.dtype = dtype
+        self.shift = None
+        self.norm = None
+
+    def fit(self, signal: np.ndarray) -> "TimeToFirstSpikeEncoder":
+        """
+        Compute the shift and the per-feature scaling from a calibration signal.
+
+        :param signal: Calibration signal (1D or 2D: time × features or channels).
+        :type signal: numpy.ndarray
+        :return: The encoder itself.
+        :rtype: TimeToFirstSpikeEncoder
+        :raises ValueError: If the signal is empty.
+
+        """
+        signal = self._as_float_2d(signal)
+
+        # Shift the signal if it has negative values, then scale the features whose amplitude is greater than 1
+        self.shift, norm = normalization_range(signal)
+        norm[norm <= 1] = 1
+        self.norm = norm
+
+        self.num_features = signal.shape[1]
+        return self
+
+    def _transform(
+        self, signal: np.ndarray, out: np.ndarray | None = None, copy: bool = True
+    ) -> np.ndarray | SpikeEvents:
+        """
+        Encode a signal with the fitted shift and scaling. Samples outside of the range seen by :meth:`fit` are
+        clipped to [0, 1] after normalization.
+
+        :param signal: Input signal to encode, shape (time, features).
+        :type signal: numpy.ndarray
+        :param out: Preallocated array receiving the dense spike train.
+        :type out: numpy.ndarray | None
+        :param copy: If ``False``, the signal may be normalized in place.
+        :type copy: bool
+        :return: A numpy array representing the encoded spike train (``out`` if given), or its events (shape (time,
+                 features) even for a 1D signal).
+        :rtype: numpy.ndarray | SpikeEvents
+        :raises ValueError: If interval_length does not divide the signal length.
+
+        """
+        interval_length = self.interval_length
+        T, F = signal.shape
+
+        if T % interval_length != 0:
+            raise ValueError(f"The interval_length ({interval_length}) is not a factor of the signal length ({T}).")
+
+        signal_copy = working_signal(signal, copy, self.shift.dtype)
+        signal_copy -= self.shift
+        signal_copy /= self.norm
+        np.clip(signal_copy, 0, 1, out=signal_copy)
+
+        # Compute mean over the signal reshaped to interval-sized chunks
+        signal_copy = np.mean(signal_copy.reshape(T // interval_length, interval_length, F), axis=1)
+
+        # Latency of every interval: number of thresholds above its mean intensity, the last timestep for the
+        # intensities below all of them
+        thresholds = _latency_thresholds(interval_length)
+        levels = interval_length - np.searchsorted(thresholds, signal_copy, side="right")
+        np.minimum(levels, interval_length - 1, out=levels)
+
+        if self.output == "events":
+            # Exactly one spike per interval and feature
+            spike_times = np.arange(T // interval_length)[:, None] * interval_length
+            spike_times = spike_times + levels
+            channels = np.broadcast_to(np.arange(F), spike_times.shape)
+            return SpikeEvents(spike_times.ravel(), channels.ravel(), np.ones(spike_times.size, dtype=np.int8), (T, F))
+
+        # A single feature is returned as a 1D spike train
+        spike_train = spike_buffer(out, (T, F) if F > 1 else (T,))
+        spikes = spike_train.reshape(T // interval_length, interval_length, F)
+        spikes[np.arange(T // interval_length)[:, None], levels, np.arange(F)] = 1
+
+        return spike_train
+
+
+@lru_cache(maxsize=64)
+def _latency_thresholds(interval_length: int) -> np.ndarray:
+    """
+    Intensity thresholds of the latencies of an interval.
 
-    spikes = spikes.reshape(T, F)
+    The latency of an interval of mean intensity ``x`` is the number of bins of ``linspace(0, 1, interval_length)``
+    below ``0.1 * log(1 / x)``, that is the number of thresholds ``exp(-10 * bin)`` above ``x``. Comparing the means
+    with the thresholds avoids evaluating the logarithm of every mean.
 
-    # Flatten if input was 1D
-    if F == 1:
-        spikes = spikes.flatten()
+    :param interval_length: Size of the interval.
+    :type interval_length: int
+    :return: The thresholds, in increasing order, shape (interval_length,).
+    :rtype: numpy.ndarray
 
-    return spikes
+    """
+    thresholds = np.exp(-10 * np.linspace(0, 1, interval_length))[::-1].copy()
+    thresholds.flags.writeable = False
+    return thresholds
@@ -1,5 +1,5 @@
 """Latency package."""
 
-from .burst_coding_algorithm import burst_coding
+from .burst_coding_algorithm import BurstEncoder, burst_coding
 
-__all__ = ["burst_coding"]
+__all__ = ["burst_coding", "BurstEncoder"]
@@ -4,10 +4,33 @@
     <h2>Burst Coding Algorithm</h2>
 """
 
-import numpy as np
-
+from typing import Literal
 
-def burst_coding(signal: np.ndarray, n_max: int, t_min: int, t_max: int, interval_length: int) -> np.ndarray:
+import numpy as np
+from spikify.encoders.base import Encoder
+from spikify.encoders.utils import (
+    check_output,
+    fold_batch,
+    normalization_range,
+    spike_buffer,
+    unfold_batch,
+    working_signal,
+    write_output,
+)
+from spikify.spikes import SpikeEvents
+
+
+def burst_coding(
+    signal: np.ndarray,
+    n_max: int,
+    t_min: int,
+    t_max: int,
+    interval_length: int,
+    output: Literal["dense", "events"] = "dense",
+    out: np.ndarray | None = None,
+    copy: bool = True,
+    dtype: type | np.dtype | str | None = None,
+) -> np.ndarray | SpikeEvents:
     """
     Perform Burst Coding (BC) on the input signal.
 
@@ -61,7 +84,10 @@ def burst_coding(signal: np.ndarray, n_max: int, t_min: int, t_max: int, interva
         >>> encoded_signal
         array([1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0], dtype=int8)
 
-    :param signal: Input signal to encode (1D or 2D: timestamps × features).
+    :param signal: Input signal to encode (1D or 2D: timestamps × features), or a batch of signals (3D: samples ×
+                   timestamps × features) encoded in a single pass, every sample with its own normalization. The
+                   spike train of a batch gets a leading samples axis (a list of events per sample with
+                   ``output="events"``).
     :type signal: numpy.ndarray
     :param n_max: Maximum number of spikes in a burst (for P = 1). Must be ≥ 1.
     :type n_max: int
@@ -73,61 +99,171 @@ def burst_coding(signal: np.ndarray, n_max: int, t_min: int, t_max: int, interva
                             Must divide the signal length evenly and be large enough to fit
                             the longest burst (approximately n_max * (t_min + 1)).
     :type interval_length: int
-    :return: A numpy array representing the encoded spike train.
-    :rtype: numpy.ndarray
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated ``int8`` array of the shape of the dense spike train, receiving it, e.g. the array of a
+                :class:`~spikify.parallel.SharedArray`.
+    :type out: numpy.ndarray | None
+    :param copy: If ``False`` and the signal is a writable array of type ``dtype``, it is normalized in place instead of
+                 copied, and holds the normalized signal afterwards.
+    :type copy: bool
+    :param dtype: Floating point type of the computation (see :mod:`spikify.backends.precision`), ``"auto"`` to
+                  follow the signal. If ``None``, the default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :return: A numpy array representing the encoded spike train (``out`` if given), or its events (shape (time,
+             features) even for a 1D signal).
+    :rtype: numpy.ndarray | SpikeEvents
     :raises ValueError: If signal is empty, interval_length does not divide signal length,
-                        or interval_length is too small for the longest possible burst.
+                        interval_length is too small for the longest possible burst,
+                        or the output format is not supported, or if ``out`` is given for events or does not match the
+                        spike train shape or ``dtype``.
 
     """
-    # Check for empty signal
-    if len(signal) == 0:
-        raise ValueError("Signal cannot be empty.")
-
-    # Ensure 2D processing (T, F)
-    if signal.ndim == 1:
-        signal = signal.reshape(-1, 1)
-
-    T, F = signal.shape
-
-    if T % interval_length != 0:
-        raise ValueError(f"The interval_length ({interval_length}) is not a factor of the signal length ({T}).")
+    signal, batch = fold_batch(signal)
+    encoder = BurstEncoder(n_max, t_min, t_max, interval_length, output=output, dtype=dtype)
+    spikes = encoder.fit_transform(signal, out if batch is None else None, copy)
+    return write_output(unfold_batch(spikes, batch), out)
 
-    signal_copy = signal.copy()
 
-    # signal_copy = np.clip(signal_copy, 0, None)
-    shift = signal_copy.min(axis=0)
-    shift[shift > 0] = 0  # only shift if negative values are present
-    signal_copy -= shift
-
-    # Compute max amplitude per feature to be used for scaling if max amplitude is grater than 1
-    max_amp = signal_copy.max(axis=0)
-
-    # Find features that require scaling
-    features_to_scale = np.where(max_amp > 1)[0]
+class BurstEncoder(Encoder):
+    """
+    Burst Coding (BC) encoder prepared once and reused across signals.
 
-    for f in features_to_scale:
-        signal_copy[:, f] /= max_amp[f]
+    :meth:`fit` computes the shift and the per-feature scaling bringing the signal to [0, 1], as :func:`burst_coding`
+    does. :meth:`transform` then encodes any signal with them, so that every signal is normalized the same way.
 
-    signal_copy = np.mean(signal_copy.reshape(-1, interval_length, F), axis=1)
+    **Code Example:**
 
-    spike_num = np.ceil(signal_copy * n_max).astype(int)
-    ISI = np.ceil(t_max - signal_copy * (t_max - t_min)).astype(int)
+    .. code-block:: python
 
-    required_length = np.max(spike_num * (ISI + 1))
-    if interval_length < required_length:
-        raise ValueError(f"Invalid stream length, the min length is {required_length}")
+        import numpy as np
+        from spikify.encoders.temporal.latency import BurstEncoder
+        encoder = BurstEncoder(n_max=4, t_min=2, t_max=6, interval_length=16).fit(np.array([0.0, 2.0]))
+        encoded_signal = encoder.transform(np.full(16, 1.0))
 
-    spikes = np.zeros((T // interval_length, interval_length, F), dtype=np.int8)
+    .. doctest::
+        :hide:
 
-    for i in range(signal_copy.shape[0]):
-        for f in range(F):
-            spike_times = np.arange(0, spike_num[i, f] * (ISI[i, f] + 1), ISI[i, f] + 1)
-            spikes[i, spike_times[spike_times < interval_length], f] = 1
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.latency import BurstEncoder
+        >>> encoder = BurstEncoder(n_max=4, t_min=2, t_max=6, interval_length=16).fit(np.array([0.0, 2.0]))
+        >>> encoder.transform(np.full(16, 1.0))
+        array([1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], dtype=int8)
 
-    spikes = spikes.reshape(-1, F)
+    :param n_max: Maximum number of spikes in a burst (for P = 1). Must be ≥ 1.
+    :type n_max: int
+    :param t_min: Minimum inter-spike interval (ISI) in time steps (for strong inputs with N_s > 1).
+    :type t_min: int
+    :param t_max: Maximum inter-spike interval (ISI) in time steps (for weak inputs or N_s = 1).
+    :type t_max: int
+    :param interval_length: Length of each output block corresponding to one input block.
+    :type interval_length: int
+    :param output: Format of the spike train, ``"dense"`` for a numpy array or ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param dtype: Floating point type of the fitted parameters and of the computation (see
+                  :mod:`spikify.backends.precision`), ``"auto"`` to follow the calibration signal. If ``None``, the
+                  default type is used.
+    :type dtype: type | numpy.dtype | str | None
+    :raises ValueError: If the output format is not supported.
 
-    # Flatten if input was 1D
-    if F == 1:
-        spikes = spikes.flatten()
+    """
 
-    return spikes
+    _feature_parameters = ("shift", "norm")
+
+    def __init__(
+        self,
+        n_max: int,
+        t_min: int,
+        t_max: int,
+        interval_length: int,
+        output: Literal["dense", "events"] = "dense",
+        dtype: type | np.dtype | str | None = None,
+    ):
+        """Constructor method."""
+        check_output(output)
+        super().__init__()
+        self.n_max = n_max
+        self.t_min = t_min
+        self.t_max = t_max
+        self.interval_length = interval_length
+        self.output = output
+        self.dtype = dtype
+        self.shift = None
+        self.norm = None
+
+    def fit(self, signal: np.ndarray) -> "BurstEncoder":
+        """
+        Compute the shift and the per-feature scaling from a calibration signal.
+
+        :param signal: Calibration signal (1D or 2D: timestamps × features).
+        :type signal: numpy.ndarray
+        :return: The encoder itself.
+        :rtype: BurstEncoder
+        :raises ValueError: If the signal is empty.
+
+        """
+        signal = self._as_float_2d(signal)
+
+        # Shift the signal if it has negative values, then scale the features whose amplitude is greater than 1
+        self.shift, norm = normalization_range(signal)
+        norm[norm <= 1] = 1
+        self.norm = norm
+
+        self.num_features = signal.shape[1]
+        return self
+
+    def _transform(
+        self, signal: np.ndarray, out: np.ndarray | None = None, copy: bool = True
+    ) -> np.ndarray | SpikeEvents:
+        """
+        Encode a signal with the fitted shift and scaling. Samples outside of the range seen by :meth:`fit` are
+        clipped to [0, 1] after normalization.
+
+        :param signal: Input signal to encode, shape (time, features).
+        :type signal: numpy.ndarray
+        :param out: Preallocated array receiving the dense spike train.
+        :type out: numpy.ndarray | None
+        :param copy: If ``False``, the signal may be normalized in place.
+        :type copy: bool
+        :return: A numpy array representing the encoded spike train (``out`` if given), or its events (shape (time,
+                 features) even for a 1D signal).
+        :rtype: numpy.ndarray | SpikeEvents
+        :raises ValueError: If interval_length does not divide the signal length or if it is too small for the longest
+                            possible burst.
+
+        """
+        interval_length = self.interval_length
+        T, F = signal.shape
+
+        if T % interval_length != 0:
+            raise ValueError(f"The interval_length ({interval_length}) is not a factor of the signal length ({T}).")
+
+        signal_copy = working_signal(signal, copy, self.shift.dtype)
+        signal_copy -= self.shift
+        signal_copy /= self.norm
+        np.clip(signal_copy, 0, 1, out=signal_copy)
+
+        signal_copy = np.mean(signal_copy.reshape(-1, interval_length, F), axis=1)
+
+        spike_num = np.ceil(signal_copy * self.n_max).astype(int)
+        ISI = np.ceil(self.t_max - signal_copy * (self.t_max - self.t_min)).astype(int)
+
+        required_length = np.max(spike_num * (ISI + 1))
+        if interval_length < required_length:
+            raise ValueError(f"Invalid stream length, the min length is {required_length}")
+
+        # The k-th spike of a burst, for k < spike_num, falls on timestep k * (ISI + 1) of its interval
+        ranks = np.arange(self.n_max)[:, None]
+        intervals, rank, channels = np.nonzero(ranks < spike_num[:, None, :])
+        steps = rank * (ISI[intervals, channels] + 1)
+
+        if self.output == "events":
+            times = intervals * interval_length + steps
+            return SpikeEvents(times, channels, np.ones(times.size, dtype=np.int8), (T, F))
+
+        # A single feature is returned as a 1D spike train
+        spike_train = spike_buffer(out, (T, F) if F > 1 else (T,))
+        spike_train.reshape(T // interval_length, interval_length, F)[intervals, steps, channels] = 1
+        return spike_train
@@ -0,0 +1,302 @@
+"""
+.. raw:: html
+
+    <h2>Encoder Utilities</h2>
+
+Helpers shared by the encoders: broadcasting of per-feature parameters, preparation of the working signal and of the
+preallocated output buffers, and folding of a batch of signals into the features of a single signal and back, so that
+every encoder handles batches, ``out`` arrays and event outputs the same way.
+"""
+
+import numpy as np
+from spikify.spikes import SpikeEvents, SpikeTrain
+
+
+def broadcast_threshold(
+    threshold: float | int | list[float | int] | np.ndarray,
+    num_features: int,
+    name: str = "Threshold",
+    dtype: type | np.dtype = np.float64,
+) -> np.ndarray:
+    """
+    Broadcast a scalar or per-feature parameter to one float value per feature.
+
+    :param threshold: Scalar or 1D sequence with one value per feature.
+    :type threshold: float | int | list[float | int] | numpy.ndarray
+    :param num_features: Number of features of the signal.
+    :type num_features: int
+    :param name: Name of the parameter used in error messages.
+    :type name: str
+    :param dtype: Floating point type of the values.
+    :type dtype: type | numpy.dtype
+    :return: Per-feature values, shape (features,).
+    :rtype: numpy.ndarray
+    :raises ValueError: If the parameter is not a scalar or a 1D sequence, or if its length does not match the number
+                        of features.
+
+    """
+    if np.isscalar(threshold):
+        return np.full(num_features, float(threshold), dtype=dtype)
+
+    thresholds = np.asarray(threshold, dtype=dtype)
+    if thresholds.ndim != 1:
+        raise ValueError(f"{name} must be a scalar or a 1D sequence of numbers.")
+    if thresholds.size != num_features:
+        raise ValueError(f"{name} must match the number of features in the signal.")
+
+    return thresholds
+
+
+def check_output(output: str, out: np.ndarray | None = None) -> None:
+    """
+    Check the output format requested from an encoder.
+
+    :param output: ``"dense"`` for a spike matrix of shape (time, features), ``"events"`` for
+                   :class:`~spikify.spikes.SpikeEvents`.
+    :type output: str
+    :param out: Preallocated array receiving the dense spike train, or ``None``.
+    :type out: numpy.ndarray | None
+    :raises ValueError: If the output format is not supported, or if ``out`` is given for events.
+
+    """
+    if output not in ("dense", "events"):
+        raise ValueError(f"Output {output} is not supported")
+    if out is not None and output != "dense":
+        raise ValueError("Output array is only supported with output='dense'.")
+
+
+def write_output(spikes, out: np.ndarray | None):
+    """
+    Copy a dense spike train into a preallocated array, for example an array placed in shared memory by
+    :class:`~spikify.parallel.SharedArray`. Nothing is copied if the spike train was already written into it.
+
+    :param spikes: Spike train returned by an encoder.
+    :type spikes: numpy.ndarray | SpikeEvents | list[SpikeEvents]
+    :param out: Preallocated array of the shape and ``dtype`` of the spike train, or ``None``.
+    :type out: numpy.ndarray | None
+    :return: ``out`` holding the spike train, or the spike train itself if ``out`` is ``None``.
+    :rtype: numpy.ndarray | SpikeEvents | list[SpikeEvents]
+    :raises ValueError: If the spike train is not dense, or if ``out`` does not match its shape or ``dtype``.
+
+    """
+    if out is None or spikes is out:
+        return spikes
+
+    if not isinstance(spikes, np.ndarray):
+        raise ValueError("Output array is only supported with output='dense'.")
+    if out.shape != spikes.shape:
+        raise ValueError(f"Output array must have shape {spikes.shape}, got {out.shape}.")
+    if out.dtype != spikes.dtype:
+        raise ValueError(f"Output array must have dtype {spikes.dtype}, got {out.dtype}.")
+
+    out[...] = spikes
+    return out
+
+
+def spike_buffer(
+    out: np.ndarray | None, shape: tuple[int, ...], clear: bool = True, dtype: type | np.dtype = np.int8
+) -> np.ndarray:
+    """
+    Array receiving the dense spike train of an encoder: ``out``, or a new array.
+
+    :param out: Preallocated array of the shape and ``dtype`` of the spike train, or ``None``.
+    :type out: numpy.ndarray | None
+    :param shape: Shape of the spike train.
+    :type shape: tuple[int, ...]
+    :param clear: Whether the spike train must start filled with zeros. Encoders that write every entry skip it.
+    :type clear: bool
+    :param dtype: Type of the spike train.
+    :type dtype: type | numpy.dtype
+    :return: ``out``, or a new array.
+    :rtype: numpy.ndarray
+    :raises ValueError: If ``out`` does not match the spike train shape or ``dtype``.
+
+    """
+    if out is None:
+        return np.zeros(shape, dtype=dtype) if clear else np.empty(shape, dtype=dtype)
+
+    if out.shape != shape:
+        raise ValueError(f"Output array must have shape {shape}, got {out.shape}.")
+    if out.dtype != np.dtype(dtype):
+        raise ValueError(f"Output array must have dtype {np.dtype(dtype)}, got {out.dtype}.")
+
+    if clear:
+        out[...] = 0
+    return out
+
+
+def working_signal(signal: np.ndarray, copy: bool = True, dtype: type | np.dtype = np.float64) -> np.ndarray:
+    """
+    Float signal that an encoder can normalize in place.
+
+    :param signal: Signal to encode.
+    :type signal: numpy.ndarray
+    :param copy: If ``False``, the signal itself is returned when it is already a writable array of type ``dtype``, so
+                 that it is overwritten by the encoder instead of copied.
+    :type copy: bool
+    :param dtype: Floating point type the encoder computes in.
+    :type dtype: type | numpy.dtype
+    :return: A copy of the signal of type ``dtype``, or the signal itself.
+    :rtype: numpy.ndarray
+
+    """
+    if copy or signal.dtype != dtype or not signal.flags.writeable:
+        return np.array(signal, dtype=dtype)
+    return signal
+
+
+def event_block_length(num_features: int) -> int:
+    """
+    Number of timesteps encoded at once when an encoder collects events block by block.
+
+    :param num_features: Number of features of the signal.
+    :type num_features: int
+    :return: The block length, chosen so that a dense block takes a few megabytes.
+    :rtype: int
+
+    """
+    return max(1024, (1 << 22) // max(num_features, 1))
+
+
+def normalization_range(signal: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per-feature range used by the encoders to bring a signal to non-negative values.
+
+    :param signal: Signal, shape (time, features).
+    :type signal: numpy.ndarray
+    :return:
+        - shift: Per-feature minimum if it is negative, 0 otherwise, shape (features,). Subtracting it makes the
+          signal non-negative.
+        - max_amp: Per-feature maximum of the shifted signal, shape (features,).
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+
+    """
+    shift = signal.min(axis=0)
+    shift[shift > 0] = 0  # only shift if negative values are present
+    return shift, (signal - shift).max(axis=0)
+
+
+def fold_batch(signal) -> tuple[np.ndarray | SpikeEvents, tuple[int, int] | None]:
+    """
+    Fold a batch of signals or spike trains into a single one whose features are the features of every sample.
+
+    A batch of shape (samples, time, features) becomes an array of shape (time, samples × features), where the
+    features of sample ``n`` are the columns ``n × features`` to ``(n + 1) × features - 1``. Every encoder and decoder
+    treats features independently, so the folded batch is processed in a single pass and :func:`unfold_batch` splits
+    the results back per sample. A sequence of :class:`~spikify.spikes.SpikeEvents` or
+    :class:`~spikify.spikes.SpikeTrain` of the same shape is folded the same way into a single
+    :class:`~spikify.spikes.SpikeEvents`.
+
+    :param signal: Signal or spike train, either a single one (1D or 2D array, events or packed train) or a batch
+                   (3D array: samples × time × features, or sequence of events or packed trains).
+    :type signal: numpy.ndarray | SpikeEvents | SpikeTrain | list[SpikeEvents | SpikeTrain]
+    :return:
+        - signal: The folded batch, shape (time, samples × features), or the signal itself if it is not a batch.
+        - batch: Shape (samples, features) of the batch, or ``None`` if the signal is not a batch.
+    :rtype: tuple[numpy.ndarray | SpikeEvents, tuple[int, int] | None]
+    :raises ValueError: If the batch is empty or if the spike trains of a sequence do not have the same shape.
+
+    """
+    if isinstance(signal, (list, tuple)) and signal and isinstance(signal[0], (SpikeEvents, SpikeTrain)):
+        samples = [spikes.to_events() if isinstance(spikes, SpikeTrain) else spikes for spikes in signal]
+        T, F = samples[0].shape
+        if any(spikes.shape != (T, F) for spikes in samples):
+            raise ValueError("Spike trains of a batch must have the same shape.")
+
+        N = len(samples)
+        # The features of the folded batch may not fit the index type of a single sample
+        channels = [spikes.channels.astype(np.int64) + n * F for n, spikes in enumerate(samples)]
+        folded = SpikeEvents(
+            np.concatenate([spikes.times for spikes in samples]),
+            np.concatenate(channels),
+            np.concatenate([spikes.polarities for spikes in samples]),
+            (T, N * F),
+        )
+        return folded, (N, F)
+
+    if isinstance(signal, (SpikeEvents, SpikeTrain)) or np.ndim(signal) != 3:
+        return signal, None
+
+    signal = np.asarray(signal)
+    if signal.size == 0:
+        raise ValueError("Signal cannot be empty.")
+
+    N, T, F = signal.shape
+    return signal.transpose(1, 0, 2).reshape(T, N * F), (N, F)
+
+
+def fold_parameter(value, batch: tuple[int, int], ndim: int = 1, name: str = "Threshold") -> np.ndarray:
+    """
+    Fold a parameter of a batch to the features of the batch folded by :func:`fold_batch`.
+
+    :param value: Parameter shared by all samples (scalar, or array whose last axis holds one value per feature) or
+                  given per sample (array with an extra leading axis, one entry per sample).
+    :type value: float | int | list | numpy.ndarray
+    :param batch: Shape (samples, features) of the batch.
+    :type batch: tuple[int, int]
+    :param ndim: Number of dimensions of the parameter of a single sample, e.g. 1 for per-feature thresholds or 2 for
+                 a filter bank of shape (window_length, features).
+    :type ndim: int
+    :param name: Name of the parameter used in error messages.
+    :type name: str
+    :return: The parameter of every folded feature, last axis of length samples × features. Values shared by all
+             samples are broadcast, so a parameter shared by all features stays a view.
+    :rtype: numpy.ndarray
+    :raises ValueError: If the parameter does not match the number of samples or features of the batch.
+
+    """
+    N, F = batch
+    value = np.asarray(value)
+
+    if value.ndim == ndim + 1:
+        if value.shape[0] != N or value.shape[-1] != F:
+            raise ValueError(f"{name} given per sample must have shape ({N}, ..., {F}), got {value.shape}.")
+        return np.moveaxis(value, 0, -2).reshape(*value.shape[1:-1], N * F)
+
+    if value.ndim > ndim:
+        raise ValueError(f"{name} must have at most {ndim + 1} dimensions.")
+    if value.ndim == 0:
+        value = np.broadcast_to(value, (F,))
+    if value.shape[-1] != F:
+        raise ValueError(f"{name} must match the number of features in the signal.")
+
+    return np.broadcast_to(value[..., None, :], (*value.shape[:-1], N, F)).reshape(*value.shape[:-1], N * F)
+
+
+def unfold_batch(value, batch: tuple[int, int] | None):
+    """
+    Split a result computed on a batch folded by :func:`fold_batch` back per sample.
+
+    :param value: Spike train or parameter of the folded batch, last axis of length samples × features, or its
+                  events.
+    :type value: numpy.ndarray | SpikeEvents
+    :param batch: Shape (samples, features) of the batch, or ``None`` if the signal was not a batch.
+    :type batch: tuple[int, int] | None
+    :return: The value itself if the signal was not a batch. Otherwise a view with a leading samples axis, e.g.
+             shape (samples, time, features) for a spike train or (samples, features) for per-feature values, or a
+             list with the events of every sample.
+    :rtype: numpy.ndarray | SpikeEvents | list[SpikeEvents]
+
+    """
+    if batch is None:
+        return value
+
+    N, F = batch
+    if isinstance(value, SpikeEvents):
+        T = value.shape[0]
+        samples = value.channels // F
+        # Group the events by sample, keeping them sorted by timestep then feature inside each sample
+        order = np.argsort(samples, kind="stable")
+        bounds = np.searchsorted(samples[order], np.arange(N + 1))
+        return [
+            SpikeEvents(
+                value.times[order[start:stop]],
+                value.channels[order[start:stop]] - n * F,
+                value.polarities[order[start:stop]],
+                (T, F),
+            )
+            for n, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:]))
+        ]
+
+    value = np.asarray(value)
+    return np.moveaxis(value.reshape(*value.shape[:-1], N, F), -2, 0)
@@ -2,6 +2,7 @@ import numpy as np
 from scipy.signal import lfilter, butter, gammatone, sosfilt
 from typing import Literal
 from abc import ABC
+from spikify.backends import resolve_dtype
 
 
 class FilterBank(ABC):
@@ -118,20 +119,30 @@ class FilterBank(ABC):
             case _:
                 raise ValueError(f"Filter {self.filter_type} is not supported")
 
-    def decompose(self, signal: np.ndarray) -> np.ndarray:
+    def decompose(self, signal: np.ndarray, dtype: type | np.dtype | str | None = None) -> np.ndarray:
         """
         Decompose input signal into frequency components using the filter bank.
 
         This method applies each filter in the bank to the input signal and returns the filtered outputs for all
         channels.
 
+        The Gammatone filters run in the type selected by ``dtype``. The recursive Butterworth and SOS filters always
+        run in ``float64``, since their poles lie too close to the unit circle to be stable in ``float32``; only their
+        output is stored in ``dtype``.
+
         :param signal: Input signal to be decomposed. Should be a 1D or 2D numpy array. If 2D, shape should be
             (timestamps, features).
         :type signal: numpy.ndarray
+        :param dtype: Floating point type of the output (``float32``, ``float64`` or ``"auto"``). If ``None``, the
+                      default type is used (see :mod:`spikify.backends.precision`).
+        :type dtype: type | numpy.dtype | str | None
         :return: Array of filtered signals with shape (timestamps, channels, features).
         :rtype: numpy.ndarray
+        :raises ValueError: If ``dtype`` is not supported.
 
         """
+        dtype = resolve_dtype(dtype, signal)
+
         # Ensure 2D processing (T, F)
         if signal.ndim == 1:
             signal = signal.reshape(-1, 1)
@@ -139,20 +150,25 @@ class FilterBank(ABC):
         T, F = signal.shape
         n_channels = len(self.filter_coeffs)
 
+        if self.filter_type == "gammatone":
+            signal = signal.astype(dtype, copy=False)
+            filter_coeffs = [(np.asarray(num, dtype), np.asarray(den, dtype)) for num, den in self.filter_coeffs]
+        else:
+            signal = signal.astype(np.float64, copy=False)
+            filter_coeffs = self.filter_coeffs
+
         # Initialize output
-        freq_components = np.zeros((T, n_channels, F))
+        freq_components = np.zeros((T, n_channels, F), dtype=dtype)
 
         for ch in range(n_channels):
-            filter_coeffs = self.filter_coeffs[ch]
-
             if self.filter_type == "sos":
                 # Use sosfilt for second-order sections
                 for feat in range(F):
-                    freq_components[:, ch, feat] = sosfilt(filter_coeffs, signal[:, feat])
+                    freq_components[:, ch, feat] = sosfilt(filter_coeffs[ch], signal[:, feat])
             else:
                 # Use lfilter for b,a coefficients
                 for feat in range(F):
-                    num, den = filter_coeffs
+                    num, den = filter_coeffs[ch]
                     freq_components[:, ch, feat] = lfilter(num, den, signal[:, feat])
 
         return freq_components
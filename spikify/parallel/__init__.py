@@ -0,0 +1,6 @@
+"""Parallel package."""
+
+from .executor import encode_many
+from .shared import SharedArray
+
+__all__ = ["encode_many", "SharedArray"]
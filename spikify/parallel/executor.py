@@ -0,0 +1,319 @@
+"""
+.. raw:: html
+
+    <h2>Parallel Executor</h2>
+
+Encoding of many recordings on several cores. Every encoder treats recordings, and the features of a recording,
+independently, so the work is split into tasks that run on a pool of worker processes or threads, and the results are
+put back together in the order of the input.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Callable, Literal, Sequence
+
+import numpy as np
+from spikify.encoders.base import Encoder
+from spikify.spikes import SpikeEvents
+
+# Shared memory blocks attached by the current worker process, by name
+_ATTACHED: dict[str, shared_memory.SharedMemory] = {}
+
+
+def encode_many(
+    encoder: Callable | Encoder,
+    signals: Sequence[np.ndarray] | np.ndarray,
+    workers: int | None = None,
+    strategy: Literal["process", "thread"] = "process",
+    chunking: Literal["recording", "feature"] = "recording",
+    chunk_size: int | None = None,
+) -> list:
+    """
+    Encode many recordings in parallel.
+
+    The recordings are split into tasks, each encoding either a group of whole recordings (``chunking="recording"``)
+    or a group of features of one recording (``chunking="feature"``, useful for a few recordings with many features).
+    The tasks run on a pool of workers and the results are returned in the order of the input, whatever the order in
+    which the tasks complete. Results split by feature are concatenated back along the feature axis.
+
+    .. note::
+        - With ``strategy="process"``, the recordings are copied once into a shared memory block that every worker
+          process reads directly, so the input arrays are never pickled. Only the encoder and the results go through
+          pickling, so ``encoder`` must be picklable (a module-level function, a :func:`functools.partial` of one or
+          a fitted :class:`~spikify.encoders.base.Encoder`). The backend selected with
+          :func:`~spikify.backends.set_backend` is not propagated to the workers; pass it to the encoder instead.
+        - With ``strategy="thread"``, the recordings are shared as they are. Threads only run in parallel while NumPy
+          releases the GIL, so processes usually scale better for the encoders with sequential inner loops.
+        - When splitting by feature, per-feature arguments bound to an encoding function must be scalars, since
+          every task only sees some of the features. A fitted :class:`~spikify.encoders.base.Encoder` is instead
+          restricted to the features of each task.
+        - The results do not depend on the number of workers, except for the random draws of the Poisson encoder
+          when the default ``chunk_size`` of the feature chunking changes with it. Seeding it with a
+          :class:`~spikify.rng.CounterRNG` makes them independent of the chunking too.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        from functools import partial
+        import numpy as np
+        from spikify.encoders.temporal.contrast import step_forward
+        from spikify.parallel import encode_many
+        recordings = [np.random.rand(1000, 3) for _ in range(8)]
+        results = encode_many(partial(step_forward, threshold=0.2), recordings, workers=4)
+
+    .. doctest::
+        :hide:
+
+        >>> from functools import partial
+        >>> import numpy as np
+        >>> from spikify.encoders.temporal.contrast import step_forward
+        >>> from spikify.parallel import encode_many
+        >>> recordings = [np.array([0.1, 0.3, 0.4, 0.2, 0.5, 0.6]), np.array([0.6, 0.5, 0.2, 0.4, 0.3, 0.1])]
+        >>> results = encode_many(partial(step_forward, threshold=0.2), recordings, workers=2, strategy="thread")
+        >>> [spikes.flatten() for spikes, _ in results]
+        [array([0, 0, 1, 0, 0, 1], dtype=int8), array([ 0,  0, -1,  0,  0, -1], dtype=int8)]
+
+    :param encoder: Encoding function called on every recording (e.g. a :func:`functools.partial` of an encoder
+                    with its parameters), or a fitted :class:`~spikify.encoders.base.Encoder` whose
+                    :meth:`~spikify.encoders.base.Encoder.transform` is called.
+    :type encoder: Callable | Encoder
+    :param signals: Recordings to encode (1D or 2D: time × features each), possibly of different lengths, or a 3D
+                    array whose first axis indexes the recordings.
+    :type signals: Sequence[numpy.ndarray] | numpy.ndarray
+    :param workers: Number of worker processes or threads. If ``None``, the number of CPUs is used. With 1 worker,
+                    the tasks run in the calling thread.
+    :type workers: int | None
+    :param strategy: ``"process"`` for a pool of processes, ``"thread"`` for a pool of threads.
+    :type strategy: str
+    :param chunking: ``"recording"`` to split the work by recording, ``"feature"`` to split every recording by
+                     feature.
+    :type chunking: str
+    :param chunk_size: Number of recordings, or of features, encoded by every task. By default, the recordings are
+                       split into about 4 tasks per worker, and the features of every recording into one task per
+                       worker.
+    :type chunk_size: int | None
+    :return: The output of the encoder for every recording, in the order of ``signals``.
+    :rtype: list
+    :raises ValueError: If the strategy or the chunking is not supported, or if ``workers`` or ``chunk_size`` is
+                        smaller than 1. Errors raised by the encoder are propagated.
+
+    """
+    if strategy not in ("process", "thread"):
+        raise ValueError(f"Strategy {strategy} is not supported")
+    if chunking not in ("recording", "feature"):
+        raise ValueError(f"Chunking {chunking} is not supported")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+
+    signals = [np.asarray(signal) for signal in signals]
+    if not signals:
+        return []
+
+    tasks = _plan_tasks(signals, workers, chunking, chunk_size)
+
+    if workers == 1:
+        results = [_encode_task(encoder, signals, task) for task in tasks]
+    elif strategy == "thread":
+        with ThreadPoolExecutor(workers) as pool:
+            results = list(pool.map(partial(_encode_task, encoder, signals), tasks))
+    else:
+        block, layout = _share(signals)
+        try:
+            shared_tasks = [[(layout[index], features) for index, features in task] for task in tasks]
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(pool.map(partial(_encode_shared_task, encoder, block.name), shared_tasks))
+        finally:
+            block.close()
+            block.unlink()
+
+    return _assemble(signals, tasks, results)
+
+
+def _plan_tasks(
+    signals: list[np.ndarray], workers: int, chunking: str, chunk_size: int | None
+) -> list[list[tuple[int, slice | None]]]:
+    """
+    Split the recordings into tasks.
+
+    :param signals: Recordings to encode.
+    :type signals: list[numpy.ndarray]
+    :param workers: Number of workers.
+    :type workers: int
+    :param chunking: ``"recording"`` or ``"feature"``.
+    :type chunking: str
+    :param chunk_size: Number of recordings or features per task, or ``None`` for the default.
+    :type chunk_size: int | None
+    :return: Every task, as a list of (recording index, features or ``None`` for all of them) pairs.
+    :rtype: list[list[tuple[int, slice | None]]]
+
+    """
+    if chunking == "recording":
+        size = chunk_size or math.ceil(len(signals) / (4 * workers))
+        return [
+            [(index, None) for index in range(start, min(start + size, len(signals)))]
+            for start in range(0, len(signals), size)
+        ]
+
+    tasks = []
+    for index, signal in enumerate(signals):
+        F = signal.shape[1] if signal.ndim == 2 else 1
+        size = chunk_size or math.ceil(F / workers)
+        if signal.ndim != 2 or size >= F:
+            tasks.append([(index, None)])
+        else:
+            tasks.extend([(index, slice(start, min(start + size, F)))] for start in range(0, F, size))
+    return tasks
+
+
+def _encode(encoder: Callable | Encoder, signal: np.ndarray, features: slice | None):
+    """
+    Encode a recording, or some of its features.
+
+    :param encoder: Encoding function or fitted encoder.
+    :type encoder: Callable | Encoder
+    :param signal: Recording.
+    :type signal: numpy.ndarray
+    :param features: Features to encode, or ``None`` for all of them.
+    :type features: slice | None
+    :return: The output of the encoder.
+
+    """
+    if features is not None:
+        signal = signal[:, features]
+        if isinstance(encoder, Encoder):
+            encoder = encoder._select_features(features)
+
+    if isinstance(encoder, Encoder):
+        return encoder.transform(signal)
+    return encoder(signal)
+
+
+def _encode_task(encoder: Callable | Encoder, signals: list[np.ndarray], task: list[tuple[int, slice | None]]) -> list:
+    """
+    Run a task on recordings held by the calling process.
+
+    :param encoder: Encoding function or fitted encoder.
+    :type encoder: Callable | Encoder
+    :param signals: Recordings to encode.
+    :type signals: list[numpy.ndarray]
+    :param task: (recording index, features) pairs to encode.
+    :type task: list[tuple[int, slice | None]]
+    :return: The output of the encoder for every pair.
+    :rtype: list
+
+    """
+    return [_encode(encoder, signals[index], features) for index, features in task]
+
+
+def _encode_shared_task(
+    encoder: Callable | Encoder, name: str, task: list[tuple[tuple[int, tuple[int, ...], str], slice | None]]
+) -> list:
+    """
+    Run a task in a worker process on recordings read from a shared memory block.
+
+    :param encoder: Encoding function or fitted encoder.
+    :type encoder: Callable | Encoder
+    :param name: Name of the shared memory block holding the recordings.
+    :type name: str
+    :param task: ((offset, shape, dtype) of the recording in the block, features) pairs to encode.
+    :type task: list[tuple[tuple[int, tuple[int, ...], str], slice | None]]
+    :return: The output of the encoder for every pair.
+    :rtype: list
+
+    """
+    block = _ATTACHED.get(name)
+    if block is None:
+        block = _ATTACHED[name] = shared_memory.SharedMemory(name=name)
+
+    results = []
+    for (offset, shape, dtype), features in task:
+        signal = np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+        signal.flags.writeable = False
+        results.append(_encode(encoder, signal, features))
+    return results
+
+
+def _share(signals: list[np.ndarray]) -> tuple[shared_memory.SharedMemory, list[tuple[int, tuple[int, ...], str]]]:
+    """
+    Copy the recordings into a new shared memory block.
+
+    :param signals: Recordings to share.
+    :type signals: list[numpy.ndarray]
+    :return:
+        - block: The shared memory block, to be closed and unlinked by the caller.
+        - layout: (offset, shape, dtype) of every recording in the block.
+    :rtype: tuple[multiprocessing.shared_memory.SharedMemory, list[tuple[int, tuple[int, ...], str]]]
+
+    """
+    layout = []
+    size = 0
+    for signal in signals:
+        layout.append((size, signal.shape, signal.dtype.str))
+        size += -(-signal.nbytes // 64) * 64  # keep every recording aligned on a cache line
+
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for signal, (offset, shape, dtype) in zip(signals, layout):
+        np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)[...] = signal
+    return block, layout
+
+
+def _assemble(signals: list[np.ndarray], tasks: list[list[tuple[int, slice | None]]], results: list[list]) -> list:
+    """
+    Put the task results back in the order of the recordings, concatenating the parts of split recordings.
+
+    :param signals: Encoded recordings.
+    :type signals: list[numpy.ndarray]
+    :param tasks: Tasks, as returned by :func:`_plan_tasks`.
+    :type tasks: list[list[tuple[int, slice | None]]]
+    :param results: Output of every task.
+    :type results: list[list]
+    :return: The output of the encoder for every recording.
+    :rtype: list
+
+    """
+    parts = [[] for _ in signals]
+    for task, outputs in zip(tasks, results):
+        for (index, _), output in zip(task, outputs):
+            parts[index].append(output)
+
+    return [part[0] if len(part) == 1 else _concatenate(part) for part in parts]
+
+
+def _concatenate(parts: list, train: bool = True):
+    """
+    Concatenate the outputs of consecutive groups of features along the feature axis.
+
+    Encoders return the spike train of a single feature as a 1D array, so a 1D spike train part is taken as a single
+    feature. The joined spike train always has a feature axis, as the spike train of the whole recording.
+
+    :param parts: Outputs of the encoder, in feature order.
+    :type parts: list
+    :param train: Whether the parts are spike trains, rather than per-feature values such as a shift. In a tuple, only
+                  the first output is the spike train.
+    :type train: bool
+    :return: The output for all the features.
+
+    """
+    if isinstance(parts[0], tuple):
+        return tuple(_concatenate(list(values), train and i == 0) for i, values in enumerate(zip(*parts)))
+
+    if isinstance(parts[0], SpikeEvents):
+        offsets = np.cumsum([0] + [events.shape[1] for events in parts])
+        return SpikeEvents(
+            np.concatenate([events.times for events in parts]),
+            np.concatenate([events.channels + offset for events, offset in zip(parts, offsets)]),
+            np.concatenate([events.polarities for events in parts]),
+            (parts[0].shape[0], offsets[-1]),
+        )
+
+    if train:
+        parts = [part.reshape(-1, 1) if part.ndim == 1 else part for part in parts]
+    return np.concatenate(parts, axis=-1)
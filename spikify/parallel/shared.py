@@ -0,0 +1,204 @@
+"""
+.. raw:: html
+
+    <h2>Shared Arrays</h2>
+
+Arrays placed in shared memory, to hand input signals and preallocated spike trains to worker processes without
+pickling them. A worker attaches the memory of an array by name, reads the signal and writes its spikes in place,
+through the ``out`` parameter of the encoders, where the parent process sees them directly.
+"""
+
+import math
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArray:
+    """
+    NumPy array stored in a shared memory block.
+
+    Pickling a :class:`SharedArray`, for example as an argument of a task submitted to a process pool, only sends the
+    name of its block with the shape and ``dtype`` of the array. Unpickling it in another process attaches the same
+    block, so both processes read and write the same memory and the array is never copied.
+
+    The process that creates the array owns the block: it must :meth:`unlink` it once every process is done with it,
+    which the context manager does on exit. Every process closes its own mapping of the block with :meth:`close`, or
+    once the :class:`SharedArray` is garbage collected. The mapping is only released once every view of :attr:`array`
+    is garbage collected as well, so that views taken before closing the array stay valid.
+
+    .. note::
+        Before Python 3.13, attaching a block registers it with the resource tracker of the process, which unlinks it
+        when the process exits. Create the shared arrays before starting the worker processes, so that they share the
+        resource tracker of the creating process, and the blocks are only released by :meth:`unlink`.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+        import numpy as np
+        from spikify.encoders.temporal.deconvolution import bens_spiker
+        from spikify.parallel import SharedArray
+
+        def encode(index, signals, spikes):
+            bens_spiker(signals.array[index], 20, 0.05, 0.5, out=spikes.array[index])
+
+        recordings = np.random.rand(16, 10000, 4)
+        with SharedArray.from_array(recordings) as signals, SharedArray(recordings.shape, np.int8) as spikes:
+            with ProcessPoolExecutor(4) as pool:
+                list(pool.map(partial(encode, signals=signals, spikes=spikes), range(len(recordings))))
+            encoded = spikes.array.copy()
+
+    .. doctest::
+        :hide:
+
+        >>> import pickle
+        >>> import numpy as np
+        >>> from spikify.encoders.rate import poisson
+        >>> from spikify.parallel import SharedArray
+        >>> with SharedArray.from_array(np.array([0.2, 0.5, 0.8, 1.0])) as signal, SharedArray(4, np.int8) as spikes:
+        ...     attached = pickle.loads(pickle.dumps(spikes))
+        ...     _ = poisson(signal.array, 2, out=attached.array)
+        ...     attached.close()
+        ...     spikes.array
+        array([0, 1, 1, 0], dtype=int8)
+
+    :param shape: Shape of the array.
+    :type shape: int | tuple[int, ...]
+    :param dtype: Type of the array.
+    :type dtype: type | numpy.dtype
+    :param name: Name of an existing block to attach. If ``None``, a new block is created, whose content is
+                 unspecified, as for :func:`numpy.empty`.
+    :type name: str | None
+    :raises FileNotFoundError: If no block has the given name.
+    :raises ValueError: If the block is smaller than the array.
+
+    """
+
+    def __init__(self, shape: int | tuple[int, ...], dtype: type | np.dtype = np.float64, name: str | None = None):
+        """Constructor method."""
+        self._array = None
+        shape = (shape,) if isinstance(shape, (int, np.integer)) else tuple(shape)
+        dtype = np.dtype(dtype)
+        nbytes = math.prod(shape) * dtype.itemsize
+
+        if name is None:
+            self._block = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        else:
+            # Only the creating process tracks the block, where supported
+            track = {"track": False} if sys.version_info >= (3, 13) else {}
+            self._block = shared_memory.SharedMemory(name=name, **track)
+            if self._block.size < nbytes:
+                self._block.close()
+                raise ValueError(f"Shared memory block {name} is smaller than an array of shape {shape}.")
+
+        self.shape = shape
+        self.dtype = dtype
+        self._owner = name is None
+        self._array = np.asarray(_Mapping(self._block, shape, dtype))
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "SharedArray":
+        """
+        Copy an array into a new shared memory block.
+
+        :param array: Array to copy.
+        :type array: numpy.ndarray
+        :return: The shared copy.
+        :rtype: SharedArray
+
+        """
+        array = np.asarray(array)
+        shared = cls(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        Array stored in the shared memory block.
+
+        :return: The array.
+        :rtype: numpy.ndarray
+        :raises ValueError: If the array was closed.
+
+        """
+        if self._array is None:
+            raise ValueError("Shared array is closed.")
+        return self._array
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the shared memory block, with which other processes attach it.
+
+        :return: The name.
+        :rtype: str
+
+        """
+        return self._block.name
+
+    def close(self) -> None:
+        """
+        Close the mapping of the block in this process. The block itself stays available to the other processes, and
+        the mapping is only released once the views of :attr:`array` taken in this process are garbage collected.
+
+        """
+        self._array = None
+
+    def unlink(self) -> None:
+        """
+        Release the block, once every process is done with it.
+
+        """
+        self._block.unlink()
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    def __reduce__(self):
+        return type(self), (self.shape, self.dtype, self.name)
+
+    def __repr__(self) -> str:
+        return f"SharedArray(name={self.name!r}, shape={self.shape}, dtype={self.dtype})"
+
+
+class _Mapping:
+    """
+    Array interface of a shared memory block. Every array built from it holds it as its base, and the block is closed
+    once the last of them is garbage collected. The mapping exports the buffer of the block while it is alive, so that
+    the block can not be unmapped under the arrays in the meantime.
+
+    :param block: Shared memory block.
+    :type block: multiprocessing.shared_memory.SharedMemory
+    :param shape: Shape of the array.
+    :type shape: tuple[int, ...]
+    :param dtype: Type of the array.
+    :type dtype: numpy.dtype
+
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, shape: tuple[int, ...], dtype: np.dtype):
+        """Constructor method."""
+        self.block = block
+        self.buffer = np.frombuffer(block.buf, dtype=np.uint8)
+        self.__array_interface__ = {
+            "shape": shape,
+            "typestr": dtype.str,
+            "descr": dtype.descr,
+            "data": (self.buffer.ctypes.data, False),
+            "version": 3,
+        }
+
+    def __del__(self):
+        # Release the export first, which would otherwise prevent closing the block
+        self.buffer = None
+        self.block.close()
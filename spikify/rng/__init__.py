@@ -0,0 +1,5 @@
+"""Random number package."""
+
+from .philox import CounterRNG, philox4x32
+
+__all__ = ["CounterRNG", "philox4x32"]
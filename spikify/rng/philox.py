@@ -0,0 +1,167 @@
+"""
+.. raw:: html
+
+    <h2>Counter-Based Random Numbers</h2>
+
+Random numbers computed from their position in the encoded data instead of drawn from a sequential stream. The
+Philox4x32-10 block cipher maps a counter and a key to four random 32-bit words, so the random numbers of every
+(recording, feature, interval, draw) position are a function of the seed and of that position only. Encoding a
+recording whole, in chunks of intervals, one feature at a time or across a process pool then draws exactly the same
+numbers.
+"""
+
+import numpy as np
+
+# Multipliers and key increments of Philox4x32 (Salmon et al., 2011)
+_M0 = np.uint64(0xD2511F53)
+_M1 = np.uint64(0xCD9E8D57)
+_W0 = 0x9E3779B9
+_W1 = 0xBB67AE85
+_MASK = np.uint64(0xFFFFFFFF)
+
+# Random words produced by every block
+_WORDS = 4
+
+
+def philox4x32(counter, key, rounds: int = 10) -> np.ndarray:
+    """
+    Philox4x32 block cipher, applied to every counter of a broadcast array of counters.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.rng import philox4x32
+        words = philox4x32((np.arange(1000), 0, 0, 0), (42, 0))
+
+    .. doctest::
+        :hide:
+
+        >>> from spikify.rng import philox4x32
+        >>> [f"{word:08x}" for word in philox4x32((0, 0, 0, 0), (0, 0))]
+        ['6627e8d5', 'e169c58d', 'bc57ac4c', '9b00dbd8']
+
+    :param counter: The four 32-bit words of the counters, each an integer or an array, broadcast together.
+    :type counter: tuple
+    :param key: The two 32-bit words of the key.
+    :type key: tuple[int, int]
+    :param rounds: Number of rounds. Philox4x32-10, with 10 rounds, is the standard variant.
+    :type rounds: int
+    :return: The four random words of every counter, shape (\\*counter shape, 4).
+    :rtype: numpy.ndarray
+
+    """
+    c0, c1, c2, c3 = np.broadcast_arrays(*(np.asarray(word, dtype=np.uint64) for word in counter))
+    k0, k1 = (int(word) for word in key)
+
+    for _ in range(rounds):
+        # Products of 32-bit words fit in 64 bits: their high and low halves are the outputs of the round
+        p0 = c0 * _M0
+        p1 = c2 * _M1
+        c0, c1, c2, c3 = (p1 >> 32) ^ c1 ^ k0, p1 & _MASK, (p0 >> 32) ^ c3 ^ k1, p0 & _MASK
+        k0 = (k0 + _W0) & 0xFFFFFFFF
+        k1 = (k1 + _W1) & 0xFFFFFFFF
+
+    return np.stack([c0, c1, c2, c3], axis=-1).astype(np.uint32)
+
+
+class CounterRNG:
+    """
+    Counter-based random source of the Poisson encoder, reproducible whatever the way the work is split.
+
+    Every uniform random number is indexed by a recording, a feature, an interval and a draw within the interval, and
+    computed by :func:`philox4x32` from the counter (draw // 4, interval, feature, recording) and the seed as the
+    key. Given as the ``seed`` of :func:`~spikify.encoders.rate.poisson` or of
+    :class:`~spikify.encoders.rate.PoissonEncoder`, it makes the spikes of every feature and interval independent of
+    the other features and intervals encoded in the same call.
+
+    Recordings encoded in separate calls must be given distinct ``recording`` indices to draw independent spikes, and
+    a recording encoded in chunks of time must be given the index of the first interval of every chunk as ``start``.
+    The samples of a batch encoded in a single call are the recordings ``recording``, ``recording + 1``, and so on.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.encoders.rate import PoissonEncoder
+        from spikify.rng import CounterRNG
+
+        signal = np.random.rand(1000, 4)
+        encoder = PoissonEncoder(10, seed=CounterRNG(7, recording=3)).fit(signal)
+        whole = encoder.transform(signal)
+        first = encoder.transform(signal[:500])
+        encoder.seed = CounterRNG(7, recording=3, start=50)
+        second = encoder.transform(signal[500:])  # whole == concatenate([first, second])
+
+    .. doctest::
+        :hide:
+
+        >>> import numpy as np
+        >>> from spikify.encoders.rate import PoissonEncoder
+        >>> from spikify.rng import CounterRNG
+        >>> signal = np.random.default_rng(0).random((40, 3))
+        >>> encoder = PoissonEncoder(4, seed=CounterRNG(7)).fit(signal)
+        >>> whole = encoder.transform(signal)
+        >>> first = encoder.transform(signal[:20])
+        >>> encoder.seed = CounterRNG(7, start=5)
+        >>> np.array_equal(whole, np.concatenate([first, encoder.transform(signal[20:])]))
+        True
+
+    :param seed: Key of the random numbers, an integer in [0, 2**64).
+    :type seed: int
+    :param recording: Index of the encoded recording, an integer in [0, 2**32).
+    :type recording: int
+    :param start: Index of the first encoded interval within the recording, an integer in [0, 2**32).
+    :type start: int
+    :raises ValueError: If an argument is out of range.
+
+    """
+
+    def __init__(self, seed: int = 0, recording: int = 0, start: int = 0):
+        """Constructor method."""
+        if not 0 <= seed < 1 << 64:
+            raise ValueError("seed must be an integer in [0, 2**64).")
+        if not 0 <= recording < 1 << 32:
+            raise ValueError("recording must be an integer in [0, 2**32).")
+        if not 0 <= start < 1 << 32:
+            raise ValueError("start must be an integer in [0, 2**32).")
+
+        self.seed = int(seed)
+        self.recording = int(recording)
+        self.start = int(start)
+
+    def uniform(self, intervals: np.ndarray, recordings: np.ndarray, features: np.ndarray, draws: range) -> np.ndarray:
+        """
+        Uniform random numbers of a block of intervals and features.
+
+        :param intervals: Indices of the intervals, relative to ``start``, shape (intervals,).
+        :type intervals: numpy.ndarray
+        :param recordings: Recording of every feature, relative to ``recording``, shape (features,).
+        :type recordings: numpy.ndarray
+        :param features: Index of every feature within its recording, shape (features,).
+        :type features: numpy.ndarray
+        :param draws: Indices of the draws within every interval.
+        :type draws: range
+        :return: Random numbers in the open interval (0, 1), shape (intervals, draws, features).
+        :rtype: numpy.ndarray
+
+        """
+        first, stop = draws.start // _WORDS, -(-draws.stop // _WORDS)
+        counter = (
+            np.arange(first, stop)[None, :, None],
+            (np.asarray(intervals) + self.start)[:, None, None],
+            np.asarray(features)[None, None, :],
+            (np.asarray(recordings) + self.recording)[None, None, :],
+        )
+        words = philox4x32(counter, (self.seed & 0xFFFFFFFF, self.seed >> 32))
+
+        # Words of consecutive draws, (intervals, blocks, features, 4) -> (intervals, draws, features)
+        num_intervals, num_blocks, num_features, _ = words.shape
+        words = np.moveaxis(words, 3, 2).reshape(num_intervals, num_blocks * _WORDS, num_features)
+        words = words[:, draws.start - first * _WORDS : draws.stop - first * _WORDS]
+        return (words + 0.5) * 2.0**-32
+
+    def __repr__(self) -> str:
+        return f"CounterRNG(seed={self.seed}, recording={self.recording}, start={self.start})"
@@ -0,0 +1,6 @@
+"""Spikes package."""
+
+from .events import SpikeEvents
+from .train import SpikeTrain
+
+__all__ = ["SpikeEvents", "SpikeTrain"]
@@ -0,0 +1,182 @@
+"""
+.. raw:: html
+
+    <h2>Spike Events</h2>
+
+Sparse representation of a spike train as a list of events. Spike trains produced by the encoders are usually
+mostly zeros, so storing only the position and polarity of every spike saves memory and lets the decoders work in
+proportion to the number of spikes instead of the number of timesteps.
+"""
+
+import numpy as np
+
+
+class SpikeEvents:
+    """
+    Spike train stored as a list of events.
+
+    Every event is described by its timestep, its feature or channel and its polarity (the value of the spike in the
+    dense spike train, e.g. +1 or -1). Events are kept sorted by timestep, then by feature. The shape of the
+    equivalent dense spike train is stored alongside, so that silent timesteps at the end of the signal are not lost.
+    Timesteps and features are stored in the smallest unsigned integer types holding every index of the shape, e.g.
+    ``uint32`` timesteps and ``uint16`` features instead of two ``int64`` per event.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.spikes import SpikeEvents
+        spikes = np.array([[0, 1], [-1, 0], [0, 0], [1, 1]], dtype=np.int8)
+        events = SpikeEvents.from_dense(spikes)
+        dense = events.to_dense()
+
+    .. doctest::
+        :hide:
+
+        >>> import numpy as np
+        >>> from spikify.spikes import SpikeEvents
+        >>> spikes = np.array([[0, 1], [-1, 0], [0, 0], [1, 1]], dtype=np.int8)
+        >>> events = SpikeEvents.from_dense(spikes)
+        >>> events.times, events.channels, events.polarities
+        (array([0, 1, 3, 3], dtype=uint8), array([1, 0, 0, 1], dtype=uint8), array([ 1, -1,  1,  1], dtype=int8))
+        >>> np.array_equal(events.to_dense(), spikes)
+        True
+
+    :param times: Timestep of every event.
+    :type times: numpy.ndarray
+    :param channels: Feature or channel of every event.
+    :type channels: numpy.ndarray
+    :param polarities: Value of every event in the dense spike train.
+    :type polarities: numpy.ndarray
+    :param shape: Shape (time, features or channels) of the dense spike train.
+    :type shape: tuple[int, int]
+    :raises ValueError: If the event arrays are not 1D arrays of the same length, or if an event lies outside of the
+                        shape.
+
+    """
+
+    def __init__(self, times: np.ndarray, channels: np.ndarray, polarities: np.ndarray, shape: tuple[int, int]):
+        """Constructor method."""
+        times = _integer_array(times)
+        channels = _integer_array(channels)
+        polarities = np.asarray(polarities)
+
+        if times.ndim != 1 or times.shape != channels.shape or times.shape != polarities.shape:
+            raise ValueError("Times, channels and polarities must be 1D arrays of the same length.")
+
+        T, F = (int(size) for size in shape)
+        if times.size and (times.min() < 0 or times.max() >= T or channels.min() < 0 or channels.max() >= F):
+            raise ValueError(f"Events must lie inside the spike train shape {(T, F)}.")
+
+        # Sort by timestep, then by channel
+        order = np.lexsort((channels, times))
+        self.times = times[order].astype(_index_dtype(T), copy=False)
+        self.channels = channels[order].astype(_index_dtype(F), copy=False)
+        self.polarities = polarities[order]
+        self.shape = (T, F)
+
+    @classmethod
+    def from_dense(cls, spikes: np.ndarray) -> "SpikeEvents":
+        """
+        Collect the nonzero entries of a dense spike train.
+
+        :param spikes: Dense spike train (1D or 2D: time × features or channels).
+        :type spikes: numpy.ndarray
+        :return: The events of the spike train.
+        :rtype: SpikeEvents
+
+        """
+        spikes = np.asarray(spikes)
+        # Ensure 2D processing (T, F)
+        if spikes.ndim == 1:
+            spikes = spikes.reshape(-1, 1)
+
+        times, channels = np.nonzero(spikes)
+        return cls(times, channels, spikes[times, channels], spikes.shape)
+
+    @classmethod
+    def from_dense_blocks(cls, blocks, shape: tuple[int, int]) -> "SpikeEvents":
+        """
+        Collect the nonzero entries of a dense spike train produced one block of timesteps at a time, so that the
+        whole dense spike train never needs to be held in memory.
+
+        :param blocks: Iterable of ``(start, spikes)`` pairs, where ``spikes`` is the dense spike train of the block
+                       of timesteps beginning at ``start``, shape (time, features or channels).
+        :type blocks: Iterable[tuple[int, numpy.ndarray]]
+        :param shape: Shape (time, features or channels) of the whole spike train.
+        :type shape: tuple[int, int]
+        :return: The events of the spike train.
+        :rtype: SpikeEvents
+
+        """
+        # The events of every block are narrowed at once, so that only the current block holds 64-bit indices
+        time_dtype, channel_dtype = _index_dtype(shape[0]), _index_dtype(shape[1])
+        times, channels, polarities = [], [], []
+        for start, spikes in blocks:
+            block_times, block_channels = np.nonzero(spikes)
+            polarities.append(spikes[block_times, block_channels])
+            times.append((block_times + start).astype(time_dtype))
+            channels.append(block_channels.astype(channel_dtype))
+
+        if not times:
+            return cls(np.empty(0), np.empty(0), np.empty(0, dtype=np.int8), shape)
+
+        return cls(np.concatenate(times), np.concatenate(channels), np.concatenate(polarities), shape)
+
+    @property
+    def num_events(self) -> int:
+        """
+        Number of events.
+
+        :return: The number of events.
+        :rtype: int
+
+        """
+        return self.times.size
+
+    def to_dense(self, dtype: type | np.dtype | None = None) -> np.ndarray:
+        """
+        Build the dense spike train.
+
+        :param dtype: Type of the dense spike train. If ``None``, the type of the polarities is used.
+        :type dtype: type | numpy.dtype | None
+        :return: Dense spike train, shape (time, features or channels).
+        :rtype: numpy.ndarray
+
+        """
+        spikes = np.zeros(self.shape, dtype=self.polarities.dtype if dtype is None else dtype)
+        spikes[self.times, self.channels] = self.polarities
+        return spikes
+
+    def __repr__(self) -> str:
+        return f"SpikeEvents(num_events={self.num_events}, shape={self.shape})"
+
+
+def _integer_array(indices) -> np.ndarray:
+    """
+    Convert timesteps or features to an integer array, keeping integer arrays in their own type.
+
+    :param indices: Timesteps or features of the events.
+    :type indices: numpy.ndarray
+    :return: The indices as an integer array.
+    :rtype: numpy.ndarray
+
+    """
+    indices = np.asarray(indices)
+    if indices.dtype.kind in "iu":
+        return indices
+    return indices.astype(np.int64)
+
+
+def _index_dtype(size: int) -> np.dtype:
+    """
+    Smallest unsigned integer type holding every index of an axis.
+
+    :param size: Length of the axis.
+    :type size: int
+    :return: The index type, from ``uint8`` to ``uint64``.
+    :rtype: numpy.dtype
+
+    """
+    return np.min_scalar_type(max(int(size) - 1, 0))
@@ -0,0 +1,239 @@
+"""
+.. raw:: html
+
+    <h2>Spike Train</h2>
+
+Bit-packed storage of a dense spike train. Unipolar spikes take one bit per sample instead of the byte of an
+``int8`` array, bipolar spikes two bits (one plane for the positive spikes and one for the negative spikes).
+"""
+
+import numpy as np
+from .events import SpikeEvents
+
+
+class SpikeTrain:
+    """
+    Spike train packed along time, eight timesteps per byte.
+
+    The bit planes are packed with :func:`numpy.packbits` along the time axis, so that selecting channels, or a range
+    of timesteps starting at a multiple of 8, returns a view of the same packed data. Other time ranges are repacked.
+    The spikes are only unpacked on demand, by :meth:`to_dense`, by :func:`numpy.asarray` (through ``__array__``), or
+    block by block by :meth:`to_events`. The decoders accept a :class:`SpikeTrain` directly and decode its events,
+    so the full matrix is never unpacked.
+
+    **Code Example:**
+
+    .. code-block:: python
+
+        import numpy as np
+        from spikify.spikes import SpikeTrain
+        spikes = np.array([[0, 1], [-1, 0], [0, 0], [1, 1]], dtype=np.int8)
+        train = SpikeTrain.from_dense(spikes)
+        dense = np.asarray(train[1:, 0])
+
+    .. doctest::
+        :hide:
+
+        >>> import numpy as np
+        >>> from spikify.spikes import SpikeTrain
+        >>> spikes = np.array([[0, 1], [-1, 0], [0, 0], [1, 1]], dtype=np.int8)
+        >>> train = SpikeTrain.from_dense(spikes)
+        >>> train
+        SpikeTrain(shape=(4, 2), bipolar=True)
+        >>> np.asarray(train[1:, 0]).flatten()
+        array([-1,  0,  1], dtype=int8)
+
+    :param positive: Packed plane of the positive spikes, shape (ceil(time / 8), features or channels).
+    :type positive: numpy.ndarray
+    :param negative: Packed plane of the negative spikes, same shape as ``positive``, or ``None`` for a unipolar
+                     spike train.
+    :type negative: numpy.ndarray | None
+    :param length: Number of timesteps.
+    :type length: int
+    :raises ValueError: If the planes do not have the expected shape.
+
+    """
+
+    def __init__(self, positive: np.ndarray, negative: np.ndarray | None, length: int):
+        """Constructor method."""
+        if positive.ndim != 2 or positive.shape[0] != -(-length // 8):
+            raise ValueError(f"Packed planes of {length} timesteps must have shape ({-(-length // 8)}, features).")
+        if negative is not None and negative.shape != positive.shape:
+            raise ValueError("Positive and negative planes must have the same shape.")
+
+        self.positive = positive
+        self.negative = negative
+        self.length = length
+
+    @classmethod
+    def from_dense(cls, spikes: np.ndarray) -> "SpikeTrain":
+        """
+        Pack a dense spike train.
+
+        :param spikes: Dense spike train (1D or 2D: time × features or channels), values in {-1, 0, +1}. It is stored
+                       as bipolar only if it contains negative spikes.
+        :type spikes: numpy.ndarray
+        :return: The packed spike train.
+        :rtype: SpikeTrain
+        :raises ValueError: If the spike train contains values other than -1, 0 and +1.
+
+        """
+        spikes = np.asarray(spikes)
+        # Ensure 2D processing (T, F)
+        if spikes.ndim == 1:
+            spikes = spikes.reshape(-1, 1)
+
+        positive = spikes == 1
+        negative = spikes == -1
+        if np.count_nonzero(positive) + np.count_nonzero(negative) != np.count_nonzero(spikes):
+            raise ValueError("Spike train values must be in {-1, 0, +1}.")
+
+        return cls(
+            np.packbits(positive, axis=0),
+            np.packbits(negative, axis=0) if negative.any() else None,
+            spikes.shape[0],
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """
+        Shape (time, features or channels) of the dense spike train.
+
+        :return: The shape.
+        :rtype: tuple[int, int]
+
+        """
+        return self.length, self.positive.shape[1]
+
+    @property
+    def bipolar(self) -> bool:
+        """
+        Whether the spike train stores negative spikes.
+
+        :return: ``True`` for a bipolar spike train.
+        :rtype: bool
+
+        """
+        return self.negative is not None
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory taken by the packed planes.
+
+        :return: The number of bytes.
+        :rtype: int
+
+        """
+        return self.positive.nbytes + (0 if self.negative is None else self.negative.nbytes)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"SpikeTrain(shape={self.shape}, bipolar={self.bipolar})"
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self.to_dense(dtype)
+
+    def __getitem__(self, key) -> "SpikeTrain":
+        """
+        Select timesteps and channels, always returning a 2D spike train.
+
+        :param key: Time index (integer or slice with step 1), optionally followed by a channel index (integer, slice
+                    or sequence of integers).
+        :type key: int | slice | tuple
+        :return: The selected spike train, sharing the packed data when the channels are selected by an integer or a
+                 slice and the time range starts at a multiple of 8.
+        :rtype: SpikeTrain
+        :raises IndexError: If the time index is not an integer or a slice with step 1.
+
+        """
+        time, channel = key if isinstance(key, tuple) else (key, slice(None))
+        if isinstance(channel, (int, np.integer)):
+            channel = slice(channel, channel + 1 if channel != -1 else None)
+        if isinstance(time, (int, np.integer)):
+            time = slice(time, time + 1 if time != -1 else None)
+        if not isinstance(time, slice):
+            raise IndexError("Time index must be an integer or a slice.")
+
+        start, stop, step = time.indices(self.length)
+        if step != 1:
+            raise IndexError("Time slices must have step 1.")
+        stop = max(start, stop)
+
+        positive = self.positive[:, channel]
+        negative = None if self.negative is None else self.negative[:, channel]
+
+        if start % 8 == 0:
+            # Aligned start: the packed rows are a view, bits past the new length are ignored
+            rows = slice(start // 8, -(-stop // 8))
+            return SpikeTrain(positive[rows], None if negative is None else negative[rows], stop - start)
+
+        planes = [positive] if negative is None else [positive, negative]
+        planes = [np.packbits(self._unpack(plane, start, stop), axis=0) for plane in planes]
+        return SpikeTrain(planes[0], planes[1] if len(planes) > 1 else None, stop - start)
+
+    def to_dense(self, dtype: type | np.dtype | None = None) -> np.ndarray:
+        """
+        Unpack the spike train.
+
+        :param dtype: Type of the dense spike train, ``numpy.int8`` if ``None``.
+        :type dtype: type | numpy.dtype | None
+        :return: Dense spike train, shape (time, features or channels).
+        :rtype: numpy.ndarray
+
+        """
+        return self._dense_rows(0, self.length).astype(np.int8 if dtype is None else dtype, copy=False)
+
+    def to_events(self, block: int = 1 << 16) -> SpikeEvents:
+        """
+        Collect the events of the spike train, unpacking one block of timesteps at a time.
+
+        :param block: Number of timesteps unpacked at once, rounded up to a multiple of 8.
+        :type block: int
+        :return: The events of the spike train.
+        :rtype: SpikeEvents
+
+        """
+        block = -(-block // 8) * 8
+        blocks = (
+            (start, self._dense_rows(start, min(start + block, self.length))) for start in range(0, self.length, block)
+        )
+        return SpikeEvents.from_dense_blocks(blocks, self.shape)
+
+    def _dense_rows(self, start: int, stop: int) -> np.ndarray:
+        """
+        Unpack a range of timesteps.
+
+        :param start: First timestep.
+        :type start: int
+        :param stop: Timestep after the last one.
+        :type stop: int
+        :return: Dense spikes of the range, shape (stop - start, features).
+        :rtype: numpy.ndarray
+
+        """
+        spikes = self._unpack(self.positive, start, stop).view(np.int8)
+        if self.negative is not None:
+            spikes = spikes - self._unpack(self.negative, start, stop).view(np.int8)
+        return spikes
+
+    @staticmethod
+    def _unpack(plane: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """
+        Unpack a range of timesteps of a bit plane, touching only the bytes that hold it.
+
+        :param plane: Packed bit plane.
+        :type plane: numpy.ndarray
+        :param start: First timestep.
+        :type start: int
+        :param stop: Timestep after the last one.
+        :type stop: int
+        :return: Unpacked bits, shape (stop - start, features), as ``numpy.uint8``.
+        :rtype: numpy.ndarray
+
+        """
+        first = start // 8
+        bits = np.unpackbits(plane[first : -(-stop // 8)], axis=0, count=stop - first * 8)
+        return bits[start - first * 8 :]
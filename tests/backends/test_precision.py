@@ -0,0 +1,159 @@
+import unittest
+import numpy as np
+from spikify.backends import get_dtype, resolve_dtype, set_dtype, use_dtype
+from spikify.decoders.temporal.contrast import contrast_decoder
+from spikify.decoders.temporal.deconvolution import deconvolution_decoder
+from spikify.encoders.rate import poisson
+from spikify.encoders.temporal.contrast import (
+    moving_window,
+    step_forward,
+    threshold_based_representation,
+    zero_cross_step_forward,
+)
+from spikify.encoders.temporal.deconvolution import (
+    BensSpikerEncoder,
+    bens_spiker,
+    hough_spiker,
+    modified_hough_spiker,
+)
+from spikify.encoders.temporal.global_referenced import phase, time_to_first_spike
+from spikify.encoders.temporal.latency import burst_coding
+from spikify.filters import FilterBank
+
+# Largest fraction of spikes allowed to differ from the float64 path, for samples rounding across a threshold
+SPIKE_TOLERANCE = 1e-3
+
+
+class TestDtypePolicy(unittest.TestCase):
+    """Tests for the library-wide compute dtype."""
+
+    def tearDown(self):
+        set_dtype(np.float64)
+
+    def test_float64_is_default(self):
+        """Test that the library computes in float64 by default."""
+        self.assertEqual(get_dtype(), np.float64)
+        self.assertEqual(resolve_dtype(), np.float64)
+        self.assertEqual(resolve_dtype(None, np.zeros(3, dtype=np.float32)), np.float64)
+
+    def test_set_dtype(self):
+        """Test that the default dtype can be changed globally and is overridden per call."""
+        set_dtype(np.float32)
+        self.assertEqual(resolve_dtype(), np.float32)
+        self.assertEqual(resolve_dtype(np.float64), np.float64)
+        _, thresholds = step_forward(np.array([0.1, 0.3, 0.4, 0.2]), 0.1)
+        self.assertEqual(thresholds.dtype, np.float32)
+
+    def test_use_dtype_restores_previous(self):
+        """Test that the context manager restores the previous default dtype, even on errors."""
+        with self.assertRaises(RuntimeError):
+            with use_dtype("float32") as dtype:
+                self.assertEqual(get_dtype(), dtype)
+                raise RuntimeError
+        self.assertEqual(get_dtype(), np.float64)
+
+    def test_auto_follows_signal(self):
+        """Test that 'auto' computes in float32 only for single or half precision inputs."""
+        self.assertEqual(resolve_dtype("auto", np.zeros(3, dtype=np.float32)), np.float32)
+        self.assertEqual(resolve_dtype("auto", np.zeros(3, dtype=np.float16)), np.float32)
+        self.assertEqual(resolve_dtype("auto", np.zeros(3, dtype=np.float64)), np.float64)
+        self.assertEqual(resolve_dtype("auto", np.zeros(3, dtype=np.int16)), np.float64)
+        self.assertEqual(resolve_dtype("auto", [0.0, 1.0]), np.float64)
+
+    def test_unsupported_dtype_raises(self):
+        """Test that types other than float32 and float64 raise ValueError, globally or per call."""
+        for dtype in (np.float16, np.int32, "complex", "unknown"):
+            with self.assertRaises(ValueError):
+                set_dtype(dtype)
+        with self.assertRaises(ValueError):
+            step_forward(np.array([0.0, 1.0]), 0.5, dtype=np.float16)
+        self.assertEqual(get_dtype(), np.float64)
+
+
+class TestFloat32Tolerance(unittest.TestCase):
+    """Tests that computing in float32 stays within the documented tolerance of the float64 path."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.walk = np.cumsum(rng.normal(size=(4000, 4)), axis=0)
+        self.uniform = rng.uniform(size=(4000, 4))
+
+    def assert_close_spikes(self, encoder, signal, *args, **kwargs):
+        expected = encoder(signal, *args, **kwargs)
+        result = encoder(signal.astype(np.float32), *args, dtype="auto", **kwargs)
+        if isinstance(expected, tuple):
+            (expected, *parameters), (result, *result_parameters) = expected, result
+            for parameter, result_parameter in zip(parameters, result_parameters):
+                self.assertEqual(result_parameter.dtype, np.float32)
+                np.testing.assert_allclose(result_parameter, parameter, rtol=1e-5, atol=1e-6)
+        self.assertEqual(result.dtype, expected.dtype)
+        self.assertLessEqual(np.mean(np.asarray(result) != expected), SPIKE_TOLERANCE)
+
+    def test_step_forward(self):
+        self.assert_close_spikes(step_forward, self.walk, 0.5)
+
+    def test_moving_window(self):
+        self.assert_close_spikes(moving_window, self.walk, 8, 0.5)
+
+    def test_threshold_based_representation(self):
+        self.assert_close_spikes(threshold_based_representation, self.walk, 0.5)
+
+    def test_zero_cross_step_forward(self):
+        self.assert_close_spikes(zero_cross_step_forward, self.walk, 0.5)
+
+    def test_bens_spiker(self):
+        self.assert_close_spikes(bens_spiker, self.uniform, 8, 0.5, 0.9)
+
+    def test_hough_spiker(self):
+        self.assert_close_spikes(hough_spiker, self.uniform, 8, 0.5)
+
+    def test_modified_hough_spiker(self):
+        self.assert_close_spikes(modified_hough_spiker, self.uniform, 8, 0.5, 0.5)
+
+    def test_poisson(self):
+        self.assert_close_spikes(poisson, self.uniform, 10)
+
+    def test_burst_coding(self):
+        self.assert_close_spikes(burst_coding, self.uniform, 5, 1, 10, 25)
+
+    def test_time_to_first_spike(self):
+        self.assert_close_spikes(time_to_first_spike, self.uniform, 10)
+
+    def test_phase(self):
+        self.assert_close_spikes(phase, self.uniform, 8)
+
+    def test_encoder_parameters(self):
+        """Test that a fitted encoder keeps its parameters in the dtype it computes in."""
+        encoder = BensSpikerEncoder(8, 0.5, 0.9, dtype=np.float32).fit(self.uniform)
+        self.assertEqual(encoder.shift.dtype, np.float32)
+        self.assertEqual(encoder.fir_bank.dtype, np.float32)
+        expected, _, _ = bens_spiker(self.uniform, 8, 0.5, 0.9)
+        self.assertLessEqual(np.mean(encoder.transform(self.uniform) != expected), SPIKE_TOLERANCE)
+
+    def test_contrast_decoder(self):
+        spikes, thresholds = step_forward(self.walk, 0.5)
+        expected = contrast_decoder(spikes, thresholds, self.walk[0])
+        result = contrast_decoder(spikes, thresholds.astype(np.float32), self.walk[0], dtype="auto")
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-5 * np.ptp(self.walk))
+
+    def test_deconvolution_decoder(self):
+        encoder = BensSpikerEncoder(8, 0.5, 0.9)
+        spikes = encoder.fit_transform(self.uniform)
+        expected = deconvolution_decoder(spikes, encoder.fir_bank, encoder.shift)
+        result = deconvolution_decoder(spikes, encoder.fir_bank, encoder.shift, dtype=np.float32)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-5)
+
+    def test_filterbank(self):
+        for filter_type in ("butterworth", "gammatone", "sos"):
+            with self.subTest(filter_type=filter_type):
+                filterbank = FilterBank(fs=1000, channels=4, f_min=50, f_max=400, order=2, filter_type=filter_type)
+                expected = filterbank.decompose(self.walk)
+                result = filterbank.decompose(self.walk.astype(np.float32), dtype="auto")
+                self.assertEqual(result.dtype, np.float32)
+                np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-5 * np.max(np.abs(expected)))
+
+
+if __name__ == "__main__":
+    unittest.main()
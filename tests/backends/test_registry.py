@@ -0,0 +1,107 @@
+import importlib.util
+import subprocess
+import sys
+import unittest
+import numpy as np
+from spikify.backends import available_backends, get_backend, get_kernel, register_kernel, set_backend, use_backend
+from spikify.backends.registry import _KERNELS
+from spikify.encoders.temporal.contrast import moving_window, step_forward
+from spikify.encoders.temporal.deconvolution import bens_spiker, hough_spiker, modified_hough_spiker
+
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+
+
+class TestBackendRegistry(unittest.TestCase):
+    """Tests for the backend registry."""
+
+    def tearDown(self):
+        set_backend("numpy")
+
+    def test_numpy_is_default_and_available(self):
+        """Test that the NumPy backend is the default one and is always available."""
+        self.assertEqual(get_backend(), "numpy")
+        self.assertIn("numpy", available_backends())
+
+    def test_set_backend(self):
+        """Test that the default backend can be changed globally."""
+        set_backend("numpy")
+        self.assertEqual(get_backend(), "numpy")
+
+    def test_unknown_backend_raises(self):
+        """Test that selecting an unknown backend raises ValueError, globally or per call."""
+        with self.assertRaises(ValueError):
+            set_backend("unknown")
+        with self.assertRaises(ValueError):
+            step_forward(np.array([0.0, 1.0]), 0.5, backend="unknown")
+
+    def test_use_backend_restores_previous(self):
+        """Test that the context manager restores the previous default backend, even on errors."""
+        with self.assertRaises(RuntimeError):
+            with use_backend("auto") as backend:
+                self.assertEqual(get_backend(), backend)
+                raise RuntimeError
+        self.assertEqual(get_backend(), "numpy")
+
+    def test_auto_backend(self):
+        """Test that 'auto' selects numba only when it is installed."""
+        with use_backend("auto") as backend:
+            self.assertEqual(backend, "numba" if HAS_NUMBA else "numpy")
+
+    def test_missing_kernel_falls_back_to_numpy(self):
+        """Test that a backend without a kernel falls back to the NumPy one."""
+        register_kernel("partial", "other_encoder")(lambda: None)
+        self.addCleanup(_KERNELS.pop, "partial")
+        self.assertIs(get_kernel("step_forward", "partial"), get_kernel("step_forward", "numpy"))
+
+    def test_import_does_not_load_optional_backends(self):
+        """Test that importing the encoders does not import any optional compiled backend."""
+        code = "import sys, spikify.encoders.temporal.contrast, spikify.encoders.temporal.deconvolution; "
+        code += "print('numba' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+@unittest.skipUnless(HAS_NUMBA, "numba is not installed")
+class TestNumbaBackend(unittest.TestCase):
+    """Tests that the numba kernels reproduce the NumPy ones."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.signal = np.cumsum(rng.normal(size=(500, 3)), axis=0)
+
+    def assert_same_outputs(self, encoder, *args):
+        expected = encoder(self.signal, *args, backend="numpy")
+        result = encoder(self.signal, *args, backend="numba")
+        for a, b in zip(expected, result):
+            np.testing.assert_array_equal(a, b)
+
+    def test_step_forward(self):
+        self.assert_same_outputs(step_forward, [0.5, 1.0, 2.0])
+
+    def test_moving_window(self):
+        self.assert_same_outputs(moving_window, 5, 0.5)
+
+    def test_moving_window_nonfinite(self):
+        """Test that non-finite samples only change the base of the windows holding them, as with NumPy."""
+        self.signal[[50, 120, 300, 310], [0, 1, 2, 2]] = [np.nan, np.inf, -np.inf, np.inf]
+        self.assert_same_outputs(moving_window, 5, 0.5)
+
+    def test_moving_window_long_window(self):
+        """Test that a window spanning most of the signal gives the same spikes."""
+        self.assert_same_outputs(moving_window, 400, 0.5)
+
+    def test_bens_spiker(self):
+        self.assert_same_outputs(bens_spiker, 5, 0.1, 0.1)
+
+    def test_hough_spiker(self):
+        self.assert_same_outputs(hough_spiker, 6, 0.1)
+
+    def test_modified_hough_spiker(self):
+        self.assert_same_outputs(modified_hough_spiker, 6, 0.1, 0.3)
+
+    def test_global_selection(self):
+        """Test that the numba backend is used when selected globally."""
+        with use_backend("numba"):
+            result, _ = step_forward(self.signal, 0.5)
+        expected, _ = step_forward(self.signal, 0.5)
+        np.testing.assert_array_equal(result, expected)
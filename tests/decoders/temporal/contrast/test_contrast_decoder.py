@@ -1,6 +1,7 @@
 import unittest
 import numpy as np
 from spikify.decoders.temporal.contrast.decoder_algorithm import contrast_decoder
+from spikify.spikes import SpikeEvents, SpikeTrain
 from spikify.encoders.temporal.contrast import (
     threshold_based_representation,
     step_forward,
@@ -261,3 +262,138 @@ class TestContrastDecoderRoundTripZCSF(unittest.TestCase):
         spikes, thresholds = zero_cross_step_forward(signal, threshold=999.0)
         result = contrast_decoder(spikes, thresholds, start_point=signal[0])
         np.testing.assert_array_almost_equal(result, np.full_like(signal, signal[0]))
+
+
+def reference_contrast_decoder(spikes, thresholds, start_points):
+    T, F = spikes.shape
+    signal = np.zeros((T, F), dtype=float)
+    signal[0] = start_points
+    for t in range(1, T):
+        for f in range(F):
+            if spikes[t, f] == 1:
+                signal[t, f] = signal[t - 1, f] + thresholds[f]
+            elif spikes[t, f] == -1:
+                signal[t, f] = signal[t - 1, f] - thresholds[f]
+            else:
+                signal[t, f] = signal[t - 1, f]
+    return signal
+
+
+class TestContrastDecoderVectorized(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.spikes = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=(2000, 4), p=[0.1, 0.8, 0.1])
+        self.thresholds = rng.uniform(0.01, 0.5, 4)
+        self.start_points = rng.normal(size=4)
+
+    def test_matches_sequential_loop(self):
+        result = contrast_decoder(self.spikes, self.thresholds, self.start_points)
+        expected = reference_contrast_decoder(self.spikes, self.thresholds, self.start_points)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_first_timestep_spikes_are_ignored(self):
+        result = contrast_decoder(np.array([1, 0, -1], dtype=np.int8), np.array([0.5]), start_point=2.0)
+        np.testing.assert_array_equal(result.flatten(), [2.0, 2.0, 1.5])
+
+    def test_float32_dtype(self):
+        result = contrast_decoder(self.spikes, self.thresholds, self.start_points, dtype=np.float32)
+        self.assertEqual(result.dtype, np.float32)
+        expected = reference_contrast_decoder(self.spikes, self.thresholds, self.start_points)
+        np.testing.assert_allclose(result, expected, atol=1e-4)
+
+    def test_out_buffer(self):
+        out = np.full(self.spikes.shape, np.nan)
+        result = contrast_decoder(self.spikes, self.thresholds, self.start_points, out=out)
+        self.assertIs(result, out)
+        np.testing.assert_array_equal(out, contrast_decoder(self.spikes, self.thresholds, self.start_points))
+
+    def test_out_buffer_sets_dtype(self):
+        out = np.empty(self.spikes.shape, dtype=np.float32)
+        result = contrast_decoder(self.spikes, self.thresholds, self.start_points, out=out)
+        self.assertEqual(result.dtype, np.float32)
+
+    def test_out_shape_mismatch_raises(self):
+        with self.assertRaises(ValueError):
+            contrast_decoder(self.spikes, self.thresholds, self.start_points, out=np.empty((10, 4)))
+
+    def test_out_dtype_mismatch_raises(self):
+        with self.assertRaises(ValueError):
+            contrast_decoder(self.spikes, self.thresholds, self.start_points, dtype=np.float32, out=np.empty((2000, 4)))
+
+
+class TestContrastDecoderEvents(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.spikes = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=(3000, 5), p=[0.02, 0.96, 0.02])
+        self.thresholds = rng.uniform(0.01, 0.5, 5)
+        self.start_points = rng.normal(size=5)
+
+    def test_events_match_dense(self):
+        events = SpikeEvents.from_dense(self.spikes)
+        result = contrast_decoder(events, self.thresholds, self.start_points)
+        np.testing.assert_array_equal(result, contrast_decoder(self.spikes, self.thresholds, self.start_points))
+
+    def test_events_at_first_timestep_are_ignored(self):
+        events = SpikeEvents([0, 2], [0, 0], [1, -1], shape=(4, 1))
+        result = contrast_decoder(events, np.array([0.5]), start_point=2.0)
+        np.testing.assert_array_equal(result.flatten(), [2.0, 2.0, 1.5, 1.5])
+
+    def test_silent_feature(self):
+        events = SpikeEvents([1], [1], [1], shape=(3, 2))
+        result = contrast_decoder(events, np.array([0.5, 0.5]), start_point=[1.0, 0.0])
+        np.testing.assert_array_equal(result, [[1.0, 0.0], [1.0, 0.5], [1.0, 0.5]])
+
+    def test_events_with_dtype_and_out(self):
+        out = np.empty(self.spikes.shape, dtype=np.float32)
+        result = contrast_decoder(SpikeEvents.from_dense(self.spikes), self.thresholds, self.start_points, out=out)
+        self.assertIs(result, out)
+        expected = contrast_decoder(self.spikes, self.thresholds, self.start_points, dtype=np.float32)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_empty_events_shape_raises(self):
+        with self.assertRaises(ValueError):
+            contrast_decoder(SpikeEvents([], [], [], shape=(0, 1)), np.array([0.2]), start_point=0.0)
+
+    def test_packed_spike_train_matches_dense(self):
+        train = SpikeTrain.from_dense(self.spikes)
+        result = contrast_decoder(train, self.thresholds, self.start_points)
+        np.testing.assert_array_equal(result, contrast_decoder(self.spikes, self.thresholds, self.start_points))
+
+
+class TestContrastDecoderBatchInput(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.signal = np.cumsum(rng.normal(scale=0.3, size=(4, 300, 3)), axis=1)
+        self.spikes, self.thresholds = step_forward(self.signal, 0.2)
+
+    def test_batch_matches_samples(self):
+        result = contrast_decoder(self.spikes, self.thresholds, self.signal[:, 0])
+        self.assertEqual(result.shape, self.signal.shape)
+        for n in range(4):
+            expected = contrast_decoder(self.spikes[n], self.thresholds[n], self.signal[n, 0])
+            np.testing.assert_array_equal(result[n], expected)
+
+    def test_batch_of_events(self):
+        events, _ = step_forward(self.signal, 0.2, output="events")
+        expected = contrast_decoder(self.spikes, self.thresholds, self.signal[:, 0])
+        np.testing.assert_array_equal(contrast_decoder(events, self.thresholds, self.signal[:, 0]), expected)
+
+    def test_shared_parameters(self):
+        result = contrast_decoder(self.spikes, np.full(3, 0.2), 0.0)
+        np.testing.assert_array_equal(result[1], contrast_decoder(self.spikes[1], np.full(3, 0.2), 0.0))
+
+    def test_out(self):
+        out = np.empty(self.signal.shape, dtype=np.float32)
+        result = contrast_decoder(self.spikes, self.thresholds, self.signal[:, 0], out=out)
+        self.assertIs(result, out)
+        expected = contrast_decoder(self.spikes, self.thresholds, self.signal[:, 0], dtype=np.float32)
+        np.testing.assert_array_equal(out, expected)
+        with self.assertRaises(ValueError):
+            contrast_decoder(self.spikes, self.thresholds, self.signal[:, 0], out=np.empty((300, 12)))
+
+    def test_start_point_mismatch_raises(self):
+        with self.assertRaises(ValueError):
+            contrast_decoder(self.spikes, self.thresholds, np.zeros((3, 3)))
@@ -1,6 +1,8 @@
 import unittest
 import numpy as np
+from scipy.signal import lfilter
 from spikify.decoders.temporal.deconvolution.decoder_algorithm import deconvolution_decoder
+from spikify.spikes import SpikeEvents, SpikeTrain
 from spikify.encoders.temporal.deconvolution import (
     bens_spiker,
     hough_spiker,
@@ -281,3 +283,168 @@ class TestDeconvolutionDecoderRoundTripHSA(unittest.TestCase):
         signal = np.array([0.1, 0.3, 0.5])
         with self.assertRaises(ValueError):
             hough_spiker(signal, window_length=4, cutoff=0.1)
+
+
+def reference_deconvolution_decoder(spikes, fir_bank, shift, norm=None):
+    T, F = spikes.shape
+    signal = np.zeros((T, F))
+    for f in range(F):
+        x = lfilter(fir_bank[:, f], 1, spikes[:, f], axis=0)
+        signal[:, f] = x * norm[f] + shift[f] if norm is not None else x + shift[f]
+    return signal
+
+
+class TestDeconvolutionDecoderBatched(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.spikes = (rng.random((3000, 5)) < 0.05).astype(np.int8)
+        self.shift = rng.normal(size=5)
+        self.norm = rng.uniform(0.5, 2.0, 5)
+        self.rng = rng
+
+    def test_shared_filter_matches_per_feature_loop(self):
+        fir_bank = np.tile(self.rng.random((9, 1)), (1, 5))
+        result = deconvolution_decoder(self.spikes, fir_bank, self.shift, self.norm)
+        expected = reference_deconvolution_decoder(self.spikes, fir_bank, self.shift, self.norm)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_1d_filter_is_shared(self):
+        fir = self.rng.random(9)
+        result = deconvolution_decoder(self.spikes, fir, self.shift)
+        expected = reference_deconvolution_decoder(self.spikes, np.tile(fir[:, None], (1, 5)), self.shift)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_short_per_feature_filters(self):
+        fir_bank = self.rng.random((9, 5))
+        result = deconvolution_decoder(self.spikes, fir_bank, self.shift, self.norm)
+        expected = reference_deconvolution_decoder(self.spikes, fir_bank, self.shift, self.norm)
+        np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
+
+    def test_long_per_feature_filters(self):
+        fir_bank = self.rng.random((200, 5))
+        result = deconvolution_decoder(self.spikes, fir_bank, self.shift, self.norm)
+        expected = reference_deconvolution_decoder(self.spikes, fir_bank, self.shift, self.norm)
+        np.testing.assert_allclose(result, expected, rtol=1e-10, atol=1e-10)
+
+    def test_filter_longer_than_signal(self):
+        spikes = np.array([[1, 0], [0, 1], [1, 1]], dtype=np.int8)
+        for length in (10, 100):
+            fir_bank = self.rng.random((length, 2))
+            result = deconvolution_decoder(spikes, fir_bank, np.zeros(2))
+            expected = reference_deconvolution_decoder(spikes, fir_bank, np.zeros(2))
+            np.testing.assert_allclose(result, expected, atol=1e-12)
+
+    def test_float32_dtype(self):
+        fir_bank = self.rng.random((9, 5))
+        for bank in (fir_bank, np.tile(fir_bank[:, :1], (1, 5))):
+            result = deconvolution_decoder(self.spikes, bank, self.shift, self.norm, dtype=np.float32)
+            self.assertEqual(result.dtype, np.float32)
+            expected = reference_deconvolution_decoder(self.spikes, bank, self.shift, self.norm)
+            np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-5)
+
+    def test_out_buffer(self):
+        for fir_bank in (self.rng.random((9, 5)), self.rng.random((200, 5)), np.tile(self.rng.random((9, 1)), (1, 5))):
+            out = np.full(self.spikes.shape, np.nan)
+            result = deconvolution_decoder(self.spikes, fir_bank, self.shift, self.norm, out=out)
+            self.assertIs(result, out)
+            np.testing.assert_array_equal(out, deconvolution_decoder(self.spikes, fir_bank, self.shift, self.norm))
+
+    def test_out_buffer_sets_dtype(self):
+        out = np.empty(self.spikes.shape, dtype=np.float32)
+        result = deconvolution_decoder(self.spikes, self.rng.random((9, 5)), self.shift, out=out)
+        self.assertEqual(result.dtype, np.float32)
+
+    def test_out_mismatch_raises(self):
+        fir_bank = self.rng.random((9, 5))
+        with self.assertRaises(ValueError):
+            deconvolution_decoder(self.spikes, fir_bank, self.shift, out=np.empty((10, 5)))
+        with self.assertRaises(ValueError):
+            deconvolution_decoder(self.spikes, fir_bank, self.shift, dtype=np.float32, out=np.empty((3000, 5)))
+
+    def test_round_trip_bsa_per_feature_scaling(self):
+        rng = np.random.default_rng(1)
+        signal = np.abs(rng.normal(size=(200, 3))) * np.array([0.5, 2.0, 4.0])
+        spikes, fir_bank, shift = bens_spiker(signal, 5, 0.1, 0.5)
+        result = deconvolution_decoder(spikes, fir_bank, shift)
+        expected = reference_deconvolution_decoder(spikes, fir_bank, shift)
+        np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
+
+
+class TestDeconvolutionDecoderEvents(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.spikes = (rng.random((2000, 4)) < 0.03).astype(np.int8)
+        self.shift = rng.normal(size=4)
+        self.norm = rng.uniform(0.5, 2.0, 4)
+        self.rng = rng
+
+    def test_events_match_dense(self):
+        events = SpikeEvents.from_dense(self.spikes)
+        for fir_bank in (self.rng.random((7, 4)), np.tile(self.rng.random((7, 1)), (1, 4)), self.rng.random((90, 4))):
+            result = deconvolution_decoder(events, fir_bank, self.shift, self.norm)
+            expected = deconvolution_decoder(self.spikes, fir_bank, self.shift, self.norm)
+            np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
+
+    def test_filter_runs_past_the_end(self):
+        events = SpikeEvents([3], [0], [1], shape=(5, 1))
+        result = deconvolution_decoder(events, np.array([[1.0], [2.0], [3.0]]), np.zeros(1))
+        np.testing.assert_array_equal(result.flatten(), [0.0, 0.0, 0.0, 1.0, 2.0])
+
+    def test_polarity_scales_filter(self):
+        events = SpikeEvents([0, 1], [0, 0], [1, -1], shape=(3, 1))
+        result = deconvolution_decoder(events, np.array([[1.0], [2.0]]), np.zeros(1))
+        np.testing.assert_array_equal(result.flatten(), [1.0, 1.0, -2.0])
+
+    def test_events_dtype(self):
+        events = SpikeEvents.from_dense(self.spikes)
+        result = deconvolution_decoder(events, self.rng.random((7, 4)), self.shift, dtype=np.float32)
+        self.assertEqual(result.dtype, np.float32)
+
+    def test_packed_spike_train_matches_dense(self):
+        fir_bank = self.rng.random((7, 4))
+        result = deconvolution_decoder(SpikeTrain.from_dense(self.spikes), fir_bank, self.shift, self.norm)
+        expected = deconvolution_decoder(self.spikes, fir_bank, self.shift, self.norm)
+        np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
+
+
+class TestDeconvolutionDecoderBatchInput(unittest.TestCase):
+
+    def setUp(self):
+        self.signal = np.random.default_rng(4).uniform(-1, 3, (4, 200, 3))
+
+    def test_batch_matches_samples(self):
+        for spikes, *parameters in (
+            bens_spiker(self.signal, 8, 0.1, 0.2),
+            hough_spiker(self.signal, 8, 0.1),
+            modified_hough_spiker(self.signal, 8, 0.1, 0.2),
+        ):
+            result = deconvolution_decoder(spikes, *parameters)
+            self.assertEqual(result.shape, self.signal.shape)
+            for n in range(4):
+                expected = deconvolution_decoder(spikes[n], *(value[n] for value in parameters))
+                np.testing.assert_allclose(result[n], expected, rtol=1e-12, atol=1e-12)
+
+    def test_batch_of_events(self):
+        spikes, fir_bank, shift, norm = hough_spiker(self.signal, 8, 0.1)
+        events, *_ = hough_spiker(self.signal, 8, 0.1, output="events")
+        expected = deconvolution_decoder(spikes, fir_bank, shift, norm)
+        np.testing.assert_allclose(deconvolution_decoder(events, fir_bank, shift, norm), expected, atol=1e-12)
+
+    def test_shared_parameters(self):
+        spikes = (np.random.default_rng(5).random((3, 100, 2)) < 0.1).astype(np.int8)
+        fir = np.random.default_rng(6).random(9)
+        result = deconvolution_decoder(spikes, fir, np.zeros(2))
+        np.testing.assert_allclose(result[2], deconvolution_decoder(spikes[2], fir, np.zeros(2)), atol=1e-12)
+
+    def test_batch_out_buffer(self):
+        spikes, fir_bank, shift, norm = hough_spiker(self.signal, 8, 0.1)
+        out = np.full(self.signal.shape, np.nan)
+        self.assertIs(deconvolution_decoder(spikes, fir_bank, shift, norm, out=out), out)
+        np.testing.assert_array_equal(out, deconvolution_decoder(spikes, fir_bank, shift, norm))
+
+    def test_shift_mismatch_raises(self):
+        spikes, fir_bank, shift, norm = hough_spiker(self.signal, 8, 0.1)
+        with self.assertRaises(ValueError):
+            deconvolution_decoder(spikes, fir_bank, shift[:2], norm)
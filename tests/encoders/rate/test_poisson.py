@@ -1,6 +1,8 @@
 import unittest
 import numpy as np
-from spikify.encoders.rate.poisson_algorithm import poisson
+from spikify.encoders.rate.poisson_algorithm import PoissonEncoder, poisson
+from spikify.parallel import encode_many
+from spikify.rng import CounterRNG
 
 
 class TestPoissonRateEncoding(unittest.TestCase):
@@ -77,6 +79,200 @@ class TestPoissonRateEncoding(unittest.TestCase):
         encoded_signal = poisson(signal, interval)
         self.assertEqual(encoded_signal.shape, signal.shape)
 
+    def test_batch_shape(self):
+        """Test that a batch is encoded into one spike train per sample, and that silent samples stay silent."""
+        signal = np.random.default_rng(5).uniform(0, 3, (4, 40, 3))
+        signal[2] = 0
+        spikes = poisson(signal, 8)
+        self.assertEqual(spikes.shape, signal.shape)
+        self.assertFalse(spikes[2].any())
+        self.assertTrue(spikes[[0, 1, 3]].any(axis=(1, 2)).all())
+
+    def test_spike_rate(self):
+        """Test that the fraction of timesteps with a spike follows the Poisson law of the signal rate."""
+        for rate in (0.1, 0.5, 0.9):
+            spikes = poisson(np.full((50000, 2), rate), 1)
+            # Probability of at least one arrival within a timestep
+            expected = 1 - np.exp(-rate)
+            self.assertAlmostEqual(spikes.mean(), expected, delta=0.02)
+
+    def test_method_spike_rate(self):
+        """Test that the Bernoulli and binomial methods spike at every timestep with the interval rate."""
+        signal = np.repeat([[0.1, 0.5, 0.9]], 40000, axis=0)
+        for method in ("bernoulli", "binomial"):
+            spikes = poisson(signal, 10, method=method)
+            np.testing.assert_allclose(spikes.mean(axis=0), signal[0], atol=0.01)
+
+    def test_method_extreme_rates(self):
+        """Test that every method stays silent at rate 0, and that the per-timestep methods always spike at 1."""
+        signal = np.repeat([[0.0, 1.0]], 40, axis=0)
+        for method in ("isi", "bernoulli", "binomial"):
+            spikes = poisson(signal, 8, method=method)
+            self.assertFalse(spikes[:, 0].any())
+            if method != "isi":
+                self.assertTrue(spikes[:, 1].all())
+
+    def test_binomial_count_within_interval(self):
+        """Test that the binomial method draws at most one spike per timestep, spread over the whole interval."""
+        spikes = poisson(np.full((8000, 2), 0.5), 8, method="binomial").reshape(1000, 8, 2)
+        self.assertTrue(np.isin(spikes, (0, 1)).all())
+        np.testing.assert_allclose(spikes.mean(axis=(0, 2)), 0.5, atol=0.05)
+
+    def test_method_events_output(self):
+        """Test that the events of every method describe the same spike train as its dense output."""
+        signal = np.random.default_rng(0).random((64, 3))
+        for method in ("isi", "bernoulli", "binomial"):
+            dense = poisson(signal, 4, method=method)
+            events = poisson(signal, 4, method=method, output="events")
+            np.testing.assert_array_equal(events.to_dense(), dense)
+
+    def test_unsupported_method_raises(self):
+        """Test that an unsupported method raises ValueError."""
+        with self.assertRaises(ValueError):
+            poisson(np.random.rand(8), 4, method="gaussian")
+
+    def test_seed_types(self):
+        """Test that an integer seed, a SeedSequence and a Generator seeded the same way give the same spikes."""
+        signal = np.random.default_rng(5).uniform(0, 1, (40, 3))
+        expected = poisson(signal, 8, seed=7)
+        np.testing.assert_array_equal(poisson(signal, 8, seed=np.random.SeedSequence(7)), expected)
+        np.testing.assert_array_equal(poisson(signal, 8, seed=np.random.default_rng(7)), expected)
+        self.assertFalse(np.array_equal(poisson(signal, 8, seed=8), expected))
+
+    def test_spawned_streams(self):
+        """Test that the children of a SeedSequence give independent streams, reproducible from the parent."""
+        signal = np.full((400, 2), 0.5)
+        first = [poisson(signal, 8, seed=child) for child in np.random.SeedSequence(3).spawn(2)]
+        second = [poisson(signal, 8, seed=child) for child in np.random.SeedSequence(3).spawn(2)]
+        np.testing.assert_array_equal(first[0], second[0])
+        np.testing.assert_array_equal(first[1], second[1])
+        self.assertFalse(np.array_equal(first[0], first[1]))
+
+    def test_counter_rng_batch_matches_recordings(self):
+        """Test that the samples of a batch get the spikes of consecutive recordings encoded one by one."""
+        signal = np.random.default_rng(5).uniform(0, 1, (3, 40, 2))
+        for method in ("isi", "bernoulli", "binomial"):
+            spikes = poisson(signal, 8, seed=CounterRNG(7, recording=2), method=method)
+            for n in range(3):
+                expected = poisson(signal[n], 8, seed=CounterRNG(7, recording=2 + n), method=method)
+                np.testing.assert_array_equal(spikes[n], expected)
+
+    def test_counter_rng_spike_rate(self):
+        """Test that the counter-based random numbers give the spike rate of the Generator ones."""
+        signal = np.repeat([[0.1, 0.5, 0.9]], 40000, axis=0)
+        for method in ("isi", "bernoulli", "binomial"):
+            expected = poisson(signal, 10, method=method).mean(axis=0)
+            spikes = poisson(signal, 10, seed=CounterRNG(1), method=method)
+            np.testing.assert_allclose(spikes.mean(axis=0), expected, atol=0.01)
+
+    def test_global_random_state_untouched(self):
+        """Test that encoding neither reads nor reseeds the global NumPy random state."""
+        np.random.seed(1)
+        expected = np.random.random(3)
+        np.random.seed(1)
+        poisson(np.full(40, 0.5), 8)
+        np.testing.assert_array_equal(np.random.random(3), expected)
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).uniform(0, 3, (4, 40, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.int8)
+            self.assertIs(poisson(values, 8, out=out), out)
+            np.testing.assert_array_equal(out, poisson(values, 8))
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).uniform(0, 3, (40, 3))
+        for out, output in (
+            (np.zeros((40, 2), dtype=np.int8), "dense"),
+            (np.zeros((40, 3), dtype=bool), "dense"),
+            (np.zeros((40, 3), dtype=np.int8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                poisson(signal, 8, output=output, out=out)
+
+
+class TestPoissonEncoder(unittest.TestCase):
+    """Tests for the PoissonEncoder class."""
+
+    def test_fit_transform_matches_function(self):
+        """Test that fitting and encoding the same signal gives the output of poisson."""
+        signal = np.random.default_rng(0).uniform(-1, 3, (40, 3))
+        np.testing.assert_array_equal(PoissonEncoder(4, seed=1).fit_transform(signal), poisson(signal, 4, seed=1))
+
+    def test_method(self):
+        """Test that the encoder draws its spikes with the selected method."""
+        signal = np.random.default_rng(0).uniform(0, 3, (40, 3))
+        for method in ("bernoulli", "binomial"):
+            encoder = PoissonEncoder(4, method=method)
+            np.testing.assert_array_equal(encoder.fit_transform(signal), poisson(signal, 4, method=method))
+
+    def test_transform_uses_fitted_scaling(self):
+        """Test that a fitted encoder scales every signal with the calibration amplitude."""
+        encoder = PoissonEncoder(4).fit(np.array([[0.0, 0.5], [4.0, 0.2]]))
+        np.testing.assert_array_equal(encoder.norm, [4.0, 1.0])
+        signal = np.array([[2.0, 0.5]] * 8)
+        expected = poisson(np.array([[0.5, 0.5]] * 8), 4)
+        np.testing.assert_array_equal(encoder.transform(signal), expected)
+
+    def test_seed_restarts_every_signal(self):
+        """Test that a seed gives the same spikes for every encoded signal, while a Generator keeps drawing."""
+        signal = np.full((400, 2), 0.5)
+        encoder = PoissonEncoder(8, seed=2).fit(signal)
+        np.testing.assert_array_equal(encoder.transform(signal), encoder.transform(signal))
+        encoder = PoissonEncoder(8, seed=np.random.default_rng(2)).fit(signal)
+        self.assertFalse(np.array_equal(encoder.transform(signal), encoder.transform(signal)))
+
+    def test_counter_rng_chunks(self):
+        """Test that counter-based spikes do not depend on how the signal is split in time or by feature."""
+        signal = np.random.default_rng(3).uniform(0, 2, (80, 6))
+        for method in ("isi", "bernoulli", "binomial"):
+            encoder = PoissonEncoder(8, seed=CounterRNG(4, recording=1), method=method).fit(signal)
+            expected = encoder.transform(signal)
+
+            chunks = []
+            for start in range(0, 80, 16):
+                encoder.seed = CounterRNG(4, recording=1, start=start // 8)
+                chunks.append(encoder.transform(signal[start : start + 16]))
+            np.testing.assert_array_equal(np.concatenate(chunks), expected)
+
+            encoder.seed = CounterRNG(4, recording=1)
+            (features,) = encode_many(encoder, [signal], workers=3, strategy="thread", chunking="feature")
+            np.testing.assert_array_equal(features, expected)
+
+    def test_not_fitted_raises(self):
+        """Test that transforming before fitting raises ValueError."""
+        with self.assertRaises(ValueError):
+            PoissonEncoder(4).transform(np.ones(8))
+
+    def test_feature_mismatch_raises(self):
+        """Test that a signal with other features than the calibration signal raises ValueError."""
+        encoder = PoissonEncoder(4).fit(np.ones((8, 2)))
+        with self.assertRaises(ValueError):
+            encoder.transform(np.ones((8, 3)))
+
 
 if __name__ == "__main__":
     unittest.main()
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = rng.random((64, 3))
+        dense = poisson(signal, 4)
+        events = poisson(signal, 4, output="events")
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            poisson(np.random.rand(8), 4, output="sparse")
+
+    def test_fit_batch_pools_samples(self):
+        """Test that fitting on a batch computes the scaling over all of its samples."""
+        signal = np.random.default_rng(6).uniform(0, 3, (4, 40, 2))
+        encoder = PoissonEncoder(8).fit(signal)
+        np.testing.assert_array_equal(encoder.norm, signal.max(axis=(0, 1)))
+        self.assertEqual(encoder.transform(signal).shape, signal.shape)
@@ -1,6 +1,27 @@
 import unittest
 import numpy as np
-from spikify.encoders.temporal.contrast.moving_window_algorithm import moving_window
+from spikify.encoders.temporal.contrast.moving_window_algorithm import (
+    MovingWindowEncoder,
+    _moving_window_kernel,
+    moving_window,
+)
+
+
+def reference_moving_window(signal, window_length, thresholds):
+    """Per-sample Moving Window loop the running-sum engine must reproduce."""
+    T, F = signal.shape
+    spikes = np.zeros_like(signal, dtype=np.int8)
+    for f in range(F):
+        for t in range(T):
+            if t < window_length:
+                base = np.mean(signal[:window_length, f])
+            else:
+                base = np.mean(signal[t - window_length : t, f])
+            if signal[t, f] > base + thresholds[f]:
+                spikes[t, f] = 1
+            elif signal[t, f] < base - thresholds[f]:
+                spikes[t, f] = -1
+    return spikes
 
 
 class TestMovingWindow(unittest.TestCase):
@@ -113,3 +134,151 @@ class TestMovingWindow(unittest.TestCase):
         threshold = [0.1, 0.3, 0.4]
         with self.assertRaises(ValueError):
             moving_window(signal, window_length, threshold)
+
+    def test_matches_reference_with_long_window(self):
+        """Test that long windows on a drifting multi-feature signal match the per-sample mean."""
+        rng = np.random.default_rng(0)
+        signal = np.cumsum(rng.normal(size=(4000, 3)), axis=0) + 1000.0
+        thresholds = np.array([0.5, 1.0, 2.0])
+        result, _ = moving_window(signal, 1500, thresholds)
+        np.testing.assert_array_equal(result, reference_moving_window(signal, 1500, thresholds))
+
+    def test_matches_reference_with_nonfinite_samples(self):
+        """Test that NaN and infinite samples only affect the windows holding them, as with the per-sample mean."""
+        rng = np.random.default_rng(2)
+        signal = np.cumsum(rng.normal(size=(3000, 4)), axis=0)
+        signal[[5, 400, 1200, 1210, 2500], [0, 1, 2, 2, 3]] = [np.nan, np.inf, np.inf, -np.inf, np.nan]
+        signal[0, 3] = -np.inf
+        thresholds = np.array([0.5, 1.0, 1.5, 2.0])
+        # The per-sample mean of a window holding infinities of both signs warns
+        with np.errstate(invalid="ignore"):
+            expected = reference_moving_window(signal, 50, thresholds)
+        for block in (None, 7, 60):
+            result = _moving_window_kernel(signal, 50, thresholds, block=block)
+            np.testing.assert_array_equal(result, expected)
+        # Spikes keep coming after the NaN sample
+        self.assertTrue(np.abs(expected[2600:, 3]).any())
+
+    def test_window_length_equal_to_signal(self):
+        """Test that a window as long as the signal uses the warm-up base for every sample."""
+        signal = np.array([0.0, 1.0, 2.0, 3.0])
+        result, _ = moving_window(signal, 4, 1.0)
+        np.testing.assert_array_equal(result.flatten(), [-1, 0, 0, 1])
+
+    def test_kernel_block_boundaries(self):
+        """Test that restarting the running sums at any block size gives the same spikes."""
+        rng = np.random.default_rng(1)
+        signal = np.cumsum(rng.normal(size=(600, 2)), axis=0)
+        thresholds = np.array([0.3, 0.6])
+        expected = reference_moving_window(signal, 7, thresholds)
+        for block in (1, 7, 50, 1000):
+            np.testing.assert_array_equal(_moving_window_kernel(signal, 7, thresholds, block=block), expected)
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = np.cumsum(rng.normal(scale=0.1, size=(3000, 3)), axis=0)
+        dense = moving_window(signal, 5, 0.2)[0]
+        events = moving_window(signal, 5, 0.2, output="events")[0]
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            moving_window(np.random.rand(8), 2, 0.2, output="sparse")
+
+    def test_batch_matches_samples(self):
+        """Test that a batch (samples, time, features) gives the outputs of encoding every sample on its own."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))
+        spikes, thresholds = moving_window(signal, 5, [0.2, 0.3, 0.4])
+        self.assertEqual(thresholds.shape, (4, 3))
+        for n in range(4):
+            np.testing.assert_array_equal(spikes[n], moving_window(signal[n], 5, [0.2, 0.3, 0.4])[0])
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.int8)
+            self.assertIs(moving_window(values, 5, 0.3, out=out)[0], out)
+            np.testing.assert_array_equal(out, moving_window(values, 5, 0.3)[0])
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))[0]
+        for out, output in (
+            (np.zeros((100, 2), dtype=np.int8), "dense"),
+            (np.zeros((100, 3), dtype=bool), "dense"),
+            (np.zeros((100, 3), dtype=np.int8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                moving_window(signal, 5, 0.3, output=output, out=out)
+
+
+class TestMovingWindowEncoder(unittest.TestCase):
+    """Tests for the streaming MovingWindowEncoder class."""
+
+    def test_chunks_match_full_signal(self):
+        """Test that concatenating the chunk outputs equals encoding the full signal, for any chunking."""
+        rng = np.random.default_rng(0)
+        signal = np.cumsum(rng.normal(size=(1000, 3)), axis=0)
+        for window_length in (1, 4, 60):
+            expected, _ = moving_window(signal, window_length, [0.2, 0.5, 1.0])
+            for size in (1, 7, 100, 1000):
+                encoder = MovingWindowEncoder(window_length, [0.2, 0.5, 1.0])
+                chunks = [encoder.push(signal[i : i + size]) for i in range(0, len(signal), size)]
+                result = np.concatenate(chunks + [encoder.flush()])
+                np.testing.assert_array_equal(result, expected)
+
+    def test_block_boundaries(self):
+        """Test that the running sums are restarted exactly where the offline kernel restarts them."""
+        rng = np.random.default_rng(1)
+        signal = np.round(np.cumsum(rng.normal(size=(600, 2)), axis=0), 1) + 1000
+        thresholds = np.array([0.3, 0.6])
+        for window_length, block in ((5, 5), (5, 64), (30, 31)):
+            expected = _moving_window_kernel(signal, window_length, thresholds, block=block)
+            for size in (1, 13, 600):
+                encoder = MovingWindowEncoder(window_length, thresholds)
+                state = dict(encoder.init_state(2), block=block)
+                chunks = []
+                for i in range(0, len(signal), size):
+                    spikes, state = encoder.process(signal[i : i + size], state)
+                    chunks.append(spikes)
+                np.testing.assert_array_equal(np.concatenate(chunks), expected)
+
+    def test_chunks_with_nonfinite_samples(self):
+        """Test that chunks holding NaN and infinite samples give the output of the full signal."""
+        rng = np.random.default_rng(2)
+        signal = np.cumsum(rng.normal(size=(800, 2)), axis=0)
+        signal[[3, 100, 420, 421], [0, 1, 0, 0]] = [np.nan, -np.inf, np.inf, np.nan]
+        for window_length, block in ((10, 10), (10, 64), (30, 200)):
+            expected = _moving_window_kernel(signal, window_length, np.array([0.5, 1.0]), block=block)
+            for size in (1, 17, 800):
+                encoder = MovingWindowEncoder(window_length, [0.5, 1.0])
+                state = dict(encoder.init_state(2), block=block)
+                chunks = []
+                for i in range(0, len(signal), size):
+                    spikes, state = encoder.process(signal[i : i + size], state)
+                    chunks.append(spikes)
+                np.testing.assert_array_equal(np.concatenate(chunks), expected)
+
+    def test_warm_up_is_held(self):
+        """Test that no spike is returned until the first window is full."""
+        encoder = MovingWindowEncoder(3, 0.2)
+        self.assertEqual(encoder.push(np.array([0.1, 0.3])).shape, (0, 1))
+        self.assertEqual(encoder.push(np.array([0.2, 0.5])).shape, (4, 1))
+
+    def test_signal_shorter_than_window(self):
+        """Test that finalize encodes a short signal against the mean of its samples."""
+        encoder = MovingWindowEncoder(10, 1.0)
+        encoder.push(np.array([0.0, 3.0, 0.0]))
+        np.testing.assert_array_equal(encoder.flush().flatten(), [0, 1, 0])
+        self.assertIsNone(encoder.state)
+
+    def test_feature_mismatch_raises(self):
+        """Test that a chunk with a different number of features raises ValueError."""
+        encoder = MovingWindowEncoder(2, 0.5)
+        encoder.push(np.zeros((5, 2)))
+        with self.assertRaises(ValueError):
+            encoder.push(np.zeros((5, 3)))
@@ -1,6 +1,28 @@
 import unittest
 import numpy as np
-from spikify.encoders.temporal.contrast.step_forward_algorithm import step_forward
+from spikify.encoders.temporal.contrast.step_forward_algorithm import (
+    StepForwardEncoder,
+    _lockstep_step_forward,
+    _step_forward_kernel,
+    step_forward,
+)
+
+
+def reference_step_forward(signal, thresholds):
+    """Sequential per-feature Step-Forward loop the vectorized engine must reproduce bit for bit."""
+    T, F = signal.shape
+    spike = np.zeros((T, F), dtype=np.int8)
+    for feat in range(F):
+        base = signal[0, feat]
+        for t in range(1, T):
+            value = signal[t, feat]
+            if value > base + thresholds[feat]:
+                spike[t, feat] = 1
+                base += thresholds[feat]
+            elif value < base - thresholds[feat]:
+                spike[t, feat] = -1
+                base -= thresholds[feat]
+    return spike
 
 
 class TestStepForward(unittest.TestCase):
@@ -117,3 +139,203 @@ class TestStepForward(unittest.TestCase):
         threshold = np.array([[0.1, 0.2], [0.3, 0.4]])
         with self.assertRaises(ValueError):
             step_forward(signal, threshold)
+
+    def test_single_sample(self):
+        """Test that a single-sample signal produces no spikes."""
+        result, _ = step_forward(np.array([3.0]), 1.0)
+        np.testing.assert_array_equal(result, np.zeros((1, 1), dtype=np.int8))
+
+    def test_matches_reference_on_smooth_signal(self):
+        """Test that slowly moving signals (closed-form path) match the sequential loop bit for bit."""
+        rng = np.random.default_rng(0)
+        signal = np.cumsum(rng.normal(scale=0.05, size=(3000, 6)), axis=0)
+        thresholds = rng.uniform(0.1, 0.5, 6)
+        result, _ = step_forward(signal, thresholds)
+        np.testing.assert_array_equal(result, reference_step_forward(signal, thresholds))
+
+    def test_matches_reference_on_noisy_signal(self):
+        """Test that signals jumping several thresholds per sample match the sequential loop bit for bit."""
+        rng = np.random.default_rng(1)
+        signal = rng.normal(scale=3.0, size=(2000, 5))
+        thresholds = rng.uniform(0.1, 1.0, 5)
+        result, _ = step_forward(signal, thresholds)
+        np.testing.assert_array_equal(result, reference_step_forward(signal, thresholds))
+
+    def test_matches_reference_on_many_noisy_features(self):
+        """Test that many features jumping several thresholds per sample, advanced in lockstep, match the loop."""
+        rng = np.random.default_rng(7)
+        signal = rng.normal(scale=3.0, size=(500, 32))
+        thresholds = rng.uniform(0.1, 1.0, 32)
+        result, _ = step_forward(signal, thresholds)
+        np.testing.assert_array_equal(result, reference_step_forward(signal, thresholds))
+
+    def test_matches_reference_with_glitches(self):
+        """Test that smooth signals with a few samples jumping far away match the sequential loop bit for bit."""
+        rng = np.random.default_rng(8)
+        signal = np.cumsum(rng.normal(scale=0.05, size=(60000, 2)), axis=0)
+        signal[[100, 30000, 30001, 59990], [0, 0, 1, 1]] += [20.0, -15.0, 8.0, 30.0]
+        thresholds = np.array([0.2, 0.3])
+        result, _ = step_forward(signal, thresholds)
+        np.testing.assert_array_equal(result, reference_step_forward(signal, thresholds))
+
+    def test_sequential_float32_matches_lockstep(self):
+        """Test that features advanced one at a time round the base to float32 as the lockstep engine does."""
+        rng = np.random.default_rng(9)
+        signal = np.cumsum(rng.normal(scale=0.4, size=(3000, 3)), axis=0).astype(np.float32)
+        thresholds = np.array([0.1, 0.3, 0.7], dtype=np.float32)
+        result, base = _step_forward_kernel(signal[1:], thresholds, signal[0])
+        expected, expected_base = _lockstep_step_forward(signal[1:], thresholds, signal[0])
+        np.testing.assert_array_equal(result, expected)
+        np.testing.assert_array_equal(base, expected_base)
+
+    def test_matches_reference_on_quantized_signal(self):
+        """Test that signals landing exactly on base ± threshold match the sequential loop bit for bit."""
+        rng = np.random.default_rng(2)
+        signal = np.round(np.cumsum(rng.normal(scale=0.03, size=(3000, 4)), axis=0), 1)
+        thresholds = np.full(4, 0.1)
+        result, _ = step_forward(signal, thresholds)
+        np.testing.assert_array_equal(result, reference_step_forward(signal, thresholds))
+
+    def test_matches_reference_with_degenerate_values(self):
+        """Test that zero, negative thresholds and NaN samples match the sequential loop."""
+        rng = np.random.default_rng(3)
+        signal = np.cumsum(rng.normal(scale=0.05, size=(500, 3)), axis=0)
+        signal[100, 2] = np.nan
+        thresholds = np.array([0.0, -0.2, 0.3])
+        result, _ = step_forward(signal, thresholds)
+        np.testing.assert_array_equal(result, reference_step_forward(signal, thresholds))
+
+    def test_kernel_block_boundaries(self):
+        """Test that the base is carried exactly across blocks of any size."""
+        rng = np.random.default_rng(4)
+        signal = np.cumsum(rng.normal(scale=0.2, size=(700, 3)), axis=0)
+        thresholds = np.array([0.3, 0.5, 0.7])
+        expected = reference_step_forward(signal, thresholds)
+        for block in (1, 7, 64, 1000):
+            result, _ = _step_forward_kernel(signal[1:], thresholds, signal[0], block=block)
+            np.testing.assert_array_equal(result, expected[1:])
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = np.cumsum(rng.normal(scale=0.1, size=(3000, 3)), axis=0)
+        dense = step_forward(signal, 0.2)[0]
+        events = step_forward(signal, 0.2, output="events")[0]
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            step_forward(np.random.rand(8), 0.2, output="sparse")
+
+    def test_batch_matches_samples(self):
+        """Test that a batch (samples, time, features) gives the outputs of encoding every sample on its own."""
+        rng = np.random.default_rng(5)
+        signal = np.cumsum(rng.normal(scale=0.3, size=(4, 200, 3)), axis=1)
+        thresholds = rng.uniform(0.1, 0.5, (4, 3))
+        spikes, batch_thresholds = step_forward(signal, thresholds)
+        self.assertEqual(spikes.shape, signal.shape)
+        for n in range(4):
+            expected, _ = step_forward(signal[n], thresholds[n])
+            np.testing.assert_array_equal(spikes[n], expected)
+        np.testing.assert_array_equal(batch_thresholds, thresholds)
+
+    def test_batch_events_output(self):
+        """Test that a batch with the events output gives the events of every sample."""
+        signal = np.cumsum(np.random.default_rng(6).normal(scale=0.3, size=(3, 100, 2)), axis=1)
+        dense, _ = step_forward(signal, 0.2)
+        events, thresholds = step_forward(signal, 0.2, output="events")
+        self.assertEqual(len(events), 3)
+        self.assertEqual(thresholds.shape, (3, 2))
+        for n in range(3):
+            np.testing.assert_array_equal(events[n].to_dense(), dense[n])
+
+    def test_batch_threshold_dims_different_from_samples(self):
+        """Test that per-sample thresholds not matching the batch raise ValueError."""
+        with self.assertRaises(ValueError):
+            step_forward(np.zeros((4, 10, 2)), np.ones((3, 2)))
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.int8)
+            self.assertIs(step_forward(values, 0.3, out=out)[0], out)
+            np.testing.assert_array_equal(out, step_forward(values, 0.3)[0])
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))[0]
+        for out, output in (
+            (np.zeros((100, 2), dtype=np.int8), "dense"),
+            (np.zeros((100, 3), dtype=bool), "dense"),
+            (np.zeros((100, 3), dtype=np.int8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                step_forward(signal, 0.3, output=output, out=out)
+
+
+class TestStepForwardEncoder(unittest.TestCase):
+    """Tests for the streaming StepForwardEncoder class."""
+
+    def test_chunks_match_full_signal(self):
+        """Test that concatenating the chunk outputs equals encoding the full signal, for any chunking."""
+        rng = np.random.default_rng(0)
+        signal = np.cumsum(rng.normal(scale=0.3, size=(1000, 4)), axis=0)
+        thresholds = [0.2, 0.4, 0.6, 0.8]
+        expected, _ = step_forward(signal, thresholds)
+        for size in (1, 10, 333, 1000):
+            encoder = StepForwardEncoder(thresholds)
+            result = np.concatenate([encoder.push(signal[i : i + size]) for i in range(0, len(signal), size)])
+            np.testing.assert_array_equal(result, expected)
+
+    def test_irregular_chunks(self):
+        """Test that chunks of different lengths, including empty ones, are carried exactly."""
+        rng = np.random.default_rng(1)
+        signal = rng.normal(size=500)
+        expected, _ = step_forward(signal, 0.5)
+        bounds = [0, 1, 1, 7, 120, 121, 400, 500]
+        encoder = StepForwardEncoder(0.5)
+        result = np.concatenate([encoder.push(signal[a:b]) for a, b in zip(bounds[:-1], bounds[1:])])
+        np.testing.assert_array_equal(result, expected)
+
+    def test_reset_starts_new_signal(self):
+        """Test that reset re-initializes the base from the next chunk."""
+        encoder = StepForwardEncoder(1.0)
+        encoder.push(np.array([0.0, 5.0, 10.0]))
+        encoder.reset()
+        result = encoder.push(np.array([10.0, 10.5, 12.0]))
+        np.testing.assert_array_equal(result.flatten(), [0, 0, 1])
+
+    def test_thresholds_and_base(self):
+        """Test that thresholds are broadcast per feature and the base follows the spikes."""
+        encoder = StepForwardEncoder(2.0)
+        encoder.push(np.array([[0.0, 0.0], [3.0, -1.0]]))
+        np.testing.assert_array_equal(encoder.state["thresholds"], [2.0, 2.0])
+        np.testing.assert_array_equal(encoder.state["base"], [2.0, 0.0])
+
+    def test_explicit_state(self):
+        """Test that process leaves the given state untouched, so that it can be replayed."""
+        encoder = StepForwardEncoder(1.0)
+        state = encoder.init_state(1)
+        first, state = encoder.process(np.array([0.0, 2.0]), state)
+        second, replay = encoder.process(np.array([4.0]), state)
+        again, _ = encoder.process(np.array([4.0]), state)
+        np.testing.assert_array_equal(second, again)
+        np.testing.assert_array_equal(state["base"], [1.0])
+        np.testing.assert_array_equal(replay["base"], [2.0])
+        self.assertEqual(encoder.finalize(replay).shape, (0, 1))
+
+    def test_feature_mismatch_raises(self):
+        """Test that a chunk with a different number of features raises ValueError."""
+        encoder = StepForwardEncoder(0.5)
+        encoder.push(np.zeros((5, 2)))
+        with self.assertRaises(ValueError):
+            encoder.push(np.zeros((5, 3)))
+
+    def test_threshold_dims_different_from_features(self):
+        """Test that thresholds not matching the features raise ValueError on the first chunk."""
+        encoder = StepForwardEncoder([0.1, 0.2, 0.3])
+        with self.assertRaises(ValueError):
+            encoder.push(np.zeros((5, 2)))
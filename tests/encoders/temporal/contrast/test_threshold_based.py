@@ -1,6 +1,9 @@
 import unittest
 import numpy as np
-from spikify.encoders.temporal.contrast.threshold_based_algorithm import threshold_based_representation
+from spikify.encoders.temporal.contrast.threshold_based_algorithm import (
+    ThresholdBasedEncoder,
+    threshold_based_representation,
+)
 
 
 class TestThresholdBasedRepresentation(unittest.TestCase):
@@ -101,3 +104,123 @@ class TestThresholdBasedRepresentation(unittest.TestCase):
         factor = np.array([[1.0, 2.0], [3.0, 4.0]])
         with self.assertRaises(ValueError):
             threshold_based_representation(signal, factor)
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = np.cumsum(rng.normal(scale=0.1, size=(3000, 3)), axis=0)
+        dense = threshold_based_representation(signal, 0.5)[0]
+        events = threshold_based_representation(signal, 0.5, output="events")[0]
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            threshold_based_representation(np.random.rand(8), 0.5, output="sparse")
+
+    def test_batch_matches_samples(self):
+        """Test that a batch gets per-sample thresholds and the spikes of encoding every sample on its own."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))
+        spikes, thresholds = threshold_based_representation(signal, 0.5)
+        self.assertEqual(thresholds.shape, (4, 3))
+        for n in range(4):
+            expected, expected_thresholds = threshold_based_representation(signal[n], 0.5)
+            np.testing.assert_array_equal(spikes[n], expected)
+            np.testing.assert_array_equal(thresholds[n], expected_thresholds)
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.int8)
+            self.assertIs(threshold_based_representation(values, 0.5, out=out)[0], out)
+            np.testing.assert_array_equal(out, threshold_based_representation(values, 0.5)[0])
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))[0]
+        for out, output in (
+            (np.zeros((100, 2), dtype=np.int8), "dense"),
+            (np.zeros((100, 3), dtype=bool), "dense"),
+            (np.zeros((100, 3), dtype=np.int8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                threshold_based_representation(signal, 0.5, output=output, out=out)
+
+
+class TestThresholdBasedEncoder(unittest.TestCase):
+    """Tests for the streaming ThresholdBasedEncoder class."""
+
+    def test_calibrated_chunks_match_full_signal(self):
+        """Test that calibrating on the whole signal reproduces the offline encoding, for any chunking."""
+        rng = np.random.default_rng(0)
+        signal = rng.normal(size=(500, 2))
+        expected, _ = threshold_based_representation(signal, [0.5, 1.0])
+        for size in (1, 2, 33, 500):
+            encoder = ThresholdBasedEncoder([0.5, 1.0]).calibrate(signal)
+            chunks = [encoder.push(signal[i : i + size]) for i in range(0, len(signal), size)]
+            np.testing.assert_array_equal(np.concatenate(chunks + [encoder.flush()]), expected)
+
+    def test_given_statistics(self):
+        """Test that the statistics can be given to the constructor."""
+        signal = np.array([0.0, 1.5, 3.0, 1.0, 1.0])
+        encoder = ThresholdBasedEncoder(1.0, mean=0.0, std=1.0)
+        result = np.concatenate([encoder.push(signal), encoder.flush()])
+        np.testing.assert_array_equal(result.flatten(), [1, 1, -1, 0, 0])
+
+    def test_running_statistics(self):
+        """Test that the running mode compares each variation with the statistics of the variations seen so far."""
+        rng = np.random.default_rng(1)
+        signal = np.cumsum(rng.normal(size=(300, 2)), axis=0)
+        factors = np.array([0.5, 1.5])
+        diff = np.diff(signal, axis=0)
+        diff = np.concatenate([diff, diff[-1:]])
+        counts = np.arange(1, len(diff) + 1)[:, None]
+        mean = np.cumsum(diff, axis=0) / counts
+        std = np.sqrt(np.maximum(np.cumsum(diff**2, axis=0) / counts - mean**2, 0))
+        thresholds = mean + factors * std
+        expected = np.where(diff > thresholds + 1e-9, 1, 0) - np.where(diff < -thresholds - 1e-9, 1, 0)
+        near = np.isclose(np.abs(diff), thresholds)
+
+        for size in (1, 10, 300):
+            encoder = ThresholdBasedEncoder(factors, mode="running")
+            chunks = [encoder.push(signal[i : i + size]) for i in range(0, len(signal), size)]
+            result = np.concatenate(chunks + [encoder.flush()])
+            np.testing.assert_array_equal(result[~near], expected[~near])
+
+    def test_running_mode_does_not_depend_on_chunking(self):
+        """Test that the running mode gives the same spikes for any chunking."""
+        rng = np.random.default_rng(2)
+        signal = rng.normal(size=(200, 3))
+        results = []
+        for size in (1, 7, 200):
+            encoder = ThresholdBasedEncoder(1.0, mode="running")
+            chunks = [encoder.push(signal[i : i + size]) for i in range(0, len(signal), size)]
+            results.append(np.concatenate(chunks + [encoder.flush()]))
+        np.testing.assert_array_equal(results[0], results[1])
+        np.testing.assert_array_equal(results[0], results[2])
+
+    def test_last_sample_is_held(self):
+        """Test that the last sample of each chunk is encoded with the next chunk."""
+        encoder = ThresholdBasedEncoder(1.0, mean=0.0, std=0.5)
+        self.assertEqual(encoder.push(np.array([0.0, 1.0, 2.0])).shape, (2, 1))
+        self.assertEqual(encoder.push(np.array([3.0])).shape, (1, 1))
+        self.assertEqual(encoder.flush().shape, (1, 1))
+
+    def test_single_sample(self):
+        """Test that a signal made of a single sample gives no spike."""
+        encoder = ThresholdBasedEncoder(1.0, mode="running")
+        self.assertEqual(encoder.push(np.array([1.0])).shape, (0, 1))
+        np.testing.assert_array_equal(encoder.flush(), np.zeros((1, 1), dtype=np.int8))
+
+    def test_missing_statistics_raise(self):
+        """Test that the calibrated mode without statistics raises ValueError."""
+        encoder = ThresholdBasedEncoder(1.0)
+        with self.assertRaises(ValueError):
+            encoder.push(np.zeros(5))
+
+    def test_invalid_mode_raises(self):
+        """Test that an unsupported mode raises ValueError."""
+        with self.assertRaises(ValueError):
+            ThresholdBasedEncoder(1.0, mode="global")
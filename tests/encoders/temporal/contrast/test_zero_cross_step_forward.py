@@ -1,6 +1,9 @@
 import unittest
 import numpy as np
-from spikify.encoders.temporal.contrast.zero_cross_step_forward_algorithm import zero_cross_step_forward
+from spikify.encoders.temporal.contrast.zero_cross_step_forward_algorithm import (
+    ZeroCrossStepForwardEncoder,
+    zero_cross_step_forward,
+)
 
 
 class TestZeroCrossStepForward(unittest.TestCase):
@@ -105,3 +108,66 @@ class TestZeroCrossStepForward(unittest.TestCase):
         threshold = np.array([[0.1, 0.2], [0.3, 0.4]])
         with self.assertRaises(ValueError):
             zero_cross_step_forward(signal, threshold)
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = np.cumsum(rng.normal(scale=0.1, size=(3000, 3)), axis=0)
+        dense = zero_cross_step_forward(signal, 0.5)[0]
+        events = zero_cross_step_forward(signal, 0.5, output="events")[0]
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            zero_cross_step_forward(np.random.rand(8), 0.5, output="sparse")
+
+    def test_batch_matches_samples(self):
+        """Test that a batch (samples, time, features) gives the outputs of encoding every sample on its own."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))
+        spikes, thresholds = zero_cross_step_forward(signal, 0.3)
+        self.assertEqual(thresholds.shape, (4, 3))
+        for n in range(4):
+            np.testing.assert_array_equal(spikes[n], zero_cross_step_forward(signal[n], 0.3)[0])
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.int8)
+            self.assertIs(zero_cross_step_forward(values, 0.3, out=out)[0], out)
+            np.testing.assert_array_equal(out, zero_cross_step_forward(values, 0.3)[0])
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).normal(size=(4, 100, 3))[0]
+        for out, output in (
+            (np.zeros((100, 2), dtype=np.int8), "dense"),
+            (np.zeros((100, 3), dtype=bool), "dense"),
+            (np.zeros((100, 3), dtype=np.int8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                zero_cross_step_forward(signal, 0.3, output=output, out=out)
+
+
+class TestZeroCrossStepForwardEncoder(unittest.TestCase):
+    """Tests for the streaming ZeroCrossStepForwardEncoder class."""
+
+    def test_chunks_match_full_signal(self):
+        """Test that concatenating the chunk outputs equals encoding the full signal."""
+        rng = np.random.default_rng(0)
+        signal = rng.normal(size=(300, 3))
+        expected, _ = zero_cross_step_forward(signal, [0.1, 0.5, 1.0])
+        for size in (1, 17, 300):
+            encoder = ZeroCrossStepForwardEncoder([0.1, 0.5, 1.0])
+            result = np.concatenate([encoder.push(signal[i : i + size]) for i in range(0, len(signal), size)])
+            np.testing.assert_array_equal(result, expected)
+            self.assertEqual(encoder.flush().shape, (0, 3))
+
+    def test_feature_mismatch_raises(self):
+        """Test that a chunk with a different number of features raises ValueError."""
+        encoder = ZeroCrossStepForwardEncoder(0.5)
+        encoder.push(np.zeros((5, 2)))
+        with self.assertRaises(ValueError):
+            encoder.push(np.zeros((5, 1)))
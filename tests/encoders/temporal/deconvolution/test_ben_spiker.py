@@ -1,8 +1,27 @@
-from spikify.encoders.temporal.deconvolution.bens_spiker_algorithm import bens_spiker
+from spikify.encoders.temporal.deconvolution.bens_spiker_algorithm import (
+    BensSpikerEncoder,
+    _bens_spiker_kernel,
+    bens_spiker,
+)
+from scipy.signal import firwin
 import unittest
 import numpy as np
 
 
+def reference_bens_spiker(signal, fir_bank, thresholds):
+    """Sequential per-feature Ben's Spiker loop the lockstep engine must reproduce bit for bit."""
+    T, F = signal.shape
+    window_length = fir_bank.shape[0]
+    spikes = np.zeros((T, F), dtype=np.int8)
+    for f in range(F):
+        for t in range(T - window_length + 1):
+            seg = signal[t : t + window_length, f]
+            if np.abs(seg - fir_bank[:, f]).sum() <= np.abs(seg).sum() - thresholds[f]:
+                spikes[t, f] = 1
+                signal[t : t + window_length, f] -= fir_bank[:, f]
+    return spikes
+
+
 class TestBenSpikerAlgorithm(unittest.TestCase):
     """Tests ben_spiker function."""
 
@@ -198,3 +217,170 @@ class TestBenSpikerAlgorithm(unittest.TestCase):
 
         np.testing.assert_array_equal(shift, expected_shift)
         self.assertAlmostEqual(fir_coeff.sum(), expected_fir_sum)
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = rng.random((64, 3))
+        dense = bens_spiker(signal, 5, 0.1, 0.5)[0]
+        events = bens_spiker(signal, 5, 0.1, 0.5, output="events")[0]
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            bens_spiker(np.random.rand(20), 5, 0.1, 0.5, output="sparse")
+
+    def test_kernel_matches_reference(self):
+        """Test that the lockstep engine matches the sequential loop, spikes and residual signal, for long windows."""
+        rng = np.random.default_rng(0)
+        T, F = 2000, 5
+        time = np.arange(T)[:, None]
+        signal = 0.5 + 0.4 * np.sin(2 * np.pi * time / rng.uniform(100, 800, F)) + 0.05 * rng.normal(size=(T, F))
+        for window_length in (9, 31, 64):
+            fir_bank = np.stack([firwin(window_length, 0.05) * scale for scale in rng.uniform(1, 2, F)], axis=1)
+            thresholds = rng.uniform(0.0, 0.5, F)
+            expected_signal = signal.copy()
+            expected = reference_bens_spiker(expected_signal, fir_bank, thresholds)
+            result_signal = signal.copy()
+            result = _bens_spiker_kernel(result_signal, fir_bank, thresholds)
+            np.testing.assert_array_equal(result, expected)
+            np.testing.assert_array_equal(result_signal, expected_signal)
+
+    def test_kernel_sparse_spikes(self):
+        """Test that jumping between isolated spikes gives the same result as the sequential loop."""
+        rng = np.random.default_rng(1)
+        signal = np.zeros((3000, 3))
+        signal[rng.integers(0, 2950, (20, 3)), np.arange(3)] = 3.0
+        fir_bank = np.stack([firwin(40, 0.1)] * 3, axis=1)
+        thresholds = np.array([0.0, 0.1, 0.5])
+        expected = reference_bens_spiker(signal.copy(), fir_bank, thresholds)
+        result = _bens_spiker_kernel(signal.copy(), fir_bank, thresholds)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_kernel_block_boundaries(self):
+        """Test that spikes near the end of a block are carried exactly into the next block."""
+        rng = np.random.default_rng(2)
+        signal = np.abs(np.cumsum(rng.normal(size=(600, 4)), axis=0)) * 0.3
+        fir_bank = np.stack([firwin(20, 0.1)] * 4, axis=1)
+        thresholds = np.array([0.0, 0.2, 0.4, 0.8])
+        expected = reference_bens_spiker(signal.copy(), fir_bank, thresholds)
+        for block in (1, 7, 19, 64, 1000):
+            result = _bens_spiker_kernel(signal.copy(), fir_bank, thresholds, block=block)
+            np.testing.assert_array_equal(result, expected)
+
+    def test_kernel_many_features(self):
+        """Test that the features evaluated together at every position match the sequential loop."""
+        rng = np.random.default_rng(3)
+        T, F = 1500, 12
+        time = np.arange(T)[:, None]
+        signal = 0.5 + 0.4 * np.sin(2 * np.pi * time / rng.uniform(100, 800, F)) + 0.05 * rng.normal(size=(T, F))
+        for window_length in (9, 31):
+            fir_bank = np.stack([firwin(window_length, 0.05) * scale for scale in rng.uniform(1, 2, F)], axis=1)
+            thresholds = rng.uniform(0.0, 0.5, F)
+            expected = reference_bens_spiker(signal.copy(), fir_bank, thresholds)
+            np.testing.assert_array_equal(_bens_spiker_kernel(signal.copy(), fir_bank, thresholds), expected)
+
+    def test_kernel_ties_and_nonfinite(self):
+        """Test that windows at the threshold and non-finite samples, summed again exactly, match the sequential
+        loop."""
+        rng = np.random.default_rng(4)
+        # Integer samples and filters are summed exactly, so that many windows are exactly at the threshold
+        signal = rng.integers(0, 4, (3000, 9)).astype(np.float64)
+        signal[rng.integers(0, 3000, 5), rng.integers(0, 9, 5)] = np.nan
+        signal[rng.integers(0, 3000, 5), rng.integers(0, 9, 5)] = np.inf
+        fir_bank = np.ones((6, 9))
+        thresholds = rng.integers(0, 4, 9).astype(np.float64)
+        for F in (9, 1):
+            expected = reference_bens_spiker(signal[:, :F].copy(), fir_bank[:, :F], thresholds[:F])
+            np.testing.assert_array_equal(
+                _bens_spiker_kernel(signal[:, :F].copy(), fir_bank[:, :F], thresholds[:F]), expected
+            )
+
+    def test_kernel_float32(self):
+        """Test that a float32 signal, summed in float32 by the sequential loop, gives the same spikes."""
+        rng = np.random.default_rng(5)
+        signal = rng.uniform(0, 2, (2000, 10)).astype(np.float32)
+        fir_bank = np.stack([firwin(24, 0.1)] * 10, axis=1).astype(np.float32)
+        thresholds = rng.uniform(0, 0.3, 10).astype(np.float32)
+        for F in (10, 2):
+            expected = reference_bens_spiker(signal[:, :F].copy(), fir_bank[:, :F], thresholds[:F])
+            np.testing.assert_array_equal(
+                _bens_spiker_kernel(signal[:, :F].copy(), fir_bank[:, :F], thresholds[:F]), expected
+            )
+
+    def test_batch_matches_samples(self):
+        """Test that a batch gets per-sample filter banks and shifts, and the spikes of every sample on its own."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 100, 3))
+        spikes, fir_bank, shift = bens_spiker(signal, 8, 0.1, 0.2)
+        self.assertEqual(fir_bank.shape, (4, 8, 3))
+        for n in range(4):
+            expected = bens_spiker(signal[n], 8, 0.1, 0.2)
+            for result, value in zip((spikes[n], fir_bank[n], shift[n]), expected):
+                np.testing.assert_array_equal(result, value)
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 100, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.int8)
+            spikes, _, _ = bens_spiker(values, 8, 0.1, 0.2, out=out)
+            self.assertIs(spikes, out)
+            np.testing.assert_array_equal(out, bens_spiker(values, 8, 0.1, 0.2)[0])
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (100, 3))
+        for out, output in (
+            (np.zeros((100, 2), dtype=np.int8), "dense"),
+            (np.zeros((100, 3)), "dense"),
+            (np.zeros((100, 3), dtype=np.int8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                bens_spiker(signal, 8, 0.1, 0.2, output=output, out=out)
+
+
+class TestBensSpikerEncoder(unittest.TestCase):
+    """Tests for the BensSpikerEncoder class."""
+
+    def test_fit_transform_matches_function(self):
+        """Test that fitting and encoding the same signal gives the outputs of bens_spiker."""
+        signal = np.random.default_rng(0).uniform(-1, 3, (200, 3))
+        encoder = BensSpikerEncoder(10, 0.1, [0.1, 0.2, 0.3])
+        spikes, fir_bank, shift = bens_spiker(signal, 10, 0.1, [0.1, 0.2, 0.3])
+        np.testing.assert_array_equal(encoder.fit_transform(signal), spikes)
+        np.testing.assert_array_equal(encoder.fir_bank, fir_bank)
+        np.testing.assert_array_equal(encoder.shift, shift)
+
+    def test_transform_reuses_fitted_parameters(self):
+        """Test that every signal is encoded with the filter bank and shift of the calibration signal."""
+        rng = np.random.default_rng(1)
+        encoder = BensSpikerEncoder(10, 0.1, 0.2).fit(rng.uniform(-1, 3, (100, 2)))
+        fir_bank = encoder.fir_bank
+        signal = rng.uniform(0, 2, (150, 2))
+        expected = _bens_spiker_kernel(signal - encoder.shift, fir_bank, encoder.thresholds)
+        np.testing.assert_array_equal(encoder.transform(signal), expected)
+        self.assertIs(encoder.fir_bank, fir_bank)
+
+    def test_not_fitted_raises(self):
+        """Test that transforming before fitting raises ValueError."""
+        with self.assertRaises(ValueError):
+            BensSpikerEncoder(5, 0.1, 0.1).transform(np.random.rand(20))
+
+    def test_feature_mismatch_raises(self):
+        """Test that a signal with other features than the calibration signal raises ValueError."""
+        encoder = BensSpikerEncoder(5, 0.1, 0.1).fit(np.random.rand(20, 2))
+        with self.assertRaises(ValueError):
+            encoder.transform(np.random.rand(20, 3))
+
+    def test_transform_batch(self):
+        """Test that a batch is encoded sample by sample with the fitted parameters."""
+        rng = np.random.default_rng(2)
+        encoder = BensSpikerEncoder(8, 0.1, [0.1, 0.2]).fit(rng.uniform(-1, 3, (100, 2)))
+        signal = rng.uniform(-1, 3, (3, 80, 2))
+        spikes = encoder.transform(signal)
+        for n in range(3):
+            np.testing.assert_array_equal(spikes[n], encoder.transform(signal[n]))
+        with self.assertRaises(ValueError):
+            encoder.transform(np.zeros((3, 80, 3)))
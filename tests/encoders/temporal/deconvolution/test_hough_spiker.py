@@ -1,8 +1,26 @@
-from spikify.encoders.temporal.deconvolution.hough_spiker_algorithm import hough_spiker
+from spikify.encoders.temporal.deconvolution.hough_spiker_algorithm import (
+    HoughSpikerEncoder,
+    _hough_spiker_kernel,
+    hough_spiker,
+)
+from scipy.signal import firwin
 import unittest
 import numpy as np
 
 
+def reference_hough_spiker(signal, fir_bank):
+    """Sequential per-feature Hough Spiker loop the lockstep engine must reproduce exactly."""
+    T, F = signal.shape
+    window_length = fir_bank.shape[0]
+    spikes = np.zeros((T, F), dtype=np.int8)
+    for f in range(F):
+        for t in range(T - window_length + 1):
+            if np.sum(signal[t : t + window_length, f] >= fir_bank[:, f]) == window_length:
+                signal[t : t + window_length, f] -= fir_bank[:, f]
+                spikes[t, f] = 1
+    return spikes
+
+
 class TestHoughSpikerAlgorithm(unittest.TestCase):
     """Tests hough_spiker function."""
 
@@ -159,3 +177,133 @@ class TestHoughSpikerAlgorithm(unittest.TestCase):
         np.testing.assert_array_equal(shift, expected_shift)
         np.testing.assert_array_equal(norm, expected_norm)
         self.assertAlmostEqual(fir_coeff.sum(), expected_fir_sum)
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = rng.random((64, 3))
+        dense = hough_spiker(signal, 5, 0.1)[0]
+        events = hough_spiker(signal, 5, 0.1, output="events")[0]
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            hough_spiker(np.random.rand(20), 5, 0.1, output="sparse")
+
+    def test_kernel_matches_reference(self):
+        """Test that the lockstep engine matches the sequential loop, spikes and residual signal."""
+        rng = np.random.default_rng(0)
+        T, F = 2000, 6
+        time = np.arange(T)[:, None]
+        signal = 0.5 + 0.45 * np.sin(2 * np.pi * time / rng.uniform(100, 800, F)) + 0.02 * rng.normal(size=(T, F))
+        signal[500:520, 2] = np.nan
+        for window_length in (5, 20, 40):
+            fir_bank = np.stack([firwin(window_length, 0.05)] * F, axis=1)
+            expected_signal = signal.copy()
+            expected = reference_hough_spiker(expected_signal, fir_bank)
+            result_signal = signal.copy()
+            result = _hough_spiker_kernel(result_signal, fir_bank)
+            self.assertGreater(expected.sum(), 0)
+            np.testing.assert_array_equal(result, expected)
+            np.testing.assert_array_equal(result_signal, expected_signal)
+
+    def test_kernel_feature_counts(self):
+        """Test that a single feature, walked spike to spike, and many features, evaluated together at every position,
+        match the sequential loop."""
+        rng = np.random.default_rng(2)
+        T = 3000
+        time = np.arange(T)[:, None]
+        for F in (1, 12):
+            signal = 0.5 + 0.45 * np.sin(2 * np.pi * time / rng.uniform(100, 800, F)) + 0.02 * rng.normal(size=(T, F))
+            fir_bank = np.stack([firwin(20, 0.05)] * F, axis=1)
+            expected = reference_hough_spiker(signal.copy(), fir_bank)
+            self.assertGreater(expected.sum(), 0)
+            np.testing.assert_array_equal(_hough_spiker_kernel(signal.copy(), fir_bank), expected)
+
+    def test_kernel_block_boundaries(self):
+        """Test that spikes near the end of a block are carried exactly into the next block."""
+        rng = np.random.default_rng(1)
+        signal = rng.random((500, 3))
+        fir_bank = np.stack([firwin(6, 0.2)] * 3, axis=1)
+        expected = reference_hough_spiker(signal.copy(), fir_bank)
+        for block in (1, 5, 17, 1000):
+            result = _hough_spiker_kernel(signal.copy(), fir_bank, block=block)
+            np.testing.assert_array_equal(result, expected)
+
+    def test_batch_matches_samples(self):
+        """Test that a batch gets per-sample shifts and norms, and the spikes of every sample on its own."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 100, 3))
+        result = hough_spiker(signal, 8, 0.1)
+        self.assertEqual(result[2].shape, (4, 3))
+        for n in range(4):
+            for value, expected in zip(result, hough_spiker(signal[n], 8, 0.1)):
+                np.testing.assert_array_equal(value[n], expected)
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 100, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.int8)
+            self.assertIs(hough_spiker(values, 8, 0.1, out=out)[0], out)
+            np.testing.assert_array_equal(out, hough_spiker(values, 8, 0.1)[0])
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 100, 3))[0]
+        for out, output in (
+            (np.zeros((100, 2), dtype=np.int8), "dense"),
+            (np.zeros((100, 3), dtype=bool), "dense"),
+            (np.zeros((100, 3), dtype=np.int8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                hough_spiker(signal, 8, 0.1, output=output, out=out)
+
+
+class TestHoughSpikerEncoder(unittest.TestCase):
+    """Tests for the HoughSpikerEncoder class."""
+
+    def test_fit_transform_matches_function(self):
+        """Test that fitting and encoding the same signal gives the outputs of hough_spiker."""
+        signal = np.random.default_rng(0).uniform(-1, 3, (200, 3))
+        encoder = HoughSpikerEncoder(8, 0.1)
+        spikes, fir_bank, shift, norm = hough_spiker(signal, 8, 0.1)
+        np.testing.assert_array_equal(encoder.fit_transform(signal), spikes)
+        np.testing.assert_array_equal(encoder.fir_bank, fir_bank)
+        np.testing.assert_array_equal(encoder.shift, shift)
+        np.testing.assert_array_equal(encoder.norm, norm)
+
+    def test_transform_uses_fitted_normalization(self):
+        """Test that every signal is normalized with the range of the calibration signal."""
+        encoder = HoughSpikerEncoder(8, 0.1).fit(np.array([[-1.0], [3.0]]))
+        signal = np.random.default_rng(1).uniform(-1, 3, (100, 1))
+        expected = _hough_spiker_kernel((signal + 1.0) / 4.0, encoder.fir_bank)
+        np.testing.assert_array_equal(encoder.transform(signal), expected)
+
+    def test_transform_without_copy(self):
+        """Test that copy=False deconvolves the signal in place and reuses the output array, with the same spikes."""
+        signal = np.random.default_rng(1).uniform(-1, 3, (100, 3))
+        encoder = HoughSpikerEncoder(8, 0.1).fit(signal)
+        expected = encoder.transform(signal)
+        working = signal.copy()
+        out = np.empty(signal.shape, dtype=np.int8)
+        self.assertIs(encoder.transform(working, out=out, copy=False), out)
+        np.testing.assert_array_equal(out, expected)
+        self.assertFalse(np.array_equal(working, signal))
+
+    def test_transform_copy_keeps_signal(self):
+        """Test that copy=False leaves a signal that is not a writable float64 array untouched."""
+        signal = np.random.default_rng(1).uniform(-1, 3, (100, 3))
+        encoder = HoughSpikerEncoder(8, 0.1).fit(signal)
+        read_only = signal.copy()
+        read_only.flags.writeable = False
+        for working in (signal.astype(np.float32), read_only):
+            original = working.copy()
+            encoder.transform(working, copy=False)
+            np.testing.assert_array_equal(working, original)
+
+    def test_not_fitted_raises(self):
+        """Test that transforming before fitting raises ValueError."""
+        with self.assertRaises(ValueError):
+            HoughSpikerEncoder(5, 0.1).transform(np.random.rand(20))
@@ -1,8 +1,28 @@
-from spikify.encoders.temporal.deconvolution.modified_hough_spiker_algorithm import modified_hough_spiker
+from spikify.encoders.temporal.deconvolution.modified_hough_spiker_algorithm import (
+    ModifiedHoughSpikerEncoder,
+    _modified_hough_spiker_kernel,
+    modified_hough_spiker,
+)
+from scipy.signal import firwin
 import unittest
 import numpy as np
 
 
+def reference_modified_hough_spiker(signal, fir_bank, thresholds):
+    """Sequential per-feature Modified Hough Spiker loop the lockstep engine must reproduce bit for bit."""
+    T, F = signal.shape
+    window_length = fir_bank.shape[0]
+    spikes = np.zeros((T, F), dtype=np.int8)
+    for f in range(F):
+        for t in range(T):
+            end_index = min(t + window_length, T)
+            filter_segment = fir_bank[: end_index - t, f]
+            if np.sum(np.maximum(filter_segment - signal[t:end_index, f], 0)) <= thresholds[f]:
+                signal[t:end_index, f] -= filter_segment
+                spikes[t, f] = 1
+    return spikes
+
+
 class TestModifiedHoughSpikerAlgorithm(unittest.TestCase):
     """Tests modified_hough_spiker function."""
 
@@ -191,3 +211,117 @@ class TestModifiedHoughSpikerAlgorithm(unittest.TestCase):
         np.testing.assert_array_equal(shift, expected_shift)
         np.testing.assert_array_equal(norm, expected_norm)
         self.assertAlmostEqual(fir_coeff.sum(), expected_fir_sum)
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = rng.random((64, 3))
+        dense = modified_hough_spiker(signal, 5, 0.1, 0.5)[0]
+        events = modified_hough_spiker(signal, 5, 0.1, 0.5, output="events")[0]
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            modified_hough_spiker(np.random.rand(20), 5, 0.1, 0.5, output="sparse")
+
+    def test_kernel_matches_reference(self):
+        """Test that the lockstep engine matches the sequential loop, including the truncated windows at the end."""
+        rng = np.random.default_rng(0)
+        T, F = 2000, 5
+        time = np.arange(T)[:, None]
+        signal = 0.5 + 0.45 * np.sin(2 * np.pi * time / rng.uniform(100, 800, F)) + 0.02 * rng.normal(size=(T, F))
+        signal[-3:, 1] = 1.0  # spikes in the truncated windows
+        for window_length in (1, 9, 30, 64):
+            fir_bank = np.stack([firwin(window_length, 0.05)] * F, axis=1)
+            thresholds = rng.uniform(0.0, 0.3, F)
+            expected_signal = signal.copy()
+            expected = reference_modified_hough_spiker(expected_signal, fir_bank, thresholds)
+            result_signal = signal.copy()
+            result = _modified_hough_spiker_kernel(result_signal, fir_bank, thresholds)
+            self.assertGreater(expected[-window_length:].sum(), 0)
+            np.testing.assert_array_equal(result, expected)
+            np.testing.assert_array_equal(result_signal, expected_signal)
+
+    def test_kernel_feature_counts(self):
+        """Test that a single feature, walked spike to spike, and many features, evaluated together at every position,
+        match the sequential loop."""
+        rng = np.random.default_rng(2)
+        T = 3000
+        time = np.arange(T)[:, None]
+        for F in (1, 12):
+            signal = 0.5 + 0.45 * np.sin(2 * np.pi * time / rng.uniform(100, 800, F)) + 0.02 * rng.normal(size=(T, F))
+            fir_bank = np.stack([firwin(20, 0.05)] * F, axis=1)
+            thresholds = rng.uniform(0.0, 0.3, F)
+            expected_signal = signal.copy()
+            expected = reference_modified_hough_spiker(expected_signal, fir_bank, thresholds)
+            result_signal = signal.copy()
+            np.testing.assert_array_equal(_modified_hough_spiker_kernel(result_signal, fir_bank, thresholds), expected)
+            np.testing.assert_array_equal(result_signal, expected_signal)
+
+    def test_kernel_block_boundaries(self):
+        """Test that spikes near the end of a block are carried exactly into the next block."""
+        rng = np.random.default_rng(1)
+        signal = rng.random((400, 3))
+        fir_bank = np.stack([firwin(12, 0.1)] * 3, axis=1)
+        thresholds = np.array([0.05, 0.2, 0.5])
+        expected = reference_modified_hough_spiker(signal.copy(), fir_bank, thresholds)
+        for block in (1, 11, 64, 1000):
+            result = _modified_hough_spiker_kernel(signal.copy(), fir_bank, thresholds, block=block)
+            np.testing.assert_array_equal(result, expected)
+
+    def test_batch_matches_samples(self):
+        """Test that a batch with per-sample thresholds gives the outputs of encoding every sample on its own."""
+        rng = np.random.default_rng(5)
+        signal = rng.uniform(-1, 3, (4, 100, 3))
+        thresholds = rng.uniform(0.1, 0.5, (4, 3))
+        result = modified_hough_spiker(signal, 8, 0.1, thresholds)
+        for n in range(4):
+            for value, expected in zip(result, modified_hough_spiker(signal[n], 8, 0.1, thresholds[n])):
+                np.testing.assert_array_equal(value[n], expected)
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 100, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.int8)
+            self.assertIs(modified_hough_spiker(values, 8, 0.1, 0.2, out=out)[0], out)
+            np.testing.assert_array_equal(out, modified_hough_spiker(values, 8, 0.1, 0.2)[0])
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 100, 3))[0]
+        for out, output in (
+            (np.zeros((100, 2), dtype=np.int8), "dense"),
+            (np.zeros((100, 3), dtype=bool), "dense"),
+            (np.zeros((100, 3), dtype=np.int8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                modified_hough_spiker(signal, 8, 0.1, 0.2, output=output, out=out)
+
+
+class TestModifiedHoughSpikerEncoder(unittest.TestCase):
+    """Tests for the ModifiedHoughSpikerEncoder class."""
+
+    def test_fit_transform_matches_function(self):
+        """Test that fitting and encoding the same signal gives the outputs of modified_hough_spiker."""
+        signal = np.random.default_rng(0).uniform(-1, 3, (200, 3))
+        encoder = ModifiedHoughSpikerEncoder(8, 0.1, [0.1, 0.2, 0.3])
+        spikes, fir_bank, shift, norm = modified_hough_spiker(signal, 8, 0.1, [0.1, 0.2, 0.3])
+        np.testing.assert_array_equal(encoder.fit_transform(signal), spikes)
+        np.testing.assert_array_equal(encoder.fir_bank, fir_bank)
+        np.testing.assert_array_equal(encoder.shift, shift)
+        np.testing.assert_array_equal(encoder.norm, norm)
+
+    def test_transform_uses_fitted_normalization(self):
+        """Test that every signal is normalized with the range of the calibration signal, clipping outliers."""
+        encoder = ModifiedHoughSpikerEncoder(8, 0.1, 0.2).fit(np.array([[-1.0], [3.0]]))
+        signal = np.random.default_rng(1).uniform(-2, 4, (100, 1))
+        expected = _modified_hough_spiker_kernel(np.clip((signal + 1.0) / 4.0, 0, 1), encoder.fir_bank, [0.2])
+        np.testing.assert_array_equal(encoder.transform(signal), expected)
+
+    def test_threshold_dims_different_from_features(self):
+        """Test that thresholds not matching the calibration features raise ValueError."""
+        with self.assertRaises(ValueError):
+            ModifiedHoughSpikerEncoder(5, 0.1, [0.1, 0.2]).fit(np.random.rand(20, 3))
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from scipy.signal import firwin
+from spikify.encoders.temporal.deconvolution import bens_spiker, hough_spiker
+from spikify.encoders.temporal.deconvolution.utils import _design_filter, design_filter
+
+
+class TestDesignFilter(unittest.TestCase):
+    """Tests for the memoized design_filter function."""
+
+    def test_matches_firwin(self):
+        """Test that the designed filter is the one of scipy.signal.firwin."""
+        np.testing.assert_array_equal(design_filter(31, 0.1), firwin(31, 0.1, window="hann"))
+        np.testing.assert_array_equal(
+            design_filter(31, [0.1, 0.3], window_type="hamming", pass_zero=False),
+            firwin(31, [0.1, 0.3], window="hamming", pass_zero=False),
+        )
+
+    def test_cached_and_read_only(self):
+        """Test that identical parameters return the same read-only array, including array cutoffs."""
+        _design_filter.cache_clear()
+        first = design_filter(21, np.array([0.2, 0.4]))
+        second = design_filter(21, [0.2, 0.4])
+        self.assertIs(first, second)
+        self.assertEqual(_design_filter.cache_info().hits, 1)
+        with self.assertRaises(ValueError):
+            first[0] = 0.0
+
+    def test_different_parameters(self):
+        """Test that any different parameter designs a new filter."""
+        self.assertIsNot(design_filter(21, 0.2), design_filter(21, 0.2, window_type="hamming"))
+        self.assertIsNot(design_filter(21, 0.2), design_filter(23, 0.2))
+
+    def test_shared_filter_bank(self):
+        """Test that the encoders share one filter between features unless some features are scaled."""
+        signal = np.random.default_rng(0).random((100, 4))
+        _, fir_bank, _, _ = hough_spiker(signal, 10, 0.1)
+        self.assertEqual(fir_bank.shape, (10, 4))
+        self.assertEqual(fir_bank.strides[1], 0)
+
+        signal[:, 1] *= 5  # only the second feature needs its own scaling
+        _, fir_bank, _ = bens_spiker(signal, 10, 0.1, 0.5)
+        np.testing.assert_array_equal(fir_bank[:, 0], design_filter(10, 0.1))
+        self.assertAlmostEqual(fir_bank[:, 1].sum(), 2 * signal[:, 1].max())
+        self.assertTrue(fir_bank.flags.writeable)
@@ -1,6 +1,7 @@
 import unittest
 import numpy as np
 from spikify.encoders.temporal.global_referenced.phase_encoding_algorithm import (
+    PhaseEncoder,
     phase,
 )
 
@@ -69,3 +70,85 @@ class TestPhaseEncoding(unittest.TestCase):
         encoded_signal_f2 = phase(signal_f2, num_bit)
         np.testing.assert_array_equal(encoded_signal[:, 0], encoded_signal_f1)
         np.testing.assert_array_equal(encoded_signal[:, 1], encoded_signal_f2)
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = rng.random((64, 3))
+        dense = phase(signal, 4)
+        events = phase(signal, 4, output="events")
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            phase(np.random.rand(8), 4, output="sparse")
+
+    def test_levels_match_arcsin_formula(self):
+        """Test that the threshold table gives the levels quantized from the arcsine of the interval means."""
+        signal = np.random.default_rng(0).random((4000, 5))
+        for num_bits in (1, 4, 8):
+            means = signal.reshape(-1, num_bits, 5).mean(axis=1)
+            means /= means.max(axis=0)
+            bins = np.linspace(0, np.pi / 2, 2**num_bits + 1)
+            expected = np.clip(np.searchsorted(bins, np.arcsin(means)), 0, 2**num_bits - 1)
+            bits = phase(signal, num_bits).reshape(-1, num_bits, 5)
+            levels = (bits.astype(int) << np.arange(num_bits - 1, -1, -1)[:, None]).sum(axis=1)
+            np.testing.assert_array_equal(levels, expected)
+
+    def test_batch_matches_samples(self):
+        """Test that a batch (samples, time, features) gives the spikes of encoding every sample on its own."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 40, 3))
+        spikes = phase(signal, 8)
+        self.assertEqual(spikes.shape, signal.shape)
+        for n in range(4):
+            np.testing.assert_array_equal(spikes[n], phase(signal[n], 8))
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 40, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.uint8)
+            self.assertIs(phase(values, 8, out=out), out)
+            np.testing.assert_array_equal(out, phase(values, 8))
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 40, 3))[0]
+        for out, output in (
+            (np.zeros((40, 2), dtype=np.uint8), "dense"),
+            (np.zeros((40, 3), dtype=np.int8), "dense"),
+            (np.zeros((40, 3), dtype=np.uint8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                phase(signal, 8, output=output, out=out)
+
+    def test_signal_not_modified(self):
+        """Test that the signal is left untouched, and that no copy argument is accepted since none is needed."""
+        signal = np.random.default_rng(6).uniform(-1, 3, (40, 3))
+        expected = signal.copy()
+        phase(signal, 8)
+        np.testing.assert_array_equal(signal, expected)
+        with self.assertRaises(TypeError):
+            phase(signal, 8, copy=False)
+
+
+class TestPhaseEncoder(unittest.TestCase):
+    """Tests for the PhaseEncoder class."""
+
+    def test_fit_transform_matches_function(self):
+        """Test that fitting and encoding the same signal gives the output of phase."""
+        signal = np.random.default_rng(0).uniform(-1, 3, (32, 3))
+        np.testing.assert_array_equal(PhaseEncoder(4).fit_transform(signal), phase(signal, 4))
+
+    def test_transform_uses_fitted_scalings(self):
+        """Test that a fitted encoder maps the same intensity to the same bits, whatever the other samples."""
+        encoder = PhaseEncoder(2).fit(np.array([0.0, 0.0, 1.0, 1.0]))
+        np.testing.assert_array_equal(encoder.transform(np.array([0.5, 0.5, 0.5, 0.5])), [1, 0, 1, 0])
+        np.testing.assert_array_equal(encoder.transform(np.array([2.0, 2.0, 0.5, 0.5])), [1, 1, 1, 0])
+
+    def test_fit_length_not_divisible_raises(self):
+        """Test that a calibration signal whose length is not a multiple of num_bits raises ValueError."""
+        with self.assertRaises(ValueError):
+            PhaseEncoder(3).fit(np.ones(8))
@@ -1,6 +1,7 @@
 import unittest
 import numpy as np
 from spikify.encoders.temporal.global_referenced.time_to_first_spike_algorithm import (
+    TimeToFirstSpikeEncoder,
     time_to_first_spike,
 )
 
@@ -97,6 +98,89 @@ class TestTimeToFirstSpike(unittest.TestCase):
         np.testing.assert_array_equal(encoded_signal[:, 0], encoded_signal_f1)
         np.testing.assert_array_equal(encoded_signal[:, 1], encoded_signal_f2)
 
+    def test_latency_matches_log_formula(self):
+        """Test that the threshold table gives the latency quantized from the logarithm of the interval means."""
+        signal = np.random.default_rng(0).random((4000, 5)) ** 4
+        for interval_length in (2, 10, 25):
+            means = signal.reshape(-1, interval_length, 5).mean(axis=1)
+            intensity = np.full_like(means, 2.0)
+            intensity[means > 0] = 0.1 * np.log(1 / means[means > 0])
+            expected = np.clip(np.searchsorted(np.linspace(0, 1, interval_length), intensity), 0, interval_length - 1)
+            spikes = time_to_first_spike(signal, interval_length).reshape(-1, interval_length, 5)
+            np.testing.assert_array_equal(spikes.argmax(axis=1), expected)
+
+    def test_batch_matches_samples(self):
+        """Test that a batch (samples, time, features) gives the spikes of encoding every sample on its own."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 40, 3))
+        spikes = time_to_first_spike(signal, 8)
+        self.assertEqual(spikes.shape, signal.shape)
+        for n in range(4):
+            np.testing.assert_array_equal(spikes[n], time_to_first_spike(signal[n], 8))
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 40, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.int8)
+            self.assertIs(time_to_first_spike(values, 8, out=out), out)
+            np.testing.assert_array_equal(out, time_to_first_spike(values, 8))
+
+    def test_copy(self):
+        """Test that copy=False normalizes the signal in place with the same spikes, and copy=True does not."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (40, 3))
+        working = signal.copy()
+        np.testing.assert_array_equal(time_to_first_spike(working, 8), time_to_first_spike(signal, 8))
+        np.testing.assert_array_equal(working, signal)
+        np.testing.assert_array_equal(time_to_first_spike(working, 8, copy=False), time_to_first_spike(signal, 8))
+        self.assertTrue(np.all((working >= 0) & (working <= 1)))
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 40, 3))[0]
+        for out, output in (
+            (np.zeros((40, 2), dtype=np.int8), "dense"),
+            (np.zeros((40, 3), dtype=bool), "dense"),
+            (np.zeros((40, 3), dtype=np.int8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                time_to_first_spike(signal, 8, output=output, out=out)
+
+
+class TestTimeToFirstSpikeEncoder(unittest.TestCase):
+    """Tests for the TimeToFirstSpikeEncoder class."""
+
+    def test_fit_transform_matches_function(self):
+        """Test that fitting and encoding the same signal gives the output of time_to_first_spike."""
+        signal = np.random.default_rng(0).uniform(-1, 3, (40, 3))
+        np.testing.assert_array_equal(TimeToFirstSpikeEncoder(8).fit_transform(signal), time_to_first_spike(signal, 8))
+
+    def test_transform_uses_fitted_normalization(self):
+        """Test that the same intensity gives the same latency in every signal encoded by a fitted encoder."""
+        encoder = TimeToFirstSpikeEncoder(4).fit(np.array([0.0, 4.0]))
+        first = encoder.transform(np.array([1.0] * 4 + [4.0] * 4))
+        second = encoder.transform(np.array([1.0] * 4 + [0.5] * 4))
+        np.testing.assert_array_equal(first[:4], second[:4])
+
+    def test_feature_mismatch_raises(self):
+        """Test that a signal with other features than the calibration signal raises ValueError."""
+        encoder = TimeToFirstSpikeEncoder(4).fit(np.ones((8, 2)))
+        with self.assertRaises(ValueError):
+            encoder.transform(np.ones(8))
+
 
 if __name__ == "__main__":
     unittest.main()
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = rng.random((64, 3))
+        dense = time_to_first_spike(signal, 8)
+        events = time_to_first_spike(signal, 8, output="events")
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            time_to_first_spike(np.random.rand(8), 4, output="sparse")
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from spikify.encoders.temporal.latency.burst_coding_algorithm import burst_coding
+from spikify.encoders.temporal.latency.burst_coding_algorithm import BurstEncoder, burst_coding
 
 
 class TestBurstCoding(unittest.TestCase):
@@ -61,6 +61,16 @@ class TestBurstCoding(unittest.TestCase):
         actual_spike_counts = np.sum(result)
         self.assertEqual(actual_spike_counts, expected_spike_counts)
 
+    def test_burst_positions(self):
+        """Test that every burst starts its interval, with spike_num spikes spaced by ISI + 1 timesteps."""
+        signal = np.array([[1.0, 0.5]] * 16 + [[0.5, 0.0]] * 16)
+        result = burst_coding(signal, 4, 2, 6, 16)
+        # Mean 1: 4 spikes with an ISI of 2, mean 0.5: 2 spikes with an ISI of 4, mean 0: no spike
+        np.testing.assert_array_equal(np.flatnonzero(result[:16, 0]), [0, 3, 6, 9])
+        np.testing.assert_array_equal(np.flatnonzero(result[:16, 1]), [0, 5])
+        np.testing.assert_array_equal(np.flatnonzero(result[16:, 0]), [0, 5])
+        self.assertFalse(result[16:, 1].any())
+
     def test_invalid_stream_length(self):
         np.random.seed(42)
         signal = np.random.rand(240)
@@ -108,3 +118,69 @@ class TestBurstCoding(unittest.TestCase):
         encoded_signal_f2 = burst_coding(signal_f2, n_max, t_min, t_max, length)
         np.testing.assert_array_equal(encoded_signal[:, 0], encoded_signal_f1)
         np.testing.assert_array_equal(encoded_signal[:, 1], encoded_signal_f2)
+
+    def test_events_output(self):
+        """Test that the events output describes the same spike train as the dense output."""
+        rng = np.random.default_rng(0)
+        signal = rng.random((64, 3))
+        dense = burst_coding(signal, 2, 1, 3, 16)
+        events = burst_coding(signal, 2, 1, 3, 16, output="events")
+        self.assertEqual(events.shape, signal.shape)
+        np.testing.assert_array_equal(events.to_dense(), dense.reshape(signal.shape))
+
+    def test_unsupported_output_raises(self):
+        """Test that an unsupported output format raises ValueError."""
+        with self.assertRaises(ValueError):
+            burst_coding(np.random.rand(16), 2, 1, 3, 16, output="sparse")
+
+    def test_batch_matches_samples(self):
+        """Test that a batch (samples, time, features) gives the spikes of encoding every sample on its own."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 40, 3))
+        spikes = burst_coding(signal, 4, 1, 6, 20)
+        self.assertEqual(spikes.shape, signal.shape)
+        for n in range(4):
+            np.testing.assert_array_equal(spikes[n], burst_coding(signal[n], 4, 1, 6, 20))
+
+    def test_out(self):
+        """Test that the spikes are written into a preallocated array, for a signal and for a batch."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 40, 3))
+        for values in (signal[0], signal):
+            out = np.full(values.shape, 5, dtype=np.int8)
+            self.assertIs(burst_coding(values, 4, 1, 6, 20, out=out), out)
+            np.testing.assert_array_equal(out, burst_coding(values, 4, 1, 6, 20))
+
+    def test_out_mismatch_raises(self):
+        """Test that an output array of the wrong shape or dtype, or with events, raises a ValueError."""
+        signal = np.random.default_rng(5).uniform(-1, 3, (4, 40, 3))[0]
+        for out, output in (
+            (np.zeros((40, 2), dtype=np.int8), "dense"),
+            (np.zeros((40, 3), dtype=bool), "dense"),
+            (np.zeros((40, 3), dtype=np.int8), "events"),
+        ):
+            with self.assertRaises(ValueError):
+                burst_coding(signal, 4, 1, 6, 20, output=output, out=out)
+
+
+class TestBurstEncoder(unittest.TestCase):
+    """Tests for the BurstEncoder class."""
+
+    def test_fit_transform_matches_function(self):
+        """Test that fitting and encoding the same signal gives the output of burst_coding."""
+        signal = np.random.default_rng(0).uniform(-1, 3, (64, 3))
+        np.testing.assert_array_equal(
+            BurstEncoder(4, 2, 6, 16).fit_transform(signal), burst_coding(signal, 4, 2, 6, 16)
+        )
+
+    def test_transform_uses_fitted_normalization(self):
+        """Test that a fitted encoder normalizes every signal with the calibration range, clipping outliers."""
+        encoder = BurstEncoder(4, 2, 6, 16).fit(np.array([-1.0, 3.0]))
+        np.testing.assert_array_equal(encoder.shift, [-1.0])
+        np.testing.assert_array_equal(encoder.norm, [4.0])
+        expected = burst_coding(np.array([1.0] * 16 + [0.5] * 16), 4, 2, 6, 16)
+        np.testing.assert_array_equal(encoder.transform(np.array([3.0] * 16 + [1.0] * 16)), expected)
+        np.testing.assert_array_equal(encoder.transform(np.full(16, 10.0)), encoder.transform(np.full(16, 3.0)))
+
+    def test_not_fitted_raises(self):
+        """Test that transforming before fitting raises ValueError."""
+        with self.assertRaises(ValueError):
+            BurstEncoder(4, 2, 6, 16).transform(np.ones(16))
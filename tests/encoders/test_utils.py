@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from spikify.encoders.utils import fold_batch, fold_parameter, unfold_batch
+from spikify.spikes import SpikeEvents, SpikeTrain
+
+
+class TestFoldBatch(unittest.TestCase):
+    """Tests for the batch folding helpers."""
+
+    def test_fold_and_unfold(self):
+        """Test that every sample lands on its own block of features and comes back unchanged."""
+        signal = np.arange(24.0).reshape(2, 4, 3)
+        folded, batch = fold_batch(signal)
+        self.assertEqual(batch, (2, 3))
+        np.testing.assert_array_equal(folded[:, 3:], signal[1])
+        np.testing.assert_array_equal(unfold_batch(folded, batch), signal)
+
+    def test_single_signal_untouched(self):
+        """Test that 1D and 2D signals are returned as they are."""
+        for signal in (np.arange(5.0), np.ones((5, 2))):
+            folded, batch = fold_batch(signal)
+            self.assertIs(folded, signal)
+            self.assertIsNone(batch)
+            self.assertIs(unfold_batch(folded, batch), folded)
+
+    def test_empty_batch_raises(self):
+        """Test that a batch without samples raises ValueError."""
+        with self.assertRaises(ValueError):
+            fold_batch(np.zeros((0, 5, 2)))
+
+    def test_fold_parameter(self):
+        """Test that scalar, per-feature and per-sample parameters are folded to one value per folded feature."""
+        np.testing.assert_array_equal(fold_parameter(0.5, (2, 3)), np.full(6, 0.5))
+        np.testing.assert_array_equal(fold_parameter([1, 2, 3], (2, 3)), [1, 2, 3, 1, 2, 3])
+        np.testing.assert_array_equal(fold_parameter([[1, 2, 3], [4, 5, 6]], (2, 3)), [1, 2, 3, 4, 5, 6])
+
+    def test_fold_shared_filter_stays_view(self):
+        """Test that a filter shared by all features is folded without copying it."""
+        fir = np.arange(4.0)
+        fir_bank = np.broadcast_to(fir[:, None], (4, 3))
+        folded = fold_parameter(fir_bank, (1000, 3), ndim=2)
+        self.assertEqual(folded.shape, (4, 3000))
+        self.assertEqual(folded.strides[1], 0)
+        np.testing.assert_array_equal(fold_parameter(unfold_batch(folded, (1000, 3)), (1000, 3), ndim=2), folded)
+
+    def test_fold_parameter_mismatch_raises(self):
+        """Test that parameters not matching the samples or the features of the batch raise ValueError."""
+        with self.assertRaises(ValueError):
+            fold_parameter([1, 2], (2, 3))
+        with self.assertRaises(ValueError):
+            fold_parameter(np.ones((3, 3)), (2, 3))
+        with self.assertRaises(ValueError):
+            fold_parameter(np.ones((2, 2, 3)), (2, 3))
+
+    def test_events_round_trip(self):
+        """Test that events are split per sample and that a list of events or packed trains folds back."""
+        spikes = (np.random.default_rng(0).random((3, 50, 2)) < 0.2).astype(np.int8)
+        folded, batch = fold_batch(spikes)
+        events = unfold_batch(SpikeEvents.from_dense(folded), batch)
+        self.assertEqual(len(events), 3)
+        for n in range(3):
+            self.assertEqual(events[n].shape, (50, 2))
+            np.testing.assert_array_equal(events[n].to_dense(), spikes[n])
+
+        for samples in (events, [SpikeTrain.from_dense(sample) for sample in spikes]):
+            folded_events, folded_batch = fold_batch(samples)
+            self.assertEqual(folded_batch, (3, 2))
+            np.testing.assert_array_equal(folded_events.to_dense(), folded)
+
+    def test_events_fold_past_sample_index_type(self):
+        """Test that folding samples whose features fit 8 bits gives folded features that need wider indices."""
+        spikes = (np.random.default_rng(1).random((3, 40, 200)) < 0.05).astype(np.int8)
+        events = [SpikeEvents.from_dense(sample) for sample in spikes]
+        self.assertEqual(events[0].channels.dtype, np.uint8)
+        folded, batch = fold_batch(events)
+        self.assertEqual(batch, (3, 200))
+        self.assertEqual(folded.channels.dtype, np.uint16)
+        np.testing.assert_array_equal(folded.to_dense(), fold_batch(spikes)[0])
+
+    def test_events_of_different_shapes_raise(self):
+        """Test that spike trains of different shapes cannot be folded together."""
+        with self.assertRaises(ValueError):
+            fold_batch([SpikeEvents.from_dense(np.zeros((5, 2))), SpikeEvents.from_dense(np.zeros((6, 2)))])
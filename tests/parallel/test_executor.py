@@ -0,0 +1,107 @@
+import unittest
+from functools import partial
+import numpy as np
+from spikify.encoders.rate import PoissonEncoder, poisson
+from spikify.encoders.temporal.contrast import step_forward
+from spikify.encoders.temporal.deconvolution import HoughSpikerEncoder, bens_spiker
+from spikify.encoders.temporal.global_referenced import time_to_first_spike
+from spikify.parallel import encode_many
+
+
+class TestEncodeMany(unittest.TestCase):
+    """Tests for the encode_many function."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.recordings = [np.cumsum(rng.normal(scale=0.3, size=(length, 6)), axis=0) for length in (120, 300, 80, 200)]
+        self.encoder = partial(step_forward, threshold=0.2)
+        self.expected = [self.encoder(recording) for recording in self.recordings]
+
+    def assert_outputs_equal(self, results, expected):
+        self.assertEqual(len(results), len(expected))
+        for result, value in zip(results, expected):
+            for array, expected_array in zip(result, value):
+                np.testing.assert_array_equal(array, expected_array)
+
+    def test_strategies_and_chunkings(self):
+        """Test that every strategy and chunking returns the outputs of the sequential loop, in input order."""
+        for strategy in ("process", "thread"):
+            for chunking in ("recording", "feature"):
+                with self.subTest(strategy=strategy, chunking=chunking):
+                    results = encode_many(
+                        self.encoder, self.recordings, workers=2, strategy=strategy, chunking=chunking, chunk_size=4
+                    )
+                    self.assert_outputs_equal(results, self.expected)
+
+    def test_single_worker(self):
+        """Test that a single worker runs the tasks in the calling thread."""
+        self.assert_outputs_equal(encode_many(self.encoder, self.recordings, workers=1), self.expected)
+
+    def test_batch_array(self):
+        """Test that a 3D array is encoded recording by recording."""
+        signals = np.stack([recording[:80] for recording in self.recordings])
+        results = encode_many(self.encoder, signals, workers=2, strategy="thread")
+        self.assert_outputs_equal(results, [self.encoder(signal) for signal in signals])
+
+    def test_fitted_encoder_split_by_feature(self):
+        """Test that a fitted encoder is restricted to the features of every task."""
+        encoder = HoughSpikerEncoder(8, 0.1).fit(self.recordings[0])
+        results = encode_many(encoder, self.recordings, workers=2, chunking="feature", chunk_size=4)
+        for result, recording in zip(results, self.recordings):
+            np.testing.assert_array_equal(result, encoder.transform(recording))
+
+    def test_events_split_by_feature(self):
+        """Test that events encoded by groups of features are concatenated back."""
+        encoder = partial(bens_spiker, window_length=8, cutoff=0.1, threshold=0.2, output="events")
+        results = encode_many(encoder, self.recordings, workers=2, strategy="thread", chunking="feature", chunk_size=4)
+        for (events, fir_bank, shift), recording in zip(results, self.recordings):
+            expected, expected_fir_bank, expected_shift = bens_spiker(recording, 8, 0.1, 0.2)
+            np.testing.assert_array_equal(events.to_dense(), expected)
+            np.testing.assert_array_equal(fir_bank, expected_fir_bank)
+            np.testing.assert_array_equal(shift, expected_shift)
+
+    def test_single_feature_parts_split_by_feature(self):
+        """Test that the 1D spike trains of single features are joined along the feature axis."""
+        encoder = partial(time_to_first_spike, interval_length=8)
+        for features, workers in ((2, 2), (3, 2), (4, 4)):
+            with self.subTest(features=features, workers=workers):
+                signals = [np.abs(recording[:64, :features]) for recording in self.recordings]
+                results = encode_many(encoder, signals, workers=workers, strategy="thread", chunking="feature")
+                for result, signal in zip(results, signals):
+                    self.assertEqual(result.shape, (64, features))
+                    np.testing.assert_array_equal(result, encoder(signal))
+
+        encoder = PoissonEncoder(8).fit(np.abs(self.recordings[0][:64, :4]))
+        signals = [np.abs(recording[:64, :4]) for recording in self.recordings]
+        for result in encode_many(encoder, signals, workers=2, strategy="thread", chunking="feature", chunk_size=1):
+            self.assertEqual(result.shape, (64, 4))
+
+    def test_deterministic_random_encoder(self):
+        """Test that a random encoder gives the same results for any number of workers with a fixed chunking."""
+        signals = [np.abs(recording[:80]) for recording in self.recordings]
+        encoder = partial(poisson, interval_length=8)
+        reference = encode_many(encoder, signals, workers=1)
+        for workers in (2, 3):
+            results = encode_many(encoder, signals, workers=workers)
+            for result, expected in zip(results, reference):
+                np.testing.assert_array_equal(result, expected)
+
+    def test_encoder_errors_propagate(self):
+        """Test that an error raised by the encoder in a worker is raised by encode_many."""
+        with self.assertRaises(ValueError):
+            encode_many(partial(step_forward, threshold=[0.1, 0.2]), self.recordings, workers=2)
+
+    def test_invalid_arguments_raise(self):
+        """Test that unsupported strategies, chunkings and sizes raise ValueError."""
+        with self.assertRaises(ValueError):
+            encode_many(self.encoder, self.recordings, strategy="gpu")
+        with self.assertRaises(ValueError):
+            encode_many(self.encoder, self.recordings, chunking="time")
+        with self.assertRaises(ValueError):
+            encode_many(self.encoder, self.recordings, workers=0)
+        with self.assertRaises(ValueError):
+            encode_many(self.encoder, self.recordings, chunk_size=0)
+
+    def test_empty_input(self):
+        """Test that no recordings give no results."""
+        self.assertEqual(encode_many(self.encoder, []), [])
@@ -0,0 +1,91 @@
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from spikify.encoders.rate import poisson
+from spikify.encoders.temporal.deconvolution import bens_spiker
+from spikify.parallel import SharedArray
+
+
+def _encode(index: int, signals: SharedArray, spikes: SharedArray) -> None:
+    bens_spiker(signals.array[index], 8, 0.1, 0.2, out=spikes.array[index])
+
+
+class TestSharedArray(unittest.TestCase):
+    """Tests for the SharedArray class."""
+
+    def test_from_array(self):
+        """Test that an array is copied into shared memory with its shape and dtype."""
+        array = np.arange(12, dtype=np.float32).reshape(3, 4)
+        with SharedArray.from_array(array) as shared:
+            self.assertEqual(shared.shape, (3, 4))
+            self.assertEqual(shared.dtype, np.float32)
+            np.testing.assert_array_equal(shared.array, array)
+
+    def test_pickle_attaches_block(self):
+        """Test that an unpickled array attaches the same memory instead of a copy."""
+        with SharedArray(5, np.int8) as shared:
+            attached = pickle.loads(pickle.dumps(shared))
+            self.assertEqual(attached.name, shared.name)
+            attached.array[:] = 3
+            attached.close()
+            np.testing.assert_array_equal(shared.array, np.full(5, 3, dtype=np.int8))
+
+    def test_view_keeps_block_mapped(self):
+        """Test that a view of the array stays valid once the shared array is garbage collected."""
+        shared = SharedArray.from_array(np.arange(6.0))
+        name = shared.name
+        view = shared.array[2:]
+        del shared
+        np.testing.assert_array_equal(view, [2.0, 3.0, 4.0, 5.0])
+        SharedArray(6, name=name).unlink()
+
+    def test_view_valid_after_close(self):
+        """Test that a view of the array stays valid once the array is closed and its block unlinked."""
+        with SharedArray.from_array(np.arange(6.0)) as shared:
+            view = shared.array[2:]
+        view[0] = 7.0
+        np.testing.assert_array_equal(view, [7.0, 3.0, 4.0, 5.0])
+        block = view.base.base.block
+        del view
+        self.assertIsNone(block.buf)
+
+    def test_close_releases_mapping(self):
+        """Test that closing an array without views releases its mapping at once."""
+        shared = SharedArray.from_array(np.arange(4.0))
+        block = shared.array.base.block
+        shared.close()
+        self.assertIsNone(block.buf)
+        shared.unlink()
+
+    def test_exit_unlinks_block(self):
+        """Test that leaving the context of the creating process releases the block."""
+        with SharedArray(4) as shared:
+            name = shared.name
+        with self.assertRaises(ValueError):
+            shared.array
+        with self.assertRaises(FileNotFoundError):
+            SharedArray(4, name=name)
+
+    def test_attach_small_block_raises(self):
+        """Test that attaching a block smaller than the array raises a ValueError."""
+        with SharedArray(4, np.int8) as shared:
+            with self.assertRaises(ValueError):
+                SharedArray(1 << 20, np.int8, name=shared.name)
+
+    def test_encode_in_place_in_process_pool(self):
+        """Test that worker processes read shared recordings and write their spikes into a shared output array."""
+        recordings = np.random.default_rng(0).uniform(-1, 3, (6, 100, 3))
+        with SharedArray.from_array(recordings) as signals, SharedArray(recordings.shape, np.int8) as spikes:
+            with ProcessPoolExecutor(2) as pool:
+                list(pool.map(partial(_encode, signals=signals, spikes=spikes), range(len(recordings))))
+            for recording, result in zip(recordings, spikes.array):
+                np.testing.assert_array_equal(result, bens_spiker(recording, 8, 0.1, 0.2)[0])
+
+    def test_poisson_out(self):
+        """Test that the Poisson encoder writes into a shared output array."""
+        signal = np.random.default_rng(0).uniform(0, 3, (40, 2))
+        with SharedArray(signal.shape, np.int8) as spikes:
+            poisson(signal, 4, out=spikes.array)
+            np.testing.assert_array_equal(spikes.array, poisson(signal, 4))
@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+from spikify.rng import CounterRNG, philox4x32
+
+
+class TestPhilox4x32(unittest.TestCase):
+    """Tests for the philox4x32 function."""
+
+    def test_known_answers(self):
+        """Test the known answer vectors of Philox4x32-10 from the Random123 reference implementation."""
+        vectors = [
+            ((0, 0, 0, 0), (0, 0), "6627e8d5 e169c58d bc57ac4c 9b00dbd8"),
+            ((0xFFFFFFFF,) * 4, (0xFFFFFFFF,) * 2, "408f276d 41c83b0e a20bc7c6 6d5451fd"),
+            (
+                (0x243F6A88, 0x85A308D3, 0x13198A2E, 0x03707344),
+                (0xA4093822, 0x299F31D0),
+                "d16cfe09 94fdcceb 5001e420 24126ea1",
+            ),
+        ]
+        for counter, key, expected in vectors:
+            words = philox4x32(counter, key)
+            self.assertEqual(words.dtype, np.uint32)
+            self.assertEqual(" ".join(f"{word:08x}" for word in words), expected)
+
+    def test_broadcast_counters(self):
+        """Test that broadcast counters give the words of every counter computed alone."""
+        words = philox4x32((np.arange(3)[:, None], np.arange(2), 5, 7), (11, 13))
+        self.assertEqual(words.shape, (3, 2, 4))
+        for i in range(3):
+            for j in range(2):
+                np.testing.assert_array_equal(words[i, j], philox4x32((i, j, 5, 7), (11, 13)))
+
+
+class TestCounterRNG(unittest.TestCase):
+    """Tests for the CounterRNG class."""
+
+    def setUp(self):
+        self.rng = CounterRNG(42, recording=3, start=10)
+        self.intervals = np.arange(6)
+        self.recordings = np.zeros(4, dtype=int)
+        self.features = np.arange(4)
+
+    def test_uniform_range(self):
+        """Test that the numbers lie in the open interval (0, 1) and have the requested shape."""
+        samples = self.rng.uniform(self.intervals, self.recordings, self.features, range(9))
+        self.assertEqual(samples.shape, (6, 9, 4))
+        self.assertTrue(((samples > 0) & (samples < 1)).all())
+        self.assertAlmostEqual(samples.mean(), 0.5, delta=0.1)
+
+    def test_position_determines_numbers(self):
+        """Test that every number only depends on its position, not on the block it is drawn with."""
+        whole = self.rng.uniform(self.intervals, self.recordings, self.features, range(10))
+        np.testing.assert_array_equal(
+            self.rng.uniform(self.intervals[2:5], self.recordings[1:3], self.features[1:3], range(3, 7)),
+            whole[2:5, 3:7, 1:3],
+        )
+        shifted = CounterRNG(42, recording=3, start=12)
+        np.testing.assert_array_equal(
+            shifted.uniform(self.intervals[:4], self.recordings, self.features, range(10)), whole[2:]
+        )
+
+    def test_streams_differ(self):
+        """Test that other seeds, recordings and features give other numbers."""
+        samples = self.rng.uniform(self.intervals, self.recordings, self.features, range(4))
+        for rng, recordings in (
+            (CounterRNG(43, recording=3, start=10), self.recordings),
+            (CounterRNG(42, recording=4, start=10), self.recordings),
+            (self.rng, self.recordings + 1),
+        ):
+            other = rng.uniform(self.intervals, recordings, self.features, range(4))
+            self.assertFalse(np.isin(other, samples).any())
+
+    def test_out_of_range_raises(self):
+        """Test that negative or too large arguments raise ValueError."""
+        for kwargs in ({"seed": -1}, {"seed": 1 << 64}, {"recording": 1 << 32}, {"start": -1}):
+            with self.assertRaises(ValueError):
+                CounterRNG(**kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
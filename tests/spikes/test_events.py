@@ -0,0 +1,100 @@
+import unittest
+import numpy as np
+from spikify.spikes import SpikeEvents
+
+
+class TestSpikeEvents(unittest.TestCase):
+    """Tests for the SpikeEvents class."""
+
+    def test_dense_round_trip(self):
+        """Test that converting a dense spike train to events and back gives the same spike train."""
+        rng = np.random.default_rng(0)
+        spikes = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=(200, 4), p=[0.05, 0.9, 0.05])
+        events = SpikeEvents.from_dense(spikes)
+        self.assertEqual(events.num_events, np.count_nonzero(spikes))
+        self.assertEqual(events.shape, (200, 4))
+        np.testing.assert_array_equal(events.to_dense(), spikes)
+        self.assertEqual(events.to_dense().dtype, np.int8)
+
+    def test_1d_spike_train(self):
+        """Test that a 1D spike train gives a single feature."""
+        events = SpikeEvents.from_dense(np.array([0, 1, 0, 1]))
+        self.assertEqual(events.shape, (4, 1))
+        np.testing.assert_array_equal(events.times, [1, 3])
+        np.testing.assert_array_equal(events.channels, [0, 0])
+
+    def test_trailing_silence_is_kept(self):
+        """Test that silent timesteps at the end of the spike train are kept in the shape."""
+        spikes = np.zeros((10, 2), dtype=np.int8)
+        spikes[2, 1] = 1
+        np.testing.assert_array_equal(SpikeEvents.from_dense(spikes).to_dense(), spikes)
+
+    def test_events_are_sorted(self):
+        """Test that events are sorted by timestep, then by feature."""
+        events = SpikeEvents([3, 1, 1], [0, 1, 0], [1, -1, 1], shape=(5, 2))
+        np.testing.assert_array_equal(events.times, [1, 1, 3])
+        np.testing.assert_array_equal(events.channels, [0, 1, 0])
+        np.testing.assert_array_equal(events.polarities, [1, -1, 1])
+
+    def test_to_dense_dtype(self):
+        """Test that the dense spike train can be built with another dtype."""
+        events = SpikeEvents([0], [0], [1], shape=(2, 1))
+        self.assertEqual(events.to_dense(dtype=np.float32).dtype, np.float32)
+
+    def test_mismatched_lengths_raise(self):
+        """Test that event arrays of different lengths raise ValueError."""
+        with self.assertRaises(ValueError):
+            SpikeEvents([0, 1], [0], [1, 1], shape=(2, 1))
+
+    def test_events_outside_shape_raise(self):
+        """Test that events outside the spike train shape raise ValueError."""
+        with self.assertRaises(ValueError):
+            SpikeEvents([5], [0], [1], shape=(5, 1))
+        with self.assertRaises(ValueError):
+            SpikeEvents([0], [2], [1], shape=(5, 2))
+
+    def test_index_types(self):
+        """Test that timesteps and features are stored in the smallest unsigned types holding the shape."""
+        for shape, times, channels in (
+            ((256, 1), np.uint8, np.uint8),
+            ((257, 256), np.uint16, np.uint8),
+            ((70_000, 300), np.uint32, np.uint16),
+            ((1 << 33, 2), np.uint64, np.uint8),
+        ):
+            events = SpikeEvents([shape[0] - 1, 0], [shape[1] - 1, 0], [1, -1], shape=shape)
+            self.assertEqual(events.times.dtype, times)
+            self.assertEqual(events.channels.dtype, channels)
+            np.testing.assert_array_equal(events.times, [0, shape[0] - 1])
+            np.testing.assert_array_equal(events.channels, [0, shape[1] - 1])
+
+    def test_memory_saving(self):
+        """Test that the events of a long spike train of many features take a quarter of 64-bit indices."""
+        rng = np.random.default_rng(2)
+        spikes = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=(100_000, 300), p=[0.01, 0.98, 0.01])
+        events = SpikeEvents.from_dense(spikes)
+        self.assertEqual(events.times.dtype, np.uint32)
+        self.assertEqual(events.channels.dtype, np.uint16)
+        wide = 2 * np.dtype(np.int64).itemsize * events.num_events
+        self.assertLessEqual(events.times.nbytes + events.channels.nbytes, 0.375 * wide)
+        np.testing.assert_array_equal(events.to_dense(), spikes)
+
+    def test_negative_indices_raise(self):
+        """Test that negative timesteps or features raise ValueError instead of wrapping around."""
+        with self.assertRaises(ValueError):
+            SpikeEvents([-1], [0], [1], shape=(5, 1))
+        with self.assertRaises(ValueError):
+            SpikeEvents([0], [-1], [1], shape=(5, 2))
+
+    def test_from_dense_blocks(self):
+        """Test that events collected block by block are offset by the start of each block."""
+        rng = np.random.default_rng(1)
+        spikes = (rng.random((100, 3)) < 0.1).astype(np.int8)
+        blocks = ((start, spikes[start : start + 30]) for start in range(0, 100, 30))
+        events = SpikeEvents.from_dense_blocks(blocks, spikes.shape)
+        np.testing.assert_array_equal(events.to_dense(), spikes)
+
+    def test_from_no_blocks(self):
+        """Test that no blocks give an empty spike train of the given shape."""
+        events = SpikeEvents.from_dense_blocks([], (1, 2))
+        self.assertEqual(events.num_events, 0)
+        np.testing.assert_array_equal(events.to_dense(), np.zeros((1, 2), dtype=np.int8))
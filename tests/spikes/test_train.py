@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+from spikify.spikes import SpikeTrain
+
+
+class TestSpikeTrain(unittest.TestCase):
+    """Tests for the SpikeTrain class."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.bipolar = rng.choice(np.array([-1, 0, 1], dtype=np.int8), size=(101, 5), p=[0.1, 0.8, 0.1])
+        self.unipolar = (rng.random((101, 5)) < 0.2).astype(np.int8)
+
+    def test_dense_round_trip(self):
+        """Test that packing and unpacking gives the same spike train."""
+        for spikes in (self.bipolar, self.unipolar):
+            train = SpikeTrain.from_dense(spikes)
+            self.assertEqual(train.shape, spikes.shape)
+            self.assertEqual(len(train), 101)
+            np.testing.assert_array_equal(train.to_dense(), spikes)
+            np.testing.assert_array_equal(np.asarray(train), spikes)
+
+    def test_polarity_detection(self):
+        """Test that only spike trains with negative spikes keep a negative plane."""
+        self.assertTrue(SpikeTrain.from_dense(self.bipolar).bipolar)
+        self.assertFalse(SpikeTrain.from_dense(self.unipolar).bipolar)
+
+    def test_packed_size(self):
+        """Test that each plane takes one bit per sample, rounded up to whole bytes along time."""
+        self.assertEqual(SpikeTrain.from_dense(self.unipolar).nbytes, 13 * 5)
+        self.assertEqual(SpikeTrain.from_dense(self.bipolar).nbytes, 2 * 13 * 5)
+
+    def test_1d_spike_train(self):
+        """Test that a 1D spike train is stored with a single channel."""
+        train = SpikeTrain.from_dense(np.array([0, 1, 1, 0, 1], dtype=np.int8))
+        self.assertEqual(train.shape, (5, 1))
+
+    def test_invalid_values_raise(self):
+        """Test that values other than -1, 0 and +1 raise ValueError."""
+        with self.assertRaises(ValueError):
+            SpikeTrain.from_dense(np.array([0, 2, 1]))
+
+    def test_slicing(self):
+        """Test that time and channel selections match the same selections on the dense spike train."""
+        train = SpikeTrain.from_dense(self.bipolar)
+        for key, expected in (
+            ((slice(16, 50), slice(1, 4)), self.bipolar[16:50, 1:4]),
+            ((slice(3, 98), [0, 4]), self.bipolar[3:98, [0, 4]]),
+            ((slice(None, -7), 2), self.bipolar[:-7, 2:3]),
+            ((slice(-1, None),), self.bipolar[-1:]),
+            ((5,), self.bipolar[5:6]),
+            ((slice(40, 40),), self.bipolar[40:40]),
+        ):
+            result = train[key if len(key) > 1 else key[0]]
+            np.testing.assert_array_equal(result.to_dense(), expected)
+
+    def test_aligned_slices_are_views(self):
+        """Test that channel slices and time ranges starting at a multiple of 8 share the packed data."""
+        train = SpikeTrain.from_dense(self.bipolar)
+        view = train[8:60, 1:3]
+        self.assertTrue(np.shares_memory(view.positive, train.positive))
+        self.assertTrue(np.shares_memory(view.negative, train.negative))
+        np.testing.assert_array_equal(view.to_dense(), self.bipolar[8:60, 1:3])
+
+    def test_stepped_time_slice_raises(self):
+        """Test that time slices with a step raise IndexError."""
+        with self.assertRaises(IndexError):
+            SpikeTrain.from_dense(self.unipolar)[::2]
+
+    def test_to_events(self):
+        """Test that events collected block by block describe the same spike train."""
+        train = SpikeTrain.from_dense(self.bipolar)
+        for block in (1, 8, 30, 1000):
+            np.testing.assert_array_equal(train.to_events(block=block).to_dense(), self.bipolar)
+
+    def test_mismatched_planes_raise(self):
+        """Test that planes of the wrong shape raise ValueError."""
+        with self.assertRaises(ValueError):
+            SpikeTrain(np.zeros((2, 3), dtype=np.uint8), None, length=20)
+        with self.assertRaises(ValueError):
+            SpikeTrain(np.zeros((2, 3), dtype=np.uint8), np.zeros((2, 2), dtype=np.uint8), length=16)